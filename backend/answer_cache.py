@@ -0,0 +1,89 @@
+"""
+EuroMatchTickets Answer Cache
+In-process TTL cache for support answers keyed by a normalized question, so
+"How do I get a refund?" and "how can i get refunds" share one LLM answer.
+Per worker; hit rate is exported on /metrics.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from metrics import Counter
+
+# Words that don't change what is being asked
+FILLER_WORDS = {
+    "a", "an", "the", "i", "me", "my", "we", "our", "you", "your", "please", "pls", "hi", "hello", "hey",
+    "can", "could", "would", "will", "do", "does", "did", "is", "are", "am", "be", "to", "of", "for",
+    "on", "in", "it", "this", "that", "how", "what", "there", "any", "just", "thanks", "thank",
+    "so", "about", "get", "got", "want", "wanted", "like", "know", "tell", "need",
+}
+_WORD = re.compile(r"[a-z0-9€$£]+")
+
+
+def _stem(word: str) -> str:
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def normalize_question(text: str) -> str:
+    """Order-insensitive key: lowercase words minus filler, crudely singularized"""
+    words = {_stem(word) for word in _WORD.findall(text.lower())}
+    return " ".join(sorted(words - FILLER_WORDS))
+
+
+answer_cache_requests = Counter("chat_answer_cache_requests_total", "Support answer cache lookups by result")
+
+
+class AnswerCache:
+    """LRU + TTL map from normalized question to answer"""
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 1000, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, question: str) -> Optional[str]:
+        key = normalize_question(question)
+        with self._lock:
+            entry = self._entries.get(key) if key else None
+            if entry and self.clock() - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                answer_cache_requests.inc(("hit",))
+                return entry[0]
+            if entry:
+                del self._entries[key]
+            self.misses += 1
+            answer_cache_requests.inc(("miss",))
+            return None
+
+    def put(self, question: str, answer: str):
+        key = normalize_question(question)
+        if not key or not answer:
+            return
+        with self._lock:
+            self._entries[key] = (answer, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def render_prometheus(self) -> str:
+        lines = answer_cache_requests.render(("result",))
+        lines.append("# TYPE chat_answer_cache_entries gauge")
+        lines.append(f"chat_answer_cache_entries {len(self._entries)}")
+        lines.append("# TYPE chat_answer_cache_hit_ratio gauge")
+        lines.append(f"chat_answer_cache_hit_ratio {self.hit_rate:.4f}")
+        return "\n".join(lines) + "\n"
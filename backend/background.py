@@ -0,0 +1,50 @@
+"""
+EuroMatchTickets Background Tasks
+Tracks fire-and-forget work (emails, fulfilment follow-ups, index builds) so a
+worker can drain it on SIGTERM instead of dropping it mid-flight.
+"""
+
+import asyncio
+import logging
+from typing import Coroutine, Set
+
+logger = logging.getLogger(__name__)
+
+_tasks: Set[asyncio.Task] = set()
+
+
+def _done(task: asyncio.Task):
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error(f"Background task {task.get_name()} failed: {task.exception()}")
+
+
+def spawn(coro: Coroutine, name: str = None) -> asyncio.Task:
+    """Run coro in the background, tracked for graceful shutdown"""
+    task = asyncio.create_task(coro, name=name)
+    _tasks.add(task)
+    task.add_done_callback(_done)
+    return task
+
+
+def pending() -> int:
+    """Number of background tasks still running"""
+    return len(_tasks)
+
+
+async def drain(timeout: float) -> int:
+    """Wait up to timeout seconds for background tasks; cancel stragglers.
+
+    Returns the number of tasks that had to be cancelled.
+    """
+    if not _tasks:
+        return 0
+
+    logger.info(f"⏳ Draining {len(_tasks)} background task(s)...")
+    done, still_running = await asyncio.wait(set(_tasks), timeout=timeout)
+    for task in still_running:
+        task.cancel()
+    if still_running:
+        await asyncio.gather(*still_running, return_exceptions=True)
+        logger.warning(f"Cancelled {len(still_running)} background task(s) after {timeout}s")
+    return len(still_running)
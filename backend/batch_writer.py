@@ -0,0 +1,80 @@
+"""
+EuroMatchTickets Batched Writes
+Buffers append-only documents (chat logs, analytics) and writes them with
+one insert_many per batch instead of one round-trip per request.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """Flushes when max_batch documents are buffered or every flush_interval seconds.
+
+    The buffer is bounded: when the database is down, the oldest documents
+    are dropped rather than growing without limit.
+    """
+
+    def __init__(self, collection, max_batch: int = 100, flush_interval: float = 1.0, max_buffer: int = 10000):
+        self.collection = collection
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._buffer = []
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, document: dict):
+        self._buffer.append(document)
+        if len(self._buffer) > self.max_buffer:
+            overflow = len(self._buffer) - self.max_buffer
+            del self._buffer[:overflow]
+            self.dropped += overflow
+        if len(self._buffer) >= self.max_batch and self._wake is not None:
+            self._wake.set()
+
+    async def flush(self):
+        while self._buffer:
+            batch = self._buffer[:self.max_batch]
+            del self._buffer[:len(batch)]
+            try:
+                await self.collection.insert_many(batch, ordered=False)
+                self.written += len(batch)
+                self.batches += 1
+            except asyncio.CancelledError:
+                self._buffer[:0] = batch
+                raise
+            except Exception as e:
+                # Keep the batch for the next attempt (bounded by max_buffer)
+                self._buffer[:0] = batch
+                logger.error(f"Batch write of {len(batch)} document(s) failed: {e}")
+                return
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="batch-writer")
+
+    async def stop(self):
+        """Stop the flush loop and write whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._wake = None
+        await self.flush()
@@ -0,0 +1,169 @@
+"""
+Replay recorded support chats to measure what the answer cache and the
+retrieval prompt save: LLM calls and prompt tokens per conversation, before
+(every message hits gpt-4o with the static prompt) and after.
+
+    python -m bench.chat_replay                     # from db.chat_logs
+    python -m bench.chat_replay --file logs.ndjson  # exported chat_logs
+    python -m bench.chat_replay --retrieval         # also query live events (needs the chat text index)
+
+No LLM calls are made; tokens are counted with tiktoken when installed,
+otherwise estimated at 4 characters per token.
+"""
+
+import argparse
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+
+# The prompt before retrieval replaced the hard-coded event list
+LEGACY_SYSTEM_MESSAGE = """You are the AI customer support assistant for EuroMatchTickets, Europe's #1 ticket marketplace for football matches and concerts.
+
+Your role:
+- Help customers find tickets for events
+- Answer questions about orders and payments
+- Explain the refund policy (full refund if event cancelled, 48-hour refund window for change of mind)
+- Provide information about ticket delivery (instant QR code)
+- Be friendly, helpful, and professional
+
+Key information:
+- We sell verified tickets for Champions League, Premier League, La Liga, Bundesliga, and major concerts
+- Payment is 100% secure via Stripe
+- All tickets are verified and guaranteed
+- 10% commission on sales
+- Instant QR code delivery after purchase
+- 24/7 customer support
+
+Popular events we cover:
+- FIFA World Cup 2026
+- UEFA Champions League
+- Bruno Mars Tour 2026
+- The Weeknd Tour 2026
+- Bad Bunny London 2026
+- Guns N' Roses Tour 2026
+
+Keep responses concise and helpful. If you don't know something specific, direct them to email support@euromatchtickets.com"""
+
+
+def token_counter():
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")
+        return lambda text: len(encoding.encode(text))
+    except Exception:
+        return lambda text: max(len(text) // 4, 1)
+
+
+def prompt_tokens(count, messages: list) -> int:
+    # ~4 tokens of framing per message in the chat format
+    return sum(count(m["content"]) + 4 for m in messages)
+
+
+async def load_logs(path: str = None, limit: int = 0) -> list:
+    if path:
+        with open(path, encoding="utf-8") as f:
+            logs = [json.loads(line) for line in f if line.strip()]
+        for log in logs:
+            if isinstance(log.get("timestamp"), str):
+                log["timestamp"] = datetime.fromisoformat(log["timestamp"].replace("Z", "+00:00"))
+        logs.sort(key=lambda log: log["timestamp"])
+        return logs[:limit] if limit else logs
+
+    from database import db
+    cursor = db.chat_logs.find({}, {"_id": 0}).sort("timestamp", 1)
+    if limit:
+        cursor = cursor.limit(limit)
+    return await cursor.to_list(None)
+
+
+async def replay(logs: list, retrieval: bool = False, ttl: float = 3600) -> dict:
+    from answer_cache import AnswerCache
+    from routers import chat
+
+    count = token_counter()
+    now = [0.0]
+    cache = AnswerCache(ttl=ttl, max_entries=100000, clock=lambda: now[0])
+    histories = defaultdict(list)
+    before = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+    after = {"llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cache_hits": 0, "with_live_context": 0}
+
+    for log in logs:
+        now[0] = log["timestamp"].timestamp()
+        history = histories[log["session_id"]]
+        question, answer = log["user_message"], log.get("ai_response") or ""
+        turn = history[-9:] + [{"role": "user", "content": question}]
+
+        before["llm_calls"] += 1
+        before["prompt_tokens"] += prompt_tokens(count, [{"role": "system", "content": LEGACY_SYSTEM_MESSAGE}] + turn)
+        before["completion_tokens"] += count(answer)
+
+        events = await chat.retrieve_events(question) if retrieval else []
+        cacheable = not history and not events
+        if cacheable and cache.get(question):
+            after["cache_hits"] += 1
+        else:
+            messages = [{"role": "system", "content": chat.SUPPORT_SYSTEM_MESSAGE}]
+            if events:
+                messages.append({"role": "system", "content": chat.format_context(events)})
+                after["with_live_context"] += 1
+            after["llm_calls"] += 1
+            after["prompt_tokens"] += prompt_tokens(count, messages + turn)
+            after["completion_tokens"] += count(answer)
+            if cacheable:
+                cache.put(question, answer)
+
+        history.extend([{"role": "user", "content": question}, {"role": "assistant", "content": answer}])
+
+    conversations = max(len(histories), 1)
+    per_conversation = {
+        "before": {k: round(v / conversations, 2) for k, v in before.items()},
+        "after": {k: round(v / conversations, 2) for k, v in after.items()},
+    }
+    return {
+        "messages": len(logs),
+        "conversations": len(histories),
+        "cache_hit_rate": round(after["cache_hits"] / len(logs), 4) if logs else 0.0,
+        "before": before,
+        "after": after,
+        "per_conversation": per_conversation,
+        "llm_calls_saved": 1 - after["llm_calls"] / before["llm_calls"] if before["llm_calls"] else 0.0,
+        "prompt_tokens_saved": 1 - after["prompt_tokens"] / before["prompt_tokens"] if before["prompt_tokens"] else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay chat_logs through the support answer cache")
+    parser.add_argument("--file", help="NDJSON export of chat_logs (default: read from MongoDB)")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--retrieval", action="store_true", help="Query live events for each question")
+    parser.add_argument("--ttl", type=float, default=3600, help="Cache TTL in seconds of log time")
+    parser.add_argument("--json", action="store_true", help="Print the raw report")
+    args = parser.parse_args()
+
+    async def run():
+        logs = await load_logs(args.file, args.limit)
+        return await replay(logs, retrieval=args.retrieval, ttl=args.ttl)
+
+    report = asyncio.run(run())
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    per = report["per_conversation"]
+    print(f"{report['messages']} messages in {report['conversations']} conversations")
+    print(f"Cache hit rate:           {report['cache_hit_rate'] * 100:.1f}%")
+    print(f"LLM calls / conversation: {per['before']['llm_calls']} -> {per['after']['llm_calls']} "
+          f"({report['llm_calls_saved'] * 100:.1f}% fewer)")
+    print(f"Prompt tokens / conv.:    {per['before']['prompt_tokens']:.0f} -> {per['after']['prompt_tokens']:.0f} "
+          f"({report['prompt_tokens_saved'] * 100:.1f}% fewer)")
+    print(f"With live context:        {report['after']['with_live_context']} message(s)")
+
+
+if __name__ == "__main__":
+    main()
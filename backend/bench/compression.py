@@ -0,0 +1,102 @@
+"""
+Compression benchmark: bytes on the wire and latency per route, identity vs
+gzip vs brotli, through CompressionMiddleware.
+
+Payloads are built from bench.generate data in the shape the real routes
+return: GET /api/events/{id} with 500 embedded tickets, an admin page of
+orders carrying base64 QR codes, and sitemap.xml for 1000 events. Each is
+served in-process (no network) so latency is the middleware's cost; the
+transfer time column adds what the bytes cost at --mbps.
+
+Usage (from backend/):
+    python -m bench.compression [--requests 200] [--mbps 10]
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import statistics
+import time
+
+from bench.generate import Spec, gen_events, gen_tickets
+from compression import CompressionBudget, CompressionMiddleware, available_encodings
+
+
+def _qr(data: str) -> str:
+    import qrcode
+    buffer = io.BytesIO()
+    qrcode.make(data).save(buffer, format="PNG")
+    return base64.b64encode(buffer.getvalue()).decode()
+
+
+def payloads() -> dict:
+    """(content type, body) per route"""
+    spec = Spec()
+    events = gen_events(spec, 0)["events"]
+    generated = gen_tickets(spec, 0)
+    event = dict(events[0], tickets=generated["tickets"][:500], ticket_count=500)
+    orders = [dict(o, qr_code=_qr(o["order_id"])) for o in generated["orders"][:50]]
+    urls = "".join(f"<url><loc>https://euromatchtickets.com/event/{e['event_id']}</loc>"
+                   f"<changefreq>daily</changefreq><priority>0.8</priority></url>" for e in events)
+    sitemap = f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+    return {
+        "GET /api/events/{id}": ("application/json", json.dumps(event, default=str).encode()),
+        "GET /api/admin/orders": ("application/json", json.dumps(orders, default=str).encode()),
+        "GET /api/sitemap.xml": ("application/xml", sitemap.encode()),
+    }
+
+
+def _app(content_type: str, body: bytes):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type.encode()), (b"content-length", str(len(body)).encode())]})
+        await send({"type": "http.response.body", "body": body})
+    return app
+
+
+async def _request(app, accept: str) -> tuple:
+    size = 0
+
+    async def send(message):
+        nonlocal size
+        if message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept.encode())]}
+    started = time.perf_counter()
+    await app(scope, None, send)
+    return size, time.perf_counter() - started
+
+
+async def measure(requests: int) -> list:
+    """Rows of (route, encoding, bytes, p50 seconds, p95 seconds)"""
+    rows = []
+    for route, (content_type, body) in payloads().items():
+        # Unlimited budget: measure the cost itself, not the budget cut-off
+        app = CompressionMiddleware(_app(content_type, body), budget=CompressionBudget(fraction=1e9))
+        for encoding in ("identity",) + available_encodings():
+            samples = [await _request(app, encoding) for _ in range(requests)]
+            latencies = sorted(s for _, s in samples)
+            rows.append((route, encoding, samples[0][0], statistics.median(latencies),
+                         latencies[int(len(latencies) * 0.95) - 1]))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--mbps", type=float, default=10.0, help="Link speed for the transfer time column")
+    args = parser.parse_args()
+    rows = asyncio.run(measure(args.requests))
+    identity = {route: size for route, encoding, size, _, _ in rows if encoding == "identity"}
+    print(f"{'route':<24} {'encoding':<9} {'bytes':>9} {'ratio':>6} {'p50 ms':>7} {'p95 ms':>7} {'transfer ms':>11}")
+    for route, encoding, size, p50, p95 in rows:
+        transfer = size * 8 / (args.mbps * 1e6) * 1000
+        print(f"{route:<24} {encoding:<9} {size:>9} {identity[route] / size:>6.1f} "
+              f"{p50 * 1000:>7.2f} {p95 * 1000:>7.2f} {transfer:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
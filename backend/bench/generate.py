@@ -0,0 +1,428 @@
+"""
+Deterministic synthetic data generator for load and capacity testing.
+
+Given a seed and scale factors, produces events, tickets, users, sessions,
+orders, payouts, ratings and price alerts with realistic skew: event
+popularity and seller volume follow Zipf-like power laws, so a handful of hot
+events hold most listings and a few power sellers list most tickets.
+
+Work is split into fixed-size chunks, each with its own RNG derived from
+(seed, kind, chunk). Ids, timestamps (relative to --epoch) and every field
+depend only on those, so the output is byte-identical whatever --workers is.
+Orders, payouts and ratings are generated alongside the tickets they refer to,
+which keeps references consistent without a second pass.
+
+    # mongoimport-ready NDJSON (Extended JSON dates) plus manifest.json
+    python -m bench.generate --scale 20 --out /data/gen --workers 8
+
+    # Parallel batched inserts into a bench database, then the API's indexes
+    DB_NAME=euromatchtickets_bench python -m bench.generate --scale 20 --mongo --workers 8
+
+manifest.json records the parameters and a sha256 per collection; two runs
+with the same parameters produce the same digests. Sessions reuse the bench
+tokens (bench-buyer-N, bench-seller-N) so bench.run can drive the data set.
+Run POST /api/admin/ratings/rebuild-stats after loading to fill
+seller_rating_stats.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from bench.seed import BATCH_SIZE, buyer_token, seller_token
+
+SEED_DATA_DIR = Path(__file__).resolve().parent.parent / "seed_data"
+CHUNK_SIZE = 10_000
+
+# Per unit of --scale
+SCALE_UNIT = {"events": 1_000, "tickets": 50_000, "buyers": 20_000, "sellers": 500, "alerts": 10_000}
+
+# kind -> collections written by its chunks
+KINDS = {
+    "events": ["events"],
+    "sellers": ["users", "user_sessions"],
+    "buyers": ["users", "user_sessions"],
+    "tickets": ["tickets", "orders", "seller_payouts", "ratings"],
+    "alerts": ["price_alerts"],
+}
+COLLECTIONS = sorted({name for names in KINDS.values() for name in names})
+
+SOLD_SHARE = 0.35
+ORDER_STATUSES = (["completed"] * 14) + (["paid"] * 4) + ["refunded", "disputed"]
+RATING_STARS = [5, 5, 5, 5, 4, 4, 4, 3, 2, 1]
+
+
+@dataclass(frozen=True)
+class Spec:
+    seed: int = 2026
+    events: int = SCALE_UNIT["events"]
+    tickets: int = SCALE_UNIT["tickets"]
+    buyers: int = SCALE_UNIT["buyers"]
+    sellers: int = SCALE_UNIT["sellers"]
+    alerts: int = SCALE_UNIT["alerts"]
+    sessions: int = 200
+    event_skew: float = 1.1
+    seller_skew: float = 1.2
+    buyer_skew: float = 0.6
+    epoch: str = "2026-01-01"
+
+    @property
+    def start(self) -> datetime:
+        return datetime.fromisoformat(self.epoch).replace(tzinfo=timezone.utc)
+
+
+def zipf_index(u: float, n: int, s: float) -> int:
+    """Map a uniform u in [0, 1) to a 0-based rank with P(rank) roughly proportional to 1 / (rank + 1) ** s"""
+    if s == 1.0:
+        x = (n + 1) ** u
+    else:
+        x = (((n + 1) ** (1 - s) - 1) * u + 1) ** (1 / (1 - s))
+    return min(int(x) - 1, n - 1)
+
+
+def _rng(spec: Spec, kind: str, chunk: int) -> random.Random:
+    # String seeds hash with sha512, so this is stable across processes and PYTHONHASHSEED
+    return random.Random(f"{spec.seed}:{kind}:{chunk}")
+
+
+def _load_templates():
+    demo = json.loads((SEED_DATA_DIR / "demo.json").read_text(encoding="utf-8"))
+    leagues = json.loads((SEED_DATA_DIR / "euro_leagues.json").read_text(encoding="utf-8"))
+    ucl = json.loads((SEED_DATA_DIR / "champions_league.json").read_text(encoding="utf-8"))
+    matches = [dict(m, event_type="match") for m in demo["matches_data"] + leagues["all_matches"]]
+    matches += [dict(m, event_type="match", league="UEFA Champions League") for m in ucl["ucl_matches"]]
+    concerts = [dict(c, event_type="concert") for c in demo["concerts_data"]]
+    categories = {"match": demo["match_categories"], "concert": demo["concert_categories"]}
+    return matches + concerts, categories, demo["team_logos"]
+
+
+TEMPLATES, CATEGORIES, TEAM_LOGOS = _load_templates()
+
+
+def event_id(i: int) -> str:
+    return f"gen_event_{i:08d}"
+
+
+def seller_id(i: int) -> str:
+    return f"gen_seller_{i:06d}"
+
+
+def buyer_id(i: int) -> str:
+    return f"gen_buyer_{i:08d}"
+
+
+def _template(i: int) -> dict:
+    # Fixed per event index, so ticket chunks know an event's type without reading it
+    return TEMPLATES[(i * 7919) % len(TEMPLATES)]
+
+
+def _heat(i: int, spec: Spec) -> float:
+    """Price premium for popular (low-index) events: 2x for the hottest, ~1x in the tail"""
+    return 1 + 1 / (1 + i) ** (spec.event_skew / 2)
+
+
+def _chunks(total: int) -> int:
+    return (total + CHUNK_SIZE - 1) // CHUNK_SIZE
+
+
+def _range(chunk: int, total: int) -> range:
+    return range(chunk * CHUNK_SIZE, min((chunk + 1) * CHUNK_SIZE, total))
+
+
+# ============== GENERATORS ==============
+
+def gen_events(spec: Spec, chunk: int) -> dict:
+    rng = _rng(spec, "events", chunk)
+    events = []
+    for i in _range(chunk, spec.events):
+        t = _template(i)
+        doc = {"event_id": event_id(i), "event_type": t["event_type"]}
+        if t["event_type"] == "match":
+            doc.update(title=f"{t['home']} vs {t['away']}", subtitle=t.get("stage") or t.get("subtitle"),
+                       home_team=t["home"], away_team=t["away"], home_logo=TEAM_LOGOS.get(t["home"]),
+                       away_logo=TEAM_LOGOS.get(t["away"]), league=t["league"])
+        else:
+            doc.update(title=f"{t['artist']} - {t['tour']}", subtitle=t["tour"], artist=t["artist"],
+                       genre=t["genre"], event_image=t.get("image"))
+        doc.update(venue=t["venue"], city=t["city"], country=t["country"],
+                   event_date=spec.start + timedelta(days=rng.randint(1, 365), hours=rng.choice([15, 18, 20])),
+                   status="upcoming", featured=i < max(spec.events // 100, 1),
+                   created_at=spec.start - timedelta(days=rng.randint(30, 180)))
+        events.append(doc)
+    return {"events": events}
+
+
+def _gen_users(spec: Spec, kind: str, chunk: int) -> dict:
+    rng = _rng(spec, kind, chunk)
+    selling = kind == "sellers"
+    total = spec.sellers if selling else spec.buyers
+    users, sessions = [], []
+    for i in _range(chunk, total):
+        user_id = seller_id(i) if selling else buyer_id(i)
+        created = spec.start - timedelta(days=rng.randint(1, 720))
+        users.append({
+            "user_id": user_id, "email": f"{user_id}@gen.local", "name": f"{kind[:-1].title()} {i}",
+            "role": "seller" if selling else "buyer", "rating": 5.0, "total_sales": 0,
+            "kyc_status": "verified" if selling else rng.choice(["pending", "pending", "verified"]),
+            "created_at": created,
+        })
+        if i < spec.sessions:
+            sessions.append({"session_id": f"gen_session_{user_id}", "user_id": user_id,
+                             "session_token": seller_token(i) if selling else buyer_token(i),
+                             "expires_at": spec.start + timedelta(days=3650), "created_at": created})
+    return {"users": users, "user_sessions": sessions}
+
+
+def gen_tickets(spec: Spec, chunk: int) -> dict:
+    """Tickets, and for the sold ones their order, payout and (sometimes) rating"""
+    rng = _rng(spec, "tickets", chunk)
+    out = {"tickets": [], "orders": [], "seller_payouts": [], "ratings": []}
+    for i in _range(chunk, spec.tickets):
+        e = zipf_index(rng.random(), spec.events, spec.event_skew)
+        s = zipf_index(rng.random(), spec.sellers, spec.seller_skew)
+        category = rng.choice(CATEGORIES[_template(e)["event_type"]])
+        original = round(category["base_price"] * _heat(e, spec) * rng.uniform(0.9, 1.1), 2)
+        price = round(original * rng.uniform(0.8, 1.6), 2)
+        listed = spec.start - timedelta(days=rng.randint(0, 90), seconds=rng.randint(0, 86399))
+        sold = rng.random() < SOLD_SHARE
+        ticket_id = f"gen_ticket_{i:09d}"
+        out["tickets"].append({
+            "ticket_id": ticket_id, "event_id": event_id(e), "seller_id": seller_id(s),
+            "seller_name": f"Seller {s}", "category": category["name"], "section": rng.choice(category["sections"]),
+            "row": str(rng.randint(1, 40)), "seat": str(rng.randint(1, 30)), "price": price,
+            "original_price": original, "currency": "EUR", "status": "sold" if sold else "available",
+            "created_at": listed,
+        })
+        if not sold:
+            continue
+
+        b = zipf_index(rng.random(), spec.buyers, spec.buyer_skew)
+        status = rng.choice(ORDER_STATUSES)
+        ordered = listed + timedelta(hours=rng.randint(1, 24 * 30))
+        commission = round(price * 0.1, 2)
+        order_id = f"gen_order_{i:09d}"
+        out["orders"].append({
+            "order_id": order_id, "buyer_id": buyer_id(b), "buyer_email": f"{buyer_id(b)}@gen.local",
+            "ticket_id": ticket_id, "event_id": event_id(e), "seller_id": seller_id(s), "ticket_price": price,
+            "commission": commission, "total_amount": round(price + commission, 2), "currency": "EUR",
+            "status": status, "stripe_session_id": f"cs_gen_{i:09d}", "created_at": ordered,
+        })
+        if status != "completed":
+            continue
+        out["seller_payouts"].append({
+            "payout_id": f"gen_payout_{i:09d}", "seller_id": seller_id(s), "order_id": order_id,
+            "ticket_id": ticket_id, "gross_amount": price, "commission": commission,
+            "net_amount": round(price - commission, 2), "currency": "EUR",
+            "status": rng.choice(["pending", "completed", "completed"]), "created_at": ordered,
+        })
+        if rng.random() < 0.4:
+            out["ratings"].append({
+                "rating_id": f"gen_rating_{i:09d}", "order_id": order_id, "seller_id": seller_id(s),
+                "buyer_id": buyer_id(b), "rating": rng.choice(RATING_STARS), "comment": None,
+                "created_at": ordered + timedelta(days=rng.randint(1, 14)),
+            })
+    return out
+
+
+def gen_alerts(spec: Spec, chunk: int) -> dict:
+    rng = _rng(spec, "alerts", chunk)
+    alerts = []
+    for i in _range(chunk, spec.alerts):
+        e = zipf_index(rng.random(), spec.events, spec.event_skew)
+        b = rng.randrange(spec.buyers)
+        base = CATEGORIES[_template(e)["event_type"]][-1]["base_price"] * _heat(e, spec)
+        alerts.append({
+            "alert_id": f"gen_alert_{i:09d}", "user_id": buyer_id(b), "user_email": f"{buyer_id(b)}@gen.local",
+            "event_id": event_id(e), "target_price": round(base * rng.uniform(0.6, 1.0), 2),
+            "current_lowest": None, "status": rng.choice(["active", "active", "active", "triggered"]),
+            "language": rng.choice(["en", "en", "de", "fr", "es"]),
+            "created_at": spec.start - timedelta(days=rng.randint(0, 60)),
+        })
+    return {"price_alerts": alerts}
+
+
+GENERATORS = {
+    "events": gen_events,
+    "sellers": lambda spec, chunk: _gen_users(spec, "sellers", chunk),
+    "buyers": lambda spec, chunk: _gen_users(spec, "buyers", chunk),
+    "tickets": gen_tickets,
+    "alerts": gen_alerts,
+}
+
+
+def plan(spec: Spec) -> list:
+    """All (kind, chunk) tasks in their canonical order"""
+    return [(kind, chunk) for kind in KINDS for chunk in range(_chunks(getattr(spec, kind)))]
+
+
+# ============== SINKS ==============
+
+def _extended_json(value):
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat(timespec="milliseconds").replace("+00:00", "Z")}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def encode(doc: dict) -> bytes:
+    """One NDJSON line in the Extended JSON mongoimport reads"""
+    return json.dumps(doc, default=_extended_json, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+
+def write_ndjson(out_dir: Path, kind: str, chunk: int, docs: dict) -> dict:
+    """Write each collection's documents to <out>/<collection>/<kind>-<chunk>.ndjson"""
+    result = {}
+    for name, rows in docs.items():
+        digest = hashlib.sha256()
+        path = out_dir / name / f"{kind}-{chunk:05d}.ndjson"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            for doc in rows:
+                line = encode(doc)
+                digest.update(line)
+                f.write(line)
+        os.replace(tmp, path)
+        result[name] = (len(rows), digest.hexdigest())
+    return result
+
+
+_client = None
+
+
+def insert_mongo(mongo_url: str, db_name: str, docs: dict) -> dict:
+    """Batched unordered inserts on a per-process client"""
+    global _client
+    if _client is None:
+        from pymongo import MongoClient
+        _client = MongoClient(mongo_url)
+    database = _client[db_name]
+    result = {}
+    for name, rows in docs.items():
+        for start in range(0, len(rows), BATCH_SIZE):
+            database[name].insert_many(rows[start:start + BATCH_SIZE], ordered=False)
+        result[name] = (len(rows), None)
+    return result
+
+
+def run_task(task) -> tuple:
+    spec, kind, chunk, sink = task
+    docs = GENERATORS[kind](spec, chunk)
+    if sink[0] == "ndjson":
+        return kind, chunk, write_ndjson(Path(sink[1]), kind, chunk, docs)
+    return kind, chunk, insert_mongo(sink[1], sink[2], docs)
+
+
+# ============== RUNNER ==============
+
+def generate(spec: Spec, sink: tuple, workers: int = 1, progress=None) -> dict:
+    """Run every chunk, in parallel when workers > 1; returns counts and digests per collection"""
+    tasks = [(spec, kind, chunk, sink) for kind, chunk in plan(spec)]
+    results = {}
+    if workers <= 1:
+        for task in tasks:
+            kind, chunk, result = run_task(task)
+            results[(kind, chunk)] = result
+            if progress:
+                progress(len(results), len(tasks))
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            for kind, chunk, result in pool.imap_unordered(run_task, tasks):
+                results[(kind, chunk)] = result
+                if progress:
+                    progress(len(results), len(tasks))
+
+    # Fold chunk results in canonical order so digests don't depend on scheduling
+    collections = {}
+    for kind, chunk in plan(spec):
+        for name, (count, digest) in results[(kind, chunk)].items():
+            entry = collections.setdefault(name, {"documents": 0, "sha256": hashlib.sha256()})
+            entry["documents"] += count
+            if digest:
+                entry["sha256"].update(bytes.fromhex(digest))
+    return {name: {"documents": c["documents"], "sha256": c["sha256"].hexdigest() if sink[0] == "ndjson" else None}
+            for name, c in sorted(collections.items())}
+
+
+def _spec_from_args(args) -> Spec:
+    counts = {key: getattr(args, key) or unit * args.scale for key, unit in SCALE_UNIT.items()}
+    return Spec(seed=args.seed, sessions=args.sessions, epoch=args.epoch, event_skew=args.event_skew,
+                seller_skew=args.seller_skew, buyer_skew=args.buyer_skew, **counts)
+
+
+async def _build_indexes():
+    import server  # loads .env before the database module reads it
+    import routers
+    await routers.ensure_indexes(routers.load(list(routers.SUBSYSTEMS)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=2026)
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier for the default counts")
+    for key, unit in SCALE_UNIT.items():
+        parser.add_argument(f"--{key}", type=int, help=f"Override the count ({unit} x scale)")
+    parser.add_argument("--sessions", type=int, default=200, help="Buyers and sellers given bench session tokens")
+    parser.add_argument("--event-skew", type=float, default=1.1)
+    parser.add_argument("--seller-skew", type=float, default=1.2)
+    parser.add_argument("--buyer-skew", type=float, default=0.6)
+    parser.add_argument("--epoch", default="2026-01-01", help="Timestamps are generated relative to this date")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", type=Path, help="Directory for NDJSON output")
+    target.add_argument("--mongo", action="store_true", help="Insert into MONGO_URL/DB_NAME (name must contain 'bench')")
+    args = parser.parse_args()
+
+    spec = _spec_from_args(args)
+    if args.mongo:
+        from dotenv import load_dotenv
+        from pymongo import MongoClient
+        load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+        mongo_url = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+        db_name = os.environ.get("DB_NAME", "euromatchtickets")
+        if "bench" not in db_name:
+            sys.exit(f"Refusing to generate into DB_NAME={db_name!r}; use a database name containing 'bench'")
+        client = MongoClient(mongo_url)
+        for name in COLLECTIONS:
+            client[db_name][name].drop()
+        client.close()
+        sink = ("mongo", mongo_url, db_name)
+    else:
+        args.out.mkdir(parents=True, exist_ok=True)
+        sink = ("ndjson", str(args.out))
+
+    print(f"🏭 Generating {asdict(spec)} with {args.workers} worker(s)")
+    started = time.monotonic()
+
+    def progress(done, total):
+        if done == total or done % max(total // 20, 1) == 0:
+            print(f"   {done}/{total} chunks ({time.monotonic() - started:.1f}s)")
+
+    collections = generate(spec, sink, args.workers, progress)
+    elapsed = time.monotonic() - started
+    total = sum(c["documents"] for c in collections.values())
+    for name, c in collections.items():
+        print(f"   {name:<16} {c['documents']:>12,}")
+    print(f"✅ {total:,} documents in {elapsed:.1f}s ({total / elapsed:,.0f}/s)")
+
+    if args.mongo:
+        import asyncio
+        asyncio.run(_build_indexes())
+        print("🗂️  Indexes built")
+    else:
+        manifest = {"spec": asdict(spec), "chunk_size": CHUNK_SIZE, "collections": collections}
+        (args.out / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        print(f"💾 {args.out}/manifest.json")
+        print(f"   Load with: for d in {args.out}/*/; do for f in $d*.ndjson; do "
+              f"mongoimport --db <DB_NAME> --collection $(basename $d) --numInsertionWorkers 4 --file $f; done; done")
+
+
+if __name__ == "__main__":
+    main()
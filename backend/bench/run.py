@@ -0,0 +1,120 @@
+"""
+Benchmark harness: seed a local Mongo, drive mixed on-sale traffic at a fixed
+concurrency and report p50/p95/p99 and RPS per route.
+
+The API must already be running against the same MONGO_URL/DB_NAME, with
+STRIPE_API_BASE pointing at stripe-mock so checkouts stay local:
+
+    docker run -p 12111:12111 stripe/stripe-mock
+    export DB_NAME=euromatchtickets_bench STRIPE_API_BASE=http://localhost:12111 STRIPE_API_KEY=sk_test_123
+    gunicorn server:app -c gunicorn.conf.py &
+
+    python -m bench.run --seed --scale 20 --duration 60 --concurrency 200 --save bench/baselines/local.json
+    python -m bench.run --duration 60 --concurrency 200 --compare bench/baselines/local.json
+
+--compare exits non-zero when p95/p99 latency or RPS regress beyond tolerance.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parent.parent / '.env')
+
+from bench import stats
+from bench.scenarios import Context, SCENARIOS, DEFAULT_MIX
+
+
+async def discover(client: httpx.AsyncClient, buyers: int, sellers: int, origin_url: str) -> Context:
+    events = (await client.get("/api/events")).json()
+    if not events:
+        raise RuntimeError("No events found - run with --seed first")
+    finals = (await client.get("/api/events", params={"search": "Finalist 1"})).json()
+    final_event_id = finals[0]["event_id"] if finals else events[0]["event_id"]
+    ordered = sorted(events, key=lambda e: not e.get("featured"))
+    return Context([e["event_id"] for e in ordered], final_event_id, buyers, sellers, origin_url)
+
+
+async def drive(base_url: str, duration: float, concurrency: int, mix: dict, ctx_args: dict, rng_seed: int) -> dict:
+    recorder = stats.Recorder()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        ctx = await discover(client, **ctx_args)
+        names = list(mix)
+        weights = [mix[n] for n in names]
+        deadline = time.monotonic() + duration
+
+        async def virtual_user(index: int):
+            rng = random.Random(rng_seed + index)
+            while time.monotonic() < deadline:
+                scenario = SCENARIOS[rng.choices(names, weights)[0]]
+                await scenario(client, ctx, recorder, rng)
+
+        started = time.monotonic()
+        await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    result = recorder.summary(elapsed)
+    result["config"] = {"duration": duration, "concurrency": concurrency, "mix": mix, "seed": rng_seed}
+    return result
+
+
+def print_report(result: dict):
+    print("\n" + "=" * 96)
+    print(f"🏟️  BENCHMARK - {result['total_requests']} requests in {result['elapsed_s']}s ({result['total_rps']} req/s)")
+    print("=" * 96)
+    print(f"{'route':<36} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}  statuses")
+    for route, r in result["routes"].items():
+        print(f"{route:<36} {r['requests']:>7} {r['rps']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['p99_ms']:>8} {r['errors']:>7}  {r['statuses']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--seed", action="store_true", help="Reseed the bench database before the run")
+    parser.add_argument("--scale", type=int, default=10, help="Catalogue copies when seeding")
+    parser.add_argument("--buyers", type=int, default=200)
+    parser.add_argument("--sellers", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--mix", type=json.loads, default=DEFAULT_MIX, help='e.g. \'{"browse": 1}\'')
+    parser.add_argument("--rng-seed", type=int, default=2026)
+    parser.add_argument("--origin-url", default="http://localhost:3000")
+    parser.add_argument("--save", type=Path, help="Write results as a baseline JSON file")
+    parser.add_argument("--compare", type=Path, help="Baseline to compare against")
+    parser.add_argument("--latency-tolerance", type=float, default=0.2)
+    parser.add_argument("--rps-tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    if args.seed:
+        from bench.seed import seed
+        counts = asyncio.run(seed(args.scale, args.buyers, args.sellers, args.rng_seed))
+        print(f"🌱 Seeded: {counts}")
+
+    ctx_args = {"buyers": args.buyers, "sellers": args.sellers, "origin_url": args.origin_url}
+    result = asyncio.run(drive(args.base_url, args.duration, args.concurrency, args.mix, ctx_args, args.rng_seed))
+    print_report(result)
+
+    if args.save:
+        stats.save(result, args.save)
+        print(f"\n💾 Baseline saved to {args.save}")
+
+    if args.compare:
+        regressions = stats.compare(stats.load(args.compare), result, args.latency_tolerance, args.rps_tolerance)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Traffic scenarios for the benchmark harness.
+
+Each scenario is one user journey; the runner picks journeys by weight. Routes
+are recorded by template (e.g. /api/events/{event_id}) so results are
+comparable across runs and data sets.
+"""
+
+import random
+import time
+
+from bench.seed import buyer_token, seller_token
+
+
+class Context:
+    """Data discovered once before the run and shared by all virtual users"""
+
+    def __init__(self, event_ids, final_event_id, buyers, sellers, origin_url):
+        self.event_ids = event_ids
+        self.final_event_id = final_event_id
+        self.buyers = buyers
+        self.sellers = sellers
+        self.origin_url = origin_url
+
+
+async def _timed(client, recorder, route, method, url, **kwargs):
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+        status = response.status_code
+    except Exception:
+        response, status = None, 0
+    recorder.record(route, status, time.perf_counter() - started)
+    return response
+
+
+async def browse(client, ctx: Context, recorder, rng: random.Random):
+    """Browse the catalogue with a filter or two, as the events page does"""
+    params = rng.choice([{}, {"event_type": "match"}, {"event_type": "concert"}, {"featured": "true"}])
+    await _timed(client, recorder, "GET /api/events", "GET", "/api/events", params=params)
+
+
+async def event_detail(client, ctx: Context, recorder, rng: random.Random):
+    """Open an event page; hot events are requested far more often"""
+    index = min(int(rng.paretovariate(1.2)) - 1, len(ctx.event_ids) - 1)
+    event_id = ctx.event_ids[index]
+    await _timed(client, recorder, "GET /api/events/{event_id}", "GET", f"/api/events/{event_id}")
+
+
+async def checkout_storm(client, ctx: Context, recorder, rng: random.Random):
+    """Everyone goes for the World Cup final: load it, then try to buy the cheapest ticket"""
+    token = buyer_token(rng.randrange(ctx.buyers))
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await _timed(client, recorder, "GET /api/events/{event_id}", "GET", f"/api/events/{ctx.final_event_id}")
+    if response is None or response.status_code != 200:
+        return
+    tickets = sorted(response.json().get("tickets", []), key=lambda t: t["price"])[:5]
+    if not tickets:
+        return
+    ticket = rng.choice(tickets)
+    await _timed(client, recorder, "POST /api/checkout/create", "POST", "/api/checkout/create",
+                 headers=headers, json={"ticket_id": ticket["ticket_id"], "origin_url": ctx.origin_url})
+
+
+async def seller_dashboard(client, ctx: Context, recorder, rng: random.Random):
+    """A seller checks their dashboard, listings and payouts"""
+    headers = {"Authorization": f"Bearer {seller_token(rng.randrange(ctx.sellers))}"}
+    await _timed(client, recorder, "GET /api/seller/dashboard-stats", "GET", "/api/seller/dashboard-stats", headers=headers)
+    await _timed(client, recorder, "GET /api/seller/tickets", "GET", "/api/seller/tickets", headers=headers)
+    await _timed(client, recorder, "GET /api/seller/payouts", "GET", "/api/seller/payouts", headers=headers)
+
+
+SCENARIOS = {
+    "browse": browse,
+    "event_detail": event_detail,
+    "checkout_storm": checkout_storm,
+    "seller_dashboard": seller_dashboard,
+}
+
+# On-sale mix: mostly browsing, a sharp checkout spike on the final
+DEFAULT_MIX = {"browse": 40, "event_detail": 35, "checkout_storm": 20, "seller_dashboard": 5}
@@ -0,0 +1,123 @@
+"""
+Seed a local benchmark database with realistic volumes.
+
+Runs the API's own seed routines (seed, World Cup 2026, Champions League,
+European leagues) and then clones the catalogue `scale` times, spreading
+tickets over a pool of sellers. Also creates buyers and sellers with fixed
+session tokens, plus payout history so seller dashboards have work to do.
+
+Refuses to touch a database whose name doesn't contain "bench".
+"""
+
+import random
+import uuid
+from datetime import datetime, timezone, timedelta
+
+from pymongo import InsertOne
+
+BATCH_SIZE = 1000
+COLLECTIONS = ["events", "tickets", "users", "user_sessions", "orders", "seller_payouts", "ratings", "seller_rating_stats"]
+
+
+def buyer_token(i: int) -> str:
+    return f"bench-buyer-{i}"
+
+
+def seller_token(i: int) -> str:
+    return f"bench-seller-{i}"
+
+
+async def _insert_batched(collection, docs):
+    batch = []
+    for doc in docs:
+        batch.append(InsertOne(doc))
+        if len(batch) >= BATCH_SIZE:
+            await collection.bulk_write(batch, ordered=False)
+            batch = []
+    if batch:
+        await collection.bulk_write(batch, ordered=False)
+
+
+async def seed(scale: int = 1, buyers: int = 200, sellers: int = 20, rng_seed: int = 2026) -> dict:
+    import server  # loads .env before the database module reads it
+    import routers
+    from routers import seeding
+    from database import db, db_name
+
+    if "bench" not in db_name:
+        raise RuntimeError(f"Refusing to seed DB_NAME={db_name!r}; use a database name containing 'bench'")
+
+    rng = random.Random(rng_seed)
+    for name in COLLECTIONS:
+        await db[name].delete_many({})
+
+    # The API's own seed routines
+    await seeding.seed_data()
+    await seeding.add_worldcup_2026()
+    await seeding.add_champions_league()
+    await seeding.add_euro_leagues()
+    await routers.ensure_indexes(routers.load(list(routers.SUBSYSTEMS)))
+
+    now = datetime.now(timezone.utc)
+    seller_ids = [f"bench_seller_{i}" for i in range(sellers)]
+
+    users = []
+    sessions = []
+    for i in range(buyers):
+        users.append({"user_id": f"bench_buyer_{i}", "email": f"buyer{i}@bench.local", "name": f"Bench Buyer {i}",
+                      "role": "buyer", "rating": 5.0, "total_sales": 0, "kyc_status": "pending", "created_at": now})
+        sessions.append({"session_id": str(uuid.uuid4()), "user_id": f"bench_buyer_{i}", "session_token": buyer_token(i),
+                         "expires_at": now + timedelta(days=7), "created_at": now})
+    for i, seller_id in enumerate(seller_ids):
+        users.append({"user_id": seller_id, "email": f"seller{i}@bench.local", "name": f"Bench Seller {i}",
+                      "role": "seller", "rating": 5.0, "total_sales": 0, "kyc_status": "verified", "created_at": now})
+        sessions.append({"session_id": str(uuid.uuid4()), "user_id": seller_id, "session_token": seller_token(i),
+                         "expires_at": now + timedelta(days=7), "created_at": now})
+    await _insert_batched(db.users, users)
+    await _insert_batched(db.user_sessions, sessions)
+
+    # Re-home the seeded tickets onto bench sellers, power-law skewed
+    weights = [1 / (rank + 1) for rank in range(sellers)]
+    base_events = await db.events.find({}, {"_id": 0}).to_list(None)
+    base_tickets = await db.tickets.find({}, {"_id": 0}).to_list(None)
+    await db.tickets.delete_many({})
+
+    def rehome(ticket, suffix=""):
+        ticket = dict(ticket, ticket_id=ticket["ticket_id"] + suffix, event_id=ticket["event_id"] + suffix)
+        ticket["seller_id"] = rng.choices(seller_ids, weights)[0]
+        ticket["seller_name"] = f"Bench Seller {ticket['seller_id'].rsplit('_', 1)[1]}"
+        return ticket
+
+    await _insert_batched(db.tickets, (rehome(t) for t in base_tickets))
+
+    # Clone the catalogue scale-1 more times
+    for copy in range(1, scale):
+        suffix = f"_x{copy}"
+        await _insert_batched(db.events, (
+            dict(e, event_id=e["event_id"] + suffix, featured=False,
+                 event_date=e["event_date"] + timedelta(days=rng.randint(1, 365)))
+            for e in base_events
+        ))
+        await _insert_batched(db.tickets, (rehome(t, suffix) for t in base_tickets))
+
+    # Payout history for seller dashboards
+    payouts = []
+    for seller_id in seller_ids:
+        for _ in range(rng.randint(20, 200)):
+            amount = round(rng.uniform(50, 1500), 2)
+            payouts.append({
+                "payout_id": f"payout_{uuid.uuid4().hex[:12]}", "seller_id": seller_id,
+                "order_id": f"order_{uuid.uuid4().hex[:12]}", "ticket_id": f"ticket_{uuid.uuid4().hex[:12]}",
+                "gross_amount": round(amount * 1.1, 2), "commission": round(amount * 0.1, 2), "net_amount": amount,
+                "currency": "EUR", "status": rng.choice(["pending", "completed"]),
+                "created_at": now - timedelta(days=rng.randint(0, 120)),
+            })
+    await _insert_batched(db.seller_payouts, payouts)
+
+    return {
+        "events": await db.events.count_documents({}),
+        "tickets": await db.tickets.count_documents({}),
+        "buyers": buyers,
+        "sellers": sellers,
+        "payouts": len(payouts),
+    }
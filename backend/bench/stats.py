@@ -0,0 +1,80 @@
+"""
+Latency statistics and baseline comparison for the benchmark harness.
+"""
+
+import json
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    """Collects (route, status, seconds) samples during a run"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, route: str, status: int, seconds: float):
+        self.latencies[route].append(seconds)
+        self.statuses[route][status] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        routes = {}
+        for route, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            statuses = dict(self.statuses[route])
+            errors = sum(n for status, n in statuses.items() if status >= 500 or status == 0)
+            routes[route] = {
+                "requests": len(values),
+                "rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+                "errors": errors,
+                "statuses": {str(k): v for k, v in sorted(statuses.items())},
+            }
+        total = sum(r["requests"] for r in routes.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "total_requests": total,
+            "total_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "routes": routes,
+        }
+
+
+def compare(baseline: dict, current: dict, latency_tolerance: float = 0.2, rps_tolerance: float = 0.2) -> List[str]:
+    """Return regressions of current against baseline (empty when within tolerance)"""
+    regressions = []
+    for route, base in baseline.get("routes", {}).items():
+        now = current.get("routes", {}).get(route)
+        if now is None:
+            regressions.append(f"{route}: missing from current run")
+            continue
+        for key in ("p95_ms", "p99_ms"):
+            if base[key] and now[key] > base[key] * (1 + latency_tolerance):
+                regressions.append(f"{route}: {key} {base[key]} -> {now[key]} (+{(now[key] / base[key] - 1) * 100:.0f}%)")
+        if base["rps"] and now["rps"] < base["rps"] * (1 - rps_tolerance):
+            regressions.append(f"{route}: rps {base['rps']} -> {now['rps']} ({(now['rps'] / base['rps'] - 1) * 100:.0f}%)")
+        if now["errors"] > base["errors"]:
+            regressions.append(f"{route}: errors {base['errors']} -> {now['errors']}")
+    return regressions
+
+
+def save(result: dict, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, sort_keys=True))
+
+
+def load(path: Path) -> dict:
+    return json.loads(path.read_text())
@@ -0,0 +1,126 @@
+"""
+Worker scaling benchmark: throughput on GET /api/events for 1..N gunicorn workers.
+
+Starts the production launcher (gunicorn.conf.py) once per worker count
+against the configured MONGO_URL/DB_NAME, drives it with several load
+generator processes so the client isn't the bottleneck, and prints RPS and
+the speed-up over a single worker.
+
+Usage (from backend/):
+    python -m bench.worker_scaling --workers 1 2 4 --duration 15 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+async def _drive(url: str, duration: float, concurrency: int) -> tuple:
+    ok = errors = 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=30.0, limits=limits) as http_client:
+        async def loop():
+            nonlocal ok, errors
+            while time.monotonic() < deadline:
+                try:
+                    response = await http_client.get(url)
+                    if response.status_code == 200:
+                        ok += 1
+                    else:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+
+        await asyncio.gather(*(loop() for _ in range(concurrency)))
+    return ok, errors
+
+
+def _client_process(url, duration, concurrency, results):
+    results.put(asyncio.run(_drive(url, duration, concurrency)))
+
+
+def run_load(url: str, duration: float, concurrency: int, clients: int) -> dict:
+    results = multiprocessing.Queue()
+    per_client = max(concurrency // clients, 1)
+    procs = [multiprocessing.Process(target=_client_process, args=(url, duration, per_client, results))
+             for _ in range(clients)]
+    started = time.monotonic()
+    for p in procs:
+        p.start()
+    totals = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    elapsed = time.monotonic() - started
+    ok = sum(t[0] for t in totals)
+    errors = sum(t[1] for t in totals)
+    return {"ok": ok, "errors": errors, "rps": ok / elapsed}
+
+
+def wait_ready(base_url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=2.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), PORT=str(port), GUNICORN_ACCESS_LOG="")
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "server:app", "-c", "gunicorn.conf.py"],
+        cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, multiprocessing.cpu_count()])
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=max(multiprocessing.cpu_count() // 2, 1))
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--path", default="/api/events")
+    args = parser.parse_args()
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    rows = []
+    for workers in args.workers:
+        server = start_server(workers, args.port)
+        try:
+            wait_ready(base_url)
+            run_load(base_url + args.path, 2.0, args.concurrency, args.clients)  # warm up
+            result = run_load(base_url + args.path, args.duration, args.concurrency, args.clients)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+        rows.append((workers, result))
+        print(f"   {workers} worker(s): {result['rps']:.1f} req/s ({result['errors']} errors)")
+
+    baseline = rows[0][1]["rps"] or 1
+    print("\n" + "=" * 50)
+    print(f"📈 WORKER SCALING - GET {args.path}")
+    print("=" * 50)
+    print(f"{'workers':>8} {'req/s':>10} {'speed-up':>9}")
+    for workers, result in rows:
+        print(f"{workers:>8} {result['rps']:>10.1f} {result['rps'] / baseline:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+EuroMatchTickets Change Feed
+Publishes typed domain events when events, tickets, orders or seller payouts
+change - through the API or not (seed and maintenance jobs, manual fixes) - so
+caches and projections can invalidate themselves.
+
+On a replica set or sharded cluster each worker tails one MongoDB change
+stream over the watched collections and hands every change to its in-process
+subscribers. Every worker tails the same stream, so a write made anywhere
+reaches subscribers on all workers. The resume token is saved in
+db.change_feed_state; a restarted worker replays what it missed, and if the
+oplog no longer has the token, subscribers get a resync instead.
+
+Standalone servers have no change streams: the feed then polls a cheap
+signature (document count and newest _id) per collection, publishing a resync
+when it moves and at least every CHANGE_FEED_RESYNC_SECONDS to cover in-place
+updates.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from database import db
+from metrics import Counter, register_collector
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_MODE = os.environ.get('CHANGE_FEED', 'auto').lower()  # auto, stream, poll, off
+POLL_SECONDS = float(os.environ.get('CHANGE_FEED_POLL_SECONDS', '2'))
+RESYNC_SECONDS = float(os.environ.get('CHANGE_FEED_RESYNC_SECONDS', '30'))
+TOKEN_SAVE_SECONDS = 1.0
+
+# collection -> entity name used in event types
+WATCHED = {"events": "event", "tickets": "ticket", "orders": "order", "seller_payouts": "payout"}
+# Fields copied from the changed document so subscribers can target what to invalidate
+KEY_FIELDS = {
+    "events": ("event_id", "event_type", "featured"),
+    "tickets": ("ticket_id", "event_id", "seller_id", "status"),
+    "orders": ("order_id", "event_id", "seller_id", "buyer_id", "status"),
+    "seller_payouts": ("payout_id", "seller_id", "status"),
+}
+OPERATIONS = ("insert", "update", "replace", "delete")
+# CappedPositionLost, ChangeStreamFatalError, ChangeStreamHistoryLost
+HISTORY_LOST = {136, 280, 286}
+
+change_events = Counter("change_feed_events_total", "Domain events published by entity and operation")
+register_collector(lambda: "\n".join(change_events.render(("entity", "operation"))) + "\n")
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """One change to a watched collection, e.g. type="ticket.update".
+
+    keys holds KEY_FIELDS of the document after the change; deletes only carry
+    document_id. A "resync" operation means anything of that entity may have
+    changed: drop everything derived from it.
+    """
+    type: str
+    entity: str
+    operation: str
+    document_id: Any = None
+    keys: Dict[str, Any] = field(default_factory=dict)
+    updated_fields: Tuple[str, ...] = ()
+
+    @classmethod
+    def resync(cls, entity: str) -> "DomainEvent":
+        return cls(f"{entity}.resync", entity, "resync")
+
+
+def from_change(change: dict) -> Optional[DomainEvent]:
+    """Domain event for a raw change stream document, or None for other collections/operations"""
+    collection = (change.get("ns") or {}).get("coll")
+    operation = change.get("operationType")
+    if collection not in WATCHED or operation not in OPERATIONS:
+        return None
+    entity = WATCHED[collection]
+    document = change.get("fullDocument") or {}
+    updated = (change.get("updateDescription") or {}).get("updatedFields") or {}
+    return DomainEvent(
+        type=f"{entity}.{operation}",
+        entity=entity,
+        operation=operation,
+        document_id=(change.get("documentKey") or {}).get("_id"),
+        keys={k: document[k] for k in KEY_FIELDS[collection] if k in document},
+        updated_fields=tuple(sorted(updated)),
+    )
+
+
+def _pipeline() -> list:
+    projection = {"_id": 1, "operationType": 1, "ns": 1, "documentKey": 1, "updateDescription.updatedFields": 1}
+    projection.update({f"fullDocument.{k}": 1 for keys in KEY_FIELDS.values() for k in keys})
+    return [
+        {"$match": {"ns.coll": {"$in": list(WATCHED)}, "operationType": {"$in": list(OPERATIONS)}}},
+        {"$project": projection},
+    ]
+
+
+# ============== BUS ==============
+
+class ChangeBus:
+    """In-process fan-out of domain events to subscribers"""
+
+    def __init__(self):
+        self._subscribers = []
+
+    def subscriber(self, *entities: str):
+        """Register `handler(event)` (sync or async) for the given entities, or all of them"""
+        def register(fn: Callable[[DomainEvent], Any]):
+            self._subscribers.append((set(entities) or None, fn))
+            return fn
+        return register
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    async def publish(self, event: DomainEvent):
+        change_events.inc((event.entity, event.operation))
+        for entities, handler in list(self._subscribers):
+            if entities is not None and event.entity not in entities:
+                continue
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                # One broken subscriber must not stall the feed for the others
+                logger.error(f"Change subscriber {getattr(handler, '__name__', handler)} failed on {event.type}: {e}")
+
+
+# ============== FEED ==============
+
+class ChangeFeed:
+    """Tails the change stream (or polls) and publishes to a ChangeBus"""
+
+    def __init__(self, database, bus: ChangeBus, mode: str = CHANGE_FEED_MODE, name: str = "default",
+                 state=None, clock=time.monotonic):
+        self.database = database
+        self.bus = bus
+        self.mode = mode
+        self.name = name
+        self.state = state if state is not None else database.change_feed_state
+        self.clock = clock
+        self.active_mode: Optional[str] = None
+        self.token = None
+        self._saved_token = None
+        self._signatures: Dict[str, Any] = {}
+        self._last_resync = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def detect_mode(self) -> str:
+        if self.mode != "auto":
+            return self.mode
+        hello = await self.database.client.admin.command("hello")
+        return "stream" if hello.get("setName") or hello.get("msg") == "isdbgrid" else "poll"
+
+    async def publish_resync(self):
+        for entity in WATCHED.values():
+            await self.bus.publish(DomainEvent.resync(entity))
+
+    # ----- change stream -----
+
+    async def load_token(self):
+        doc = await self.state.find_one({"_id": self.name})
+        self.token = self._saved_token = doc.get("token") if doc else None
+        return self.token
+
+    async def save_token(self):
+        if self.token == self._saved_token:
+            return
+        await self.state.replace_one(
+            {"_id": self.name},
+            {"_id": self.name, "token": self.token, "updated_at": datetime.now(timezone.utc)},
+            upsert=True
+        )
+        self._saved_token = self.token
+
+    async def consume(self, stream):
+        """Publish changes until the stream closes; saves the resume token at most every TOKEN_SAVE_SECONDS"""
+        saved_at = self.clock()
+        while stream.alive:
+            change = await stream.try_next()  # None after the server's await time with no changes
+            if change is not None:
+                event = from_change(change)
+                if event is not None:
+                    await self.bus.publish(event)
+            # Advances on idle batches too, so a quiet feed doesn't fall off the oplog
+            self.token = stream.resume_token
+            if self.clock() - saved_at >= TOKEN_SAVE_SECONDS:
+                await self.save_token()
+                saved_at = self.clock()
+
+    async def _stream(self):
+        await self.load_token()
+        backoff = 1.0
+        while True:
+            try:
+                async with self.database.watch(_pipeline(), full_document="updateLookup",
+                                               start_after=self.token) as stream:
+                    logger.info(f"📡 Change feed streaming from {'saved token' if self.token else 'now'}")
+                    backoff = 1.0
+                    await self.consume(stream)
+            except OperationFailure as e:
+                if e.code not in HISTORY_LOST:
+                    logger.warning(f"Change streams unavailable ({e}); polling instead")
+                    self.active_mode = "poll"
+                    await self._poll()
+                    return
+                logger.warning(f"Change feed resume token is no longer in the oplog ({e.code}); resyncing")
+                self.token = None
+                await self.save_token()
+                await self.publish_resync()
+            except PyMongoError as e:
+                logger.warning(f"Change stream interrupted: {e}; retrying in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    # ----- polling fallback -----
+
+    async def _signature(self, collection: str):
+        coll = self.database[collection]
+        newest = await coll.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+        return await coll.estimated_document_count(), newest["_id"] if newest else None
+
+    async def poll_once(self) -> int:
+        """Publish a resync for each collection whose signature moved, or all of them when one is due"""
+        now = self.clock()
+        due = self._last_resync is not None and now - self._last_resync >= RESYNC_SECONDS
+        if self._last_resync is None or due:
+            self._last_resync = now
+        published = 0
+        for collection, entity in WATCHED.items():
+            signature = await self._signature(collection)
+            previous = self._signatures.get(collection, signature)
+            self._signatures[collection] = signature
+            if due or signature != previous:
+                await self.bus.publish(DomainEvent.resync(entity))
+                published += 1
+        return published
+
+    async def _poll(self):
+        logger.info(f"📡 Change feed polling every {POLL_SECONDS}s (no change streams on this deployment)")
+        while True:
+            try:
+                await self.poll_once()
+            except PyMongoError as e:
+                logger.warning(f"Change feed poll failed: {e}")
+            await asyncio.sleep(POLL_SECONDS)
+
+    # ----- lifecycle -----
+
+    async def _run(self):
+        try:
+            self.active_mode = await self.detect_mode()
+        except PyMongoError as e:
+            logger.warning(f"Change feed mode detection failed ({e}); polling")
+            self.active_mode = "poll"
+        if self.active_mode == "stream":
+            await self._stream()
+        else:
+            await self._poll()
+
+    def start(self):
+        """Start feeding the bus on this worker, if anything subscribed"""
+        if self._task is None and self.mode != "off" and self.bus.has_subscribers:
+            self._task = asyncio.create_task(self._run(), name="change-feed")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self.active_mode == "stream":
+            try:
+                await self.save_token()
+            except PyMongoError as e:
+                logger.warning(f"Could not save change feed token: {e}")
+
+
+bus = ChangeBus()
+feed = ChangeFeed(db, bus)
@@ -0,0 +1,250 @@
+"""
+EuroMatchTickets Response Compression
+Brotli or gzip for API responses, negotiated from Accept-Encoding: event
+pages with hundreds of embedded tickets, admin order lists with base64 QR
+codes and the sitemap shrink 5-10x.
+
+Skipped: bodies under COMPRESS_MIN_BYTES, Server-Sent Events (compressors
+buffer, which would hold back every live message), media types that are
+already compressed (video, images, archives), partial (206) responses and
+anything that already carries a Content-Encoding, such as precompressed
+static files.
+
+Compression runs on the worker that serves the request, so it is capped by
+a CPU budget: at most COMPRESS_CPU_BUDGET of each second is spent
+compressing; past that, responses go out uncompressed until the next second.
+Bodies from COMPRESS_THREAD_BYTES up are compressed in a thread (zlib and
+brotli release the GIL) so a large admin export doesn't stall other requests.
+
+Brotli needs the optional `brotli` package; without it only gzip is offered.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import zlib
+from typing import Optional
+
+from metrics import Counter, register_collector
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_MIN_BYTES = int(os.environ.get('COMPRESS_MIN_BYTES', '1024'))
+COMPRESS_CPU_BUDGET = float(os.environ.get('COMPRESS_CPU_BUDGET', '0.25'))  # fraction of a second, per worker
+COMPRESS_THREAD_BYTES = int(os.environ.get('COMPRESS_THREAD_BYTES', str(256 * 1024)))
+# Dynamic responses favour speed; precompressed files are done once at maximum ratio
+GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', '4'))
+
+# Already compressed, or streamed message by message
+SKIP_TYPES = ("text/event-stream", "image/", "video/", "audio/", "font/woff", "application/zip",
+              "application/gzip", "application/x-gzip", "application/octet-stream", "application/pdf")
+
+compressed_responses = Counter("compressed_responses_total", "Responses by content encoding chosen")
+compressed_bytes = Counter("compressed_bytes_total", "Response body bytes before and after compression")
+register_collector(lambda: "\n".join(compressed_responses.render(("encoding",))
+                                     + compressed_bytes.render(("stage",))) + "\n")
+
+
+def available_encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, offered: tuple = None) -> Optional[str]:
+    """The preferred offered encoding the client accepts (q > 0), or None"""
+    offered = offered or available_encodings()
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    for encoding in offered:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY if level is None else level)
+    compressor = zlib.compressobj(GZIP_LEVEL if level is None else level, zlib.DEFLATED, 31)
+    return compressor.compress(body) + compressor.flush()
+
+
+class StreamCompressor:
+    """Incremental encoder for streamed bodies; each chunk is flushed so it reaches the client"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._gz = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._br.process(data) + self._br.flush()
+        return self._gz.compress(data) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._br.finish() if self.encoding == "br" else self._gz.flush()
+
+
+class CompressionBudget:
+    """Seconds of compression allowed per one-second window"""
+
+    def __init__(self, fraction: float = COMPRESS_CPU_BUDGET, clock=time.perf_counter):
+        self.fraction = fraction
+        self.clock = clock
+        self._window = clock()
+        self._spent = 0.0
+
+    def allow(self) -> bool:
+        now = self.clock()
+        if now - self._window >= 1.0:
+            self._window, self._spent = now, 0.0
+        return self._spent < self.fraction
+
+    def charge(self, seconds: float):
+        self._spent += seconds
+
+
+def _compressible(headers: list) -> bool:
+    for name, value in headers:
+        if name == b"content-encoding":
+            return False
+        if name == b"content-type" and value.decode("latin-1").lower().startswith(SKIP_TYPES):
+            return False
+        if name == b"content-range":
+            return False
+    return True
+
+
+def _with_vary(headers: list) -> list:
+    for i, (name, value) in enumerate(headers):
+        if name == b"vary":
+            if b"accept-encoding" not in value.lower():
+                headers[i] = (name, value + b", Accept-Encoding")
+            return headers
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+
+def _encoded_headers(headers: list, encoding: str, length: Optional[int]) -> list:
+    """Response headers for the encoded body: new length, encoding, and a weak ETag (bytes changed)"""
+    out = []
+    for name, value in headers:
+        if name == b"content-length":
+            continue
+        if name == b"etag" and not value.startswith(b"W/"):
+            value = b"W/" + value
+        out.append((name, value))
+    out.append((b"content-encoding", encoding.encode()))
+    if length is not None:
+        out.append((b"content-length", str(length).encode()))
+    return _with_vary(out)
+
+
+class CompressionMiddleware:
+    """Compresses response bodies for clients that accept br or gzip"""
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES, budget: Optional[CompressionBudget] = None,
+                 thread_bytes: int = COMPRESS_THREAD_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.budget = budget or CompressionBudget()
+        self.thread_bytes = thread_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        accept = b""
+        for name, value in scope.get("headers") or ():
+            if name == b"accept-encoding":
+                accept = value
+                break
+        encoding = negotiate(accept.decode("latin-1")) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        stream: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, stream, passthrough
+            kind = message["type"]
+            if kind == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                if status < 200 or status in (204, 206, 304) or not _compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = {**message, "headers": headers}
+                return
+            if passthrough or kind != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if stream is not None:
+                started = time.perf_counter()
+                data = stream.chunk(body) if body else b""
+                if not more:
+                    data += stream.finish()
+                self.budget.charge(time.perf_counter() - started)
+                compressed_bytes.inc(("identity",), len(body))
+                compressed_bytes.inc(("encoded",), len(data))
+                await send({"type": kind, "body": data, "more_body": more})
+                return
+
+            declared = next((int(v) for n, v in start["headers"] if n == b"content-length"), None)
+            size = len(body) if not more else declared
+            small = size is not None and size < self.minimum_size
+            if small or not self.budget.allow():
+                passthrough = True
+                compressed_responses.inc(("identity" if small else "over_budget",))
+                await send({**start, "headers": _with_vary(start["headers"])})
+                await send(message)
+                return
+
+            if more:
+                # Streamed body of unknown size: encode chunk by chunk
+                stream = StreamCompressor(encoding)
+                compressed_responses.inc((encoding,))
+                await send({**start, "headers": _encoded_headers(start["headers"], encoding, None)})
+                await send_wrapper(message)
+                return
+
+            started = time.perf_counter()
+            if len(body) >= self.thread_bytes:
+                data = await asyncio.to_thread(compress, body, encoding)
+            else:
+                data = compress(body, encoding)
+            self.budget.charge(time.perf_counter() - started)
+            if len(data) >= len(body):
+                compressed_responses.inc(("identity",))
+                await send({**start, "headers": _with_vary(start["headers"])})
+                await send(message)
+                return
+            compressed_responses.inc((encoding,))
+            compressed_bytes.inc(("identity",), len(body))
+            compressed_bytes.inc(("encoded",), len(data))
+            await send({**start, "headers": _encoded_headers(start["headers"], encoding, len(data))})
+            await send({"type": kind, "body": data, "more_body": False})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,96 @@
+"""
+EuroMatchTickets Database Layer
+MongoDB client and typed document helpers shared by the API and scripts
+"""
+
+import os
+from datetime import datetime, timezone, date
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import BaseModel
+
+from metrics import command_metrics
+from pool_metrics import pool_metrics
+
+mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+db_name = os.environ.get('DB_NAME', 'euromatchtickets')
+
+# Connection pool sizing (per worker process). Size maxPoolSize for the
+# on-sale burst, and keep waitQueueTimeoutMS short so exhausted pools fail
+# fast instead of queueing requests invisibly.
+POOL_OPTIONS = {
+    "maxPoolSize": int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+    "minPoolSize": int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+    "maxIdleTimeMS": int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '300000')),
+    "waitQueueTimeoutMS": int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000')),
+}
+
+# tz_aware so dates read back from Mongo compare cleanly with datetime.now(timezone.utc)
+client = AsyncIOMotorClient(
+    mongo_url,
+    serverSelectionTimeoutMS=30000,
+    connectTimeoutMS=30000,
+    tz_aware=True,
+    event_listeners=[pool_metrics, command_metrics],
+    **POOL_OPTIONS
+)
+db = client[db_name]
+
+# Timestamp fields per collection, stored as BSON dates.
+# Used by migrate_datetimes.py to convert documents written as ISO strings.
+DATETIME_FIELDS = {
+    "users": ["created_at", "kyc_documents.submitted_at"],
+    "user_sessions": ["expires_at", "created_at"],
+    "events": ["event_date", "created_at"],
+    "tickets": ["created_at"],
+    "orders": ["created_at"],
+    "payment_transactions": ["created_at"],
+    "seller_payouts": ["created_at", "payout_date"],
+    "payouts": ["created_at", "completed_at"],
+    "price_alerts": ["created_at"],
+    "disputes": ["created_at"],
+    "ratings": ["created_at"],
+    "raffle_entries": ["created_at"],
+    "chat_logs": ["timestamp"],
+}
+
+
+def utc(value: datetime) -> datetime:
+    """Return value as an aware UTC datetime (naive values are assumed UTC)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Coerce an ISO string, date or datetime into an aware UTC datetime"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return utc(value)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    if isinstance(value, str):
+        return utc(datetime.fromisoformat(value.strip().replace("Z", "+00:00")))
+    raise ValueError(f"Cannot convert {type(value).__name__} to datetime")
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return utc(value)
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def to_document(model: BaseModel) -> dict:
+    """Serialize a model for insertion, keeping datetimes as native BSON dates"""
+    return _normalize(model.model_dump())
+
+
+def pool_snapshot() -> dict:
+    """Connection pool usage and configuration for this worker"""
+    return {**pool_metrics.snapshot(POOL_OPTIONS["maxPoolSize"]), "config": POOL_OPTIONS}
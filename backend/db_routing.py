@@ -0,0 +1,107 @@
+"""
+EuroMatchTickets Read Routing
+Sends read-mostly traffic (catalogue, sitemap, ratings, analytics) to
+secondaries with bounded staleness while checkout, auth and fulfilment stay
+on the primary.
+
+Read-your-writes: after a user's successful write the middleware sets a short
+lived cookie; while it is valid, that user's routed reads go to the primary
+so they never see a replica that hasn't caught up with their own change.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+
+from pymongo.read_preferences import SecondaryPreferred
+
+from database import client, db, db_name
+
+# Routed read classes; anything not listed here reads from the primary
+READ_CLASSES = {"catalogue", "sitemap", "ratings", "analytics"}
+
+# MongoDB requires maxStalenessSeconds >= 90
+MAX_STALENESS_SECONDS = max(int(os.environ.get('MONGO_MAX_STALENESS_SECONDS', '90')), 90)
+READ_ROUTING_ENABLED = os.environ.get('MONGO_READ_ROUTING', 'on').lower() not in ('off', '0', 'false')
+
+# Pin window covers the worst case replica lag we accept for routed reads
+PIN_COOKIE = "rw_primary_until"
+PIN_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', str(MAX_STALENESS_SECONDS)))
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+secondary_db = client.get_database(
+    db_name,
+    read_preference=SecondaryPreferred(max_staleness=MAX_STALENESS_SECONDS)
+)
+
+_pinned_to_primary: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+
+def reads(read_class: str):
+    """Return the database handle routed reads of read_class should use"""
+    if read_class not in READ_CLASSES:
+        raise ValueError(f"Unknown read class: {read_class}")
+    if not READ_ROUTING_ENABLED or _pinned_to_primary.get():
+        return db
+    return secondary_db
+
+
+def read_preference_for(read_class: str):
+    """Read preference reads(read_class) resolves to in the current context"""
+    return reads(read_class).read_preference
+
+
+def is_pinned(cookie_value, now: float = None) -> bool:
+    """Whether a rw_primary_until cookie value is still in its window"""
+    try:
+        return float(cookie_value) > (now if now is not None else time.time())
+    except (TypeError, ValueError):
+        return False
+
+
+def _cookie_from_headers(headers) -> str:
+    for name, value in headers:
+        if name == b"cookie":
+            cookie = SimpleCookie()
+            cookie.load(value.decode("latin-1"))
+            if PIN_COOKIE in cookie:
+                return cookie[PIN_COOKIE].value
+    return None
+
+
+def _has_identity(headers) -> bool:
+    for name, value in headers:
+        if name == b"authorization" or (name == b"cookie" and b"session_token=" in value):
+            return True
+    return False
+
+
+class ReadRoutingMiddleware:
+    """Pins a user's routed reads to the primary for a short window after they write"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not READ_ROUTING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        headers = scope.get("headers", [])
+        token = _pinned_to_primary.set(is_pinned(_cookie_from_headers(headers)))
+        pin_after_write = scope["method"] in WRITE_METHODS and _has_identity(headers)
+
+        async def send_wrapper(message):
+            if pin_after_write and message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + PIN_SECONDS
+                cookie = f"{PIN_COOKIE}={until:.0f}; Max-Age={PIN_SECONDS}; Path=/; HttpOnly; Secure; SameSite=None"
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"set-cookie", cookie.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _pinned_to_primary.reset(token)
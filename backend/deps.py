@@ -0,0 +1,63 @@
+"""
+EuroMatchTickets Auth Dependencies
+Session lookup and role checks shared by the API routers
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from database import db, parse_datetime
+from models import User
+
+async def get_current_user(request: Request) -> Optional[User]:
+    """Get current user from session token"""
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            session_token = auth_header.split(" ")[1]
+    
+    if not session_token:
+        return None
+    
+    session_doc = await db.user_sessions.find_one({"session_token": session_token}, {"_id": 0})
+    if not session_doc:
+        return None
+    
+    expires_at = parse_datetime(session_doc["expires_at"])
+    if expires_at < datetime.now(timezone.utc):
+        return None
+    
+    user_doc = await db.users.find_one({"user_id": session_doc["user_id"]}, {"_id": 0})
+    if not user_doc:
+        return None
+    
+    return User(**user_doc)
+
+async def require_auth(request: Request) -> User:
+    """Require authentication"""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    return user
+
+async def require_seller(request: Request) -> User:
+    """Require seller or admin role"""
+    user = await require_auth(request)
+    if user.role not in ["seller", "admin"]:
+        raise HTTPException(status_code=403, detail="Seller access required")
+    return user
+
+async def require_admin(request: Request) -> User:
+    """Require admin role"""
+    user = await require_auth(request)
+    if user.role != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return user
+
+async def is_admin_scope(scope) -> bool:
+    """Admin check for ASGI middleware"""
+    user = await get_current_user(Request(scope))
+    return bool(user and user.role == "admin")
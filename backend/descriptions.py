@@ -0,0 +1,210 @@
+"""
+EuroMatchTickets Event Descriptions
+SEO copy is generated per template, not per event. The prompt is built from
+an event's teams or artist, competition or tour, venue and city, with the
+date left as a {date} placeholder, and the generated template is cached in
+db.description_templates under the sha256 fingerprint of the normalized
+prompt. World Cup games with the same line-up and recurring tour dates at a
+venue share one LLM call; events store description_fingerprint so copy is
+only regenerated when its inputs change.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict
+
+from database import db
+from llm import chat_completion
+from metrics import Counter, Histogram, register_collector
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-4o"
+# Bump to regenerate all copy after changing the prompts below
+PROMPT_VERSION = 1
+DATE_PLACEHOLDER = "{date}"
+
+SYSTEM_MESSAGE = """You are an SEO expert for a ticket marketplace. Generate compelling,
+            SEO-optimized descriptions for events. The description should be 150-250 words,
+            include relevant keywords naturally, and encourage ticket purchases.
+            Write in a professional but exciting tone. Do not use markdown formatting.
+            Where you mention the event date, write the literal placeholder {date} instead."""
+
+description_requests = Counter("event_descriptions_total", "Event descriptions by source")
+description_tokens = Counter("event_description_tokens_total", "LLM tokens spent on event descriptions by kind")
+description_latency = Histogram("event_description_llm_seconds", "LLM latency per generated description template",
+                                (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0))
+register_collector(lambda: "\n".join(
+    description_requests.render(("source",)) + description_tokens.render(("kind",))
+    + description_latency.render(("event_type",))
+) + "\n")
+
+
+@dataclass
+class Description:
+    text: str
+    fingerprint: str
+    source: str  # "cache" or "llm"
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+
+
+def _norm(value) -> str:
+    return re.sub(r"\s+", " ", str(value or "")).strip()
+
+
+def description_inputs(event: dict) -> dict:
+    """The event fields the copy depends on (the date is filled in at render time)"""
+    if event.get("event_type") == "match":
+        return {
+            "event_type": "match",
+            "home_team": _norm(event.get("home_team")),
+            "away_team": _norm(event.get("away_team")),
+            "competition": _norm(event.get("subtitle") or event.get("league") or "Football Match"),
+            "venue": _norm(event.get("venue")),
+            "city": _norm(event.get("city")),
+            "country": _norm(event.get("country")),
+        }
+    return {
+        "event_type": "concert",
+        "artist": _norm(event.get("artist")),
+        "tour": _norm(event.get("subtitle") or "Live Concert"),
+        "genre": _norm(event.get("genre") or "Music"),
+        "venue": _norm(event.get("venue")),
+        "city": _norm(event.get("city")),
+        "country": _norm(event.get("country")),
+    }
+
+
+def build_prompt(inputs: dict) -> str:
+    if inputs["event_type"] == "match":
+        return f"""Write an SEO description for this football match:
+
+Match: {inputs['home_team']} vs {inputs['away_team']}
+Competition: {inputs['competition']}
+Venue: {inputs['venue']}, {inputs['city']}, {inputs['country']}
+Date: {DATE_PLACEHOLDER}
+
+Include keywords like: buy tickets, {inputs['home_team']} tickets, {inputs['away_team']} tickets,
+{inputs['city']} football, secure tickets, official tickets."""
+    return f"""Write an SEO description for this concert:
+
+Artist: {inputs['artist']}
+Tour: {inputs['tour']}
+Genre: {inputs['genre']}
+Venue: {inputs['venue']}, {inputs['city']}, {inputs['country']}
+Date: {DATE_PLACEHOLDER}
+
+Include keywords like: buy tickets, {inputs['artist']} concert tickets, {inputs['artist']} tour,
+{inputs['city']} concert, live music, official tickets."""
+
+
+def fingerprint(event: dict) -> str:
+    """sha256 of the normalized prompt; case and spacing differences don't change it"""
+    inputs = {key: value.casefold() for key, value in description_inputs(event).items()}
+    payload = json.dumps({"v": PROMPT_VERSION, "model": MODEL, "system": SYSTEM_MESSAGE, "inputs": inputs},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def render(template: str, event: dict) -> str:
+    event_date = event.get("event_date")
+    if isinstance(event_date, datetime):
+        event_date = f"{event_date.day} {event_date.strftime('%B %Y')}"
+    return template.replace(DATE_PLACEHOLDER, str(event_date or "soon"))
+
+
+def is_current(event: dict) -> bool:
+    """The event's description was generated from its current inputs"""
+    return bool(event.get("description")) and event.get("description_fingerprint") == fingerprint(event)
+
+
+class DescriptionCache:
+    """Generated templates by prompt fingerprint, shared by all workers"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("fingerprint", unique=True)
+
+    async def _generate(self, fp: str, event: dict) -> Description:
+        inputs = description_inputs(event)
+        started = time.perf_counter()
+        response = await chat_completion(
+            model=MODEL,
+            messages=[
+                {"role": "system", "content": SYSTEM_MESSAGE},
+                {"role": "user", "content": build_prompt(inputs)}
+            ],
+            max_tokens=500
+        )
+        latency = time.perf_counter() - started
+        usage = response.usage
+        result = Description(
+            text=response.choices[0].message.content,
+            fingerprint=fp,
+            source="llm",
+            prompt_tokens=usage.prompt_tokens if usage else 0,
+            completion_tokens=usage.completion_tokens if usage else 0,
+            latency_ms=round(latency * 1000, 1),
+        )
+        description_latency.observe((inputs["event_type"],), latency)
+        description_tokens.inc(("prompt",), result.prompt_tokens)
+        description_tokens.inc(("completion",), result.completion_tokens)
+        await self.collection.update_one(
+            {"fingerprint": fp},
+            {"$set": {
+                "fingerprint": fp,
+                "template": result.text,
+                "inputs": inputs,
+                "model": MODEL,
+                "prompt_version": PROMPT_VERSION,
+                "prompt_tokens": result.prompt_tokens,
+                "completion_tokens": result.completion_tokens,
+                "latency_ms": result.latency_ms,
+                "created_at": datetime.now(timezone.utc),
+            }},
+            upsert=True
+        )
+        return result
+
+    async def describe(self, event: dict, refresh: bool = False, limiter=None) -> Description:
+        """Description for the event: from a cached template, or one LLM call shared by concurrent callers.
+
+        refresh skips the cache lookup; limiter (a jobs.RateLimiter) only paces actual LLM calls.
+        """
+        fp = fingerprint(event)
+        if not refresh:
+            cached = await self.collection.find_one({"fingerprint": fp}, {"_id": 0, "template": 1})
+            if cached:
+                description_requests.inc(("cache",))
+                return Description(text=render(cached["template"], event), fingerprint=fp, source="cache")
+
+        pending = self._inflight.get(fp)
+        if pending is None:
+            if limiter:
+                await limiter.wait()
+            pending = self._inflight.get(fp)
+        if pending is None:
+            pending = self._inflight[fp] = asyncio.ensure_future(self._generate(fp, event))
+            pending.add_done_callback(lambda _: self._inflight.pop(fp, None))
+            source = "llm"
+        else:
+            source = "cache"  # another event with the same inputs is already generating it
+        generated = await asyncio.shield(pending)
+        description_requests.inc((source,))
+        if source == "cache":
+            return Description(text=render(generated.text, event), fingerprint=fp, source="cache")
+        return Description(**{**generated.__dict__, "text": render(generated.text, event)})
+
+
+description_cache = DescriptionCache(db.description_templates)
@@ -4,12 +4,12 @@ Professional email templates for transactional emails
 """
 
 import os
-import asyncio
 import logging
-import resend
-from typing import Optional, Dict, Any
+from typing import Dict, Any, Union
 from datetime import datetime
 
+from http_clients import outbound
+
 logger = logging.getLogger(__name__)
 
 # Initialize Resend
@@ -17,9 +17,6 @@ RESEND_API_KEY = os.environ.get('RESEND_API_KEY')
 SENDER_EMAIL = os.environ.get('SENDER_EMAIL', 'onboarding@resend.dev')
 FRONTEND_URL = os.environ.get('FRONTEND_URL', '')
 
-if RESEND_API_KEY:
-    resend.api_key = RESEND_API_KEY
-
 # Email Template Base
 BASE_TEMPLATE = """
 <!DOCTYPE html>
@@ -126,15 +123,18 @@ def get_text(key: str, lang: str = 'en') -> str:
     return TRANSLATIONS.get(lang, TRANSLATIONS['en']).get(key, key)
 
 
-def format_date(date_str: str, lang: str = 'en') -> str:
-    """Format date for display"""
-    try:
-        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        if lang == 'de':
-            return dt.strftime('%d.%m.%Y um %H:%M Uhr')
-        return dt.strftime('%B %d, %Y at %I:%M %p')
-    except:
-        return date_str
+def format_date(value: Union[datetime, str], lang: str = 'en') -> str:
+    """Format date for display (BSON datetimes, naive or aware, or legacy ISO strings)"""
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            return str(value or '')
+    if lang == 'de':
+        return dt.strftime('%d.%m.%Y um %H:%M Uhr')
+    return dt.strftime('%B %d, %Y at %I:%M %p')
 
 
 def build_email(content: str) -> str:
@@ -337,7 +337,7 @@ def welcome_email(user_name: str, lang: str = 'en') -> Dict[str, str]:
 # ============== SEND EMAIL FUNCTION ==============
 
 async def send_email(to_email: str, subject: str, html_content: str) -> Dict[str, Any]:
-    """Send email using Resend (async, non-blocking)"""
+    """Send email using the Resend API over the shared outbound pool"""
     if not RESEND_API_KEY or RESEND_API_KEY == 're_your_api_key_here':
         logger.warning("Resend API key not configured - email not sent")
         return {"status": "skipped", "message": "Email service not configured"}
@@ -350,7 +350,12 @@ async def send_email(to_email: str, subject: str, html_content: str) -> Dict[str
     }
     
     try:
-        result = await asyncio.to_thread(resend.Emails.send, params)
+        response = await outbound.request(
+            "resend", "POST", "/emails", json=params,
+            headers={"Authorization": f"Bearer {RESEND_API_KEY}"}
+        )
+        response.raise_for_status()
+        result = response.json()
         logger.info(f"Email sent to {to_email}: {subject}")
         return {"status": "success", "email_id": result.get("id")}
     except Exception as e:
@@ -0,0 +1,43 @@
+"""
+Gunicorn configuration for the EuroMatchTickets API.
+
+    gunicorn server:app -c gunicorn.conf.py
+
+Every setting can be overridden from the environment (see below) or on the
+command line.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8001')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# One uvicorn event loop per core; WEB_CONCURRENCY wins when set
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+
+# Import the app once in the master so workers fork with it loaded.
+# The Mongo client connects lazily, so no sockets are shared across forks.
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() != 'false'
+
+# Recycle workers periodically; jitter keeps them from restarting together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '5000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '500'))
+
+# On SIGTERM workers stop accepting, finish in-flight requests, then run the
+# shutdown hook which drains background jobs (SHUTDOWN_DRAIN_SECONDS)
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    server.log.info(f"Worker spawned (pid: {worker.pid})")
+
+
+def worker_exit(server, worker):
+    server.log.info(f"Worker exited (pid: {worker.pid})")
@@ -0,0 +1,286 @@
+"""
+EuroMatchTickets Outbound HTTP
+One pooled client per external dependency (auth provider, Stripe, OpenAI,
+Resend), created at startup and closed on shutdown, with keep-alive, HTTP/2
+(h2 comes with httpx[http2]; HTTP/1.1 if it's missing), per-host connection
+limits, timeouts and a circuit breaker per dependency so a failing provider
+is shed quickly instead of tying up workers for the full timeout.
+
+Usage:
+    response = await outbound.request("auth", "GET", "/auth/v1/...")
+
+    async with outbound.guard("stripe"):      # SDKs with their own transport
+        session = await stripe.checkout.Session.create_async(...)
+
+Stripe and OpenAI keep the SDKs' own (async, keep-alive) transports, sized
+by the same timeouts, and are closed alongside the pooled clients.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Tuple, Type
+
+import httpx
+
+from lazy import available
+from metrics import Counter, Histogram, LATENCY_BUCKETS, register_collector
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = available("h2")
+
+
+@dataclass
+class Dependency:
+    name: str
+    base_url: str = ""
+    timeout: float = 10.0
+    connect_timeout: float = 5.0
+    max_connections: int = 50
+    max_keepalive: int = 20
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    # False for SDKs that bring their own transport (breaker and metrics only)
+    pooled: bool = True
+
+
+def _env(name: str, key: str, default):
+    value = os.environ.get(f"HTTP_{name.upper()}_{key}")
+    return type(default)(value) if value is not None else default
+
+
+def _dependency(name: str, base_url: str, pooled: bool = True, **defaults) -> Dependency:
+    fields = {key: _env(name, key.upper(), value) for key, value in defaults.items()}
+    return Dependency(name=name, base_url=base_url, pooled=pooled, **fields)
+
+
+# Override any setting per dependency with HTTP_<NAME>_<FIELD>, e.g. HTTP_OPENAI_TIMEOUT=60
+DEPENDENCIES: Dict[str, Dependency] = {
+    "auth": _dependency(
+        "auth", os.environ.get('AUTH_API_BASE', 'https://demobackend.emergentagent.com'),
+        timeout=10.0, connect_timeout=5.0, max_connections=50, max_keepalive=20,
+        failure_threshold=5, reset_timeout=30.0),
+    "stripe": _dependency(
+        "stripe", os.environ.get('STRIPE_API_BASE', 'https://api.stripe.com'), pooled=False,
+        timeout=30.0, connect_timeout=5.0, max_connections=100, max_keepalive=50,
+        failure_threshold=5, reset_timeout=30.0),
+    "openai": _dependency(
+        "openai", os.environ.get('OPENAI_BASE_URL', 'https://api.openai.com/v1'), pooled=False,
+        timeout=60.0, connect_timeout=5.0, max_connections=50, max_keepalive=20,
+        failure_threshold=5, reset_timeout=60.0),
+    "resend": _dependency(
+        "resend", os.environ.get('RESEND_API_BASE', 'https://api.resend.com'),
+        timeout=10.0, connect_timeout=5.0, max_connections=20, max_keepalive=10,
+        failure_threshold=5, reset_timeout=60.0),
+}
+
+
+class CircuitOpen(Exception):
+    """Raised without calling the dependency while its breaker is open"""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} circuit open, retry in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Opens after N consecutive failures; lets one trial call through after reset_timeout"""
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return
+            if state == self.HALF_OPEN and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return
+            retry_in = max(self.reset_timeout - (self.clock() - self.opened_at), 0)
+            raise CircuitOpen(self.name, retry_in)
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"✅ {self.name} circuit closed")
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            reopen = self.trial_in_flight
+            self.trial_in_flight = False
+            if reopen or (self.opened_at is None and self.failures >= self.failure_threshold):
+                self.opened_at = self.clock()
+                logger.warning(f"🔌 {self.name} circuit open after {self.failures} failure(s)")
+
+    def release(self):
+        """A call ended without an outcome (cancelled, or failed on our side): free the trial slot"""
+        with self._lock:
+            self.trial_in_flight = False
+
+
+DEPENDENCY_LABELS = ("dependency",)
+outbound_duration = Histogram("outbound_request_duration_seconds", "Outbound call latency", LATENCY_BUCKETS)
+outbound_total = Counter("outbound_requests_total", "Outbound calls by outcome")
+
+CIRCUIT_STATE_VALUES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+
+class OutboundHTTP:
+    """Per-dependency pooled clients and circuit breakers for this worker"""
+
+    def __init__(self, dependencies: Dict[str, Dependency]):
+        self.dependencies = dependencies
+        self.breakers = {
+            name: CircuitBreaker(name, dep.failure_threshold, dep.reset_timeout)
+            for name, dep in dependencies.items()
+        }
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._closers = []
+
+    def _build(self, dep: Dependency) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=dep.base_url,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(dep.timeout, connect=dep.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=dep.max_connections,
+                max_keepalive_connections=dep.max_keepalive,
+                keepalive_expiry=30.0,
+            ),
+        )
+
+    def client(self, name: str) -> httpx.AsyncClient:
+        """Pooled client for a dependency (created on first use if startup hasn't run)"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = self._build(self.dependencies[name])
+        return client
+
+    def on_close(self, closer):
+        """Register an async callable to run on shutdown (e.g. an SDK's own client)"""
+        self._closers.append(closer)
+
+    async def start(self):
+        for name, dep in self.dependencies.items():
+            if dep.pooled:
+                self.client(name)
+        logger.info(f"🌐 Outbound HTTP ready ({'HTTP/2' if HTTP2_AVAILABLE else 'HTTP/1.1'} keep-alive)")
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        for closer in self._closers:
+            try:
+                await closer()
+            except Exception as e:
+                logger.warning(f"Outbound client close failed: {e}")
+        self._closers.clear()
+
+    @asynccontextmanager
+    async def guard(self, name: str, failures: Tuple[Type[BaseException], ...] = (Exception,)):
+        """Circuit breaker and metrics around one call to a dependency.
+
+        Only exceptions in failures (connection errors, 5xx) count against the
+        breaker; anything else (e.g. a declined card) means the dependency is up.
+        """
+        breaker = self.breakers[name]
+        try:
+            breaker.before_call()
+        except CircuitOpen:
+            outbound_total.inc((name, "rejected"))
+            raise
+        started = time.perf_counter()
+        try:
+            yield
+        except failures:
+            breaker.record_failure()
+            outbound_total.inc((name, "error"))
+            raise
+        except Exception:
+            breaker.record_success()
+            outbound_total.inc((name, "client_error"))
+            raise
+        except BaseException:
+            # Cancelled, or a stream closed by a client disconnect: says nothing about the dependency
+            breaker.release()
+            outbound_total.inc((name, "cancelled"))
+            raise
+        finally:
+            outbound_duration.observe((name,), time.perf_counter() - started)
+        breaker.record_success()
+        outbound_total.inc((name, "ok"))
+
+    async def request(self, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request through the dependency's pool; 5xx responses count as failures"""
+        breaker = self.breakers[name]
+        try:
+            breaker.before_call()
+        except CircuitOpen:
+            outbound_total.inc((name, "rejected"))
+            raise
+        started = time.perf_counter()
+        try:
+            response = await self.client(name).request(method, url, **kwargs)
+        except httpx.HTTPError:
+            breaker.record_failure()
+            outbound_total.inc((name, "error"))
+            raise
+        except BaseException:
+            breaker.release()
+            outbound_total.inc((name, "cancelled"))
+            raise
+        finally:
+            outbound_duration.observe((name,), time.perf_counter() - started)
+        if response.status_code >= 500:
+            breaker.record_failure()
+            outbound_total.inc((name, "5xx"))
+        else:
+            breaker.record_success()
+            outbound_total.inc((name, "ok"))
+        return response
+
+    def snapshot(self) -> dict:
+        return {
+            name: {"circuit": breaker.state, "consecutive_failures": breaker.failures}
+            for name, breaker in self.breakers.items()
+        }
+
+    def render_prometheus(self) -> str:
+        lines = outbound_duration.render(DEPENDENCY_LABELS)
+        lines += outbound_total.render(DEPENDENCY_LABELS + ("outcome",))
+        lines.append("# TYPE outbound_circuit_state gauge")
+        for name, breaker in sorted(self.breakers.items()):
+            lines.append(f'outbound_circuit_state{{dependency="{name}"}} {CIRCUIT_STATE_VALUES[breaker.state]}')
+        return "\n".join(lines) + "\n"
+
+
+outbound = OutboundHTTP(DEPENDENCIES)
+register_collector(outbound.render_prometheus)
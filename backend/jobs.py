@@ -0,0 +1,393 @@
+"""
+EuroMatchTickets Background Jobs
+Long-running admin work (bulk AI descriptions, maintenance) runs as a tracked
+background task instead of a long-held HTTP request. Progress and a resume
+checkpoint are persisted in db.jobs; a worker holds a lease on a running job
+and renews it while alive, so a job interrupted by a deploy or a crashed
+worker is picked up again on the next startup.
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+from background import spawn
+from database import db
+
+logger = logging.getLogger(__name__)
+
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', '60'))
+MAX_JOB_ERRORS = 50  # per job document; counts keep going
+
+ACTIVE = ("queued", "running")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobCancelled(Exception):
+    """Raised from Job.progress() once an admin has asked the job to stop"""
+
+
+class JobConflict(Exception):
+    """Raised from submit() when a job of the same kind with different params is active"""
+
+    def __init__(self, active: dict):
+        super().__init__(f"{active['kind']} job {active['job_id']} is already {active['status']}")
+        self.active = active
+
+
+class DuplicateJob(Exception):
+    """Raised by a store's insert() when a job of the same kind is already active"""
+
+
+# ============== STORES ==============
+
+class MongoJobStore:
+    """Job documents in a MongoDB collection"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("job_id", unique=True)
+        await self.collection.create_index([("kind", 1), ("status", 1)])
+        # One active job per kind, even when two workers submit at the same moment
+        await self.collection.create_index("active_key", unique=True,
+                                           partialFilterExpression={"active_key": {"$type": "string"}})
+
+    async def insert(self, doc: dict):
+        from pymongo.errors import DuplicateKeyError
+        try:
+            await self.collection.insert_one(dict(doc))
+        except DuplicateKeyError:
+            raise DuplicateJob(doc["kind"])
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.collection.find_one({"job_id": job_id}, {"_id": 0})
+
+    async def update(self, job_id: str, fields: dict, inc: Optional[dict] = None, push: Optional[dict] = None):
+        change = {"$set": fields}
+        if inc:
+            change["$inc"] = inc
+        if push:
+            change["$push"] = {key: {"$each": values, "$slice": -MAX_JOB_ERRORS} for key, values in push.items()}
+        await self.collection.update_one({"job_id": job_id}, change)
+
+    async def claim(self, job_id: str, owner: str, now: datetime, lease_until: datetime) -> Optional[dict]:
+        """Atomically take an active job whose lease is free or expired"""
+        from pymongo import ReturnDocument
+        return await self.collection.find_one_and_update(
+            {"job_id": job_id, "status": {"$in": list(ACTIVE)},
+             "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]},
+            {"$set": {"status": "running", "owner": owner, "lease_until": lease_until, "updated_at": now}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def find_active(self, kinds: Iterable[str]) -> List[dict]:
+        return await self.collection.find(
+            {"kind": {"$in": list(kinds)}, "status": {"$in": list(ACTIVE)}}, {"_id": 0}
+        ).to_list(100)
+
+    async def recent(self, limit: int = 50) -> List[dict]:
+        return await self.collection.find(
+            {}, {"_id": 0, "errors": 0, "state": 0}
+        ).sort("created_at", -1).to_list(limit)
+
+
+class MemoryJobStore:
+    """In-process stand-in for tests and single-process tools"""
+
+    def __init__(self):
+        self.jobs: Dict[str, dict] = {}
+
+    async def ensure_indexes(self):
+        pass
+
+    async def insert(self, doc: dict):
+        key = doc.get("active_key")
+        if key is not None and any(d.get("active_key") == key for d in self.jobs.values()):
+            raise DuplicateJob(doc["kind"])
+        self.jobs[doc["job_id"]] = copy.deepcopy(doc)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return copy.deepcopy(self.jobs.get(job_id))
+
+    async def update(self, job_id: str, fields: dict, inc: Optional[dict] = None, push: Optional[dict] = None):
+        doc = self.jobs[job_id]
+        doc.update(copy.deepcopy(fields))
+        for key, amount in (inc or {}).items():
+            doc[key] = doc.get(key, 0) + amount
+        for key, values in (push or {}).items():
+            doc[key] = (doc.get(key, []) + list(values))[-MAX_JOB_ERRORS:]
+
+    async def claim(self, job_id: str, owner: str, now: datetime, lease_until: datetime) -> Optional[dict]:
+        doc = self.jobs.get(job_id)
+        if not doc or doc["status"] not in ACTIVE or (doc.get("lease_until") and doc["lease_until"] >= now):
+            return None
+        doc.update(status="running", owner=owner, lease_until=lease_until, updated_at=now)
+        return copy.deepcopy(doc)
+
+    async def find_active(self, kinds: Iterable[str]) -> List[dict]:
+        kinds = set(kinds)
+        return [copy.deepcopy(d) for d in self.jobs.values() if d["kind"] in kinds and d["status"] in ACTIVE]
+
+    async def recent(self, limit: int = 50) -> List[dict]:
+        docs = sorted(self.jobs.values(), key=lambda d: d["created_at"], reverse=True)[:limit]
+        return [{k: v for k, v in copy.deepcopy(d).items() if k not in ("errors", "state")} for d in docs]
+
+
+# ============== JOBS ==============
+
+class Job:
+    """Handle passed to a job handler: parameters, checkpoint and progress reporting"""
+
+    def __init__(self, doc: dict, store):
+        self.job_id = doc["job_id"]
+        self.kind = doc["kind"]
+        self.params = doc.get("params") or {}
+        self.state = doc.get("state") or {}
+        self.total = doc.get("total")
+        self.done = doc.get("done", 0)
+        self.failed = doc.get("failed", 0)
+        self._store = store
+
+    async def progress(self, done: int = 0, failed: int = 0, state: Optional[dict] = None,
+                       errors: Iterable[dict] = (), total: Optional[int] = None, counts: Optional[dict] = None):
+        """Persist counts and the resume checkpoint; call after each durable batch.
+
+        counts are extra per-kind totals (tokens, skipped items...) added to the job document.
+        Raises JobCancelled if the job was cancelled, so it stops at this checkpoint.
+        """
+        fields = {"updated_at": _now()}
+        if state is not None:
+            self.state = state
+            fields["state"] = state
+        if total is not None:
+            self.total = total
+            fields["total"] = total
+        self.done += done
+        self.failed += failed
+        errors = list(errors)
+        await self._store.update(self.job_id, fields, inc={"done": done, "failed": failed, **(counts or {})},
+                                 push={"errors": errors} if errors else None)
+        if await self.cancel_requested():
+            raise JobCancelled(self.job_id)
+
+    async def cancel_requested(self) -> bool:
+        doc = await self._store.get(self.job_id)
+        return bool(doc and doc.get("cancel_requested"))
+
+
+class RateLimiter:
+    """Spaces calls to at most `rate` per second across concurrent callers"""
+
+    def __init__(self, rate: float, clock=time.monotonic, sleep=asyncio.sleep):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.clock = clock
+        self.sleep = sleep
+        self._next = 0.0
+
+    async def wait(self):
+        now = self.clock()
+        slot = max(self._next, now)
+        self._next = slot + self.interval
+        if slot > now:
+            await self.sleep(slot - now)
+
+
+async def run_bounded(items: list, fn: Callable[[dict], Awaitable], concurrency: int,
+                      limiter: Optional[RateLimiter] = None) -> list:
+    """fn(item) for every item, at most `concurrency` at a time; exceptions are returned, not raised"""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(item):
+        async with slots:
+            if limiter:
+                await limiter.wait()
+            return await fn(item)
+
+    return await asyncio.gather(*(one(item) for item in items), return_exceptions=True)
+
+
+class JobRunner:
+    """Registry of job kinds; runs, tracks and resumes their jobs on this worker"""
+
+    def __init__(self, store, lease_seconds: float = JOB_LEASE_SECONDS):
+        self.store = store
+        self.lease_seconds = lease_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self.handlers: Dict[str, Callable[[Job], Awaitable]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._watcher: Optional[asyncio.Task] = None
+
+    def handler(self, kind: str):
+        """Register `async def handler(job: Job)` for a job kind"""
+        def register(fn):
+            self.handlers[kind] = fn
+            return fn
+        return register
+
+    async def submit(self, kind: str, params: Optional[dict] = None, created_by: Optional[str] = None) -> dict:
+        """Start a job, or return the active job of this kind if it has the same params.
+
+        One job of a kind runs at a time: raises JobConflict if the active one
+        was submitted with different params (another draw, another task).
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        params = params or {}
+        active = await self.store.find_active([kind])
+        if active:
+            return self._same_job(active[0], params)
+
+        now = _now()
+        doc = {
+            "job_id": f"job_{uuid.uuid4().hex[:12]}",
+            "kind": kind,
+            "active_key": kind,  # cleared when the job finishes
+            "params": params,
+            "status": "queued",
+            "state": {},
+            "total": None,
+            "done": 0,
+            "failed": 0,
+            "errors": [],
+            "created_by": created_by,
+            "owner": None,
+            "lease_until": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        try:
+            await self.store.insert(doc)
+        except DuplicateJob:
+            # Lost a race with a concurrent submit: return the job that won
+            active = await self.store.find_active([kind])
+            if not active:
+                raise
+            return self._same_job(active[0], params)
+        self._start(doc["job_id"])
+        return doc
+
+    @staticmethod
+    def _same_job(active: dict, params: dict) -> dict:
+        if (active.get("params") or {}) != params:
+            raise JobConflict(active)
+        return active
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.store.get(job_id)
+
+    async def recent(self, limit: int = 50) -> List[dict]:
+        return await self.store.recent(limit)
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """Ask a queued or running job, on any worker, to stop at its next checkpoint"""
+        doc = await self.store.get(job_id)
+        if doc and doc["status"] in ACTIVE:
+            await self.store.update(job_id, {"cancel_requested": True, "updated_at": _now()})
+            doc = await self.store.get(job_id)
+        return doc
+
+    def _start(self, job_id: str):
+        if job_id not in self._tasks:
+            task = spawn(self._run(job_id), name=f"job-{job_id}")
+            self._tasks[job_id] = task
+            task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    def _lease(self) -> datetime:
+        return _now() + timedelta(seconds=self.lease_seconds)
+
+    async def _heartbeat(self, job_id: str):
+        # Renews at a third of the lease, so a failed renewal or two is retried before it lapses
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                await self.store.update(job_id, {"lease_until": self._lease()})
+            except Exception as e:
+                logger.warning(f"Job {job_id} lease renewal failed: {e}")
+
+    async def _run(self, job_id: str):
+        doc = await self.store.claim(job_id, self.owner, _now(), self._lease())
+        if doc is None:
+            return  # another worker holds it
+        job = Job(doc, self.store)
+        if doc.get("cancel_requested"):
+            await self._finish(job, "cancelled")
+            return
+        logger.info(f"⚙️ Job {job_id} ({job.kind}) running, resuming from {job.state or 'start'}")
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await self.handlers[job.kind](job)
+        except asyncio.CancelledError:
+            heartbeat.cancel()
+            # Shutdown: release the lease so the next startup resumes from the checkpoint
+            await self.store.update(job_id, {"status": "queued", "lease_until": None, "updated_at": _now()})
+            logger.info(f"⏸️ Job {job_id} interrupted after {job.done} item(s)")
+            raise
+        except JobCancelled:
+            heartbeat.cancel()
+            await self._finish(job, "cancelled")
+        except Exception as e:
+            heartbeat.cancel()
+            logger.error(f"Job {job_id} ({job.kind}) failed: {e}")
+            await self.store.update(job_id, {"status": "failed", "error": str(e), "lease_until": None,
+                                             "active_key": None, "updated_at": _now(), "finished_at": _now()})
+        else:
+            heartbeat.cancel()
+            await self.store.update(job_id, {"status": "completed", "lease_until": None, "active_key": None,
+                                             "updated_at": _now(), "finished_at": _now()})
+            logger.info(f"✅ Job {job_id} ({job.kind}) completed: {job.done} done, {job.failed} failed")
+
+    async def _finish(self, job: Job, status: str):
+        await self.store.update(job.job_id, {"status": status, "lease_until": None, "active_key": None,
+                                             "updated_at": _now(), "finished_at": _now()})
+        logger.info(f"🛑 Job {job.job_id} ({job.kind}) {status} after {job.done} item(s)")
+
+    async def resume(self) -> int:
+        """Pick up queued jobs and jobs whose worker stopped renewing the lease"""
+        resumed = 0
+        for doc in await self.store.find_active(self.handlers):
+            if doc["job_id"] not in self._tasks:
+                self._start(doc["job_id"])
+                resumed += 1
+        return resumed
+
+    async def _watch(self):
+        try:
+            await self.store.ensure_indexes()
+        except Exception as e:
+            logger.warning(f"Job index creation failed: {e}")
+        while True:
+            try:
+                await self.resume()
+            except Exception as e:
+                logger.warning(f"Job resume check failed: {e}")
+            await asyncio.sleep(self.lease_seconds)
+
+    def start(self):
+        """Resume interrupted jobs of the kinds registered on this worker, then keep watching for orphans"""
+        if self._watcher is None and self.handlers:
+            self._watcher = asyncio.create_task(self._watch(), name="job-watcher")
+
+    async def stop(self):
+        """Interrupt this worker's jobs; their checkpoints let another worker resume them"""
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+runner = JobRunner(MongoJobStore(db.jobs))
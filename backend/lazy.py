@@ -0,0 +1,61 @@
+"""
+EuroMatchTickets Lazy Imports
+Heavy third-party SDKs (stripe, openai, qrcode, resend) are only needed by a
+handful of endpoints, so they are imported on first use instead of at worker
+boot. tests/test_import_time.py keeps them out of the import path.
+"""
+
+import importlib
+import importlib.util
+import threading
+from typing import Callable, Optional
+
+
+def available(name: str) -> bool:
+    """True if the module can be imported, without importing it"""
+    return importlib.util.find_spec(name) is not None
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access.
+
+    configure(module) runs once after the import, e.g. to set API keys.
+    """
+
+    def __init__(self, name: str, configure: Optional[Callable] = None):
+        self._name = name
+        self._configure = configure
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    module = importlib.import_module(self._name)
+                    if self._configure:
+                        self._configure(module)
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def warm(*modules: LazyModule) -> int:
+    """Import lazy modules ahead of first use (run off the event loop).
+
+    Returns how many imported successfully.
+    """
+    loaded = 0
+    for module in modules:
+        try:
+            module._load()
+            loaded += 1
+        except ImportError:
+            pass
+    return loaded
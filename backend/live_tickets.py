@@ -0,0 +1,318 @@
+"""
+EuroMatchTickets Live Availability
+Pushes ticket changes for an event (listed, price changed, reserved, sold,
+category counts and minimums) to every open event page over Server-Sent
+Events, instead of each page re-reading up to 500 tickets per poll.
+
+Each worker keeps one channel per event with open streams. The channel loads
+the event's available tickets once, then follows ticket changes from the
+change feed: a change for a watched event re-reads that one ticket and the
+resulting delta is encoded once and fanned out to every subscriber.
+
+Subscribers have bounded queues. A client that falls behind doesn't slow the
+others or grow memory: its queue is dropped and it gets a fresh snapshot
+instead of the deltas it missed. Streams end after LIVE_STREAM_MAX_SECONDS;
+EventSource reconnects on its own, which keeps subscribers spread over
+workers and lets deploys drain.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from change_feed import DomainEvent, bus as change_bus
+from database import db
+from metrics import Counter, register_collector
+
+logger = logging.getLogger(__name__)
+
+LIVE_QUEUE_SIZE = int(os.environ.get('LIVE_QUEUE_SIZE', '64'))
+LIVE_HEARTBEAT_SECONDS = float(os.environ.get('LIVE_HEARTBEAT_SECONDS', '15'))
+LIVE_STREAM_MAX_SECONDS = float(os.environ.get('LIVE_STREAM_MAX_SECONDS', '900'))
+RETRY_MS = 3000
+
+TICKET_FIELDS = {"_id": 1, "ticket_id": 1, "event_id": 1, "category": 1, "section": 1, "row": 1, "seat": 1,
+                 "price": 1, "original_price": 1, "currency": 1, "status": 1, "seller_id": 1, "seller_name": 1}
+# Sentinels queued to a subscriber instead of a message
+RESYNC = object()
+PING = object()
+CLOSE = object()
+
+live_messages = Counter("live_ticket_messages_total", "Live availability messages fanned out by type")
+live_overflows = Counter("live_ticket_overflows_total", "Slow live subscribers resynced after a full queue")
+
+
+def sse(kind: str, payload: dict) -> str:
+    return f"event: {kind}\ndata: {json.dumps(payload, default=str)}\n\n"
+
+
+def _public(ticket: dict) -> dict:
+    return {k: v for k, v in ticket.items() if k != "_id"}
+
+
+class Subscriber:
+    """Bounded mailbox of one stream. A single waiter future and no timers keep idle streams cheap."""
+
+    __slots__ = ("items", "size", "deadline", "_resync", "_waiter")
+
+    def __init__(self, size: int, deadline: float):
+        self.items = []  # at most `size`; lighter than a deque per idle stream
+        self.size = size
+        self.deadline = deadline
+        self._resync = False
+        self._waiter: Optional[asyncio.Future] = None
+
+    def offer(self, message: str) -> bool:
+        """Queue a delta; returns False if the queue was full and the client was switched to a resync"""
+        if self._resync:
+            return True  # the snapshot it's about to get already includes this change
+        if len(self.items) >= self.size:
+            self.resync()
+            return False
+        self.items.append(message)
+        self._wake()
+        return True
+
+    def resync(self):
+        self.items.clear()
+        self.items.append(RESYNC)
+        self._resync = True
+        self._wake()
+
+    def ping(self):
+        if not self.items:
+            self.items.append(PING)
+            self._wake()
+
+    def close(self):
+        self.items.clear()
+        self.items.append(CLOSE)
+        self._wake()
+
+    def _wake(self):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def get(self):
+        while not self.items:
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        item = self.items.pop(0)
+        if item is RESYNC:
+            self._resync = False
+        return item
+
+
+class EventChannel:
+    """Available tickets of one event on this worker, and the streams watching it"""
+
+    def __init__(self, event_id: str, database, queue_size: int = LIVE_QUEUE_SIZE):
+        self.event_id = event_id
+        self.database = database
+        self.queue_size = queue_size
+        self.tickets: Dict[str, dict] = {}
+        self.ids: Dict[object, str] = {}  # _id -> ticket_id, for deletes that only carry _id
+        self.categories: Dict[str, dict] = {}
+        self.subscribers: Set[Subscriber] = set()
+        self.lock = asyncio.Lock()
+        self._loaded = False
+        self._snapshot: Optional[str] = None
+
+    # ----- state -----
+
+    async def load(self):
+        tickets = await self.database.tickets.find(
+            {"event_id": self.event_id, "status": "available"}, TICKET_FIELDS
+        ).to_list(None)
+        self.tickets = {t["ticket_id"]: t for t in tickets}
+        self.ids = {t["_id"]: t["ticket_id"] for t in tickets}
+        self.categories = {}
+        for category in {t["category"] for t in tickets}:
+            self._recount(category)
+        self._snapshot = None
+        self._loaded = True
+
+    async def ensure_loaded(self):
+        async with self.lock:
+            if not self._loaded:
+                await self.load()
+
+    def _recount(self, category: str):
+        prices = [t["price"] for t in self.tickets.values() if t["category"] == category]
+        if prices:
+            self.categories[category] = {"count": len(prices), "lowest_price": min(prices)}
+        else:
+            self.categories.pop(category, None)
+
+    def snapshot(self) -> str:
+        """Same shape as GET /api/events/{id}'s tickets, categories and ticket_count; encoded once per change"""
+        if self._snapshot is None:
+            self._snapshot = sse("snapshot", {
+                "event_id": self.event_id,
+                "tickets": [_public(t) for t in self.tickets.values()],
+                "categories": self.categories,
+                "ticket_count": len(self.tickets),
+            })
+        return self._snapshot
+
+    def apply(self, ticket_id: str, current: Optional[dict]) -> list:
+        """Update state from a ticket's current document (None: deleted); returns the messages to send"""
+        previous = self.tickets.get(ticket_id)
+        available = current is not None and current.get("event_id") == self.event_id \
+            and current.get("status") == "available"
+        messages = []
+        if available:
+            if previous is None:
+                messages.append(("listed", {"ticket": _public(current)}))
+            elif previous["price"] != current["price"]:
+                messages.append(("price", {"ticket_id": ticket_id, "price": current["price"],
+                                           "previous_price": previous["price"]}))
+            elif _public(previous) != _public(current):
+                messages.append(("updated", {"ticket": _public(current)}))
+            self.tickets[ticket_id] = current
+            self.ids[current["_id"]] = ticket_id
+        elif previous is not None:
+            status = current.get("status") if current else None
+            kind = status if status in ("reserved", "sold") else "removed"
+            messages.append((kind, {"ticket_id": ticket_id}))
+            del self.tickets[ticket_id]
+            self.ids.pop(previous["_id"], None)
+        if not messages:
+            return []
+
+        before = {c: dict(v) for c, v in self.categories.items()}
+        for category in {t["category"] for t in (previous, current) if t}:
+            self._recount(category)
+        if self.categories != before:
+            messages.append(("categories", {"categories": self.categories, "ticket_count": len(self.tickets)}))
+        self._snapshot = None
+        return messages
+
+    async def refresh(self, document_id, ticket_id: Optional[str] = None):
+        """Re-read one changed ticket and fan out what changed"""
+        async with self.lock:
+            if not self._loaded:
+                return
+            current = await self.database.tickets.find_one({"_id": document_id}, TICKET_FIELDS)
+            ticket_id = ticket_id or (current or {}).get("ticket_id") or self.ids.get(document_id)
+            if ticket_id is None:
+                return
+            for kind, payload in self.apply(ticket_id, current):
+                self.broadcast(kind, sse(kind, payload))
+
+    async def resync(self):
+        async with self.lock:
+            await self.load()
+            for subscriber in list(self.subscribers):
+                subscriber.resync()
+
+    def broadcast(self, kind: str, message: str):
+        live_messages.inc((kind,))
+        for subscriber in list(self.subscribers):
+            if not subscriber.offer(message):
+                live_overflows.inc(())
+
+
+class LiveHub:
+    """Channels by event for this worker, fed by the change bus"""
+
+    def __init__(self, database, queue_size: int = LIVE_QUEUE_SIZE, heartbeat: float = LIVE_HEARTBEAT_SECONDS,
+                 max_seconds: float = LIVE_STREAM_MAX_SECONDS):
+        self.database = database
+        self.queue_size = queue_size
+        self.heartbeat = heartbeat
+        self.max_seconds = max_seconds
+        self.channels: Dict[str, EventChannel] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._ticker: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(c.subscribers) for c in self.channels.values())
+
+    @asynccontextmanager
+    async def subscribe(self, event_id: str) -> AsyncIterator[tuple]:
+        loop = asyncio.get_running_loop()
+        channel = self.channels.get(event_id)
+        if channel is None:
+            channel = self.channels[event_id] = EventChannel(event_id, self.database, self.queue_size)
+        subscriber = Subscriber(self.queue_size, loop.time() + self.max_seconds)
+        channel.subscribers.add(subscriber)
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._tick(), name="live-tickets-heartbeat")
+        try:
+            await channel.ensure_loaded()
+            yield channel, subscriber
+        finally:
+            channel.subscribers.discard(subscriber)
+            if not channel.subscribers and self.channels.get(event_id) is channel:
+                del self.channels[event_id]
+
+    async def _tick(self):
+        """One timer for all streams: heartbeats for idle ones, close the ones past their lifetime"""
+        loop = asyncio.get_running_loop()
+        while self.channels:
+            await asyncio.sleep(self.heartbeat)
+            now = loop.time()
+            for channel in list(self.channels.values()):
+                for subscriber in list(channel.subscribers):
+                    if now >= subscriber.deadline:
+                        subscriber.close()
+                    else:
+                        subscriber.ping()
+
+    async def stream(self, event_id: str) -> AsyncIterator[str]:
+        """SSE body for one client: a snapshot, then deltas, heartbeats and resyncs"""
+        async with self.subscribe(event_id) as (channel, subscriber):
+            yield f"retry: {RETRY_MS}\n\n"
+            yield channel.snapshot()  # shared string, not a per-client copy
+            while True:
+                item = await subscriber.get()
+                if item is CLOSE:
+                    return
+                if item is PING:
+                    yield ": ping\n\n"
+                elif item is RESYNC:
+                    yield channel.snapshot()
+                else:
+                    yield item
+
+    def _schedule(self, coro):
+        task = asyncio.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def on_change(self, event: DomainEvent):
+        """Change bus subscriber: only events with open streams on this worker cost anything"""
+        if event.operation == "resync":
+            for channel in list(self.channels.values()):
+                self._schedule(channel.resync())
+            return
+        channel = self.channels.get(event.keys.get("event_id"))
+        if channel is not None:
+            self._schedule(channel.refresh(event.document_id, event.keys.get("ticket_id")))
+        # Moved to another event, or deleted: the ticket may still be listed on another channel
+        for other in list(self.channels.values()):
+            if other is not channel and event.document_id in other.ids:
+                self._schedule(other.refresh(event.document_id))
+
+    def close(self):
+        """End every open stream; clients reconnect elsewhere"""
+        for channel in list(self.channels.values()):
+            for subscriber in list(channel.subscribers):
+                subscriber.close()
+
+
+live_hub = LiveHub(db)
+change_bus.subscriber("ticket")(live_hub.on_change)
+register_collector(lambda: "\n".join(
+    live_messages.render(("type",)) + live_overflows.render(())
+    + ["# TYPE live_ticket_subscribers gauge", f"live_ticket_subscribers {live_hub.subscriber_count}",
+       "# TYPE live_ticket_channels gauge", f"live_ticket_channels {len(live_hub.channels)}"]
+) + "\n")
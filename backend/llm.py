@@ -0,0 +1,104 @@
+"""
+EuroMatchTickets LLM Client
+Shared async OpenAI client for support chat and event descriptions, created
+on first use so workers that never call the model don't import the SDK.
+Calls go through the "openai" circuit breaker (see http_clients.py) and a
+per-worker semaphore that bounds concurrent LLM calls; callers that can't get
+a slot within LLM_QUEUE_TIMEOUT seconds get LLMBusy instead of queueing.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from http_clients import outbound, DEPENDENCIES
+from lazy import available
+from metrics import Counter, register_collector
+
+logger = logging.getLogger(__name__)
+
+AI_CHAT_AVAILABLE = available("openai")
+if not AI_CHAT_AVAILABLE:
+    logger.warning("OpenAI not available")
+
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', '16'))
+LLM_QUEUE_TIMEOUT = float(os.environ.get('LLM_QUEUE_TIMEOUT', '10'))
+
+_openai_client = None
+_slots = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+
+llm_tokens = Counter("llm_tokens_total", "LLM tokens used by kind")
+register_collector(lambda: "\n".join(llm_tokens.render(("kind",))) + "\n")
+
+
+def _record_usage(usage, into: Optional[dict] = None):
+    if usage is None:
+        return
+    llm_tokens.inc(("prompt",), usage.prompt_tokens or 0)
+    llm_tokens.inc(("completion",), usage.completion_tokens or 0)
+    if into is not None:
+        into["prompt_tokens"] = usage.prompt_tokens
+        into["completion_tokens"] = usage.completion_tokens
+
+
+class LLMBusy(Exception):
+    """All LLM slots on this worker stayed busy for LLM_QUEUE_TIMEOUT seconds"""
+
+
+@asynccontextmanager
+async def _llm_slot():
+    try:
+        await asyncio.wait_for(_slots.acquire(), timeout=LLM_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise LLMBusy(f"{LLM_MAX_CONCURRENCY} LLM calls already in flight")
+    try:
+        yield
+    finally:
+        _slots.release()
+
+
+def _failures():
+    import openai
+    return (openai.APIConnectionError, openai.InternalServerError)
+
+
+def get_openai_client():
+    """Shared AsyncOpenAI client, or None if the SDK or API key is missing"""
+    global _openai_client
+    if _openai_client is None and AI_CHAT_AVAILABLE:
+        openai_api_key = os.environ.get('OPENAI_API_KEY') or os.environ.get('EMERGENT_LLM_KEY')
+        if openai_api_key:
+            from openai import AsyncOpenAI
+            dep = DEPENDENCIES["openai"]
+            _openai_client = AsyncOpenAI(api_key=openai_api_key, timeout=dep.timeout, max_retries=1)
+            outbound.on_close(_openai_client.close)
+    return _openai_client
+
+
+async def chat_completion(**params):
+    """client.chat.completions.create behind the concurrency limit and circuit breaker"""
+    async with _llm_slot():
+        async with outbound.guard("openai", failures=_failures()):
+            response = await get_openai_client().chat.completions.create(**params)
+    _record_usage(response.usage)
+    return response
+
+
+async def stream_chat_completion(usage: Optional[dict] = None, **params) -> AsyncIterator[str]:
+    """Yield the completion's text deltas as they arrive; token counts are written into usage"""
+    async with _llm_slot():
+        async with outbound.guard("openai", failures=_failures()):
+            stream = await get_openai_client().chat.completions.create(
+                stream=True, stream_options={"include_usage": True}, **params
+            )
+            try:
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None):
+                        _record_usage(chunk.usage, usage)
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                await stream.close()
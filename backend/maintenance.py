@@ -0,0 +1,103 @@
+"""
+EuroMatchTickets Maintenance
+Bulk deletes and updates for admin maintenance jobs. Instead of one
+delete_many/update_many over a whole collection, work walks the collection in
+_id order one bounded batch at a time: each batch is a delete or update over
+an _id range (so it uses the _id index and holds the primary briefly), paced
+by a rate limiter and checkpointed in the job. A cancelled job stops at a batch
+boundary; an interrupted one resumes from the last batch.
+"""
+
+import logging
+import os
+from typing import List, Optional, Tuple
+
+from jobs import Job, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_BATCH_SIZE = int(os.environ.get('MAINTENANCE_BATCH_SIZE', '1000'))
+MAINTENANCE_BATCH_RATE = float(os.environ.get('MAINTENANCE_BATCH_RATE', '10'))  # write batches per second
+
+
+def delete(collection: str, filter: Optional[dict] = None, cascade: List[Tuple[str, str]] = ()) -> dict:
+    """Operation: delete matching documents.
+
+    cascade=[(child_collection, key)] first deletes child documents whose `key`
+    equals a deleted parent's, batch by batch, so the key list never exceeds a batch.
+    """
+    return {"op": "delete", "collection": collection, "filter": filter or {}, "cascade": list(cascade)}
+
+
+def update(collection: str, filter: dict, change: dict) -> dict:
+    """Operation: apply an update document to matching documents"""
+    return {"op": "update", "collection": collection, "filter": filter, "change": change}
+
+
+async def count(database, operations: List[dict]) -> int:
+    total = 0
+    for op in operations:
+        collection = database[op["collection"]]
+        if op["filter"]:
+            total += await collection.count_documents(op["filter"])
+        else:
+            total += await collection.estimated_document_count()
+    return total
+
+
+async def _next_batch(collection, filter: dict, after, size: int, fields: Tuple[str, ...] = ()) -> List[dict]:
+    query = dict(filter)
+    if after is not None:
+        query["_id"] = {"$gt": after}
+    projection = {"_id": 1, **{f: 1 for f in fields}}
+    return await collection.find(query, projection).sort("_id", 1).limit(size).to_list(size)
+
+
+async def _delete_children(collection, key: str, values: list, size: int, limiter: RateLimiter) -> int:
+    deleted = 0
+    after = None
+    while True:
+        batch = await _next_batch(collection, {key: {"$in": values}}, after, size)
+        if not batch:
+            return deleted
+        await limiter.wait()
+        result = await collection.delete_many({"_id": {"$in": [d["_id"] for d in batch]}})
+        deleted += result.deleted_count
+        after = batch[-1]["_id"]
+
+
+async def run_operations(job: Job, database, operations: List[dict], batch_size: int = None,
+                         limiter: Optional[RateLimiter] = None):
+    """Run operations in order, checkpointing {"step", "last_id"} after every batch"""
+    batch_size = batch_size or MAINTENANCE_BATCH_SIZE
+    limiter = limiter or RateLimiter(MAINTENANCE_BATCH_RATE)
+    if job.total is None:
+        await job.progress(total=await count(database, operations))
+
+    first = job.state.get("step", 0)
+    for step in range(first, len(operations)):
+        op = operations[step]
+        collection = database[op["collection"]]
+        after = job.state.get("last_id") if step == first else None
+        keys = tuple(key for _, key in op.get("cascade", ()))
+        while True:
+            batch = await _next_batch(collection, op["filter"], after, batch_size, keys)
+            if not batch:
+                break
+            id_range = {"_id": {"$gte": batch[0]["_id"], "$lte": batch[-1]["_id"]}, **op["filter"]}
+            counts = {}
+            if op["op"] == "delete":
+                for child, key in op["cascade"]:
+                    values = [d[key] for d in batch if d.get(key) is not None]
+                    counts[f"{child}_deleted"] = await _delete_children(database[child], key, values,
+                                                                       batch_size, limiter)
+                await limiter.wait()
+                affected = (await collection.delete_many(id_range)).deleted_count
+            else:
+                await limiter.wait()
+                affected = (await collection.update_many(id_range, op["change"])).modified_count
+            after = batch[-1]["_id"]
+            counts[f"{op['collection']}_{op['op']}d"] = affected
+            await job.progress(done=affected, state={"step": step, "last_id": after}, counts=counts)
+        logger.info(f"🧹 Job {job.job_id}: {op['op']} on {op['collection']} finished")
+        await job.progress(state={"step": step + 1, "last_id": None})
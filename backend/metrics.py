@@ -0,0 +1,227 @@
+"""
+EuroMatchTickets Request Metrics
+ASGI middleware plus a PyMongo CommandListener that attribute wall time, DB
+command count, DB time and bytes returned to each request, aggregated into
+Prometheus-style histograms per route template.
+
+Per-request attribution works because Motor runs PyMongo calls in an
+executor with a copy of the caller's contextvars, so the listener sees the
+RequestStats object of the request that issued the command.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple
+
+import bson
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = float(os.environ.get('SLOW_REQUEST_MS', '1000'))
+SERVER_TIMING = os.environ.get('SERVER_TIMING', os.environ.get('DEBUG', '')).lower() in ('1', 'true', 'on')
+# Measuring reply size re-encodes each reply; switch off if it shows up in profiles
+MEASURE_DB_BYTES = os.environ.get('METRICS_DB_BYTES', 'on').lower() not in ('0', 'false', 'off')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+BYTES_BUCKETS = (1024, 10240, 102400, 512000, 1048576, 5242880, 10485760)
+
+
+class RequestStats:
+    """DB work attributed to one request"""
+    __slots__ = ("db_commands", "db_seconds", "db_bytes", "_lock")
+
+    def __init__(self):
+        self.db_commands = 0
+        self.db_seconds = 0.0
+        self.db_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float, size: int):
+        with self._lock:
+            self.db_commands += 1
+            self.db_seconds += seconds
+            self.db_bytes += size
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _current.get()
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: tuple):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._series: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple, value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # bucket counts + [sum, count]
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self, label_names: Tuple[str, ...]) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in sorted(items):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-2]}")
+            lines.append(f"{self.name}_count{{{base}}} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self, label_names: Tuple[str, ...]) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(label_names, labels))
+            lines.append(f"{self.name}{{{base}}} {value}")
+        return lines
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+ROUTE_LABELS = ("method", "route")
+request_duration = Histogram("http_request_duration_seconds", "Request wall time", LATENCY_BUCKETS)
+request_db_commands = Histogram("http_request_db_commands", "MongoDB commands per request", COUNT_BUCKETS)
+request_db_seconds = Histogram("http_request_db_seconds", "Time spent in MongoDB per request", LATENCY_BUCKETS)
+request_db_bytes = Histogram("http_request_db_bytes", "Bytes returned by MongoDB per request", BYTES_BUCKETS)
+requests_total = Counter("http_requests_total", "Requests by status")
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Attributes each MongoDB command to the request that issued it"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        stats = _current.get()
+        if stats is None:
+            return
+        size = len(bson.encode(event.reply)) if MEASURE_DB_BYTES else 0
+        stats.add(event.duration_micros / 1_000_000, size)
+
+    def failed(self, event):
+        stats = _current.get()
+        if stats is not None:
+            stats.add(event.duration_micros / 1_000_000, 0)
+
+
+command_metrics = CommandMetrics()
+
+
+def route_template(scope) -> str:
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    return "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Records per-route latency and DB usage; adds Server-Timing in debug mode"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    app_ms = (time.perf_counter() - started) * 1000
+                    timing = (f'app;dur={app_ms:.1f}, '
+                              f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.db_commands} cmds {stats.db_bytes} B"')
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            labels = (scope["method"], route_template(scope))
+            request_duration.observe(labels, elapsed)
+            request_db_commands.observe(labels, stats.db_commands)
+            request_db_seconds.observe(labels, stats.db_seconds)
+            request_db_bytes.observe(labels, stats.db_bytes)
+            requests_total.inc(labels + (str(status),))
+
+            if elapsed * 1000 >= SLOW_REQUEST_MS:
+                logger.warning(
+                    f"🐢 Slow request {labels[0]} {labels[1]}: {elapsed * 1000:.0f}ms, "
+                    f"{stats.db_commands} DB commands, {stats.db_seconds * 1000:.0f}ms in DB, {stats.db_bytes} bytes"
+                )
+
+
+# Other modules' exporters (outbound HTTP, caches); each returns exposition text
+_collectors: List[Callable[[], str]] = []
+
+
+def register_collector(render: Callable[[], str]):
+    _collectors.append(render)
+
+
+def render_prometheus(pool: Optional[dict] = None) -> str:
+    """Prometheus text exposition of this worker's metrics"""
+    lines = []
+    lines += request_duration.render(ROUTE_LABELS)
+    lines += request_db_commands.render(ROUTE_LABELS)
+    lines += request_db_seconds.render(ROUTE_LABELS)
+    lines += request_db_bytes.render(ROUTE_LABELS)
+    lines += requests_total.render(ROUTE_LABELS + ("status",))
+
+    if pool:
+        gauges = (("mongo_pool_checked_out", "checked_out"), ("mongo_pool_open_connections", "open_connections"),
+                  ("mongo_pool_saturation", "saturation"), ("mongo_pool_avg_wait_ms", "avg_wait_ms"))
+        for name, key in gauges:
+            lines.append(f"# TYPE {name} gauge")
+            for address, server in sorted(pool.get("servers", {}).items()):
+                lines.append(f'{name}{{server="{address}",pid="{pool["pid"]}"}} {server[key] or 0}')
+    return "\n".join(lines) + "\n" + "".join(render() for render in _collectors)
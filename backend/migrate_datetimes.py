@@ -0,0 +1,126 @@
+"""
+Online migration: convert ISO-string timestamps to native BSON dates.
+
+Walks each collection in _id order, rewriting documents in small batches so
+the primary is never held by one long write. Safe to stop and re-run: only
+fields still stored as strings are selected.
+
+Usage:
+    python migrate_datetimes.py [--batch-size 500] [--pause 0.05] [--dry-run]
+                                [--collection events ...]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+load_dotenv(Path(__file__).parent / '.env')
+
+from database import client, db, DATETIME_FIELDS, parse_datetime
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("migrate_datetimes")
+
+
+def _get_path(doc: dict, path: str):
+    for part in path.split("."):
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(part)
+    return doc
+
+
+def build_updates(doc: dict, fields: list) -> dict:
+    """Return the $set payload converting string timestamps in doc"""
+    updates = {}
+    for field in fields:
+        value = _get_path(doc, field)
+        if not isinstance(value, str):
+            continue
+        try:
+            updates[field] = parse_datetime(value)
+        except ValueError:
+            logger.warning(f"Skipping unparseable {field}={value!r} on _id={doc['_id']}")
+    return updates
+
+
+async def migrate_collection(name: str, fields: list, batch_size: int, pause: float, dry_run: bool) -> dict:
+    collection = db[name]
+    query = {"$or": [{field: {"$type": "string"}} for field in fields]}
+    projection = {field: 1 for field in fields}
+
+    total = await collection.count_documents(query)
+    if not total:
+        logger.info(f"✅ {name}: nothing to migrate")
+        return {"collection": name, "matched": 0, "modified": 0}
+
+    logger.info(f"🔄 {name}: {total} documents with string timestamps")
+    last_id = None
+    scanned = 0
+    modified = 0
+    started = time.monotonic()
+
+    while True:
+        batch_query = dict(query)
+        if last_id is not None:
+            batch_query["_id"] = {"$gt": last_id}
+        batch = await collection.find(batch_query, projection).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+
+        last_id = batch[-1]["_id"]
+        scanned += len(batch)
+        operations = []
+        for doc in batch:
+            updates = build_updates(doc, fields)
+            if updates:
+                operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": updates}))
+
+        if operations and not dry_run:
+            result = await collection.bulk_write(operations, ordered=False)
+            modified += result.modified_count
+        elif dry_run:
+            modified += len(operations)
+
+        elapsed = time.monotonic() - started
+        rate = scanned / elapsed if elapsed else 0
+        logger.info(f"   {name}: {scanned}/{total} ({scanned * 100 // total}%) - {rate:.0f} docs/s")
+
+        if pause:
+            await asyncio.sleep(pause)
+
+    logger.info(f"✅ {name}: {modified} documents {'would be ' if dry_run else ''}updated")
+    return {"collection": name, "matched": total, "modified": modified}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--collection", action="append", help="Limit to these collections")
+    args = parser.parse_args()
+
+    collections = args.collection or list(DATETIME_FIELDS)
+    results = []
+    for name in collections:
+        if name not in DATETIME_FIELDS:
+            logger.error(f"Unknown collection: {name}")
+            continue
+        results.append(await migrate_collection(name, DATETIME_FIELDS[name], args.batch_size, args.pause, args.dry_run))
+
+    print("\n" + "=" * 50)
+    print("📅 DATETIME MIGRATION COMPLETE" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 50)
+    for r in results:
+        print(f"   {r['collection']}: {r['modified']}/{r['matched']}")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,200 @@
+"""
+EuroMatchTickets Models
+Pydantic models shared by the API routers and seed scripts
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# ============== MODELS ==============
+
+class User(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    user_id: str
+    email: str
+    name: str
+    picture: Optional[str] = None
+    role: str = "buyer"  # buyer, seller, admin
+    rating: float = 5.0
+    total_sales: int = 0
+    kyc_status: str = "pending"  # pending, submitted, verified, rejected
+    kyc_documents: Optional[Dict[str, Any]] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class UserSession(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    session_id: str
+    user_id: str
+    session_token: str
+    expires_at: datetime
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Event(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    event_id: str = Field(default_factory=lambda: f"event_{uuid.uuid4().hex[:12]}")
+    event_type: str  # match, concert
+    title: str
+    subtitle: Optional[str] = None  # e.g., "World Tour 2025" for concerts
+    description: Optional[str] = None  # SEO description 150-300 words
+    # For matches
+    home_team: Optional[str] = None
+    away_team: Optional[str] = None
+    home_logo: Optional[str] = None
+    away_logo: Optional[str] = None
+    league: Optional[str] = None
+    league_logo: Optional[str] = None
+    # For concerts
+    artist: Optional[str] = None
+    artist_image: Optional[str] = None
+    genre: Optional[str] = None
+    # Common fields
+    venue: str
+    city: str
+    country: str
+    event_date: datetime
+    event_image: Optional[str] = None
+    status: str = "upcoming"  # upcoming, live, completed, cancelled
+    featured: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class EventCreate(BaseModel):
+    event_type: str
+    title: str
+    subtitle: Optional[str] = None
+    home_team: Optional[str] = None
+    away_team: Optional[str] = None
+    home_logo: Optional[str] = None
+    away_logo: Optional[str] = None
+    league: Optional[str] = None
+    league_logo: Optional[str] = None
+    artist: Optional[str] = None
+    artist_image: Optional[str] = None
+    genre: Optional[str] = None
+    venue: str
+    city: str
+    country: str
+    event_date: datetime
+    event_image: Optional[str] = None
+    featured: bool = False
+
+class Ticket(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    ticket_id: str = Field(default_factory=lambda: f"ticket_{uuid.uuid4().hex[:12]}")
+    event_id: str
+    seller_id: str
+    seller_name: str
+    category: str  # vip, cat1, cat2, cat3, standing, floor
+    section: str
+    row: Optional[str] = None
+    seat: Optional[str] = None
+    price: float
+    original_price: float
+    currency: str = "EUR"
+    status: str = "available"  # available, reserved, sold
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class TicketCreate(BaseModel):
+    event_id: str
+    category: str
+    section: str
+    row: Optional[str] = None
+    seat: Optional[str] = None
+    price: float
+    original_price: float
+    currency: str = "EUR"
+
+class Order(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    order_id: str = Field(default_factory=lambda: f"order_{uuid.uuid4().hex[:12]}")
+    buyer_id: str
+    buyer_email: str
+    ticket_id: str
+    event_id: str
+    seller_id: str
+    ticket_price: float
+    commission: float
+    total_amount: float
+    currency: str = "EUR"
+    status: str = "pending"  # pending, paid, completed, cancelled, refunded, disputed
+    stripe_session_id: Optional[str] = None
+    qr_code: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Rating(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    rating_id: str = Field(default_factory=lambda: f"rating_{uuid.uuid4().hex[:12]}")
+    order_id: str
+    seller_id: str
+    buyer_id: str
+    rating: int  # 1-5
+    comment: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class RatingCreate(BaseModel):
+    order_id: str
+    rating: int = Field(ge=1, le=5)
+    comment: Optional[str] = None
+
+class PaymentTransaction(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    transaction_id: str = Field(default_factory=lambda: f"txn_{uuid.uuid4().hex[:12]}")
+    order_id: str
+    session_id: str
+    amount: float
+    currency: str
+    status: str = "initiated"  # initiated, paid, failed, expired
+    metadata: Dict[str, Any] = {}
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class Dispute(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    dispute_id: str = Field(default_factory=lambda: f"dispute_{uuid.uuid4().hex[:12]}")
+    order_id: str
+    buyer_id: str
+    seller_id: str
+    reason: str
+    description: str
+    status: str = "open"  # open, investigating, resolved, closed
+    resolution: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class KYCSubmission(BaseModel):
+    full_name: str
+    date_of_birth: str
+    address: str
+    country: str
+    id_type: str  # passport, national_id, drivers_license
+    id_number: str
+
+class PriceAlert(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    alert_id: str = Field(default_factory=lambda: f"alert_{uuid.uuid4().hex[:12]}")
+    user_id: str
+    user_email: str
+    event_id: str
+    target_price: float
+    current_lowest: Optional[float] = None
+    status: str = "active"  # active, triggered, cancelled
+    language: str = "en"
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class PriceAlertCreate(BaseModel):
+    event_id: str
+    target_price: float
+
+class SellerPayout(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    payout_id: str = Field(default_factory=lambda: f"payout_{uuid.uuid4().hex[:12]}")
+    seller_id: str
+    order_id: str
+    ticket_id: str
+    gross_amount: float  # Total ticket price
+    commission: float  # Platform fee
+    net_amount: float  # What seller receives
+    currency: str = "EUR"
+    status: str = "pending"  # pending, processing, completed, failed
+    payout_date: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
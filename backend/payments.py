@@ -0,0 +1,36 @@
+"""
+EuroMatchTickets Payments
+Stripe configuration shared by checkout and the raffle. The SDK is imported
+on first use (see lazy.py) and called through its async HTTPX transport, one
+keep-alive pool per worker, behind the "stripe" circuit breaker.
+"""
+
+import os
+
+from http_clients import outbound, DEPENDENCIES
+from lazy import LazyModule
+
+STRIPE_API_KEY = os.environ.get('STRIPE_API_KEY', 'sk_test_emergent')
+PLATFORM_COMMISSION = 0.10  # 10% commission
+
+
+def _configure_stripe(module):
+    module.api_key = STRIPE_API_KEY
+    # Point at stripe-mock (e.g. http://localhost:12111) for local load tests
+    if os.environ.get('STRIPE_API_BASE'):
+        module.api_base = os.environ['STRIPE_API_BASE']
+    module.max_network_retries = 1
+    http_client = module.HTTPXClient(timeout=DEPENDENCIES["stripe"].timeout)
+    module.default_http_client = http_client
+    outbound.on_close(http_client.close_async)
+
+
+stripe = LazyModule("stripe", configure=_configure_stripe)
+STRIPE_AVAILABLE = True
+
+
+async def call_stripe(method, **params):
+    """Await an async Stripe SDK method (e.g. stripe.checkout.Session.create_async)"""
+    failures = (stripe.error.APIConnectionError, stripe.error.APIError)
+    async with outbound.guard("stripe", failures=failures):
+        return await method(**params)
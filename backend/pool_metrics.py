@@ -0,0 +1,148 @@
+"""
+EuroMatchTickets Connection Pool Metrics
+PyMongo CMAP listener tracking pool usage for this worker process:
+checked-out connections, checkout wait time, connection creation rate and
+checkout failures (e.g. wait-queue timeouts during on-sale bursts).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from pymongo import monitoring
+
+# Window used for the connection creation rate
+CREATION_RATE_WINDOW = 60.0
+
+
+class _ServerPoolStats:
+    def __init__(self):
+        self.checked_out = 0
+        self.max_checked_out = 0
+        self.open = 0
+        self.created_total = 0
+        self.closed_total = 0
+        self.checkouts_total = 0
+        self.checkout_failures = {}
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.pool_clears = 0
+        self.recent_creations = deque()
+
+    def creation_rate(self, now: float) -> float:
+        while self.recent_creations and self.recent_creations[0] < now - CREATION_RATE_WINDOW:
+            self.recent_creations.popleft()
+        return len(self.recent_creations) / CREATION_RATE_WINDOW
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Aggregates CMAP events per server address.
+
+    Checkout wait time is measured from ConnectionCheckOutStarted to
+    ConnectionCheckedOut/CheckOutFailed; both fire on the thread doing the
+    checkout, so the start time is kept in thread-local storage.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._servers = {}
+        self._local = threading.local()
+
+    def _stats(self, address) -> _ServerPoolStats:
+        key = f"{address[0]}:{address[1]}"
+        stats = self._servers.get(key)
+        if stats is None:
+            stats = self._servers[key] = _ServerPoolStats()
+        return stats
+
+    def _waited(self) -> float:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return time.monotonic() - started if started is not None else 0.0
+
+    def pool_created(self, event):
+        with self._lock:
+            self._stats(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._stats(event.address).pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.open += 1
+            stats.created_total += 1
+            stats.recent_creations.append(time.monotonic())
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.open = max(stats.open - 1, 0)
+            stats.closed_total += 1
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.monotonic()
+
+    def connection_check_out_failed(self, event):
+        waited = self._waited()
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.checkout_failures[event.reason] = stats.checkout_failures.get(event.reason, 0) + 1
+            stats.wait_seconds_total += waited
+            stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.checked_out += 1
+            stats.max_checked_out = max(stats.max_checked_out, stats.checked_out)
+            stats.checkouts_total += 1
+            stats.wait_seconds_total += waited
+            stats.wait_seconds_max = max(stats.wait_seconds_max, waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            stats = self._stats(event.address)
+            stats.checked_out = max(stats.checked_out - 1, 0)
+
+    def snapshot(self, max_pool_size: int) -> dict:
+        """Point-in-time pool usage for this worker"""
+        now = time.monotonic()
+        servers = {}
+        with self._lock:
+            for address, stats in self._servers.items():
+                servers[address] = {
+                    "checked_out": stats.checked_out,
+                    "max_checked_out": stats.max_checked_out,
+                    "open_connections": stats.open,
+                    "saturation": round(stats.checked_out / max_pool_size, 3) if max_pool_size else None,
+                    "connections_created": stats.created_total,
+                    "connections_closed": stats.closed_total,
+                    "creation_rate_per_sec": round(stats.creation_rate(now), 3),
+                    "checkouts": stats.checkouts_total,
+                    "checkout_failures": dict(stats.checkout_failures),
+                    "avg_wait_ms": round(stats.wait_seconds_total * 1000 / stats.checkouts_total, 3) if stats.checkouts_total else 0.0,
+                    "max_wait_ms": round(stats.wait_seconds_max * 1000, 3),
+                    "pool_clears": stats.pool_clears,
+                }
+        saturation = max((s["saturation"] or 0 for s in servers.values()), default=0)
+        return {
+            "pid": os.getpid(),
+            "max_pool_size": max_pool_size,
+            "saturation": saturation,
+            "servers": servers,
+        }
+
+
+pool_metrics = PoolMetrics()
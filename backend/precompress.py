@@ -0,0 +1,73 @@
+"""
+Write .br and .gz variants of compressible static files at maximum ratio,
+for StaticAssets to serve without compressing per request.
+
+Files that are already compressed (video, images, archives) or that don't
+shrink by at least --min-saving are skipped, as are variants newer than
+their source. Run after changing files in static/ (or as a build step):
+
+Usage:
+    python precompress.py [--dir static] [--min-size 1024] [--min-saving 0.1] [--force]
+"""
+
+import argparse
+import logging
+import os
+from mimetypes import guess_type
+from pathlib import Path
+
+from compression import SKIP_TYPES, brotli, compress
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("precompress")
+
+SUFFIXES = {"br": ".br", "gzip": ".gz"}
+MAX_LEVEL = {"br": 11, "gzip": 9}
+
+
+def precompress(directory: Path, min_size: int = 1024, min_saving: float = 0.1, force: bool = False) -> dict:
+    """Returns {"written": n, "skipped": n, "saved_bytes": n}"""
+    encodings = [e for e in SUFFIXES if e != "br" or brotli is not None]
+    if brotli is None:
+        logger.warning("brotli not installed; writing .gz variants only")
+    totals = {"written": 0, "skipped": 0, "saved_bytes": 0}
+    for path in sorted(p for p in directory.rglob("*") if p.is_file() and p.suffix not in (".br", ".gz")):
+        media_type = guess_type(str(path))[0] or "application/octet-stream"
+        size = path.stat().st_size
+        if size < min_size or media_type.startswith(SKIP_TYPES):
+            totals["skipped"] += 1
+            continue
+        body = None
+        for encoding in encodings:
+            target = path.with_name(path.name + SUFFIXES[encoding])
+            if not force and target.exists() and target.stat().st_mtime >= path.stat().st_mtime:
+                continue
+            body = body if body is not None else path.read_bytes()
+            data = compress(body, encoding, MAX_LEVEL[encoding])
+            if len(data) > size * (1 - min_saving):
+                target.unlink(missing_ok=True)
+                totals["skipped"] += 1
+                continue
+            temp = target.with_name(target.name + ".tmp")
+            temp.write_bytes(data)
+            os.replace(temp, target)
+            totals["written"] += 1
+            totals["saved_bytes"] += size - len(data)
+            logger.info(f"🗜️ {target.relative_to(directory)}: {size} -> {len(data)} bytes")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=Path(__file__).parent / "static")
+    parser.add_argument("--min-size", type=int, default=1024)
+    parser.add_argument("--min-saving", type=float, default=0.1, help="Skip variants saving less than this fraction")
+    parser.add_argument("--force", action="store_true", help="Rewrite variants even if up to date")
+    args = parser.parse_args()
+    totals = precompress(args.dir, args.min_size, args.min_saving, args.force)
+    logger.info(f"✅ {totals['written']} variant(s) written, {totals['skipped']} skipped, "
+                f"{totals['saved_bytes']} bytes saved")
+
+
+if __name__ == "__main__":
+    main()
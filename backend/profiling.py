@@ -0,0 +1,194 @@
+"""
+EuroMatchTickets On-Demand Profiling
+A low-overhead sampling profiler for live workers. Nothing runs until an admin
+asks for a profile: a daemon thread then samples the event loop thread's
+stack every few milliseconds and aggregates collapsed stacks
+("frame;frame;frame count"), which flamegraph.pl, speedscope or the built-in
+SVG renderer turn into a flamegraph.
+
+Because every coroutine shares the event loop thread, a per-request profile
+shows everything the worker did while that request was in flight - use it on
+a quiet or canary worker for clean results.
+"""
+
+import html
+import itertools
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Awaitable, Callable, Optional
+
+DEFAULT_INTERVAL = float(os.environ.get('PROFILE_INTERVAL_MS', '5')) / 1000
+MAX_SECONDS = float(os.environ.get('PROFILE_MAX_SECONDS', '60'))
+KEEP_PROFILES = 20
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is already being captured on this worker"""
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack at a fixed interval"""
+
+    _active_lock = threading.Lock()
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if not SamplingProfiler._active_lock.acquire(blocking=False):
+            raise ProfilerBusy("A profile is already running on this worker")
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.duration = time.time() - self.started_at
+            SamplingProfiler._active_lock.release()
+        return self
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or self.thread_id == own_id:
+                continue
+            self.stacks[_collapse(frame)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed stack format, one "stack count" line per unique stack"""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+def _collapse(frame) -> str:
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+def render_flamegraph(stacks: Counter, title: str = "Flamegraph", width: int = 1200) -> str:
+    """Minimal SVG flamegraph (root at the bottom) for collapsed stacks"""
+    tree = {"children": {}, "count": 0}
+    for stack, count in stacks.items():
+        node = tree
+        node["count"] += count
+        for frame in stack.split(";"):
+            node = node["children"].setdefault(frame, {"children": {}, "count": 0})
+            node["count"] += count
+
+    total = tree["count"] or 1
+    row_height = 16
+
+    def depth(node):
+        return 1 + max((depth(c) for c in node["children"].values()), default=0)
+
+    height = (depth(tree) + 1) * row_height + 30
+    rects = []
+
+    def layout(node, name, x, level):
+        w = node["count"] / total * width
+        if w < 0.5:
+            return
+        y = height - (level + 1) * row_height
+        hue = 20 + (hash(name) % 40)
+        label = html.escape(name)
+        text = label if w > 60 else ""
+        rects.append(
+            f'<g><title>{label} ({node["count"]} samples, {node["count"] * 100 / total:.1f}%)</title>'
+            f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row_height - 1}" fill="hsl({hue},90%,60%)"/>'
+            f'<text x="{x + 3:.1f}" y="{y + 12}" font-size="11">{text[:int(w / 7)]}</text></g>'
+        )
+        child_x = x
+        for child_name, child in sorted(node["children"].items()):
+            layout(child, child_name, child_x, level + 1)
+            child_x += child["count"] / total * width
+
+    layout(tree, "all", 0.0, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace">'
+        f'<text x="10" y="18" font-size="14">{html.escape(title)}</text>{"".join(rects)}</svg>'
+    )
+
+
+# Recent per-request profiles, retrievable by id
+_profiles: "OrderedDict[str, SamplingProfiler]" = OrderedDict()
+
+
+def store_profile(profiler: SamplingProfiler) -> str:
+    profile_id = uuid.uuid4().hex[:12]
+    _profiles[profile_id] = profiler
+    while len(_profiles) > KEEP_PROFILES:
+        _profiles.popitem(last=False)
+    return profile_id
+
+
+def get_profile(profile_id: str) -> Optional[SamplingProfiler]:
+    return _profiles.get(profile_id)
+
+
+def list_profiles() -> list:
+    return [
+        {"profile_id": pid, "samples": p.samples, "duration": round(p.duration, 3), "started_at": p.started_at}
+        for pid, p in itertools.islice(reversed(_profiles.items()), KEEP_PROFILES)
+    ]
+
+
+class ProfileRequestMiddleware:
+    """Profiles a single request when it carries an X-Profile header.
+
+    The only cost for normal requests is a scan of the header list. The
+    authorize callable receives the ASGI scope and must return True for admins.
+    """
+
+    def __init__(self, app, authorize: Callable[[dict], Awaitable[bool]]):
+        self.app = app
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not any(name == PROFILE_HEADER for name, _ in scope.get("headers", [])):
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.authorize(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profiler = SamplingProfiler(threading.get_ident())
+        try:
+            profiler.start()
+        except ProfilerBusy:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = store_profile(profiler)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
@@ -0,0 +1,143 @@
+"""
+EuroMatchTickets Raffle Draw
+Seeded, verifiable winner selection over completed raffle entries.
+
+Commit-reveal: committing a draw stores sha256(seed) and publishes it before
+the draw; the seed itself is only revealed with the result, so it can't be
+chosen after seeing the entries. Entries completed after the commit are not
+in the draw.
+
+Selection is weighted reservoir sampling (Efraimidis-Spirakis A-Res): every
+entry gets key u ** (1 / entries), with u derived from HMAC-SHA256(seed,
+entry_id), and the entries with the largest keys win, one place per
+participant (a hashed user id). Entries are streamed once in entry_id order:
+O(n) time, O(places) memory, and the state checkpoints so a draw over
+millions of entries can resume.
+
+The published verification hash covers the seed, a hash chain over every
+(entry_id, participant, entries) row in stream order, and the winners;
+verify() recomputes all of it from the public entry list.
+"""
+
+import hashlib
+import heapq
+import hmac
+import json
+import math
+import secrets
+from typing import Iterable, List, Optional, Tuple
+
+ALGORITHM = "A-Res/HMAC-SHA256/v1"
+EMPTY_DIGEST = hashlib.sha256(b"raffle-entries").hexdigest()
+
+
+def new_seed() -> str:
+    return secrets.token_hex(32)
+
+
+def commitment(seed: str) -> str:
+    return hashlib.sha256(seed.encode()).hexdigest()
+
+
+def entry_key(seed: str, entry_id: str, weight: int) -> float:
+    """log(u) / weight for a uniform u in (0, 1) fixed by the seed; larger keys win"""
+    digest = hmac.new(seed.encode(), entry_id.encode(), hashlib.sha256).digest()
+    u = (int.from_bytes(digest[:8], "big") + 0.5) / 2 ** 64
+    return math.log(u) / weight
+
+
+def participant(user_id: str) -> str:
+    """Public pseudonym for a user: lets auditors apply one-win-per-user without seeing user ids"""
+    return hashlib.sha256(f"raffle-participant|{user_id}".encode()).hexdigest()[:16]
+
+
+def chain(digest: str, entry_id: str, participant_id: str, weight: int) -> str:
+    """Hash chain over the entry list: any added, removed, reordered or changed entry changes it"""
+    return hashlib.sha256(f"{digest}|{entry_id}|{participant_id}|{weight}".encode()).hexdigest()
+
+
+class Draw:
+    """Streaming state of one draw; to_state()/from_state() round-trip it for checkpoints"""
+
+    def __init__(self, seed: str, places: int):
+        self.seed = seed
+        self.places = places
+        self.digest = EMPTY_DIGEST
+        self.count = 0
+        self.total_weight = 0
+        # Min-heap of the best key per participant currently in the top `places`
+        self._heap: List[Tuple[float, str, str, int]] = []
+        self._participants = {}
+
+    def add(self, entry_id: str, participant_id: str, weight: int):
+        weight = int(weight)
+        self.digest = chain(self.digest, entry_id, participant_id, weight)
+        self.count += 1
+        if weight <= 0:
+            return
+        self.total_weight += weight
+        key = entry_key(self.seed, entry_id, weight)
+
+        current = self._participants.get(participant_id)
+        if current is not None:
+            # A user's chance across several entries is that of their combined weight
+            if key > current[0]:
+                self._heap.remove(current)
+                heapq.heapify(self._heap)
+                self._push((key, entry_id, participant_id, weight))
+            return
+        if len(self._heap) < self.places:
+            self._push((key, entry_id, participant_id, weight))
+        elif key > self._heap[0][0]:
+            dropped = heapq.heappop(self._heap)
+            del self._participants[dropped[2]]
+            self._push((key, entry_id, participant_id, weight))
+
+    def _push(self, item):
+        heapq.heappush(self._heap, item)
+        self._participants[item[2]] = item
+
+    def winners(self) -> List[dict]:
+        ranked = sorted(self._heap, key=lambda item: (-item[0], item[1]))
+        return [{"rank": i + 1, "entry_id": entry_id, "participant": participant_id, "entries": weight}
+                for i, (key, entry_id, participant_id, weight) in enumerate(ranked)]
+
+    def verification_hash(self, raffle_type: str) -> str:
+        payload = {
+            "algorithm": ALGORITHM,
+            "raffle_type": raffle_type,
+            "seed": self.seed,
+            "entries_digest": self.digest,
+            "entry_count": self.count,
+            "total_weight": self.total_weight,
+            "winners": [w["entry_id"] for w in self.winners()],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def to_state(self) -> dict:
+        return {"digest": self.digest, "count": self.count, "total_weight": self.total_weight,
+                "heap": [list(item) for item in self._heap]}
+
+    @classmethod
+    def from_state(cls, seed: str, places: int, state: Optional[dict]) -> "Draw":
+        draw = cls(seed, places)
+        if state:
+            draw.digest = state["digest"]
+            draw.count = state["count"]
+            draw.total_weight = state["total_weight"]
+            for item in state["heap"]:
+                draw._push(tuple(item))
+        return draw
+
+
+def verify(raffle_type: str, seed: str, places: int, entries: Iterable[Tuple[str, str, int]]) -> dict:
+    """Recompute a draw from the published (entry_id, participant, entries) rows, in entry_id order"""
+    draw = Draw(seed, places)
+    for entry_id, participant_id, weight in entries:
+        draw.add(entry_id, participant_id, weight)
+    return {
+        "entries_digest": draw.digest,
+        "entry_count": draw.count,
+        "winners": draw.winners(),
+        "verification_hash": draw.verification_hash(raffle_type),
+    }
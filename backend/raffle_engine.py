@@ -0,0 +1,351 @@
+"""
+EuroMatchTickets Raffle Engine
+Hard capacity for raffle entries under contention. Each raffle has counter
+documents in db.raffle_counters (optionally split into shards, each holding
+a slice of the capacity):
+
+    {_id: "world_cup_2026:0", capacity, used, reserved, completed}
+
+A checkout reserves its slots with one conditional $inc (used + n <= capacity)
+before the Stripe session is created; the slots are either completed by the
+checkout.session.completed webhook or released when the session expires
+(webhook, or the sweeper for sessions whose webhook never arrives). Stats are
+read from the counters instead of counting entries.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+RAFFLE_COUNTER_SHARDS = int(os.environ.get('RAFFLE_COUNTER_SHARDS', '1'))
+# Stripe rejects sessions expiring less than 30 minutes after it creates them; the extra
+# minute absorbs request latency and clock skew (expires_at is computed before the call)
+STRIPE_MIN_SESSION_MINUTES = 30
+RAFFLE_RESERVATION_MINUTES = max(int(os.environ.get('RAFFLE_RESERVATION_MINUTES', '31')),
+                                 STRIPE_MIN_SESSION_MINUTES + 1)
+# Slots are released this long after the session expires, so a late webhook still finds them held
+RAFFLE_RELEASE_GRACE = timedelta(minutes=5)
+RAFFLE_STATS_TTL = float(os.environ.get('RAFFLE_STATS_TTL', '2'))
+SWEEP_INTERVAL = 60
+
+
+@dataclass
+class Raffle:
+    raffle_type: str
+    capacity: int
+    draw_date: str
+    max_entries_per_checkout: int = 10
+
+
+RAFFLES: Dict[str, Raffle] = {
+    "world_cup_2026": Raffle("world_cup_2026", int(os.environ.get('RAFFLE_MAX_ENTRIES', '500')), "2026-05-01"),
+}
+
+
+class SoldOut(Exception):
+    """No counter shard has room for the requested entries"""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def shard_capacities(capacity: int, shards: int) -> List[int]:
+    """Split capacity across shards; the first shards take the remainder"""
+    base, extra = divmod(capacity, shards)
+    return [base + (1 if i < extra else 0) for i in range(shards)]
+
+
+# ============== STORES ==============
+
+class MongoRaffleStore:
+    """Counters in db.raffle_counters, entries in db.raffle_entries"""
+
+    def __init__(self, database):
+        self.counters = database.raffle_counters
+        self.entries = database.raffle_entries
+
+    async def ensure_indexes(self):
+        await self.entries.create_index("entry_id", unique=True)
+        await self.entries.create_index([("status", 1), ("expires_at", 1)])
+        await self.entries.create_index("user_id")
+
+    async def completed_entries(self, raffle_type: str) -> int:
+        result = await self.entries.aggregate([
+            {"$match": {"raffle_type": raffle_type, "status": "completed"}},
+            {"$group": {"_id": None, "entries": {"$sum": "$entries"}}}
+        ]).to_list(1)
+        return result[0]["entries"] if result else 0
+
+    async def init_counter(self, counter_id: str, raffle_type: str, capacity: int, completed: int):
+        from pymongo.errors import DuplicateKeyError
+        try:
+            await self.counters.update_one(
+                {"_id": counter_id},
+                {"$set": {"raffle_type": raffle_type, "capacity": capacity},
+                 "$setOnInsert": {"used": completed, "reserved": 0, "completed": completed}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            pass  # another worker created it first
+
+    async def reserve(self, counter_id: str, n: int) -> bool:
+        result = await self.counters.update_one(
+            {"_id": counter_id, "$expr": {"$lte": [{"$add": ["$used", n]}, "$capacity"]}},
+            {"$inc": {"used": n, "reserved": n}}
+        )
+        return result.modified_count == 1
+
+    async def adjust(self, counter_id: str, used: int = 0, reserved: int = 0, completed: int = 0):
+        await self.counters.update_one(
+            {"_id": counter_id}, {"$inc": {"used": used, "reserved": reserved, "completed": completed}}
+        )
+
+    async def counters_for(self, raffle_type: str) -> List[dict]:
+        return await self.counters.find({"raffle_type": raffle_type}).to_list(None)
+
+    async def insert_entry(self, entry: dict):
+        await self.entries.insert_one(dict(entry))
+
+    async def transition(self, entry_id: str, from_status: str, to_status: str, fields: Optional[dict] = None) -> Optional[dict]:
+        """Move an entry between statuses; None if it wasn't in from_status"""
+        return await self.entries.find_one_and_update(
+            {"entry_id": entry_id, "status": from_status},
+            {"$set": {"status": to_status, **(fields or {})}},
+            projection={"_id": 0}
+        )
+
+    async def update_entry(self, entry_id: str, fields: dict):
+        await self.entries.update_one({"entry_id": entry_id}, {"$set": fields})
+
+    async def overdue(self, before: datetime, limit: int = 100) -> List[str]:
+        docs = await self.entries.find(
+            {"status": "pending", "expires_at": {"$lt": before}}, {"_id": 0, "entry_id": 1}
+        ).to_list(limit)
+        return [doc["entry_id"] for doc in docs]
+
+
+class MemoryRaffleStore:
+    """In-process stand-in with the same atomicity as the Mongo store: every
+    conditional update happens without yielding to the event loop."""
+
+    def __init__(self):
+        self.counters: Dict[str, dict] = {}
+        self.entries: Dict[str, dict] = {}
+
+    async def ensure_indexes(self):
+        pass
+
+    async def completed_entries(self, raffle_type: str) -> int:
+        return sum(e["entries"] for e in self.entries.values()
+                   if e["raffle_type"] == raffle_type and e["status"] == "completed")
+
+    async def init_counter(self, counter_id: str, raffle_type: str, capacity: int, completed: int):
+        counter = self.counters.setdefault(counter_id, {"_id": counter_id, "used": completed, "reserved": 0,
+                                                        "completed": completed})
+        counter.update(raffle_type=raffle_type, capacity=capacity)
+
+    async def reserve(self, counter_id: str, n: int) -> bool:
+        await asyncio.sleep(0)
+        counter = self.counters[counter_id]
+        if counter["used"] + n > counter["capacity"]:
+            return False
+        counter["used"] += n
+        counter["reserved"] += n
+        return True
+
+    async def adjust(self, counter_id: str, used: int = 0, reserved: int = 0, completed: int = 0):
+        await asyncio.sleep(0)
+        counter = self.counters[counter_id]
+        counter["used"] += used
+        counter["reserved"] += reserved
+        counter["completed"] += completed
+
+    async def counters_for(self, raffle_type: str) -> List[dict]:
+        return [dict(c) for c in self.counters.values() if c["raffle_type"] == raffle_type]
+
+    async def insert_entry(self, entry: dict):
+        self.entries[entry["entry_id"]] = dict(entry)
+
+    async def transition(self, entry_id: str, from_status: str, to_status: str, fields: Optional[dict] = None) -> Optional[dict]:
+        await asyncio.sleep(0)
+        entry = self.entries.get(entry_id)
+        if not entry or entry["status"] != from_status:
+            return None
+        before = dict(entry)
+        entry.update(status=to_status, **(fields or {}))
+        return before
+
+    async def update_entry(self, entry_id: str, fields: dict):
+        self.entries[entry_id].update(fields)
+
+    async def overdue(self, before: datetime, limit: int = 100) -> List[str]:
+        return [e["entry_id"] for e in self.entries.values()
+                if e["status"] == "pending" and e["expires_at"] < before][:limit]
+
+
+# ============== ENGINE ==============
+
+class RaffleEngine:
+    def __init__(self, store, raffles: Dict[str, Raffle] = RAFFLES, shards: int = RAFFLE_COUNTER_SHARDS):
+        self.store = store
+        self.raffles = raffles
+        self.shards = max(shards, 1)
+        self._stats: Dict[str, tuple] = {}
+        self._sweeper: Optional[asyncio.Task] = None
+        self._ready = False
+        self._setup_lock = asyncio.Lock()
+
+    def raffle(self, raffle_type: str) -> Raffle:
+        raffle = self.raffles.get(raffle_type)
+        if raffle is None:
+            raise ValueError(f"Unknown raffle: {raffle_type}")
+        return raffle
+
+    def _counter_id(self, raffle_type: str, shard: int) -> str:
+        return f"{raffle_type}:{shard}"
+
+    async def setup(self):
+        """Create counter shards once per worker; entries completed before counters existed are carried over"""
+        async with self._setup_lock:
+            if self._ready:
+                return
+            for raffle in self.raffles.values():
+                completed = await self.store.completed_entries(raffle.raffle_type)
+                for shard, capacity in enumerate(shard_capacities(raffle.capacity, self.shards)):
+                    await self.store.init_counter(self._counter_id(raffle.raffle_type, shard), raffle.raffle_type,
+                                                  capacity, completed if shard == 0 else 0)
+            self._ready = True
+
+    async def reserve(self, raffle_type: str, entries: int) -> int:
+        """Hold entry slots on some shard; returns the shard. Raises SoldOut."""
+        self.raffle(raffle_type)
+        if not self._ready:
+            await self.setup()
+        start = random.randrange(self.shards)
+        for i in range(self.shards):
+            shard = (start + i) % self.shards
+            if await self.store.reserve(self._counter_id(raffle_type, shard), entries):
+                return shard
+        raise SoldOut(f"{raffle_type} has no room for {entries} more entr{'y' if entries == 1 else 'ies'}")
+
+    async def release(self, raffle_type: str, shard: int, entries: int):
+        await self.store.adjust(self._counter_id(raffle_type, shard), used=-entries, reserved=-entries)
+
+    async def open_entry(self, raffle_type: str, entries: int, user, price: float) -> dict:
+        """Reserve slots and record a pending entry that holds them until it expires"""
+        shard = await self.reserve(raffle_type, entries)
+        now = _now()
+        entry = {
+            "entry_id": str(uuid.uuid4())[:12],
+            "user_id": user.user_id,
+            "user_email": user.email,
+            "user_name": user.name if user.name else '',
+            "raffle_type": raffle_type,
+            "price": price,
+            "entries": entries,
+            "counter_shard": shard,
+            "stripe_session_id": None,
+            "status": "pending",
+            "created_at": now,
+            "expires_at": now + timedelta(minutes=RAFFLE_RESERVATION_MINUTES) + RAFFLE_RELEASE_GRACE,
+        }
+        try:
+            await self.store.insert_entry(entry)
+        except BaseException:
+            await self.release(raffle_type, shard, entries)
+            raise
+        return entry
+
+    async def attach_session(self, entry_id: str, session_id: str):
+        await self.store.update_entry(entry_id, {"stripe_session_id": session_id})
+
+    async def complete(self, entry_id: str) -> Optional[dict]:
+        """Payment received: the held slots become completed entries (idempotent)"""
+        entry = await self.store.transition(entry_id, "pending", "completed", {"completed_at": _now()})
+        if entry and entry.get("counter_shard") is not None:
+            await self.store.adjust(self._counter_id(entry["raffle_type"], entry["counter_shard"]),
+                                    reserved=-entry["entries"], completed=entry["entries"])
+        else:
+            # Paid after its slots were released, or opened before counters existed:
+            # honour it even if that overfills the raffle
+            entry = entry or await self.store.transition(entry_id, "expired", "completed",
+                                                         {"completed_at": _now(), "late": True})
+            if entry:
+                logger.warning(f"Raffle entry {entry_id} paid without a held reservation")
+                await self.store.adjust(self._counter_id(entry["raffle_type"], entry.get("counter_shard") or 0),
+                                        used=entry["entries"], completed=entry["entries"])
+        if entry:
+            self._stats.pop(entry["raffle_type"], None)
+        return entry
+
+    async def expire(self, entry_id: str) -> Optional[dict]:
+        """Checkout abandoned or failed: give the slots back (idempotent)"""
+        entry = await self.store.transition(entry_id, "pending", "expired", {"expired_at": _now()})
+        if entry:
+            # Entries opened before counters existed hold no reservation to give back
+            if entry.get("counter_shard") is not None:
+                await self.release(entry["raffle_type"], entry["counter_shard"], entry["entries"])
+            self._stats.pop(entry["raffle_type"], None)
+        return entry
+
+    async def sweep(self, now: Optional[datetime] = None) -> int:
+        """Release pending entries whose checkout expired without a webhook"""
+        released = 0
+        for entry_id in await self.store.overdue(now or _now()):
+            if await self.expire(entry_id):
+                released += 1
+        if released:
+            logger.info(f"🎟️ Released {released} expired raffle reservation(s)")
+        return released
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.warning(f"Raffle sweep failed: {e}")
+
+    def start_sweeper(self):
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever(), name="raffle-sweeper")
+
+    async def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+    async def stats(self, raffle_type: str) -> dict:
+        """Entry counts from the counter shards, cached for RAFFLE_STATS_TTL seconds"""
+        raffle = self.raffle(raffle_type)
+        if not self._ready:
+            await self.setup()
+        cached = self._stats.get(raffle_type)
+        if cached and time.monotonic() - cached[0] < RAFFLE_STATS_TTL:
+            return cached[1]
+        counters = await self.store.counters_for(raffle_type)
+        used = sum(c["used"] for c in counters)
+        stats = {
+            "total_entries": sum(c["completed"] for c in counters),
+            "reserved_entries": sum(c["reserved"] for c in counters),
+            "max_entries": raffle.capacity,
+            "entries_remaining": max(raffle.capacity - used, 0),
+            "draw_date": raffle.draw_date
+        }
+        self._stats[raffle_type] = (time.monotonic(), stats)
+        return stats
+
+
+raffle_engine = RaffleEngine(MongoRaffleStore(db))
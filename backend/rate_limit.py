@@ -0,0 +1,321 @@
+"""
+EuroMatchTickets Rate Limiting
+Token buckets per client and route for the endpoints that cost money or
+hold inventory: support chat (paid LLM calls), session exchange (outbound
+auth calls), checkout (ticket holds) and the unauthenticated seed endpoints.
+
+Each rule names a method and path (exact, `{param}` segments, or a trailing
+`*` prefix), a rate with a burst, and what the bucket is keyed by: the
+signed-in user, the session token, or the client IP. Requests to routes
+without a rule cost one dict lookup. Over-limit requests get 429 with
+Retry-After before reaching the app.
+
+Rules come from RATE_LIMITS (default DEFAULT_RULES), one per `;`:
+
+    RATE_LIMITS="POST /api/chat/support* 20/min burst=5 by=user; POST /api/auth/session 10/min by=ip"
+
+RATE_LIMIT_BACKEND=memory keeps buckets per worker (limits are per worker);
+mongo shares them through db.rate_limits, one atomic update per limited
+request. If the shared store is unreachable requests are let through.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from metrics import Counter, register_collector
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory').lower()  # memory, mongo, off
+# Proxies in front of the app that append to X-Forwarded-For (Render: 1); 0 trusts only the socket address
+RATE_LIMIT_PROXY_HOPS = int(os.environ.get('RATE_LIMIT_PROXY_HOPS', '1'))
+MEMORY_BUCKETS = int(os.environ.get('RATE_LIMIT_MEMORY_BUCKETS', '100000'))
+SESSION_CACHE_SECONDS = 60.0
+SESSION_CACHE_SIZE = 10000
+
+PERIODS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60, "h": 3600, "hour": 3600}
+KEYS = ("user", "session", "ip")
+
+DEFAULT_RULES = (
+    "POST /api/chat/support* 20/min burst=5 by=user;"
+    "POST /api/auth/session 10/min burst=10 by=ip;"
+    "POST /api/checkout/create 10/min burst=5 by=user;"
+    "POST /api/raffle/checkout 10/min burst=5 by=user;"
+    "POST /api/events/{event_id}/queue 30/min burst=10 by=user;"
+    "POST /api/seed* 5/hour burst=2 by=ip;"
+    "POST /api/add-* 5/hour burst=2 by=ip;"
+    "POST /api/reseed 5/hour burst=2 by=ip;"
+    "POST /api/reset-and-seed 5/hour burst=2 by=ip;"
+    "POST /api/cleanup-categories 5/hour burst=2 by=ip;"
+    "POST /api/fix-tickets-seller 5/hour burst=2 by=ip"
+)
+
+rate_limited = Counter("rate_limited_requests_total", "Requests refused by the rate limiter by rule")
+rate_limit_errors = Counter("rate_limit_backend_errors_total", "Shared rate limit store failures (requests let through)")
+register_collector(lambda: "\n".join(rate_limited.render(("rule",)) + rate_limit_errors.render(())) + "\n")
+
+
+@dataclass(frozen=True)
+class Rule:
+    method: str
+    path: str
+    rate: float   # tokens per second
+    burst: int
+    key: str = "ip"
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+def parse_rules(spec: str) -> List[Rule]:
+    """Rules from "METHOD PATH N/period [burst=N] [by=user|session|ip]; ..." """
+    rules = []
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        fields = part.split()
+        if len(fields) < 3:
+            raise ValueError(f"Bad rate limit rule: {part!r}")
+        method, path, limit = fields[:3]
+        count, _, period = limit.partition("/")
+        if period not in PERIODS:
+            raise ValueError(f"Bad rate limit period in {part!r}")
+        options = dict(f.split("=", 1) for f in fields[3:])
+        key = options.get("by", "ip")
+        if key not in KEYS:
+            raise ValueError(f"Bad rate limit key in {part!r}: by={key}")
+        rules.append(Rule(method.upper(), path, float(count) / PERIODS[period],
+                          int(options.get("burst", count)), key))
+    return rules
+
+
+class RuleTable:
+    """Finds the rule for a request: exact paths by dict lookup, then patterns in order"""
+
+    def __init__(self, rules: List[Rule]):
+        self.exact: Dict[Tuple[str, str], Rule] = {}
+        self.patterns: List[Tuple[str, re.Pattern, Rule]] = []
+        for rule in rules:
+            if "*" not in rule.path and "{" not in rule.path:
+                self.exact.setdefault((rule.method, rule.path), rule)
+                continue
+            pattern = re.escape(rule.path.rstrip("*")).replace(r"\{", "{").replace(r"\}", "}")
+            pattern = re.sub(r"{[^/}]+}", "[^/]+", pattern)
+            self.patterns.append((rule.method, re.compile(pattern + ("" if rule.path.endswith("*") else "$")), rule))
+        self.prefixes = tuple({r.path.split("{")[0].rstrip("*") for _, _, r in self.patterns})
+
+    def match(self, method: str, path: str) -> Optional[Rule]:
+        rule = self.exact.get((method, path))
+        if rule is not None:
+            return rule
+        if self.patterns and path.startswith(self.prefixes):
+            for rule_method, pattern, rule in self.patterns:
+                if rule_method in (method, "*") and pattern.match(path):
+                    return rule
+        return self.exact.get(("*", path))
+
+
+# ============== BUCKETS ==============
+
+class MemoryBuckets:
+    """Buckets in this worker, least recently used dropped beyond `size`"""
+
+    def __init__(self, size: int = MEMORY_BUCKETS, clock: Callable[[], float] = time.monotonic):
+        self.size = size
+        self.clock = clock
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    async def take(self, key: str, rule: Rule) -> float:
+        """0 if a token was taken, else seconds until one is available"""
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(rule.burst), now]
+            if len(self._buckets) > self.size:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(rule.burst, bucket[0] + (now - bucket[1]) * rule.rate)
+            bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / rule.rate
+
+
+class MongoBuckets:
+    """Buckets shared by every worker: one pipeline update refills and takes atomically"""
+
+    def __init__(self, collection, clock: Callable[[], float] = time.time):
+        self.collection = collection
+        self.clock = clock
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def take(self, key: str, rule: Rule) -> float:
+        now = self.clock()
+        # A bucket left alone for this long is full again and can be forgotten
+        expires_at = datetime.fromtimestamp(now + rule.burst / rule.rate + 60, timezone.utc)
+        refilled = {"$min": [rule.burst, {"$add": [
+            {"$ifNull": ["$tokens", rule.burst]},
+            {"$multiply": [{"$max": [0, {"$subtract": [now, {"$ifNull": ["$at", now]}]}]}, rule.rate]},
+        ]}]}
+        bucket = await self.collection.find_one_and_update(
+            {"_id": key},
+            [{"$set": {"tokens": refilled, "at": now, "expires_at": expires_at}},
+             {"$set": {"taken": {"$gte": ["$tokens", 1]}}},
+             {"$set": {"tokens": {"$cond": ["$taken", {"$subtract": ["$tokens", 1]}, "$tokens"]}}}],
+            upsert=True, return_document=ReturnDocument.AFTER, projection={"tokens": 1, "taken": 1}
+        )
+        if bucket["taken"]:
+            return 0.0
+        return (1 - bucket["tokens"]) / rule.rate
+
+
+# ============== CLIENT KEYS ==============
+
+def _headers(scope) -> Dict[bytes, bytes]:
+    return dict(scope.get("headers") or ())
+
+
+def client_ip(scope, headers: Dict[bytes, bytes], hops: int = RATE_LIMIT_PROXY_HOPS) -> str:
+    """The address the outermost trusted proxy saw; clients can only prepend to X-Forwarded-For"""
+    forwarded = headers.get(b"x-forwarded-for")
+    if hops > 0 and forwarded:
+        addresses = [a.strip() for a in forwarded.decode("latin-1").split(",") if a.strip()]
+        if addresses:
+            return addresses[-min(hops, len(addresses))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def session_token(headers: Dict[bytes, bytes]) -> Optional[str]:
+    """Same lookup order as deps.get_current_user: cookie, then bearer token"""
+    cookie = headers.get(b"cookie")
+    if cookie:
+        for part in cookie.decode("latin-1").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "session_token" and value:
+                return value
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    if auth.startswith("Bearer "):
+        return auth[7:] or None
+    return None
+
+
+class SessionUsers:
+    """session_token -> user_id, cached so a limited request costs at most one read a minute per session"""
+
+    def __init__(self, sessions=None, ttl: float = SESSION_CACHE_SECONDS, size: int = SESSION_CACHE_SIZE):
+        self.sessions = sessions
+        self.ttl = ttl
+        self.size = size
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def user_id(self, token: str) -> Optional[str]:
+        now = time.monotonic()
+        cached = self._cache.get(token)
+        if cached and now - cached[0] < self.ttl:
+            return cached[1]
+        if self.sessions is None:
+            from database import db
+            self.sessions = db.user_sessions
+        doc = await self.sessions.find_one({"session_token": token}, {"_id": 0, "user_id": 1})
+        user_id = doc["user_id"] if doc else None
+        self._cache[token] = (now, user_id)
+        self._cache.move_to_end(token)
+        if len(self._cache) > self.size:
+            self._cache.popitem(last=False)
+        return user_id
+
+
+# ============== MIDDLEWARE ==============
+
+class RateLimiter:
+    def __init__(self, rules: List[Rule], buckets, users: Optional[SessionUsers] = None,
+                 proxy_hops: int = RATE_LIMIT_PROXY_HOPS):
+        self.table = RuleTable(rules)
+        self.buckets = buckets
+        self.users = users or SessionUsers()
+        self.proxy_hops = proxy_hops
+
+    async def client_key(self, rule: Rule, scope) -> str:
+        headers = _headers(scope)
+        if rule.key != "ip":
+            token = session_token(headers)
+            if token:
+                if rule.key == "user":
+                    user_id = await self.users.user_id(token)
+                    if user_id:
+                        return f"user:{user_id}"
+                else:
+                    # Don't keep raw session tokens around as bucket keys
+                    return "session:" + hashlib.sha256(token.encode()).hexdigest()[:24]
+        return f"ip:{client_ip(scope, headers, self.proxy_hops)}"
+
+    async def check(self, scope) -> Optional[Tuple[Rule, float]]:
+        """(rule, retry_after) if the request is over its limit, else None"""
+        rule = self.table.match(scope["method"], scope["path"])
+        if rule is None:
+            return None
+        key = f"{rule.name}|{await self.client_key(rule, scope)}"
+        try:
+            wait = await self.buckets.take(key, rule)
+        except PyMongoError as e:
+            rate_limit_errors.inc(())
+            logger.warning(f"Rate limit store unavailable, letting request through: {e}")
+            return None
+        return (rule, wait) if wait > 0 else None
+
+
+class RateLimitMiddleware:
+    """Answers 429 with Retry-After for requests over their rule's limit"""
+
+    def __init__(self, app, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limited = await self.limiter.check(scope)
+        if limited is None:
+            await self.app(scope, receive, send)
+            return
+
+        rule, wait = limited
+        rate_limited.inc((rule.name,))
+        retry_after = max(1, int(wait + 0.999))
+        body = json.dumps({"detail": f"Too many requests - try again in {retry_after}s"}).encode()
+        await send({"type": "http.response.start", "status": 429, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def build_limiter() -> Optional[RateLimiter]:
+    """The limiter configured by RATE_LIMIT_BACKEND and RATE_LIMITS, or None when switched off"""
+    if RATE_LIMIT_BACKEND == "off":
+        return None
+    rules = parse_rules(os.environ.get('RATE_LIMITS', DEFAULT_RULES))
+    if RATE_LIMIT_BACKEND == "mongo":
+        from database import db
+        buckets = MongoBuckets(db.rate_limits)
+    else:
+        buckets = MemoryBuckets()
+    logger.info(f"🚦 Rate limiting {len(rules)} route(s) with {type(buckets).__name__}")
+    return RateLimiter(rules, buckets)
@@ -0,0 +1,234 @@
+"""
+EuroMatchTickets Seller Ratings
+Running rating counters per seller in db.seller_rating_stats, kept in step
+with db.ratings without a multi-document transaction:
+
+    {seller_id, rating_sum, rating_count, histogram: {"1".."5": n}, applied: [rating_id, ...]}
+
+A rating is inserted with counted=false, folded into the counters with one
+conditional $inc that also pushes its rating_id onto `applied` (the last
+RATING_APPLIED_WINDOW ids), then marked counted. A request that dies between
+those writes leaves the rating uncounted, and the seller's next rating
+applies it first; `applied` makes a repeat of the $inc a no-op, so nothing is
+counted twice. A seller's counters are seeded from their existing counted
+ratings on first use (their next rating or the first read of their summary),
+so ratings from before the counters aren't dropped.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from database import db
+
+logger = logging.getLogger(__name__)
+
+RATING_APPLIED_WINDOW = 50  # ids kept per seller to recognise a repeated $inc
+STATS_PROJECTION = {"_id": 0, "applied": 0}
+
+
+def _totals(counts: Dict[int, int]) -> dict:
+    """Counter fields from {star: number of ratings}"""
+    return {
+        "rating_sum": sum(star * n for star, n in counts.items()),
+        "rating_count": sum(counts.values()),
+        "histogram": {str(star): n for star, n in counts.items()},
+    }
+
+
+# ============== STORES ==============
+
+class MongoRatingStore:
+    """Ratings in db.ratings, counters in db.seller_rating_stats, averages on db.users"""
+
+    def __init__(self, database):
+        self.ratings = database.ratings
+        self.stats = database.seller_rating_stats
+        self.users = database.users
+
+    async def ensure_indexes(self):
+        await self.ratings.create_index("order_id", unique=True)
+        await self.ratings.create_index([("seller_id", 1), ("created_at", -1)])
+        await self.ratings.create_index([("seller_id", 1), ("counted", 1)],
+                                        partialFilterExpression={"counted": False})
+        await self.stats.create_index("seller_id", unique=True)
+
+    async def insert(self, rating: dict):
+        await self.ratings.insert_one(dict(rating))
+
+    async def uncounted(self, seller_id: str, limit: int = 20) -> List[dict]:
+        return await self.ratings.find({"seller_id": seller_id, "counted": False}, {"_id": 0}).to_list(limit)
+
+    async def star_counts(self, seller_id: Optional[str] = None) -> Dict[str, Dict[int, int]]:
+        """{seller_id: {star: n}} over counted ratings (and those from before the flag existed)"""
+        match = {"counted": {"$ne": False}}
+        if seller_id is not None:
+            match["seller_id"] = seller_id
+        counts: Dict[str, Dict[int, int]] = {}
+        async for row in self.ratings.aggregate([
+            {"$match": match},
+            {"$group": {"_id": {"seller_id": "$seller_id", "rating": "$rating"}, "count": {"$sum": 1}}}
+        ]):
+            counts.setdefault(row["_id"]["seller_id"], {})[row["_id"]["rating"]] = row["count"]
+        return counts
+
+    async def seed(self, seller_id: str, totals: dict):
+        try:
+            await self.stats.update_one({"seller_id": seller_id},
+                                        {"$setOnInsert": {**totals, "applied": []}}, upsert=True)
+        except DuplicateKeyError:
+            pass  # another request seeded it first
+
+    async def apply(self, seller_id: str, rating_id: str, star: int) -> Optional[dict]:
+        """Counters after adding the rating; None if they don't exist or already include it"""
+        return await self.stats.find_one_and_update(
+            {"seller_id": seller_id, "applied": {"$ne": rating_id}},
+            {"$inc": {"rating_sum": star, "rating_count": 1, f"histogram.{star}": 1},
+             "$push": {"applied": {"$each": [rating_id], "$slice": -RATING_APPLIED_WINDOW}}},
+            projection=STATS_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def get(self, seller_id: str) -> Optional[dict]:
+        return await self.stats.find_one({"seller_id": seller_id}, STATS_PROJECTION)
+
+    async def replace_totals(self, seller_id: str, totals: dict):
+        await self.stats.update_one({"seller_id": seller_id}, {"$set": totals}, upsert=True)
+
+    async def mark_counted(self, rating_id: str):
+        await self.ratings.update_one({"rating_id": rating_id}, {"$set": {"counted": True}})
+
+    async def set_average(self, seller_id: str, stats: dict, only_if_newer: bool = True):
+        # Only the write that produced the latest count may set the average, so a
+        # slower concurrent request can't overwrite it with a stale value
+        query = {"user_id": seller_id}
+        if only_if_newer:
+            query["rating_count"] = {"$not": {"$gte": stats["rating_count"]}}
+        await self.users.update_one(query, {"$set": {
+            "rating": round(stats["rating_sum"] / stats["rating_count"], 1),
+            "rating_count": stats["rating_count"]
+        }})
+
+
+class MemoryRatingStore:
+    """In-process stand-in; each conditional update happens without yielding"""
+
+    def __init__(self):
+        self.ratings: Dict[str, dict] = {}
+        self.stats: Dict[str, dict] = {}
+        self.users: Dict[str, dict] = {}
+
+    async def ensure_indexes(self):
+        pass
+
+    async def insert(self, rating: dict):
+        if any(r["order_id"] == rating["order_id"] for r in self.ratings.values()):
+            raise DuplicateKeyError("order_id")
+        self.ratings[rating["rating_id"]] = dict(rating)
+
+    async def uncounted(self, seller_id: str, limit: int = 20) -> List[dict]:
+        return [dict(r) for r in self.ratings.values()
+                if r["seller_id"] == seller_id and r.get("counted") is False][:limit]
+
+    async def star_counts(self, seller_id: Optional[str] = None) -> Dict[str, Dict[int, int]]:
+        counts: Dict[str, Dict[int, int]] = {}
+        for r in self.ratings.values():
+            if r.get("counted") is not False and seller_id in (None, r["seller_id"]):
+                stars = counts.setdefault(r["seller_id"], {})
+                stars[r["rating"]] = stars.get(r["rating"], 0) + 1
+        return counts
+
+    async def seed(self, seller_id: str, totals: dict):
+        await asyncio.sleep(0)
+        self.stats.setdefault(seller_id, {"seller_id": seller_id, **copy.deepcopy(totals), "applied": []})
+
+    async def apply(self, seller_id: str, rating_id: str, star: int) -> Optional[dict]:
+        await asyncio.sleep(0)
+        stats = self.stats.get(seller_id)
+        if stats is None or rating_id in stats["applied"]:
+            return None
+        stats["rating_sum"] += star
+        stats["rating_count"] += 1
+        stats["histogram"][str(star)] = stats["histogram"].get(str(star), 0) + 1
+        stats["applied"] = (stats["applied"] + [rating_id])[-RATING_APPLIED_WINDOW:]
+        return {k: copy.deepcopy(v) for k, v in stats.items() if k != "applied"}
+
+    async def get(self, seller_id: str) -> Optional[dict]:
+        stats = self.stats.get(seller_id)
+        return {k: copy.deepcopy(v) for k, v in stats.items() if k != "applied"} if stats else None
+
+    async def replace_totals(self, seller_id: str, totals: dict):
+        self.stats.setdefault(seller_id, {"seller_id": seller_id, "applied": []}).update(copy.deepcopy(totals))
+
+    async def mark_counted(self, rating_id: str):
+        self.ratings[rating_id]["counted"] = True
+
+    async def set_average(self, seller_id: str, stats: dict, only_if_newer: bool = True):
+        user = self.users.get(seller_id)
+        if user is None or (only_if_newer and user.get("rating_count", 0) >= stats["rating_count"]):
+            return
+        user.update(rating=round(stats["rating_sum"] / stats["rating_count"], 1), rating_count=stats["rating_count"])
+
+
+# ============== COUNTERS ==============
+
+class SellerRatings:
+    def __init__(self, store):
+        self.store = store
+
+    async def add(self, rating: dict) -> dict:
+        """Insert a rating and fold it into the seller's counters; returns the counters.
+
+        Raises DuplicateKeyError if the order was already rated.
+        """
+        await self.store.insert({**rating, "counted": False})
+        # Ratings an earlier request inserted but didn't get to count
+        for pending in await self.store.uncounted(rating["seller_id"]):
+            if pending["rating_id"] != rating["rating_id"]:
+                logger.info(f"⭐ Counting rating {pending['rating_id']} left over by a failed request")
+                await self.apply(pending)
+        stats = await self.apply(rating)
+        await self.store.set_average(rating["seller_id"], stats)
+        return stats
+
+    async def apply(self, rating: dict) -> dict:
+        """Add one rating to its seller's counters exactly once, then mark it counted"""
+        seller_id = rating["seller_id"]
+        stats = await self.store.apply(seller_id, rating["rating_id"], rating["rating"])
+        if stats is None:
+            stats = await self.store.get(seller_id)
+            if stats is None:
+                # First rating since the counters were introduced: start from the existing ones
+                counts = await self.store.star_counts(seller_id)
+                await self.store.seed(seller_id, _totals(counts.get(seller_id, {})))
+                stats = await self.store.apply(seller_id, rating["rating_id"], rating["rating"])
+                stats = stats or await self.store.get(seller_id)
+        await self.store.mark_counted(rating["rating_id"])
+        return stats
+
+    async def get(self, seller_id: str) -> Optional[dict]:
+        """A seller's counters; seeded from their existing ratings if nothing has created them yet"""
+        stats = await self.store.get(seller_id)
+        if stats is None:
+            stars = (await self.store.star_counts(seller_id)).get(seller_id)
+            if not stars:
+                return None  # no ratings: nothing worth storing
+            await self.store.seed(seller_id, _totals(stars))
+            stats = await self.store.get(seller_id)
+        return stats
+
+    async def rebuild(self) -> int:
+        """Recompute every seller's counters from their counted ratings; returns sellers updated"""
+        counts = await self.store.star_counts()
+        for seller_id, stars in counts.items():
+            totals = _totals(stars)
+            await self.store.replace_totals(seller_id, totals)
+            await self.store.set_average(seller_id, totals, only_if_newer=False)
+        return len(counts)
+
+
+seller_ratings = SellerRatings(MongoRatingStore(db))
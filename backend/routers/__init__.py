@@ -0,0 +1,58 @@
+"""
+EuroMatchTickets API Subsystems
+Each subsystem is a module exposing `router` and, optionally, lifecycle hooks:
+
+    async def ensure_indexes()   # run in the background at startup
+    async def startup()          # cache warmup, background workers
+    async def shutdown()
+
+API_SUBSYSTEMS selects which subsystems a deployment mounts, e.g.
+API_SUBSYSTEMS=catalogue for read replicas. Modules that aren't enabled are
+never imported.
+"""
+
+import importlib
+import logging
+import os
+from types import ModuleType
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+SUBSYSTEMS = ("catalogue", "auth", "checkout", "queue", "seller", "admin", "raffle", "chat", "seo", "seeding")
+
+
+def enabled_subsystems(value: str = None) -> List[str]:
+    """Parse API_SUBSYSTEMS ("all" or a comma-separated list)"""
+    value = value if value is not None else os.environ.get('API_SUBSYSTEMS', 'all')
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    if not names or names == ["all"]:
+        return list(SUBSYSTEMS)
+    unknown = [name for name in names if name not in SUBSYSTEMS]
+    if unknown:
+        raise ValueError(f"Unknown API subsystem(s): {', '.join(unknown)}")
+    return [name for name in SUBSYSTEMS if name in names]
+
+
+def load(names: List[str]) -> List[ModuleType]:
+    return [importlib.import_module(f"routers.{name}") for name in names]
+
+
+async def ensure_indexes(modules: List[ModuleType]):
+    """Create the indexes each subsystem's hot queries rely on"""
+    for module in modules:
+        hook = getattr(module, "ensure_indexes", None)
+        if hook is None:
+            continue
+        try:
+            await hook()
+        except Exception as e:
+            logger.error(f"Index creation failed for {module.__name__}: {e}")
+    logger.info("✅ Indexes ensured")
+
+
+async def run_hooks(modules: List[ModuleType], name: str):
+    for module in modules:
+        hook = getattr(module, name, None)
+        if hook is not None:
+            await hook()
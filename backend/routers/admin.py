@@ -0,0 +1,424 @@
+"""
+Owner/admin subsystem: disputes, users, platform stats, seller payouts and
+on-demand profiling
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+import profiling
+from database import db
+from db_routing import reads
+from deps import require_admin
+from jobs import runner
+from ratings import seller_ratings
+
+router = APIRouter(prefix="/api", tags=["admin"])
+
+
+async def ensure_indexes():
+    await db.disputes.create_index("created_at")
+
+# ============== DISPUTES ENDPOINTS ==============
+
+@router.get("/admin/disputes")
+async def get_disputes(request: Request):
+    """Get all disputes (admin only)"""
+    user = await require_admin(request)
+    
+    disputes = await db.disputes.find({}, {"_id": 0}).sort("created_at", -1).to_list(100)
+    
+    for dispute in disputes:
+        order = await db.orders.find_one({"order_id": dispute["order_id"]}, {"_id": 0})
+        buyer = await db.users.find_one({"user_id": dispute["buyer_id"]}, {"_id": 0})
+        seller = await db.users.find_one({"user_id": dispute["seller_id"]}, {"_id": 0})
+        dispute["order"] = order
+        dispute["buyer"] = buyer
+        dispute["seller"] = seller
+    
+    return disputes
+
+@router.put("/admin/disputes/{dispute_id}")
+async def resolve_dispute(dispute_id: str, request: Request):
+    """Resolve a dispute (admin only)"""
+    user = await require_admin(request)
+    body = await request.json()
+    
+    status = body.get("status")
+    resolution = body.get("resolution")
+    
+    result = await db.disputes.update_one(
+        {"dispute_id": dispute_id},
+        {"$set": {"status": status, "resolution": resolution}}
+    )
+    
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Dispute not found")
+    
+    return {"success": True}
+
+# ============== RATINGS ENDPOINTS ==============
+
+@router.post("/admin/ratings/rebuild-stats")
+async def rebuild_seller_rating_stats(request: Request):
+    """Recompute seller rating counters from the ratings collection (admin only)"""
+    user = await require_admin(request)
+    sellers_updated = await seller_ratings.rebuild()
+    return {"success": True, "sellers_updated": sellers_updated}
+
+# ============== ADMIN ENDPOINTS ==============
+
+@router.get("/admin/stats")
+async def get_admin_stats(request: Request):
+    """Get admin statistics"""
+    user = await require_admin(request)
+    read_db = reads("analytics")
+    
+    total_users = await read_db.users.count_documents({})
+    total_sellers = await read_db.users.count_documents({"role": "seller"})
+    verified_sellers = await read_db.users.count_documents({"role": "seller", "kyc_status": "verified"})
+    total_events = await read_db.events.count_documents({})
+    total_matches = await read_db.events.count_documents({"event_type": "match"})
+    total_concerts = await read_db.events.count_documents({"event_type": "concert"})
+    total_tickets = await read_db.tickets.count_documents({})
+    available_tickets = await read_db.tickets.count_documents({"status": "available"})
+    sold_tickets = await read_db.tickets.count_documents({"status": "sold"})
+    open_disputes = await read_db.disputes.count_documents({"status": "open"})
+    
+    completed_orders = await read_db.orders.find(
+        {"status": "completed"},
+        {"_id": 0, "total_amount": 1, "commission": 1}
+    ).to_list(10000)
+    
+    total_revenue = sum(o["total_amount"] for o in completed_orders)
+    total_commission = sum(o["commission"] for o in completed_orders)
+    
+    return {
+        "total_users": total_users,
+        "total_sellers": total_sellers,
+        "verified_sellers": verified_sellers,
+        "total_events": total_events,
+        "total_matches": total_matches,
+        "total_concerts": total_concerts,
+        "total_tickets": total_tickets,
+        "available_tickets": available_tickets,
+        "sold_tickets": sold_tickets,
+        "open_disputes": open_disputes,
+        "total_revenue": round(total_revenue, 2),
+        "total_commission": round(total_commission, 2)
+    }
+
+@router.get("/admin/users")
+async def get_admin_users(request: Request):
+    """Get all users (admin only)"""
+    user = await require_admin(request)
+    
+    users = await db.users.find({}, {"_id": 0}).to_list(1000)
+    return users
+
+@router.put("/admin/users/{user_id}/role")
+async def update_user_role(user_id: str, request: Request):
+    """Update user role (admin only)"""
+    admin = await require_admin(request)
+    body = await request.json()
+    role = body.get("role")
+    
+    if role not in ["buyer", "seller", "admin"]:
+        raise HTTPException(status_code=400, detail="Invalid role")
+    
+    result = await db.users.update_one(
+        {"user_id": user_id},
+        {"$set": {"role": role}}
+    )
+    
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return {"success": True}
+
+@router.put("/admin/users/{user_id}/kyc")
+async def update_kyc_status(user_id: str, request: Request):
+    """Update user KYC status (admin only)"""
+    admin = await require_admin(request)
+    body = await request.json()
+    status = body.get("status")
+    
+    if status not in ["pending", "submitted", "verified", "rejected"]:
+        raise HTTPException(status_code=400, detail="Invalid status")
+    
+    result = await db.users.update_one(
+        {"user_id": user_id},
+        {"$set": {"kyc_status": status}}
+    )
+    
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    return {"success": True}
+
+@router.get("/admin/orders")
+async def get_admin_orders(request: Request):
+    """Get all orders (admin only)"""
+    user = await require_admin(request)
+    
+    orders = await db.orders.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
+    return orders
+
+# ============== OWNER DASHBOARD (Revenue & Payouts) ==============
+
+@router.get("/owner/dashboard")
+async def get_owner_dashboard(request: Request):
+    """Get owner dashboard with revenue stats"""
+    user = await require_admin(request)
+    read_db = reads("analytics")
+    
+    # Get all completed orders
+    orders = await read_db.orders.find(
+        {"status": "completed"},
+        {"_id": 0}
+    ).to_list(1000)
+    
+    # Calculate totals
+    total_revenue = sum(order.get("total_amount", 0) for order in orders)
+    total_commission = sum(order.get("commission", 0) for order in orders)
+    total_seller_amount = total_revenue - total_commission
+    
+    # Get pending payouts
+    pending_payouts = await read_db.payouts.find(
+        {"status": "pending"},
+        {"_id": 0}
+    ).to_list(100)
+    
+    pending_payout_amount = sum(p.get("amount", 0) for p in pending_payouts)
+    
+    # Get completed payouts
+    completed_payouts = await read_db.payouts.find(
+        {"status": "completed"},
+        {"_id": 0}
+    ).to_list(100)
+    
+    total_paid_out = sum(p.get("amount", 0) for p in completed_payouts)
+    
+    # Orders by status
+    orders_pending = await read_db.orders.count_documents({"status": "pending"})
+    orders_completed = await read_db.orders.count_documents({"status": "completed"})
+    orders_cancelled = await read_db.orders.count_documents({"status": "cancelled"})
+    
+    # Recent orders (last 10)
+    recent_orders = await read_db.orders.find(
+        {},
+        {"_id": 0}
+    ).sort("created_at", -1).to_list(10)
+    
+    # Enrich recent orders
+    for order in recent_orders:
+        event = await read_db.events.find_one({"event_id": order.get("event_id")}, {"_id": 0, "title": 1})
+        order["event_title"] = event.get("title") if event else "Unknown"
+    
+    return {
+        "revenue": {
+            "total": round(total_revenue, 2),
+            "commission": round(total_commission, 2),
+            "seller_amount": round(total_seller_amount, 2)
+        },
+        "payouts": {
+            "pending_count": len(pending_payouts),
+            "pending_amount": round(pending_payout_amount, 2),
+            "total_paid": round(total_paid_out, 2)
+        },
+        "orders": {
+            "pending": orders_pending,
+            "completed": orders_completed,
+            "cancelled": orders_cancelled,
+            "total": orders_pending + orders_completed + orders_cancelled
+        },
+        "recent_orders": recent_orders
+    }
+
+@router.get("/owner/sellers")
+async def get_sellers_with_balance(request: Request):
+    """Get all sellers with their pending balances"""
+    user = await require_admin(request)
+    # Payouts are decided from these balances: read the primary, never a lagging secondary
+    
+    # Get all sellers
+    sellers = await db.users.find(
+        {"role": "seller"},
+        {"_id": 0, "user_id": 1, "name": 1, "email": 1, "kyc_status": 1}
+    ).to_list(100)
+    
+    for seller in sellers:
+        # Calculate pending balance (completed orders not yet paid out)
+        orders = await db.orders.find(
+            {"seller_id": seller["user_id"], "status": "completed"},
+            {"_id": 0, "total_amount": 1, "commission": 1}
+        ).to_list(100)
+        
+        total_sales = sum(o.get("total_amount", 0) for o in orders)
+        total_commission = sum(o.get("commission", 0) for o in orders)
+        seller_earnings = total_sales - total_commission
+        
+        # Get already paid out
+        payouts = await db.payouts.find(
+            {"seller_id": seller["user_id"], "status": "completed"},
+            {"_id": 0, "amount": 1}
+        ).to_list(100)
+        
+        total_paid = sum(p.get("amount", 0) for p in payouts)
+        
+        seller["total_sales"] = round(total_sales, 2)
+        seller["total_commission"] = round(total_commission, 2)
+        seller["total_earnings"] = round(seller_earnings, 2)
+        seller["total_paid"] = round(total_paid, 2)
+        seller["pending_balance"] = round(seller_earnings - total_paid, 2)
+        seller["orders_count"] = len(orders)
+    
+    return sellers
+
+@router.post("/owner/payouts")
+async def create_payout(request: Request):
+    """Create a payout record for a seller"""
+    user = await require_admin(request)
+    body = await request.json()
+    
+    seller_id = body.get("seller_id")
+    amount = body.get("amount")
+    payment_method = body.get("payment_method", "bank_transfer")
+    notes = body.get("notes", "")
+    
+    if not seller_id or not amount:
+        raise HTTPException(status_code=400, detail="seller_id and amount required")
+    
+    seller = await db.users.find_one({"user_id": seller_id}, {"_id": 0})
+    if not seller:
+        raise HTTPException(status_code=404, detail="Seller not found")
+    
+    payout = {
+        "payout_id": f"payout_{uuid.uuid4().hex[:12]}",
+        "seller_id": seller_id,
+        "seller_name": seller.get("name"),
+        "seller_email": seller.get("email"),
+        "amount": amount,
+        "payment_method": payment_method,
+        "status": "pending",  # pending, processing, completed, failed
+        "notes": notes,
+        "created_at": datetime.now(timezone.utc),
+        "completed_at": None
+    }
+    
+    await db.payouts.insert_one(payout)
+    payout.pop("_id", None)
+    
+    return payout
+
+@router.put("/owner/payouts/{payout_id}/complete")
+async def complete_payout(payout_id: str, request: Request):
+    """Mark a payout as completed"""
+    user = await require_admin(request)
+    
+    result = await db.payouts.update_one(
+        {"payout_id": payout_id},
+        {"$set": {
+            "status": "completed",
+            "completed_at": datetime.now(timezone.utc)
+        }}
+    )
+    
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Payout not found")
+    
+    return {"success": True}
+
+@router.get("/owner/payouts")
+async def get_all_payouts(request: Request):
+    """Get all payouts"""
+    user = await require_admin(request)
+    
+    payouts = await db.payouts.find({}, {"_id": 0}).sort("created_at", -1).to_list(100)
+    return payouts
+
+# ============== PROFILING (ADMIN) ==============
+
+def _profile_response(profiler: profiling.SamplingProfiler, output: str, title: str):
+    from fastapi.responses import PlainTextResponse
+    
+    if output == "svg":
+        return Response(
+            content=profiling.render_flamegraph(profiler.stacks, title=title),
+            media_type="image/svg+xml"
+        )
+    return PlainTextResponse(profiler.collapsed())
+
+@router.post("/admin/profile")
+async def profile_worker(request: Request, seconds: float = 10, output: str = Query("collapsed", alias="format")):
+    """Sample this worker's event loop for N seconds; returns collapsed stacks or an SVG flamegraph"""
+    user = await require_admin(request)
+    
+    seconds = min(max(seconds, 0.1), profiling.MAX_SECONDS)
+    profiler = profiling.SamplingProfiler(threading.get_ident())
+    try:
+        profiler.start()
+    except profiling.ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+    
+    title = f"worker {os.getpid()} - {seconds:g}s, {profiler.samples} samples"
+    return _profile_response(profiler, output, title)
+
+@router.get("/admin/profiles")
+async def get_request_profiles(request: Request):
+    """List recent per-request profiles captured via the X-Profile header"""
+    user = await require_admin(request)
+    return {"pid": os.getpid(), "profiles": profiling.list_profiles()}
+
+@router.get("/admin/profiles/{profile_id}")
+async def get_request_profile(profile_id: str, request: Request, output: str = Query("collapsed", alias="format")):
+    """Get a per-request profile (only available on the worker that served it)"""
+    user = await require_admin(request)
+    
+    profiler = profiling.get_profile(profile_id)
+    if not profiler:
+        raise HTTPException(status_code=404, detail="Profile not found on this worker")
+    
+    return _profile_response(profiler, output, f"request profile {profile_id}")
+
+# ============== BACKGROUND JOBS ==============
+
+@router.get("/admin/jobs")
+async def get_jobs(request: Request, limit: int = 50):
+    """Recent background jobs, newest first (admin only)"""
+    user = await require_admin(request)
+    return await runner.recent(min(limit, 200))
+
+@router.get("/admin/jobs/{job_id}")
+async def get_job(job_id: str, request: Request):
+    """Progress of a background job (admin only)"""
+    user = await require_admin(request)
+    
+    job = await runner.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.pop("state", None)  # internal resume checkpoint (may hold ObjectIds)
+    if job.get("total"):
+        processed = job["done"] + job["failed"] + job.get("skipped", 0)
+        job["percent"] = round(100 * processed / job["total"], 1)
+    return job
+
+@router.post("/admin/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str, request: Request):
+    """Stop a queued or running job at its next checkpoint (admin only)"""
+    user = await require_admin(request)
+    
+    job = await runner.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, "job_id": job_id, "status": job["status"],
+            "cancel_requested": job.get("cancel_requested", False)}
@@ -0,0 +1,414 @@
+"""
+Catalogue subsystem: events, ticket listings, price alerts and seller ratings.
+Read-heavy; this is the subsystem catalogue-only replicas serve.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pymongo.errors import DuplicateKeyError
+
+from database import db, to_document, parse_datetime
+from db_routing import reads
+from deps import require_auth, require_admin
+from email_service import send_price_drop_alert
+from live_tickets import live_hub
+from ratings import seller_ratings
+from models import Event, EventCreate, PriceAlert, PriceAlertCreate, Rating, RatingCreate
+
+router = APIRouter(prefix="/api", tags=["catalogue"])
+
+
+async def ensure_indexes():
+    await db.events.create_index([("status", 1), ("event_date", 1)])
+    await db.price_alerts.create_index([("user_id", 1), ("created_at", -1)])
+    await seller_ratings.store.ensure_indexes()
+
+
+async def shutdown():
+    live_hub.close()
+
+# ============== EVENTS ENDPOINTS ==============
+
+@router.get("/events")
+async def get_events(
+    event_type: Optional[str] = None,
+    league: Optional[str] = None,
+    genre: Optional[str] = None,
+    city: Optional[str] = None,
+    country: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    featured: Optional[bool] = None,
+    search: Optional[str] = None
+):
+    """Get events with filters"""
+    read_db = reads("catalogue")
+    query = {"status": {"$ne": "cancelled"}}
+    
+    if event_type and event_type != "all":
+        query["event_type"] = event_type
+    if league:
+        query["league"] = league
+    if genre:
+        query["genre"] = genre
+    if city:
+        query["city"] = {"$regex": city, "$options": "i"}
+    if country:
+        query["country"] = {"$regex": country, "$options": "i"}
+    if featured is not None:
+        query["featured"] = featured
+    try:
+        if date_from:
+            query["event_date"] = {"$gte": parse_datetime(date_from)}
+        if date_to:
+            query.setdefault("event_date", {})["$lte"] = parse_datetime(date_to)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date_from/date_to must be ISO dates")
+    if search:
+        query["$or"] = [
+            {"title": {"$regex": search, "$options": "i"}},
+            {"artist": {"$regex": search, "$options": "i"}},
+            {"home_team": {"$regex": search, "$options": "i"}},
+            {"away_team": {"$regex": search, "$options": "i"}},
+            {"venue": {"$regex": search, "$options": "i"}},
+            {"city": {"$regex": search, "$options": "i"}}
+        ]
+    
+    events = await read_db.events.find(query, {"_id": 0}).sort("event_date", 1).to_list(100)
+    
+    # Batch fetch ticket info using aggregation to avoid N+1 queries
+    if events:
+        event_ids = [e["event_id"] for e in events]
+        
+        # Aggregate ticket counts and lowest prices in one query
+        pipeline = [
+            {"$match": {"event_id": {"$in": event_ids}, "status": "available"}},
+            {"$group": {
+                "_id": "$event_id",
+                "ticket_count": {"$sum": 1},
+                "lowest_price": {"$min": "$price"}
+            }}
+        ]
+        ticket_stats = await read_db.tickets.aggregate(pipeline).to_list(None)
+        
+        # Create lookup dict
+        stats_map = {s["_id"]: s for s in ticket_stats}
+        
+        # Apply stats to events
+        for event in events:
+            stats = stats_map.get(event["event_id"], {})
+            event["available_tickets"] = stats.get("ticket_count", 0)
+            event["lowest_price"] = stats.get("lowest_price")
+    
+    return events
+
+@router.get("/events/{event_id}")
+async def get_event(event_id: str):
+    """Get event details"""
+    read_db = reads("catalogue")
+    event = await read_db.events.find_one({"event_id": event_id}, {"_id": 0})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    tickets = await read_db.tickets.find(
+        {"event_id": event_id, "status": "available"},
+        {"_id": 0}
+    ).to_list(500)
+    
+    event["tickets"] = tickets
+    event["ticket_count"] = len(tickets)
+    
+    categories = {}
+    for ticket in tickets:
+        cat = ticket["category"]
+        if cat not in categories:
+            categories[cat] = {"count": 0, "lowest_price": float('inf')}
+        categories[cat]["count"] += 1
+        if ticket["price"] < categories[cat]["lowest_price"]:
+            categories[cat]["lowest_price"] = ticket["price"]
+    
+    event["categories"] = categories
+    
+    return event
+
+@router.get("/events/{event_id}/live")
+async def live_event_tickets(event_id: str):
+    """Server-Sent Events: a tickets snapshot, then listed/price/reserved/sold/categories deltas"""
+    event = await reads("catalogue").events.find_one({"event_id": event_id}, {"_id": 0, "event_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    return StreamingResponse(
+        live_hub.stream(event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/events")
+async def create_event(event_data: EventCreate, request: Request):
+    """Create a new event (admin only)"""
+    user = await require_admin(request)
+    
+    event = Event(**event_data.model_dump())
+    event_doc = to_document(event)
+    
+    await db.events.insert_one(event_doc)
+    return {"success": True, "event_id": event.event_id}
+
+@router.put("/events/{event_id}")
+async def update_event(event_id: str, event_data: dict, request: Request):
+    """Update an event (admin only)"""
+    user = await require_admin(request)
+    
+    if event_data.get("event_date"):
+        try:
+            event_data["event_date"] = parse_datetime(event_data["event_date"])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid event_date")
+    
+    result = await db.events.update_one(
+        {"event_id": event_id},
+        {"$set": event_data}
+    )
+    
+    if result.matched_count == 0:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    return {"success": True}
+
+@router.delete("/events/{event_id}")
+async def delete_event(event_id: str, request: Request):
+    """Delete an event (admin only)"""
+    user = await require_admin(request)
+    
+    result = await db.events.delete_one({"event_id": event_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    return {"success": True}
+
+# ============== TICKETS ENDPOINTS ==============
+
+@router.get("/tickets")
+async def get_tickets(
+    event_id: Optional[str] = None,
+    category: Optional[str] = None,
+    seller_id: Optional[str] = None,
+    status: str = "available"
+):
+    """Get tickets with filters"""
+    query = {"status": status}
+    
+    if event_id:
+        query["event_id"] = event_id
+    if category:
+        query["category"] = category
+    if seller_id:
+        query["seller_id"] = seller_id
+    
+    tickets = await reads("catalogue").tickets.find(query, {"_id": 0}).to_list(500)
+    return tickets
+
+# ============== PRICE ALERTS ENDPOINTS ==============
+
+@router.post("/price-alerts")
+async def create_price_alert(alert_data: PriceAlertCreate, request: Request):
+    """Create a price drop alert"""
+    user = await require_auth(request)
+    
+    # Check if event exists
+    event = await db.events.find_one({"event_id": alert_data.event_id}, {"_id": 0})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    # Get current lowest price
+    lowest_ticket = await db.tickets.find_one(
+        {"event_id": alert_data.event_id, "status": "available"},
+        {"_id": 0, "price": 1},
+        sort=[("price", 1)]
+    )
+    current_lowest = lowest_ticket["price"] if lowest_ticket else None
+    
+    # Check if alert already exists
+    existing = await db.price_alerts.find_one({
+        "user_id": user.user_id,
+        "event_id": alert_data.event_id,
+        "status": "active"
+    }, {"_id": 0})
+    
+    if existing:
+        # Update existing alert
+        await db.price_alerts.update_one(
+            {"alert_id": existing["alert_id"]},
+            {"$set": {"target_price": alert_data.target_price, "current_lowest": current_lowest}}
+        )
+        return {"success": True, "alert_id": existing["alert_id"], "updated": True}
+    
+    alert = PriceAlert(
+        user_id=user.user_id,
+        user_email=user.email,
+        event_id=alert_data.event_id,
+        target_price=alert_data.target_price,
+        current_lowest=current_lowest
+    )
+    
+    alert_doc = to_document(alert)
+    await db.price_alerts.insert_one(alert_doc)
+    
+    return {"success": True, "alert_id": alert.alert_id}
+
+@router.get("/price-alerts")
+async def get_my_alerts(request: Request):
+    """Get user's price alerts"""
+    user = await require_auth(request)
+    
+    alerts = await db.price_alerts.find(
+        {"user_id": user.user_id},
+        {"_id": 0}
+    ).sort("created_at", -1).to_list(100)
+    
+    if alerts:
+        # Batch fetch events
+        event_ids = list(set(a["event_id"] for a in alerts))
+        events = await db.events.find({"event_id": {"$in": event_ids}}, {"_id": 0}).to_list(None)
+        events_map = {e["event_id"]: e for e in events}
+        
+        # Batch fetch lowest prices using aggregation
+        pipeline = [
+            {"$match": {"event_id": {"$in": event_ids}, "status": "available"}},
+            {"$group": {"_id": "$event_id", "lowest_price": {"$min": "$price"}}}
+        ]
+        lowest_prices = await db.tickets.aggregate(pipeline).to_list(None)
+        prices_map = {p["_id"]: p["lowest_price"] for p in lowest_prices}
+        
+        for alert in alerts:
+            alert["event"] = events_map.get(alert["event_id"])
+            alert["current_lowest"] = prices_map.get(alert["event_id"])
+    
+    return alerts
+
+@router.delete("/price-alerts/{alert_id}")
+async def delete_price_alert(alert_id: str, request: Request):
+    """Delete a price alert"""
+    user = await require_auth(request)
+    
+    alert = await db.price_alerts.find_one({"alert_id": alert_id}, {"_id": 0})
+    if not alert:
+        raise HTTPException(status_code=404, detail="Alert not found")
+    
+    if alert["user_id"] != user.user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    await db.price_alerts.delete_one({"alert_id": alert_id})
+    return {"success": True}
+
+async def check_and_trigger_price_alerts(event_id: str, new_price: float):
+    """Check if any price alerts should be triggered"""
+    # Find all active alerts for this event where target price >= new price
+    alerts = await db.price_alerts.find({
+        "event_id": event_id,
+        "status": "active",
+        "target_price": {"$gte": new_price}
+    }, {"_id": 0}).to_list(1000)
+    
+    if not alerts:
+        return
+    
+    event = await db.events.find_one({"event_id": event_id}, {"_id": 0})
+    if not event:
+        return
+    
+    for alert in alerts:
+        old_price = alert.get("current_lowest", new_price + 50)
+        
+        # Send email notification
+        await send_price_drop_alert(
+            event=event,
+            old_price=old_price,
+            new_price=new_price,
+            user_email=alert["user_email"],
+            lang=alert.get("language", "en")
+        )
+        
+        # Update alert status
+        await db.price_alerts.update_one(
+            {"alert_id": alert["alert_id"]},
+            {"$set": {"status": "triggered", "current_lowest": new_price}}
+        )
+
+# ============== RATINGS ENDPOINTS ==============
+
+@router.post("/ratings")
+async def create_rating(rating_data: RatingCreate, request: Request):
+    """Create a seller rating"""
+    user = await require_auth(request)
+    
+    order = await db.orders.find_one({"order_id": rating_data.order_id}, {"_id": 0})
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    if order["buyer_id"] != user.user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if order["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Order not completed")
+    
+    existing = await db.ratings.find_one({"order_id": rating_data.order_id}, {"_id": 0})
+    if existing:
+        raise HTTPException(status_code=400, detail="Already rated")
+    
+    rating = Rating(
+        order_id=rating_data.order_id,
+        seller_id=order["seller_id"],
+        buyer_id=user.user_id,
+        rating=rating_data.rating,
+        comment=rating_data.comment
+    )
+    
+    # Counted into the seller's running totals exactly once, even if this
+    # request dies part way (see ratings.py)
+    try:
+        await seller_ratings.add(to_document(rating))
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Already rated")
+    
+    return {"success": True}
+
+def summarize_rating_stats(stats: Optional[dict]) -> dict:
+    """Build the public rating summary from a seller_rating_stats document"""
+    stats = stats or {}
+    count = stats.get("rating_count", 0)
+    histogram = stats.get("histogram", {})
+    return {
+        "average": round(stats.get("rating_sum", 0) / count, 1) if count else None,
+        "count": count,
+        "histogram": {str(star): histogram.get(str(star), 0) for star in range(1, 6)}
+    }
+
+@router.get("/sellers/{seller_id}/ratings")
+async def get_seller_ratings(seller_id: str, skip: int = 0, limit: int = 20):
+    """Get seller ratings (paginated) with the rating histogram"""
+    read_db = reads("ratings")
+    skip = max(skip, 0)
+    limit = min(max(limit, 1), 100)
+    
+    ratings = await read_db.ratings.find(
+        {"seller_id": seller_id},
+        {"_id": 0}
+    ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
+    
+    stats = await read_db.seller_rating_stats.find_one({"seller_id": seller_id}, {"_id": 0})
+    if stats is None:
+        # Sellers last rated before the counters existed get them seeded on first view
+        stats = await seller_ratings.get(seller_id)
+    summary = summarize_rating_stats(stats)
+    
+    return {
+        "ratings": ratings,
+        "summary": summary,
+        "skip": skip,
+        "limit": limit,
+        "has_more": skip + len(ratings) < summary["count"]
+    }
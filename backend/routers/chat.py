@@ -0,0 +1,270 @@
+"""
+Chat subsystem: AI customer support
+
+First-turn FAQ answers are served from a normalized-question cache; questions
+about specific events get live event and price data retrieved from our own
+collections instead of a hard-coded list in the prompt.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from answer_cache import AnswerCache, FILLER_WORDS
+from batch_writer import BatchWriter
+from change_feed import bus as change_bus
+from database import db
+from db_routing import reads
+from llm import get_openai_client, chat_completion, stream_chat_completion, LLMBusy
+from metrics import register_collector
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["chat"])
+
+# ============== AI CHAT SUPPORT ==============
+
+class ChatMessage(BaseModel):
+    message: str
+    session_id: str
+
+# Store chat history in memory (for simplicity - could use DB for persistence)
+chat_histories: Dict[str, list] = {}
+
+SUPPORT_SYSTEM_MESSAGE = """You are the AI customer support assistant for EuroMatchTickets, Europe's #1 ticket marketplace for football matches and concerts.
+
+Your role:
+- Help customers find tickets for events
+- Answer questions about orders and payments
+- Explain the refund policy (full refund if event cancelled, 48-hour refund window for change of mind)
+- Provide information about ticket delivery (instant QR code)
+- Be friendly, helpful, and professional
+
+Key information:
+- We sell verified tickets for the World Cup, Champions League, Premier League, La Liga, Bundesliga, and major concerts
+- Payment is 100% secure via Stripe
+- All tickets are verified and guaranteed
+- 10% commission on sales
+- Instant QR code delivery after purchase
+- 24/7 customer support
+
+Only quote events, dates and prices given to you under "Live catalogue". Keep responses concise and helpful. If you don't know something specific, direct them to email support@euromatchtickets.com"""
+
+UNAVAILABLE_MESSAGE = "AI support is currently unavailable. Please email us at support@euromatchtickets.com for assistance."
+BUSY_MESSAGE = "Our assistant is busy right now. Please try again in a moment or email us at support@euromatchtickets.com."
+ERROR_MESSAGE = "I'm having trouble connecting right now. Please try again or email us at support@euromatchtickets.com for assistance."
+
+# Chat transcripts for analytics, written in batches
+chat_log_writer = BatchWriter(db.chat_logs, max_batch=100, flush_interval=2.0)
+
+# Generic (no live data) first-turn answers, per worker
+answer_cache = AnswerCache(
+    ttl=float(os.environ.get('CHAT_CACHE_TTL_SECONDS', '3600')),
+    max_entries=int(os.environ.get('CHAT_CACHE_MAX_ENTRIES', '1000'))
+)
+register_collector(answer_cache.render_prometheus)
+
+CONTEXT_EVENTS = 5
+# Questions mentioning these without naming an event get upcoming featured events
+CATALOGUE_WORDS = {"event", "events", "match", "matches", "game", "games", "concert", "concerts", "show", "shows",
+                   "tour", "available", "upcoming", "sell", "selling"}
+_featured_cache = {"at": 0.0, "events": []}
+FEATURED_TTL = 300
+
+
+@change_bus.subscriber("event")
+def _invalidate_featured(event):
+    """Refetch featured events after any event change instead of serving them for up to FEATURED_TTL"""
+    _featured_cache["at"] = 0.0
+
+
+async def ensure_indexes():
+    await db.events.create_index(
+        [("title", "text"), ("home_team", "text"), ("away_team", "text"),
+         ("artist", "text"), ("city", "text"), ("league", "text")],
+        name="events_text"
+    )
+
+
+async def startup():
+    await chat_log_writer.start()
+
+
+async def shutdown():
+    await chat_log_writer.stop()
+
+
+async def _with_prices(read_db, events: List[dict]) -> List[dict]:
+    if not events:
+        return events
+    pipeline = [
+        {"$match": {"event_id": {"$in": [e["event_id"] for e in events]}, "status": "available"}},
+        {"$group": {"_id": "$event_id", "ticket_count": {"$sum": 1}, "lowest_price": {"$min": "$price"}}}
+    ]
+    stats = {s["_id"]: s async for s in read_db.tickets.aggregate(pipeline)}
+    for event in events:
+        event["available_tickets"] = stats.get(event["event_id"], {}).get("ticket_count", 0)
+        event["lowest_price"] = stats.get(event["event_id"], {}).get("lowest_price")
+    return events
+
+
+async def retrieve_events(question: str) -> List[dict]:
+    """Upcoming events matching the question, with live ticket counts and lowest prices"""
+    read_db = reads("catalogue")
+    projection = {"_id": 0, "event_id": 1, "title": 1, "event_date": 1, "venue": 1, "city": 1}
+    terms = [w for w in question.lower().split() if w.strip("?!.,") not in FILLER_WORDS]
+
+    events = []
+    if terms:
+        events = await read_db.events.find(
+            {"$text": {"$search": " ".join(terms)}, "status": {"$in": ["upcoming", "live"]}},
+            {**projection, "score": {"$meta": "textScore"}}
+        ).sort([("score", {"$meta": "textScore"})]).limit(CONTEXT_EVENTS).to_list(CONTEXT_EVENTS)
+
+    if not events and CATALOGUE_WORDS & {w.strip("?!.,") for w in terms}:
+        if time.monotonic() - _featured_cache["at"] > FEATURED_TTL:
+            _featured_cache["events"] = await read_db.events.find(
+                {"featured": True, "status": "upcoming", "event_date": {"$gte": datetime.now(timezone.utc)}},
+                projection
+            ).sort("event_date", 1).limit(CONTEXT_EVENTS).to_list(CONTEXT_EVENTS)
+            _featured_cache["at"] = time.monotonic()
+        events = [dict(e) for e in _featured_cache["events"]]
+
+    return await _with_prices(read_db, events)
+
+
+def format_context(events: List[dict]) -> str:
+    lines = []
+    for event in events:
+        when = event["event_date"].strftime("%d %b %Y") if isinstance(event.get("event_date"), datetime) else event.get("event_date")
+        price = f"from €{event['lowest_price']:.0f}" if event.get("lowest_price") is not None else "sold out"
+        lines.append(f"- {event['title']} | {when} | {event.get('venue')}, {event.get('city')} | "
+                     f"{event['available_tickets']} tickets {price} | /event/{event['event_id']}")
+    return "Live catalogue:\n" + "\n".join(lines)
+
+
+def build_messages(chat_msg: ChatMessage, events: Optional[List[dict]] = None) -> list:
+    """Prompt for the model; the turn is only added to the history once it's answered"""
+    history = chat_histories.get(chat_msg.session_id, [])
+
+    messages = [{"role": "system", "content": SUPPORT_SYSTEM_MESSAGE}]
+    if events:
+        messages.append({"role": "system", "content": format_context(events)})
+    messages.extend(history[-9:])  # Keep last 10 messages, this one included
+    messages.append({"role": "user", "content": chat_msg.message})
+    return messages
+
+
+async def prepare(chat_msg: ChatMessage):
+    """Returns (cached answer or None, prompt messages, whether the answer may be cached)"""
+    first_turn = not chat_histories.get(chat_msg.session_id)
+    try:
+        events = await retrieve_events(chat_msg.message)
+    except Exception as e:
+        logger.warning(f"Chat retrieval failed: {e}")
+        events = []
+
+    # Only generic first-turn answers are shareable; live prices and follow-ups are not
+    cacheable = first_turn and not events
+    if cacheable:
+        cached = answer_cache.get(chat_msg.message)
+        if cached:
+            return cached, None, False
+    return None, build_messages(chat_msg, events), cacheable
+
+
+def record_reply(chat_msg: ChatMessage, ai_response: str, cached: bool = False, usage: Optional[dict] = None):
+    chat_histories.setdefault(chat_msg.session_id, []).extend([
+        {"role": "user", "content": chat_msg.message},
+        {"role": "assistant", "content": ai_response}
+    ])
+    chat_log_writer.add({
+        "session_id": chat_msg.session_id,
+        "user_message": chat_msg.message,
+        "ai_response": ai_response,
+        "cached": cached,
+        **(usage or {}),
+        "timestamp": datetime.now(timezone.utc)
+    })
+
+
+@router.post("/chat/support")
+async def chat_support(chat_msg: ChatMessage):
+    """AI-powered customer support chat"""
+    if not get_openai_client():
+        return {"response": UNAVAILABLE_MESSAGE}
+
+    cached, messages, cacheable = await prepare(chat_msg)
+    if cached:
+        record_reply(chat_msg, cached, cached=True)
+        return {"response": cached}
+
+    try:
+        response = await chat_completion(
+            model="gpt-4o",
+            messages=messages,
+            max_tokens=500
+        )
+    except LLMBusy:
+        return {"response": BUSY_MESSAGE}
+    except Exception as e:
+        logger.error(f"Chat error: {str(e)}")
+        return {"response": ERROR_MESSAGE}
+
+    ai_response = response.choices[0].message.content
+    usage = {"prompt_tokens": response.usage.prompt_tokens, "completion_tokens": response.usage.completion_tokens} if response.usage else None
+    record_reply(chat_msg, ai_response, usage=usage)
+    if cacheable:
+        answer_cache.put(chat_msg.message, ai_response)
+    return {"response": ai_response}
+
+
+def _sse(payload: dict) -> str:
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+@router.post("/chat/support/stream")
+async def chat_support_stream(chat_msg: ChatMessage):
+    """Streaming support chat: Server-Sent Events with {"delta": ...} chunks, then {"done": true}"""
+    if not get_openai_client():
+        return StreamingResponse(iter([_sse({"delta": UNAVAILABLE_MESSAGE}), _sse({"done": True})]),
+                                 media_type="text/event-stream")
+
+    cached, messages, cacheable = await prepare(chat_msg)
+    if cached:
+        record_reply(chat_msg, cached, cached=True)
+        return StreamingResponse(iter([_sse({"delta": cached}), _sse({"done": True})]),
+                                 media_type="text/event-stream")
+
+    async def events():
+        parts = []
+        usage = {}
+        try:
+            async for delta in stream_chat_completion(usage=usage, model="gpt-4o", messages=messages, max_tokens=500):
+                parts.append(delta)
+                yield _sse({"delta": delta})
+        except LLMBusy:
+            yield _sse({"error": BUSY_MESSAGE})
+            return
+        except Exception as e:
+            logger.error(f"Chat stream error: {str(e)}")
+            yield _sse({"error": ERROR_MESSAGE})
+            return
+        ai_response = "".join(parts)
+        record_reply(chat_msg, ai_response, usage=usage)
+        if cacheable:
+            answer_cache.put(chat_msg.message, ai_response)
+        yield _sse({"done": True})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
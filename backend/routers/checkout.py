@@ -0,0 +1,409 @@
+"""
+Checkout subsystem: Stripe checkout, fulfilment, webhooks, orders and disputes
+"""
+
+import asyncio
+import base64
+import io
+import logging
+import os
+
+from fastapi import APIRouter, HTTPException, Request
+
+from background import spawn
+from database import db, to_document
+from deps import require_auth
+from email_service import send_order_confirmation, send_seller_notification
+from lazy import warm
+from models import Order, PaymentTransaction, SellerPayout, Dispute
+from payments import stripe, call_stripe, PLATFORM_COMMISSION
+from raffle_engine import raffle_engine
+from waiting_room import QueueRequired, waiting_room
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["checkout"])
+
+WARM_SDKS = os.environ.get('WARM_SDKS', 'on').lower() not in ('0', 'false', 'off')
+
+
+async def startup():
+    # Import the Stripe SDK in a thread once serving, so the first checkout doesn't pay for it
+    if WARM_SDKS:
+        spawn(asyncio.to_thread(warm, stripe), name="warm-sdks")
+
+
+async def ensure_indexes():
+    await db.orders.create_index([("buyer_id", 1), ("created_at", -1)])
+    await db.orders.create_index("created_at")
+
+# ============== PAYMENT ENDPOINTS ==============
+
+def generate_qr_code(data: str) -> str:
+    """Generate QR code as base64 string"""
+    import qrcode
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(data)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    buffer.seek(0)
+    
+    return base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+@router.post("/checkout/create")
+async def create_checkout(request: Request):
+    """Create Stripe checkout session"""
+    user = await require_auth(request)
+    body = await request.json()
+    
+    ticket_id = body.get("ticket_id")
+    origin_url = body.get("origin_url")
+    
+    if not ticket_id or not origin_url:
+        raise HTTPException(status_code=400, detail="ticket_id and origin_url required")
+    
+    ticket = await db.tickets.find_one({"ticket_id": ticket_id, "status": "available"}, {"_id": 0})
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not available")
+    
+    # High-demand on-sales: only buyers the waiting room has admitted get through
+    try:
+        await waiting_room.check_admission(ticket["event_id"], user.user_id,
+                                           body.get("queue_token") or request.headers.get("X-Queue-Token"))
+    except QueueRequired as e:
+        raise HTTPException(status_code=403, detail=str(e), headers={"X-Queue": "required"})
+    
+    event = await db.events.find_one({"event_id": ticket["event_id"]}, {"_id": 0})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    ticket_price = float(ticket["price"])
+    commission = round(ticket_price * PLATFORM_COMMISSION, 2)
+    total_amount = round(ticket_price + commission, 2)
+    
+    order = Order(
+        buyer_id=user.user_id,
+        buyer_email=user.email,
+        ticket_id=ticket_id,
+        event_id=ticket["event_id"],
+        seller_id=ticket["seller_id"],
+        ticket_price=ticket_price,
+        commission=commission,
+        total_amount=total_amount,
+        currency=ticket["currency"]
+    )
+    
+    order_doc = to_document(order)
+    
+    await db.tickets.update_one(
+        {"ticket_id": ticket_id},
+        {"$set": {"status": "reserved"}}
+    )
+    
+    success_url = f"{origin_url}/order/success?session_id={{CHECKOUT_SESSION_ID}}"
+    cancel_url = f"{origin_url}/event/{ticket['event_id']}"
+    
+    # Create Stripe Checkout Session using official Stripe SDK
+    checkout_session = await call_stripe(
+        stripe.checkout.Session.create_async,
+        payment_method_types=['card'],
+        line_items=[{
+            'price_data': {
+                'currency': ticket["currency"].lower(),
+                'unit_amount': int(total_amount * 100),  # Stripe uses cents
+                'product_data': {
+                    'name': f"Ticket for {event['title']}",
+                    'description': f"{ticket.get('category', 'Standard')} - {ticket.get('section', 'General')}",
+                },
+            },
+            'quantity': 1,
+        }],
+        mode='payment',
+        success_url=success_url,
+        cancel_url=cancel_url,
+        metadata={
+            "order_id": order.order_id,
+            "ticket_id": ticket_id,
+            "buyer_id": user.user_id,
+            "event": event['title']
+        }
+    )
+    
+    order_doc["stripe_session_id"] = checkout_session.id
+    await db.orders.insert_one(order_doc)
+    
+    transaction = PaymentTransaction(
+        order_id=order.order_id,
+        session_id=checkout_session.id,
+        amount=total_amount,
+        currency=ticket["currency"],
+        status="initiated",
+        metadata={
+            "order_id": order.order_id,
+            "ticket_id": ticket_id,
+            "buyer_id": user.user_id,
+            "event": event['title']
+        }
+    )
+    txn_doc = to_document(transaction)
+    await db.payment_transactions.insert_one(txn_doc)
+    
+    return {
+        "url": checkout_session.url,
+        "session_id": checkout_session.id,
+        "order_id": order.order_id
+    }
+
+@router.get("/checkout/status/{session_id}")
+async def get_checkout_status(session_id: str, request: Request):
+    """Get checkout status and complete order if paid"""
+    # Get session from Stripe
+    session = await call_stripe(stripe.checkout.Session.retrieve_async, id=session_id)
+    payment_status = session.payment_status  # 'paid', 'unpaid', 'no_payment_required'
+    
+    order = await db.orders.find_one({"stripe_session_id": session_id}, {"_id": 0})
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    await db.payment_transactions.update_one(
+        {"session_id": session_id},
+        {"$set": {"status": payment_status}}
+    )
+    
+    if payment_status == "paid" and order["status"] != "completed":
+        qr_data = f"FANPASS-{order['order_id']}-{order['ticket_id']}"
+        qr_code = generate_qr_code(qr_data)
+        
+        await db.orders.update_one(
+            {"order_id": order["order_id"]},
+            {"$set": {"status": "completed", "qr_code": qr_code}}
+        )
+        
+        await db.tickets.update_one(
+            {"ticket_id": order["ticket_id"]},
+            {"$set": {"status": "sold"}}
+        )
+        
+        await db.users.update_one(
+            {"user_id": order["seller_id"]},
+            {"$inc": {"total_sales": 1}}
+        )
+        
+        order["status"] = "completed"
+        order["qr_code"] = qr_code
+        
+        # Get event and ticket for emails
+        event = await db.events.find_one({"event_id": order["event_id"]}, {"_id": 0})
+        ticket = await db.tickets.find_one({"ticket_id": order["ticket_id"]}, {"_id": 0})
+        
+        # Create seller payout record
+        payout = SellerPayout(
+            seller_id=order["seller_id"],
+            order_id=order["order_id"],
+            ticket_id=order["ticket_id"],
+            gross_amount=order["total_amount"],
+            commission=order["commission"],
+            net_amount=order["ticket_price"]
+        )
+        payout_doc = to_document(payout)
+        await db.seller_payouts.insert_one(payout_doc)
+        
+        # Emails go out in the background; shutdown drains them
+        spawn(send_sale_emails(dict(order), event, ticket), name=f"sale-emails-{order['order_id']}")
+    
+    return {
+        "payment_status": payment_status,
+        "status": session.status,
+        "order": order
+    }
+
+async def send_sale_emails(order: dict, event: dict, ticket: dict):
+    """Send the buyer confirmation and seller sale notification for a completed order"""
+    # Send order confirmation email to buyer
+    try:
+        await send_order_confirmation(order, event, ticket, order["buyer_email"])
+    except Exception as e:
+        logger.error(f"Failed to send buyer email: {e}")
+    
+    # Send sale notification to seller
+    try:
+        seller = await db.users.find_one({"user_id": order["seller_id"]}, {"_id": 0})
+        if seller:
+            await send_seller_notification(order, event, ticket, seller["email"])
+    except Exception as e:
+        logger.error(f"Failed to send seller email: {e}")
+
+@router.post("/webhook/stripe")
+async def stripe_webhook(request: Request):
+    """Handle Stripe webhooks"""
+    payload = await request.body()
+    sig_header = request.headers.get("Stripe-Signature")
+    endpoint_secret = os.environ.get('STRIPE_WEBHOOK_SECRET', '')
+    
+    try:
+        if endpoint_secret:
+            event = stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
+        else:
+            # For testing without webhook secret
+            data = await request.json()
+            event = stripe.Event.construct_from(data, stripe.api_key)
+        
+        if event['type'] in ('checkout.session.completed', 'checkout.session.expired'):
+            session = event['data']['object']
+            metadata = session.get('metadata') or {}
+            if metadata.get('type') == 'raffle':
+                await handle_raffle_session(event['type'], session, metadata)
+                return {"received": True}
+        
+        if event['type'] == 'checkout.session.completed':
+            session = event['data']['object']
+            session_id = session['id']
+            payment_status = session.get('payment_status', '')
+            
+            if payment_status == "paid":
+                order = await db.orders.find_one(
+                    {"stripe_session_id": session_id},
+                    {"_id": 0}
+                )
+                
+                if order and order["status"] != "completed":
+                    qr_data = f"FANPASS-{order['order_id']}-{order['ticket_id']}"
+                    qr_code = generate_qr_code(qr_data)
+                    
+                    await db.orders.update_one(
+                        {"order_id": order["order_id"]},
+                        {"$set": {"status": "completed", "qr_code": qr_code}}
+                    )
+                    
+                    await db.tickets.update_one(
+                        {"ticket_id": order["ticket_id"]},
+                        {"$set": {"status": "sold"}}
+                    )
+                    
+                    await db.users.update_one(
+                        {"user_id": order["seller_id"]},
+                        {"$inc": {"total_sales": 1}}
+                    )
+        
+        return {"received": True}
+    except RaffleWebhookError:
+        raise HTTPException(status_code=500, detail="Raffle update failed")
+    except Exception as e:
+        logging.error(f"Webhook error: {e}")
+        return {"received": True}
+
+
+class RaffleWebhookError(Exception):
+    pass
+
+
+async def handle_raffle_session(event_type: str, session, metadata):
+    """Complete or release the entry's reserved slots.
+
+    Failures answer 500 so Stripe retries; otherwise the sweeper would release
+    the slots of a paid entry.
+    """
+    try:
+        entry_id = metadata.get('entry_id')
+        if not entry_id:
+            # Entries opened before reservations carried their id in the metadata
+            entry = await db.raffle_entries.find_one({"stripe_session_id": session['id']}, {"_id": 0, "entry_id": 1})
+            entry_id = entry and entry["entry_id"]
+        if not entry_id:
+            logger.warning(f"Raffle webhook for unknown session {session['id']}")
+        elif event_type == 'checkout.session.completed' and session.get('payment_status') == "paid":
+            await raffle_engine.complete(entry_id)
+        elif event_type == 'checkout.session.expired':
+            await raffle_engine.expire(entry_id)
+    except Exception as e:
+        logger.error(f"Raffle webhook error: {e}")
+        raise RaffleWebhookError() from e
+
+# ============== ORDERS ENDPOINTS ==============
+
+@router.get("/orders")
+async def get_orders(request: Request):
+    """Get user's orders"""
+    user = await require_auth(request)
+    
+    orders = await db.orders.find(
+        {"buyer_id": user.user_id},
+        {"_id": 0}
+    ).sort("created_at", -1).to_list(100)
+    
+    if orders:
+        # Batch fetch events and tickets
+        event_ids = list(set(o["event_id"] for o in orders))
+        ticket_ids = list(set(o["ticket_id"] for o in orders))
+        
+        events = await db.events.find({"event_id": {"$in": event_ids}}, {"_id": 0}).to_list(None)
+        tickets = await db.tickets.find({"ticket_id": {"$in": ticket_ids}}, {"_id": 0}).to_list(None)
+        
+        events_map = {e["event_id"]: e for e in events}
+        tickets_map = {t["ticket_id"]: t for t in tickets}
+        
+        for order in orders:
+            order["event"] = events_map.get(order["event_id"])
+            order["ticket"] = tickets_map.get(order["ticket_id"])
+    
+    return orders
+
+@router.get("/orders/{order_id}")
+async def get_order(order_id: str, request: Request):
+    """Get order details"""
+    user = await require_auth(request)
+    
+    order = await db.orders.find_one({"order_id": order_id}, {"_id": 0})
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    if order["buyer_id"] != user.user_id and user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    event = await db.events.find_one({"event_id": order["event_id"]}, {"_id": 0})
+    ticket = await db.tickets.find_one({"ticket_id": order["ticket_id"]}, {"_id": 0})
+    
+    order["event"] = event
+    order["ticket"] = ticket
+    
+    return order
+
+# ============== DISPUTES ENDPOINTS ==============
+
+@router.post("/disputes")
+async def create_dispute(request: Request):
+    """Create a dispute"""
+    user = await require_auth(request)
+    body = await request.json()
+    
+    order_id = body.get("order_id")
+    reason = body.get("reason")
+    description = body.get("description")
+    
+    order = await db.orders.find_one({"order_id": order_id}, {"_id": 0})
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    if order["buyer_id"] != user.user_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    dispute = Dispute(
+        order_id=order_id,
+        buyer_id=user.user_id,
+        seller_id=order["seller_id"],
+        reason=reason,
+        description=description
+    )
+    
+    dispute_doc = to_document(dispute)
+    await db.disputes.insert_one(dispute_doc)
+    
+    await db.orders.update_one(
+        {"order_id": order_id},
+        {"$set": {"status": "disputed"}}
+    )
+    
+    return {"success": True, "dispute_id": dispute.dispute_id}
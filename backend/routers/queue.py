@@ -0,0 +1,108 @@
+"""
+Queue subsystem: the waiting room in front of checkout for high-demand
+on-sales. Can be mounted on its own workers (API_SUBSYSTEMS=queue) so queued
+pages never share a process with checkout.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from database import db, parse_datetime
+from deps import get_current_user, require_auth, require_admin
+from waiting_room import (QUEUE_ADMIT_MINUTES, QUEUE_RATE_PER_MINUTE, QueueRequired, QueueUnavailable,
+                          queue_hub, waiting_room)
+
+router = APIRouter(prefix="/api", tags=["queue"])
+
+
+class QueueSettings(BaseModel):
+    active: bool = True
+    rate_per_minute: int = QUEUE_RATE_PER_MINUTE
+    admit_minutes: int = QUEUE_ADMIT_MINUTES
+    opens_at: Optional[str] = None
+
+
+async def ensure_indexes():
+    await waiting_room.store.ensure_indexes()
+
+
+async def shutdown():
+    queue_hub.close()
+
+# ============== WAITING ROOM ==============
+
+@router.get("/events/{event_id}/queue")
+async def get_queue(event_id: str, request: Request):
+    """Whether the event has an active queue and, for a signed-in buyer, their place in it"""
+    room = await waiting_room.room(event_id)
+    if not room or not room.get("active"):
+        return {"event_id": event_id, "active": False}
+    
+    user = await get_current_user(request)
+    entry = await waiting_room.store.get_entry(event_id, user.user_id) if user else None
+    if not entry:
+        return {"event_id": event_id, "active": True, "state": "not_joined"}
+    entry = await waiting_room.sequence(entry, room)
+    try:
+        token = waiting_room.token(entry)
+    except QueueUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {**waiting_room.status(entry, room), "active": True, "token": token}
+
+@router.post("/events/{event_id}/queue")
+async def join_queue(event_id: str, request: Request):
+    """Take a place in the queue; joining again returns the same place"""
+    user = await require_auth(request)
+    try:
+        status = await waiting_room.join(event_id, user.user_id)
+    except QueueRequired as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except QueueUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {**status, "active": True, "stream_url": f"/api/events/{event_id}/queue/stream?token={status['token']}"}
+
+@router.get("/events/{event_id}/queue/stream")
+async def queue_stream(event_id: str, token: str):
+    """Server-Sent Events: the current status, then position updates until admitted.
+
+    Authenticated by the signed queue token alone, so reconnects cost one read.
+    """
+    claims = waiting_room.verify(token)
+    if claims is None or claims[0] != event_id:
+        raise HTTPException(status_code=403, detail="Invalid queue token")
+    entry = await waiting_room.store.get_entry_by_id(claims[2])
+    if not entry:
+        raise HTTPException(status_code=404, detail="Queue place not found")
+    
+    return StreamingResponse(
+        queue_hub.stream(event_id, entry),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.put("/admin/events/{event_id}/queue")
+async def configure_queue(event_id: str, settings: QueueSettings, request: Request):
+    """Turn the waiting room on (or off) for an event and set its admission rate"""
+    await require_admin(request)
+    event = await db.events.find_one({"event_id": event_id}, {"_id": 0, "event_id": 1})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if settings.rate_per_minute < 1 or settings.admit_minutes < 1:
+        raise HTTPException(status_code=400, detail="rate_per_minute and admit_minutes must be positive")
+    
+    try:
+        opens_at = parse_datetime(settings.opens_at)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid opens_at")
+    try:
+        room = await waiting_room.configure(
+            event_id, active=settings.active, rate_per_minute=settings.rate_per_minute,
+            admit_minutes=settings.admit_minutes, opens_at=opens_at.timestamp() if opens_at else None
+        )
+    except QueueUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    room.pop("_id", None)
+    return {"event_id": event_id, **room}
@@ -0,0 +1,274 @@
+"""
+Raffle subsystem: World Cup raffle entries paid through Stripe, with
+capacity enforced by raffle_engine and verifiable draws by raffle_draw
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from background import spawn
+from database import db
+from deps import get_current_user, require_admin
+from http_clients import CircuitOpen
+from jobs import Job, JobConflict, runner
+from payments import stripe, call_stripe
+from raffle_draw import ALGORITHM, Draw, commitment, new_seed, participant
+from raffle_engine import raffle_engine, SoldOut, RAFFLE_RESERVATION_MINUTES
+
+router = APIRouter(prefix="/api", tags=["raffle"])
+
+# ============== RAFFLE SYSTEM ==============
+
+class RaffleEntry(BaseModel):
+    raffle_type: str
+    price: float = 100
+    entries: int = 1
+
+
+async def ensure_indexes():
+    await raffle_engine.store.ensure_indexes()
+    await db.raffle_draws.create_index("draw_id", unique=True)
+
+
+async def startup():
+    # Counters are also created on first use; don't hold up startup on the DB
+    spawn(raffle_engine.setup(), name="raffle-counters")
+    raffle_engine.start_sweeper()
+
+
+async def shutdown():
+    await raffle_engine.stop_sweeper()
+
+
+@router.post("/raffle/checkout")
+async def create_raffle_checkout(entry: RaffleEntry, request: Request):
+    """Create Stripe checkout for raffle entry.
+
+    Entry slots are reserved before the Stripe session exists and held until
+    the session completes or expires, so the raffle can never be oversold.
+    """
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Please sign in to enter the raffle")
+    
+    try:
+        raffle = raffle_engine.raffle(entry.raffle_type)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Raffle not found")
+    if not 1 <= entry.entries <= raffle.max_entries_per_checkout:
+        raise HTTPException(status_code=400, detail=f"You can buy 1 to {raffle.max_entries_per_checkout} entries at a time")
+    
+    try:
+        raffle_entry = await raffle_engine.open_entry(entry.raffle_type, entry.entries, user, entry.price)
+    except SoldOut:
+        raise HTTPException(status_code=409, detail="Sorry, the raffle is sold out")
+    
+    try:
+        # Create Stripe Checkout Session
+        checkout_session = await call_stripe(
+            stripe.checkout.Session.create_async,
+            payment_method_types=['card'],
+            line_items=[{
+                'price_data': {
+                    'currency': 'eur',
+                    'unit_amount': int(entry.price * 100),  # Stripe uses cents
+                    'product_data': {
+                        'name': 'World Cup 2026 VIP Raffle Entry',
+                        'description': 'Enter for a chance to win an all-inclusive trip for 2 to FIFA World Cup 2026!',
+                        'images': ['https://images.pexels.com/photos/46798/the-ball-stadion-football-the-pitch-46798.jpeg'],
+                    },
+                },
+                'quantity': entry.entries,
+            }],
+            mode='payment',
+            expires_at=int((datetime.now(timezone.utc) + timedelta(minutes=RAFFLE_RESERVATION_MINUTES)).timestamp()),
+            success_url=f'{os.environ.get("FRONTEND_URL")}/raffle/success?session_id={{CHECKOUT_SESSION_ID}}',
+            cancel_url=f'{os.environ.get("FRONTEND_URL")}/world-cup-raffle',
+            metadata={
+                'type': 'raffle',
+                'raffle_type': entry.raffle_type,
+                'entry_id': raffle_entry["entry_id"],
+                'user_id': user.user_id,
+                'user_email': user.email
+            }
+        )
+        await raffle_engine.attach_session(raffle_entry["entry_id"], checkout_session.id)
+        
+        return {"checkout_url": checkout_session.url}
+        
+    except Exception as e:
+        # No checkout to complete: give the slots back now
+        await raffle_engine.expire(raffle_entry["entry_id"])
+        if isinstance(e, CircuitOpen):
+            raise
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/raffle/entries")
+async def get_raffle_entries(request: Request):
+    """Get raffle entries for current user"""
+    user = await get_current_user(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Not authenticated")
+    
+    entries = await db.raffle_entries.find(
+        {"user_id": user.user_id},
+        {"_id": 0}
+    ).to_list(100)
+    
+    return entries
+
+@router.get("/raffle/stats")
+async def get_raffle_stats(raffle_type: str = "world_cup_2026"):
+    """Get raffle statistics (from the capacity counter, not a count of entries)"""
+    try:
+        return await raffle_engine.stats(raffle_type)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Raffle not found")
+
+# ============== RAFFLE DRAW ==============
+
+DRAW_CHECKPOINT_EVERY = int(os.environ.get('RAFFLE_DRAW_CHECKPOINT_EVERY', '50000'))
+DRAW_PUBLIC_FIELDS = {"_id": 0, "seed": 0, "state": 0, "winner_users": 0}
+
+
+class DrawRequest(BaseModel):
+    winners: int = 1
+    alternates: int = 0
+
+
+def _draw_entries(draw: dict, after: str = None):
+    """Entries in the draw, in entry_id order: completed before the commit"""
+    query = {
+        "raffle_type": draw["raffle_type"],
+        "status": "completed",
+        "$or": [{"completed_at": {"$lte": draw["committed_at"]}}, {"completed_at": {"$exists": False}}]
+    }
+    if after:
+        query["entry_id"] = {"$gt": after}
+    return db.raffle_entries.find(
+        query, {"_id": 0, "entry_id": 1, "user_id": 1, "entries": 1}
+    ).sort("entry_id", 1).batch_size(5000)
+
+
+@runner.handler("raffle_draw")
+async def run_raffle_draw(job: Job):
+    """Stream the entries once through the A-Res draw, checkpointing every DRAW_CHECKPOINT_EVERY entries"""
+    draw_doc = await db.raffle_draws.find_one({"draw_id": job.params["draw_id"]}, {"_id": 0})
+    if not draw_doc or draw_doc["status"] == "drawn":
+        return
+    places = draw_doc["winners"] + draw_doc["alternates"]
+    draw = Draw.from_state(draw_doc["seed"], places, job.state.get("draw"))
+    last_entry_id = job.state.get("last_entry_id")
+
+    since_checkpoint = 0
+    async for entry in _draw_entries(draw_doc, after=last_entry_id):
+        draw.add(entry["entry_id"], participant(entry["user_id"]), entry.get("entries", 1))
+        last_entry_id = entry["entry_id"]
+        since_checkpoint += 1
+        if since_checkpoint >= DRAW_CHECKPOINT_EVERY:
+            await job.progress(done=since_checkpoint, state={"draw": draw.to_state(), "last_entry_id": last_entry_id})
+            since_checkpoint = 0
+
+    winners = draw.winners()
+    # Winners' user ids are only kept for the admin view
+    winner_users = {}
+    for winner in winners:
+        winner["alternate"] = winner["rank"] > draw_doc["winners"]
+        entry = await db.raffle_entries.find_one({"entry_id": winner["entry_id"]}, {"_id": 0, "user_id": 1})
+        winner_users[winner["entry_id"]] = entry["user_id"]
+
+    await db.raffle_draws.update_one({"draw_id": draw_doc["draw_id"]}, {"$set": {
+        "status": "drawn",
+        "revealed_seed": draw_doc["seed"],
+        "algorithm": ALGORITHM,
+        "entries_digest": draw.digest,
+        "entry_count": draw.count,
+        "total_weight": draw.total_weight,
+        "results": winners,
+        "winner_users": winner_users,
+        "verification_hash": draw.verification_hash(draw_doc["raffle_type"]),
+        "drawn_at": datetime.now(timezone.utc)
+    }})
+    await job.progress(done=since_checkpoint, state={"draw": draw.to_state(), "last_entry_id": last_entry_id})
+
+
+@router.post("/admin/raffle/{raffle_type}/draws")
+async def commit_raffle_draw(raffle_type: str, body: DrawRequest, request: Request):
+    """Commit to a secret seed for the draw; only its sha256 is published until the draw runs"""
+    user = await require_admin(request)
+    try:
+        raffle_engine.raffle(raffle_type)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Raffle not found")
+    if body.winners < 1 or body.alternates < 0 or body.winners + body.alternates > 100:
+        raise HTTPException(status_code=400, detail="Choose 1-100 places in total")
+    
+    seed = new_seed()
+    draw = {
+        "draw_id": f"draw_{uuid.uuid4().hex[:12]}",
+        "raffle_type": raffle_type,
+        "winners": body.winners,
+        "alternates": body.alternates,
+        "seed": seed,
+        "seed_commitment": commitment(seed),
+        "status": "committed",
+        "created_by": user.user_id,
+        "committed_at": datetime.now(timezone.utc)
+    }
+    await db.raffle_draws.insert_one(dict(draw))
+    return {k: v for k, v in draw.items() if k != "seed"}
+
+@router.post("/admin/raffle/draws/{draw_id}/run", status_code=202)
+async def run_draw(draw_id: str, request: Request):
+    """Run a committed draw as a background job"""
+    user = await require_admin(request)
+    draw = await db.raffle_draws.find_one({"draw_id": draw_id}, {"_id": 0, "status": 1})
+    if not draw:
+        raise HTTPException(status_code=404, detail="Draw not found")
+    if draw["status"] == "drawn":
+        raise HTTPException(status_code=409, detail="Draw already completed")
+    
+    try:
+        job = await runner.submit("raffle_draw", {"draw_id": draw_id}, created_by=user.user_id)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=f"Another draw is running ({e.active['params'].get('draw_id')}); "
+                                                    f"try again when job {e.active['job_id']} finishes")
+    return {"job_id": job["job_id"], "status_url": f"/api/admin/jobs/{job['job_id']}"}
+
+@router.get("/admin/raffle/draws/{draw_id}")
+async def get_draw_admin(draw_id: str, request: Request):
+    """Draw including the winners' user ids (admin only)"""
+    user = await require_admin(request)
+    draw = await db.raffle_draws.find_one({"draw_id": draw_id}, {"_id": 0, "seed": 0})
+    if not draw:
+        raise HTTPException(status_code=404, detail="Draw not found")
+    return draw
+
+@router.get("/raffle/draws/{draw_id}")
+async def get_draw(draw_id: str):
+    """Public draw record: the seed commitment, and once drawn the seed, winners and verification hash"""
+    draw = await db.raffle_draws.find_one({"draw_id": draw_id}, DRAW_PUBLIC_FIELDS)
+    if not draw:
+        raise HTTPException(status_code=404, detail="Draw not found")
+    return draw
+
+@router.get("/raffle/draws/{draw_id}/entries")
+async def get_draw_entries(draw_id: str):
+    """The entry list the draw ran over, as NDJSON (entry_id, participant, entries), for independent verification"""
+    draw = await db.raffle_draws.find_one({"draw_id": draw_id}, {"_id": 0, "seed": 0})
+    if not draw:
+        raise HTTPException(status_code=404, detail="Draw not found")
+    if draw["status"] != "drawn":
+        raise HTTPException(status_code=409, detail="Entries are published once the draw has run")
+
+    async def rows():
+        async for entry in _draw_entries(draw):
+            yield json.dumps([entry["entry_id"], participant(entry["user_id"]), entry.get("entries", 1)]) + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
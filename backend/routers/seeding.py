@@ -0,0 +1,667 @@
+"""
+Seeding subsystem: demo and tournament catalogue data, plus the admin
+maintenance jobs that clear or fix it. Datasets live in seed_data/*.json;
+production deployments normally leave this subsystem off.
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request
+
+from database import db, to_document
+from deps import require_admin
+from jobs import Job, JobConflict, runner
+from maintenance import delete, run_operations, update
+from models import User, Event, Ticket
+
+router = APIRouter(prefix="/api", tags=["seeding"])
+
+# ============== SEED DATA ==============
+
+SEED_DATA_DIR = Path(__file__).resolve().parent.parent / "seed_data"
+
+
+def load_seed_data(name: str) -> dict:
+    """Load a seed dataset from seed_data/<name>.json"""
+    with open(SEED_DATA_DIR / f"{name}.json", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@router.post("/add-worldcup-2026")
+async def add_worldcup_2026():
+    """Add FIFA World Cup 2026 matches with all ticket categories"""
+    import random
+    
+    # World Cup 2026 venues (USA, Mexico, Canada)
+    seed = load_seed_data("worldcup_2026")
+    wc_matches = seed["wc_matches"]
+    
+    # Ticket categories with prices
+    ticket_categories = seed["ticket_categories"]
+    
+    added_events = 0
+    added_tickets = 0
+    
+    for match in wc_matches:
+        # Create event
+        event_id = f"wc2026_{uuid.uuid4().hex[:8]}"
+        event = {
+            "event_id": event_id,
+            "event_type": "match",
+            "title": f"FIFA World Cup 2026: {match['home']} vs {match['away']}",
+            "subtitle": match["stage"],
+            "home_team": match["home"],
+            "away_team": match["away"],
+            "league": "FIFA World Cup 2026",
+            "venue": match["venue"],
+            "city": match["city"],
+            "country": match["country"],
+            "event_date": datetime.now(timezone.utc) + timedelta(days=match["days"]),
+            "event_image": "https://images.pexels.com/photos/46798/the-ball-stadion-football-the-pitch-46798.jpeg?auto=compress&w=800",
+            "featured": match["featured"],
+            "status": "upcoming",
+            "created_at": datetime.now(timezone.utc)
+        }
+        await db.events.insert_one(event)
+        added_events += 1
+        
+        # Add tickets for each category
+        for cat in ticket_categories:
+            # More tickets for higher categories (finals get more VIP)
+            num_tickets = random.randint(5, 15) if "vip" in cat["category"] else random.randint(10, 25)
+            
+            # Finals have higher prices
+            price_multiplier = 2.5 if "FINAL" in match["stage"] else (1.5 if "Semi" in match["stage"] else 1.0)
+            
+            for i in range(num_tickets):
+                price = round(cat["base_price"] * price_multiplier * random.uniform(0.9, 1.2), 2)
+                ticket = {
+                    "ticket_id": f"wc_{uuid.uuid4().hex[:10]}",
+                    "event_id": event_id,
+                    "seller_id": "seller_euromatch",
+                    "seller_name": "EuroMatchTickets Official",
+                    "category": cat["category"],
+                    "section": cat["section"],
+                    "row": "VIP" if "vip" in cat["category"] else str(random.randint(1, 30)),
+                    "seat": f"Suite {random.randint(1, 50)}" if "vip" in cat["category"] else str(random.randint(1, 50)),
+                    "price": price,
+                    "original_price": cat["base_price"] * price_multiplier,
+                    "currency": "EUR",
+                    "status": "available",
+                    "created_at": datetime.now(timezone.utc)
+                }
+                await db.tickets.insert_one(ticket)
+                added_tickets += 1
+    
+    return {
+        "message": "FIFA World Cup 2026 data added!",
+        "events_added": added_events,
+        "tickets_added": added_tickets
+    }
+
+@router.post("/add-champions-league")
+async def add_champions_league():
+    """Add UEFA Champions League matches with tickets"""
+    import random
+    
+    seed = load_seed_data("champions_league")
+    ucl_matches = seed["ucl_matches"]
+    
+    ticket_categories = seed["ticket_categories"]
+    
+    added_events = 0
+    added_tickets = 0
+    
+    for match in ucl_matches:
+        event_id = f"ucl_{uuid.uuid4().hex[:8]}"
+        event = {
+            "event_id": event_id,
+            "event_type": "match",
+            "title": f"UCL: {match['home']} vs {match['away']}",
+            "subtitle": f"Champions League {match['stage']}",
+            "home_team": match["home"],
+            "away_team": match["away"],
+            "league": "UEFA Champions League",
+            "venue": match["venue"],
+            "city": match["city"],
+            "country": match["country"],
+            "event_date": datetime.now(timezone.utc) + timedelta(days=match["days"]),
+            "event_image": "https://images.pexels.com/photos/274422/pexels-photo-274422.jpeg?auto=compress&w=800",
+            "featured": match["featured"],
+            "status": "upcoming",
+            "created_at": datetime.now(timezone.utc)
+        }
+        await db.events.insert_one(event)
+        added_events += 1
+        
+        price_multiplier = 3.0 if "FINAL" in match["stage"] else (1.8 if "Semi" in match["stage"] else 1.0)
+        
+        for cat in ticket_categories:
+            num_tickets = random.randint(8, 20)
+            for i in range(num_tickets):
+                price = round(cat["base_price"] * price_multiplier * random.uniform(0.85, 1.25), 2)
+                ticket = {
+                    "ticket_id": f"ucl_{uuid.uuid4().hex[:10]}",
+                    "event_id": event_id,
+                    "seller_id": "seller_euromatch",
+                    "seller_name": "EuroMatchTickets Official",
+                    "category": cat["category"],
+                    "section": cat["section"],
+                    "row": "VIP" if "vip" in cat["category"] else str(random.randint(1, 25)),
+                    "seat": str(random.randint(1, 40)),
+                    "price": price,
+                    "original_price": cat["base_price"] * price_multiplier,
+                    "currency": "EUR",
+                    "status": "available",
+                    "created_at": datetime.now(timezone.utc)
+                }
+                await db.tickets.insert_one(ticket)
+                added_tickets += 1
+    
+    return {
+        "message": "Champions League data added!",
+        "events_added": added_events,
+        "tickets_added": added_tickets
+    }
+
+@router.post("/add-euro-leagues")
+async def add_euro_leagues():
+    """Add Premier League, La Liga, Bundesliga, Serie A matches"""
+    import random
+    
+    seed = load_seed_data("euro_leagues")
+    all_matches = seed["all_matches"]
+    
+    ticket_categories = seed["ticket_categories"]
+    
+    added_events = 0
+    added_tickets = 0
+    
+    for match in all_matches:
+        event_id = f"league_{uuid.uuid4().hex[:8]}"
+        event = {
+            "event_id": event_id,
+            "event_type": "match",
+            "title": f"{match['home']} vs {match['away']}",
+            "subtitle": match["league"],
+            "home_team": match["home"],
+            "away_team": match["away"],
+            "league": match["league"],
+            "venue": match["venue"],
+            "city": match["city"],
+            "country": match["country"],
+            "event_date": datetime.now(timezone.utc) + timedelta(days=match["days"]),
+            "event_image": "https://images.pexels.com/photos/46798/the-ball-stadion-football-the-pitch-46798.jpeg?auto=compress&w=800",
+            "featured": match["featured"],
+            "status": "upcoming",
+            "created_at": datetime.now(timezone.utc)
+        }
+        await db.events.insert_one(event)
+        added_events += 1
+        
+        # El Clasico and derbies have higher prices
+        price_multiplier = 1.8 if "Clásico" in match["league"] or "Derby" in match["league"] else 1.0
+        
+        for cat in ticket_categories:
+            num_tickets = random.randint(15, 35)
+            for i in range(num_tickets):
+                price = round(cat["base_price"] * price_multiplier * random.uniform(0.8, 1.3), 2)
+                ticket = {
+                    "ticket_id": f"lg_{uuid.uuid4().hex[:10]}",
+                    "event_id": event_id,
+                    "seller_id": "seller_euromatch",
+                    "seller_name": "EuroMatchTickets Official",
+                    "category": cat["category"],
+                    "section": cat["section"],
+                    "row": str(random.randint(1, 30)),
+                    "seat": str(random.randint(1, 50)),
+                    "price": price,
+                    "original_price": cat["base_price"] * price_multiplier,
+                    "currency": "EUR",
+                    "status": "available",
+                    "created_at": datetime.now(timezone.utc)
+                }
+                await db.tickets.insert_one(ticket)
+                added_tickets += 1
+    
+    return {
+        "message": "European Leagues data added!",
+        "events_added": added_events,
+        "tickets_added": added_tickets
+    }
+
+# ============== MAINTENANCE ==============
+
+UNWANTED_TYPES = ["train", "attraction", "festival", "f1", "tennis"]
+
+MAINTENANCE_TASKS = {
+    "reset": [
+        delete("events"),
+        delete("tickets"),
+        delete("users", {"user_id": {"$in": ["admin_001", "seller_demo"]}}),
+    ],
+    "reseed": [delete("events"), delete("tickets")],
+    "cleanup_categories": [
+        delete("events", {"event_type": {"$in": UNWANTED_TYPES}}, cascade=[("tickets", "event_id")]),
+    ],
+    "fix_tickets_seller": [
+        update("tickets",
+               {"$or": [{"seller_id": {"$exists": False}}, {"seller_id": None}, {"seller_id": ""}]},
+               {"$set": {"seller_id": "seller_euromatch", "seller_name": "EuroMatchTickets Official"}}),
+    ],
+}
+
+
+@runner.handler("maintenance")
+async def run_maintenance(job: Job):
+    """Batched, rate-limited deletes/updates for one of MAINTENANCE_TASKS"""
+    task = job.params["task"]
+    await run_operations(job, db, MAINTENANCE_TASKS[task])
+    if task == "reseed":
+        await seed_data()
+
+
+async def start_maintenance(request: Request, task: str) -> dict:
+    """Start a maintenance job (admin only), or return the one already running for this task"""
+    user = await require_admin(request)
+    try:
+        job = await runner.submit("maintenance", {"task": task}, created_by=user.user_id)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=f"Maintenance task {e.active['params'].get('task')} is running; "
+                                                    f"try again when job {e.active['job_id']} finishes")
+    return {
+        "success": True,
+        "job_id": job["job_id"],
+        "task": job["params"]["task"],
+        "status": job["status"],
+        "status_url": f"/api/admin/jobs/{job['job_id']}"
+    }
+
+
+@router.post("/reset-and-seed", status_code=202)
+async def reset_and_seed(request: Request):
+    """Delete all events and tickets in the background; call /api/seed to repopulate"""
+    return await start_maintenance(request, "reset")
+
+@router.post("/cleanup-categories", status_code=202)
+async def cleanup_categories(request: Request):
+    """Remove unwanted event categories (trains, attractions, festivals, f1, tennis) and their tickets"""
+    return await start_maintenance(request, "cleanup_categories")
+
+@router.post("/fix-tickets-seller", status_code=202)
+async def fix_tickets_seller(request: Request):
+    """Add seller_id to all tickets that don't have one"""
+    return await start_maintenance(request, "fix_tickets_seller")
+
+@router.post("/add-vip-worldcup-tickets")
+async def add_vip_worldcup_tickets():
+    """Add premium VIP World Cup 2026 tickets with competitive prices"""
+    import random
+    
+    # Get all World Cup events
+    wc_events = await db.events.find(
+        {"title": {"$regex": "FIFA World Cup 2026|World Cup", "$options": "i"}},
+        {"_id": 0}
+    ).to_list(100)
+    
+    if not wc_events:
+        return {"error": "No World Cup events found"}
+    
+    added_tickets = 0
+    
+    # VIP Packages with competitive prices
+    seed = load_seed_data("vip_worldcup")
+    vip_packages = seed["vip_packages"]
+    
+    for event in wc_events:
+        for pkg in vip_packages:
+            # Add 3-5 tickets per package per event
+            for i in range(random.randint(3, 5)):
+                price_variation = random.uniform(0.95, 1.15)
+                price = round(pkg["base_price"] * price_variation, 2)
+                
+                ticket = {
+                    "ticket_id": f"vip_{uuid.uuid4().hex[:12]}",
+                    "event_id": event["event_id"],
+                    "seller_id": "seller_euromatch",
+                    "seller_name": "EuroMatchTickets Official",
+                    "category": pkg["category"],
+                    "section": pkg["section"],
+                    "row": str(random.randint(1, 10)) if pkg["category"] != "vip" else "VIP",
+                    "seat": str(random.randint(1, 30)) if pkg["category"] != "vip" else f"Suite {random.randint(1, 20)}",
+                    "price": price,
+                    "original_price": pkg["base_price"],
+                    "currency": "EUR",
+                    "status": "available",
+                    "description": pkg["description"],
+                    "created_at": datetime.now(timezone.utc)
+                }
+                await db.tickets.insert_one(ticket)
+                added_tickets += 1
+    
+    return {
+        "message": "VIP World Cup tickets added",
+        "tickets_added": added_tickets,
+        "events_updated": len(wc_events)
+    }
+
+@router.post("/reseed", status_code=202)
+async def reseed_data(request: Request):
+    """Clear and reseed demo data in the background"""
+    return await start_maintenance(request, "reseed")
+
+@router.post("/seed")
+async def seed_data():
+    """Seed demo data"""
+    existing = await db.events.count_documents({})
+    if existing > 0:
+        return {"message": "Already seeded"}
+    
+    # Team logos
+    seed = load_seed_data("demo")
+    team_logos = seed["team_logos"]
+    
+    leagues = seed["leagues"]
+    
+    # Football matches - BIG EVENTS 2025
+    matches_data = seed["matches_data"]
+    
+    for m in matches_data:
+        event = Event(
+            event_type="match",
+            title=f"{m['home']} vs {m['away']}",
+            subtitle=m.get("subtitle", ""),
+            home_team=m["home"],
+            away_team=m["away"],
+            home_logo=team_logos.get(m["home"], ""),
+            away_logo=team_logos.get(m["away"], ""),
+            league=m["league"],
+            league_logo=leagues.get(m["league"], ""),
+            venue=m["venue"],
+            city=m["city"],
+            country=m["country"],
+            event_date=datetime.now(timezone.utc) + timedelta(days=m["days"]),
+            event_image="https://images.pexels.com/photos/46798/the-ball-stadion-football-the-pitch-46798.jpeg",
+            featured=m["featured"]
+        )
+        event_doc = to_document(event)
+        await db.events.insert_one(event_doc)
+    
+    # Concert data - MAJOR TOURS 2025
+    concerts_data = seed["concerts_data"]
+    
+    for c in concerts_data:
+        event = Event(
+            event_type="concert",
+            title=f"{c['artist']} Live",
+            subtitle=c["tour"],
+            artist=c["artist"],
+            artist_image=c["image"],
+            genre=c["genre"],
+            venue=c["venue"],
+            city=c["city"],
+            country=c["country"],
+            event_date=datetime.now(timezone.utc) + timedelta(days=c["days"]),
+            event_image=c["image"],
+            featured=c["featured"]
+        )
+        event_doc = to_document(event)
+        await db.events.insert_one(event_doc)
+    
+    # Create demo users
+    admin_user = User(
+        user_id="admin_001",
+        email="admin@fanpass.com",
+        name="FanPass Admin",
+        role="admin",
+        kyc_status="verified"
+    )
+    admin_doc = to_document(admin_user)
+    await db.users.insert_one(admin_doc)
+    
+    seller_user = User(
+        user_id="seller_demo",
+        email="seller@fanpass.com",
+        name="Premium Tickets GmbH",
+        role="seller",
+        rating=4.8,
+        total_sales=234,
+        kyc_status="verified"
+    )
+    seller_doc = to_document(seller_user)
+    await db.users.insert_one(seller_doc)
+    
+    # Add tickets for all events
+    all_events = await db.events.find({}, {"_id": 0}).to_list(100)
+    
+    import random
+    
+    match_categories = seed["match_categories"]
+    
+    concert_categories = seed["concert_categories"]
+    
+    for event in all_events:
+        categories = concert_categories if event["event_type"] == "concert" else match_categories
+        
+        for cat in categories:
+            for section in cat["sections"]:
+                for _ in range(random.randint(3, 8)):
+                    price_variation = random.uniform(0.85, 1.4)
+                    price = round(cat["base_price"] * price_variation, 2)
+                    
+                    ticket = Ticket(
+                        event_id=event["event_id"],
+                        seller_id="seller_demo",
+                        seller_name="Premium Tickets GmbH",
+                        category=cat["name"],
+                        section=section,
+                        row=str(random.randint(1, 25)) if cat["name"] not in ["standing", "floor"] else None,
+                        seat=str(random.randint(1, 40)) if cat["name"] not in ["standing", "floor"] else None,
+                        price=price,
+                        original_price=cat["base_price"]
+                    )
+                    
+                    ticket_doc = to_document(ticket)
+                    await db.tickets.insert_one(ticket_doc)
+    
+    return {"message": "Seeded successfully", "events": len(all_events)}
+
+@router.post("/seed-expanded")
+async def seed_expanded_categories():
+    """Add trains, theme parks, F1, tennis, festivals to the marketplace"""
+    import random
+    
+    added_events = []
+    
+    # ============== HIGH-SPEED TRAINS ==============
+    seed = load_seed_data("expanded")
+    trains_data = seed["trains_data"]
+    
+    for t in trains_data:
+        event = Event(
+            event_type="train",
+            title=t["title"],
+            subtitle=t["subtitle"],
+            description=f"Book {t['operator']} tickets. Route: {t['route']}. Fast, comfortable, and eco-friendly travel across Europe.",
+            venue=t["route"],
+            city=t["city"],
+            country=t["country"],
+            event_date=datetime.now(timezone.utc) + timedelta(days=t["days"]),
+            event_image=t["image"],
+            featured=t["featured"]
+        )
+        event_doc = to_document(event)
+        await db.events.insert_one(event_doc)
+        
+        # Add train tickets
+        for _ in range(random.randint(20, 50)):
+            price = round(t["base_price"] * random.uniform(0.7, 2.0), 2)
+            ticket = Ticket(
+                event_id=event.event_id,
+                seller_id="seller_demo",
+                seller_name="EuroRail Tickets",
+                category=random.choice(["standard", "first_class", "business"]),
+                section=random.choice(["Coach A", "Coach B", "Coach C", "Coach D"]),
+                price=price,
+                original_price=t["base_price"]
+            )
+            ticket_doc = to_document(ticket)
+            await db.tickets.insert_one(ticket_doc)
+        
+        added_events.append(event.event_id)
+    
+    # ============== THEME PARKS & ATTRACTIONS ==============
+    attractions_data = seed["attractions_data"]
+    
+    for a in attractions_data:
+        event = Event(
+            event_type="attraction",
+            title=a["title"],
+            subtitle=a["subtitle"],
+            venue=a["venue"],
+            city=a["city"],
+            country=a["country"],
+            event_date=datetime.now(timezone.utc) + timedelta(days=a["days"]),
+            event_image=a["image"],
+            featured=a["featured"]
+        )
+        event_doc = to_document(event)
+        await db.events.insert_one(event_doc)
+        
+        # Add tickets
+        for _ in range(random.randint(30, 80)):
+            price = round(a["base_price"] * random.uniform(0.9, 1.5), 2)
+            ticket = Ticket(
+                event_id=event.event_id,
+                seller_id="seller_demo",
+                seller_name="EuroAttractions",
+                category=random.choice(["standard", "priority", "vip"]),
+                section="General",
+                price=price,
+                original_price=a["base_price"]
+            )
+            ticket_doc = to_document(ticket)
+            await db.tickets.insert_one(ticket_doc)
+        
+        added_events.append(event.event_id)
+    
+    # ============== MUSIC FESTIVALS ==============
+    festivals_data = seed["festivals_data"]
+    
+    for f in festivals_data:
+        event = Event(
+            event_type="festival",
+            title=f["title"],
+            subtitle=f["subtitle"],
+            venue=f["venue"],
+            city=f["city"],
+            country=f["country"],
+            event_date=datetime.now(timezone.utc) + timedelta(days=f["days"]),
+            event_image=f["image"],
+            featured=f["featured"]
+        )
+        event_doc = to_document(event)
+        await db.events.insert_one(event_doc)
+        
+        # Add festival tickets
+        for _ in range(random.randint(15, 40)):
+            price = round(f["base_price"] * random.uniform(0.9, 1.8), 2)
+            ticket = Ticket(
+                event_id=event.event_id,
+                seller_id="seller_demo",
+                seller_name="Festival Tickets Europe",
+                category=random.choice(["day_pass", "weekend", "full_madness", "vip"]),
+                section="General Admission",
+                price=price,
+                original_price=f["base_price"]
+            )
+            ticket_doc = to_document(ticket)
+            await db.tickets.insert_one(ticket_doc)
+        
+        added_events.append(event.event_id)
+    
+    # ============== FORMULA 1 ==============
+    f1_data = seed["f1_data"]
+    
+    for f1 in f1_data:
+        event = Event(
+            event_type="f1",
+            title=f1["title"],
+            subtitle=f1["subtitle"],
+            venue=f1["venue"],
+            city=f1["city"],
+            country=f1["country"],
+            event_date=datetime.now(timezone.utc) + timedelta(days=f1["days"]),
+            event_image=f1["image"],
+            featured=f1["featured"]
+        )
+        event_doc = to_document(event)
+        await db.events.insert_one(event_doc)
+        
+        # Add F1 tickets
+        categories = [
+            {"name": "grandstand", "base": f1["base_price"]},
+            {"name": "general_admission", "base": f1["base_price"] * 0.4},
+            {"name": "vip_hospitality", "base": f1["base_price"] * 3},
+            {"name": "paddock_club", "base": f1["base_price"] * 5}
+        ]
+        for cat in categories:
+            for _ in range(random.randint(5, 15)):
+                price = round(cat["base"] * random.uniform(0.9, 1.5), 2)
+                ticket = Ticket(
+                    event_id=event.event_id,
+                    seller_id="seller_demo",
+                    seller_name="F1 Tickets Pro",
+                    category=cat["name"],
+                    section=random.choice(["Turn 1", "Main Straight", "Pit Lane", "Sector 3"]),
+                    price=price,
+                    original_price=cat["base"]
+                )
+                ticket_doc = to_document(ticket)
+                await db.tickets.insert_one(ticket_doc)
+        
+        added_events.append(event.event_id)
+    
+    # ============== TENNIS GRAND SLAMS ==============
+    tennis_data = seed["tennis_data"]
+    
+    for t in tennis_data:
+        event = Event(
+            event_type="tennis",
+            title=t["title"],
+            subtitle=t["subtitle"],
+            venue=t["venue"],
+            city=t["city"],
+            country=t["country"],
+            event_date=datetime.now(timezone.utc) + timedelta(days=t["days"]),
+            event_image=t["image"],
+            featured=t["featured"]
+        )
+        event_doc = to_document(event)
+        await db.events.insert_one(event_doc)
+        
+        # Add tennis tickets
+        for _ in range(random.randint(10, 30)):
+            price = round(t["base_price"] * random.uniform(0.8, 2.0), 2)
+            ticket = Ticket(
+                event_id=event.event_id,
+                seller_id="seller_demo",
+                seller_name="Tennis Tickets EU",
+                category=random.choice(["centre_court", "court_1", "ground_pass", "debenture"]),
+                section=random.choice(["Lower Tier", "Upper Tier", "Royal Box Area"]),
+                price=price,
+                original_price=t["base_price"]
+            )
+            ticket_doc = to_document(ticket)
+            await db.tickets.insert_one(ticket_doc)
+        
+        added_events.append(event.event_id)
+    
+    return {
+        "message": "Expanded categories added successfully",
+        "added_events": len(added_events),
+        "categories": ["trains", "attractions", "festivals", "f1", "tennis"]
+    }
@@ -0,0 +1,170 @@
+"""
+Seller subsystem: listings management, payouts and dashboard stats
+"""
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, Request
+
+from database import db, to_document
+from deps import require_seller
+from models import Ticket, TicketCreate
+
+router = APIRouter(prefix="/api", tags=["seller"])
+
+
+async def ensure_indexes():
+    await db.seller_payouts.create_index([("seller_id", 1), ("created_at", -1)])
+
+# ============== TICKETS ENDPOINTS ==============
+
+@router.post("/tickets")
+async def create_ticket(ticket_data: TicketCreate, request: Request):
+    """Create a ticket listing (seller only)"""
+    user = await require_seller(request)
+    
+    event = await db.events.find_one({"event_id": ticket_data.event_id}, {"_id": 0})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    ticket = Ticket(
+        **ticket_data.model_dump(),
+        seller_id=user.user_id,
+        seller_name=user.name
+    )
+    
+    ticket_doc = to_document(ticket)
+    
+    await db.tickets.insert_one(ticket_doc)
+    return {"success": True, "ticket_id": ticket.ticket_id}
+
+@router.get("/seller/tickets")
+async def get_seller_tickets(request: Request):
+    """Get seller's tickets"""
+    user = await require_seller(request)
+    
+    tickets = await db.tickets.find(
+        {"seller_id": user.user_id},
+        {"_id": 0}
+    ).to_list(500)
+    
+    # Batch fetch events to avoid N+1 queries
+    if tickets:
+        event_ids = list(set(t["event_id"] for t in tickets))
+        events = await db.events.find({"event_id": {"$in": event_ids}}, {"_id": 0}).to_list(None)
+        events_map = {e["event_id"]: e for e in events}
+        
+        for ticket in tickets:
+            ticket["event"] = events_map.get(ticket["event_id"])
+    
+    return tickets
+
+@router.delete("/tickets/{ticket_id}")
+async def delete_ticket(ticket_id: str, request: Request):
+    """Delete a ticket (seller only)"""
+    user = await require_seller(request)
+    
+    ticket = await db.tickets.find_one({"ticket_id": ticket_id}, {"_id": 0})
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    
+    if ticket["seller_id"] != user.user_id and user.role != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    
+    if ticket["status"] != "available":
+        raise HTTPException(status_code=400, detail="Cannot delete sold ticket")
+    
+    await db.tickets.delete_one({"ticket_id": ticket_id})
+    return {"success": True}
+
+# ============== SELLER PAYOUTS ENDPOINTS ==============
+
+@router.get("/seller/payouts")
+async def get_seller_payouts(request: Request):
+    """Get seller's payout history"""
+    user = await require_seller(request)
+    
+    payouts = await db.seller_payouts.find(
+        {"seller_id": user.user_id},
+        {"_id": 0}
+    ).sort("created_at", -1).to_list(500)
+    
+    # Calculate totals
+    total_gross = sum(p.get("gross_amount", 0) for p in payouts)
+    total_commission = sum(p.get("commission", 0) for p in payouts)
+    total_net = sum(p.get("net_amount", 0) for p in payouts)
+    pending_amount = sum(p.get("net_amount", 0) for p in payouts if p.get("status") == "pending")
+    completed_amount = sum(p.get("net_amount", 0) for p in payouts if p.get("status") == "completed")
+    
+    # Batch fetch orders and events
+    if payouts:
+        order_ids = list(set(p["order_id"] for p in payouts))
+        orders = await db.orders.find({"order_id": {"$in": order_ids}}, {"_id": 0}).to_list(None)
+        orders_map = {o["order_id"]: o for o in orders}
+        
+        event_ids = list(set(o.get("event_id") for o in orders if o.get("event_id")))
+        events = await db.events.find({"event_id": {"$in": event_ids}}, {"_id": 0}).to_list(None)
+        events_map = {e["event_id"]: e for e in events}
+        
+        for payout in payouts:
+            order = orders_map.get(payout["order_id"])
+            payout["order"] = order
+            payout["event"] = events_map.get(order["event_id"]) if order else None
+    
+    return {
+        "payouts": payouts,
+        "summary": {
+            "total_gross": round(total_gross, 2),
+            "total_commission": round(total_commission, 2),
+            "total_net": round(total_net, 2),
+            "pending_amount": round(pending_amount, 2),
+            "completed_amount": round(completed_amount, 2),
+            "total_sales": len(payouts)
+        }
+    }
+
+@router.get("/seller/dashboard-stats")
+async def get_seller_dashboard_stats(request: Request):
+    """Get comprehensive seller dashboard statistics"""
+    user = await require_seller(request)
+    
+    # Get active tickets
+    active_tickets = await db.tickets.count_documents({
+        "seller_id": user.user_id,
+        "status": "available"
+    })
+    
+    # Get sold tickets
+    sold_tickets = await db.tickets.count_documents({
+        "seller_id": user.user_id,
+        "status": "sold"
+    })
+    
+    # Calculate earnings: one pass over the seller's payouts (seller_id prefix of the
+    # seller_id/created_at index) gives all-time, pending and current-month totals
+    now = datetime.now(timezone.utc)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    pipeline = [
+        {"$match": {"seller_id": user.user_id}},
+        {"$group": {
+            "_id": None,
+            "total": {"$sum": "$net_amount"},
+            "pending": {"$sum": {"$cond": [{"$eq": ["$status", "pending"]}, "$net_amount", 0]}},
+            "monthly": {"$sum": {"$cond": [{"$gte": ["$created_at", month_start]}, "$net_amount", 0]}}
+        }}
+    ]
+    earnings = await db.seller_payouts.aggregate(pipeline).to_list(1)
+    earnings = earnings[0] if earnings else {}
+    total_earnings = earnings.get("total", 0)
+    pending_earnings = earnings.get("pending", 0)
+    monthly_earnings = earnings.get("monthly", 0)
+    
+    return {
+        "active_listings": active_tickets,
+        "sold_tickets": sold_tickets,
+        "total_earnings": round(total_earnings, 2),
+        "pending_earnings": round(pending_earnings, 2),
+        "monthly_earnings": round(monthly_earnings, 2),
+        "rating": user.rating,
+        "kyc_status": user.kyc_status
+    }
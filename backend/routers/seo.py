@@ -0,0 +1,297 @@
+"""
+SEO subsystem: sitemap, robots.txt and AI-generated event descriptions
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, HTTPException, Request
+from pymongo import UpdateOne
+
+from database import db
+from db_routing import reads
+from deps import require_admin
+from http_clients import CircuitOpen
+from jobs import Job, JobConflict, RateLimiter, run_bounded, runner
+from descriptions import Description, description_cache, is_current
+from llm import get_openai_client, LLMBusy
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api", tags=["seo"])
+
+# ============== SITEMAP ENDPOINT ==============
+
+@router.get("/sitemap.xml")
+async def get_sitemap():
+    """Generate dynamic sitemap.xml for SEO"""
+    from fastapi.responses import Response
+    
+    base_url = os.environ.get('FRONTEND_URL', 'https://euromatchtickets.com')
+    
+    # Static pages
+    static_pages = [
+        {"loc": f"{base_url}/", "priority": "1.0", "changefreq": "daily"},
+        {"loc": f"{base_url}/events", "priority": "0.9", "changefreq": "hourly"},
+        {"loc": f"{base_url}/events?type=match", "priority": "0.85", "changefreq": "hourly"},
+        {"loc": f"{base_url}/events?type=concert", "priority": "0.85", "changefreq": "hourly"},
+        # High-value landing pages - Football
+        {"loc": f"{base_url}/world-cup-2026", "priority": "0.95", "changefreq": "daily"},
+        {"loc": f"{base_url}/world-cup-raffle", "priority": "0.95", "changefreq": "daily"},
+        {"loc": f"{base_url}/champions-league-tickets", "priority": "0.95", "changefreq": "daily"},
+        # High-value landing pages - Concerts & Artists
+        {"loc": f"{base_url}/bruno-mars-tour-2026", "priority": "0.95", "changefreq": "daily"},
+        {"loc": f"{base_url}/guns-n-roses-tour-2026", "priority": "0.95", "changefreq": "daily"},
+        {"loc": f"{base_url}/bad-bunny-london-2026", "priority": "0.95", "changefreq": "daily"},
+        {"loc": f"{base_url}/the-weeknd-tour-2026", "priority": "0.95", "changefreq": "daily"},
+        {"loc": f"{base_url}/blog", "priority": "0.8", "changefreq": "weekly"},
+        {"loc": f"{base_url}/reviews", "priority": "0.7", "changefreq": "weekly"},
+        {"loc": f"{base_url}/faq", "priority": "0.6", "changefreq": "monthly"},
+        {"loc": f"{base_url}/about", "priority": "0.6", "changefreq": "monthly"},
+        {"loc": f"{base_url}/contact", "priority": "0.5", "changefreq": "monthly"},
+        {"loc": f"{base_url}/terms", "priority": "0.3", "changefreq": "monthly"},
+        {"loc": f"{base_url}/refund-policy", "priority": "0.3", "changefreq": "monthly"},
+    ]
+    
+    # Blog articles (hardcoded for now - could be moved to DB)
+    blog_articles = [
+        "best-seats-santiago-bernabeu",
+        "how-to-buy-champions-league-tickets-safely",
+        "is-it-safe-to-buy-resale-concert-tickets",
+        "premier-league-away-days-guide",
+        "taylor-swift-eras-tour-europe-2025",
+        "el-clasico-atmosphere-guide"
+    ]
+    
+    # Get all events
+    events = await reads("sitemap").events.find(
+        {"status": {"$ne": "cancelled"}},
+        {"_id": 0, "event_id": 1, "event_date": 1}
+    ).to_list(1000)
+    
+    # Build sitemap XML
+    xml_items = ['<?xml version="1.0" encoding="UTF-8"?>']
+    xml_items.append('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">')
+    
+    # Add static pages
+    for page in static_pages:
+        xml_items.append(f"""  <url>
+    <loc>{page['loc']}</loc>
+    <changefreq>{page['changefreq']}</changefreq>
+    <priority>{page['priority']}</priority>
+  </url>""")
+    
+    # Add blog articles
+    for article_id in blog_articles:
+        xml_items.append(f"""  <url>
+    <loc>{base_url}/blog/{article_id}</loc>
+    <changefreq>monthly</changefreq>
+    <priority>0.7</priority>
+  </url>""")
+    
+    # Add event pages
+    for event in events:
+        event_date = event.get('event_date', '')
+        if isinstance(event_date, datetime):
+            lastmod = event_date.strftime('%Y-%m-%d')
+        else:
+            lastmod = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        
+        xml_items.append(f"""  <url>
+    <loc>{base_url}/event/{event['event_id']}</loc>
+    <lastmod>{lastmod}</lastmod>
+    <changefreq>daily</changefreq>
+    <priority>0.8</priority>
+  </url>""")
+    
+    xml_items.append('</urlset>')
+    
+    return Response(
+        content='\n'.join(xml_items),
+        media_type="application/xml"
+    )
+
+@router.get("/robots.txt")
+async def get_robots(request: Request):
+    """Generate robots.txt for SEO"""
+    from fastapi.responses import PlainTextResponse
+    
+    # Get domain from request or environment
+    host = request.headers.get("host", "euromatchtickets.com")
+    base_url = f"https://{host}"
+    
+    robots_content = f"""User-agent: *
+Allow: /
+Allow: /events
+Allow: /event/
+Allow: /world-cup-2026
+Allow: /blog
+Allow: /blog/
+
+Disallow: /admin
+Disallow: /seller
+Disallow: /owner
+Disallow: /my-tickets
+Disallow: /alerts
+Disallow: /api/
+
+Sitemap: {base_url}/api/sitemap.xml
+
+# Crawl-delay for polite crawling
+Crawl-delay: 1
+"""
+    return PlainTextResponse(content=robots_content)
+
+# ============== AI DESCRIPTION GENERATOR ==============
+
+# Batch job tuning: parallel LLM calls, LLM calls per second, events per checkpoint
+DESCRIPTION_JOB_CONCURRENCY = int(os.environ.get('DESCRIPTION_JOB_CONCURRENCY', '4'))
+DESCRIPTION_JOB_RATE = float(os.environ.get('DESCRIPTION_JOB_RATE', '2'))
+DESCRIPTION_JOB_BATCH = int(os.environ.get('DESCRIPTION_JOB_BATCH', '20'))
+DESCRIPTION_RETRIES = 3
+
+# description: None also matches events without the field
+MISSING_DESCRIPTION = [{"description": None}, {"description": ""}]
+# Generated descriptions carry a fingerprint; hand-written ones are never replaced
+GENERATED_DESCRIPTION = {"description_fingerprint": {"$exists": True}}
+
+
+async def ensure_indexes():
+    await description_cache.ensure_indexes()
+
+
+@router.post("/events/{event_id}/generate-description")
+async def generate_event_description(event_id: str, request: Request, force: bool = False):
+    """Generate SEO-optimized description for an event using AI.
+
+    Reuses the cached copy for events with the same inputs; force=true asks the model again.
+    """
+    user = await require_admin(request)
+    
+    event = await db.events.find_one({"event_id": event_id}, {"_id": 0})
+    if not event:
+        raise HTTPException(status_code=404, detail="Event not found")
+    
+    if not force and is_current(event):
+        return {"success": True, "description": event["description"], "source": "event"}
+    
+    try:
+        openai_client = get_openai_client()
+        if not openai_client:
+            raise HTTPException(status_code=500, detail="OpenAI not configured")
+        
+        description = await description_cache.describe(event, refresh=force)
+        
+        # Update event with description
+        await db.events.update_one(
+            {"event_id": event_id},
+            {"$set": {"description": description.text, "description_fingerprint": description.fingerprint}}
+        )
+        
+        return {
+            "success": True,
+            "description": description.text,
+            "source": description.source,
+            "prompt_tokens": description.prompt_tokens,
+            "completion_tokens": description.completion_tokens,
+            "latency_ms": description.latency_ms
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating description: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _describe_with_retry(event: dict, limiter: RateLimiter) -> Description:
+    """Interactive chat has priority: back off while LLM slots are busy or the breaker is open"""
+    for attempt in range(DESCRIPTION_RETRIES):
+        try:
+            return await description_cache.describe(event, limiter=limiter)
+        except (LLMBusy, CircuitOpen) as e:
+            if attempt == DESCRIPTION_RETRIES - 1:
+                raise
+            await asyncio.sleep(getattr(e, "retry_in", 2 ** attempt))
+
+
+@runner.handler("descriptions")
+async def generate_descriptions_job(job: Job):
+    """Describe events in _id order, checkpointing after each batch.
+
+    Covers events without a description, plus (refresh=true) generated ones
+    whose inputs changed since. Failed events are listed in the job's errors;
+    a later run retries them.
+    """
+    events = db.events
+    limit = job.params.get("limit")
+    refresh = job.params.get("refresh", False)
+    candidates = {"$or": MISSING_DESCRIPTION + ([GENERATED_DESCRIPTION] if refresh else [])}
+    if job.total is None:
+        count = await events.count_documents(candidates)
+        await job.progress(total=min(count, limit) if limit else count)
+
+    limiter = RateLimiter(DESCRIPTION_JOB_RATE)
+    while True:
+        seen = job.state.get("seen", 0)
+        size = min(DESCRIPTION_JOB_BATCH, limit - seen) if limit else DESCRIPTION_JOB_BATCH
+        if size <= 0:
+            break
+        query = dict(candidates)
+        if job.state.get("last_id") is not None:
+            query["_id"] = {"$gt": job.state["last_id"]}
+        batch = await events.find(query).sort("_id", 1).limit(size).to_list(size)
+        if not batch:
+            break
+
+        stale = [event for event in batch if not is_current(event)]
+        results = await run_bounded(stale, lambda event: _describe_with_retry(event, limiter),
+                                    DESCRIPTION_JOB_CONCURRENCY)
+        described = [(event, r) for event, r in zip(stale, results) if not isinstance(r, Exception)]
+        errors = [{"event_id": event.get("event_id"), "error": str(r)}
+                  for event, r in zip(stale, results) if isinstance(r, Exception)]
+        if described:
+            await events.bulk_write([
+                UpdateOne({"_id": event["_id"]},
+                          {"$set": {"description": d.text, "description_fingerprint": d.fingerprint}})
+                for event, d in described
+            ], ordered=False)
+        generated = [d for _, d in described if d.source == "llm"]
+        await job.progress(
+            done=len(described), failed=len(errors), errors=errors,
+            state={"last_id": batch[-1]["_id"], "seen": seen + len(batch)},
+            counts={
+                "skipped": len(batch) - len(stale),
+                "cache_hits": len(described) - len(generated),
+                "llm_calls": len(generated),
+                "prompt_tokens": sum(d.prompt_tokens for d in generated),
+                "completion_tokens": sum(d.completion_tokens for d in generated),
+                "llm_ms": round(sum(d.latency_ms for d in generated)),
+            }
+        )
+
+
+@router.post("/events/generate-all-descriptions", status_code=202)
+async def generate_all_descriptions(request: Request, limit: int = 0, refresh: bool = False):
+    """Start (or return the running) background job describing events.
+
+    refresh=true also regenerates AI descriptions whose event details changed.
+    """
+    user = await require_admin(request)
+    if not get_openai_client():
+        raise HTTPException(status_code=500, detail="OpenAI not configured")
+
+    params = {"limit": limit, "refresh": refresh}
+    try:
+        job = await runner.submit("descriptions", params, created_by=user.user_id)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=f"A description job with other options is running "
+                                                    f"(job {e.active['job_id']})")
+    return {
+        "success": True,
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/api/admin/jobs/{job['job_id']}"
+    }
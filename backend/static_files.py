@@ -0,0 +1,159 @@
+"""
+EuroMatchTickets Static Files
+StaticFiles for /api/static with what media and text assets need:
+
+- Byte ranges: video players seek and resume with `Range: bytes=a-b`, which
+  gets a 206 with just that slice (If-Range falls back to the whole file
+  once it has changed) instead of the whole file.
+- Precompressed variants: `name.br` / `name.gz` files written by
+  precompress.py next to an asset are sent as-is to clients that accept
+  them, with no compression work per request.
+- Validators and caching: ETag/Last-Modified with 304s (from Starlette),
+  Accept-Ranges, Vary and a Cache-Control max-age.
+"""
+
+import os
+from email.utils import parsedate_to_datetime
+from mimetypes import guess_type
+from typing import Optional, Tuple
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from compression import negotiate
+
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', '3600'))
+CHUNK_SIZE = 256 * 1024  # fewer sends per video segment than Starlette's 64 KiB
+VARIANTS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end) inclusive for a single `bytes=` range; None to send the whole file.
+
+    Raises ValueError when the range can't be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in spec or not dash:
+        return None  # other units, multipart or malformed ranges: the whole file is a valid answer
+    if not first:
+        if not last.isdigit():
+            return None
+        if int(last) == 0 or size == 0:
+            raise ValueError("range not satisfiable")
+        return max(size - int(last), 0), size - 1
+    if not first.isdigit() or (last and not last.isdigit()):
+        return None
+    start, end = int(first), int(last) if last else size - 1
+    if last and end < start:
+        return None
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(FileResponse):
+    """FileResponse for one byte range of the file"""
+
+    chunk_size = CHUNK_SIZE
+
+    def __init__(self, path, start: int, end: int, size: int, **kwargs):
+        super().__init__(path, status_code=206, **kwargs)
+        self.start = start
+        self.end = end
+        self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+        self.headers["content-length"] = str(end - start + 1)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:  # file shrank under us; end the body anyway
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class StaticAssets(StaticFiles):
+    """StaticFiles with ranges, precompressed variants and cache headers"""
+
+    def __init__(self, *args, max_age: int = STATIC_MAX_AGE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    @staticmethod
+    def variants(full_path: str, stat_result: os.stat_result) -> dict:
+        """Precompressed files at least as new as the original.
+
+        Stat'd on every request like the original itself: precompress.py runs
+        against a live server, and a cached stat would miss new variants or
+        send the wrong Content-Length for rewritten or deleted ones.
+        """
+        found = {}
+        for encoding, suffix in VARIANTS:
+            try:
+                variant = os.stat(f"{full_path}{suffix}")
+            except OSError:
+                continue
+            if variant.st_mtime >= stat_result.st_mtime:
+                found[encoding] = (f"{full_path}{suffix}", variant)
+        return found
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        media_type = guess_type(str(full_path))[0] or "text/plain"
+        headers = {"accept-ranges": "bytes", "cache-control": f"public, max-age={self.max_age}"}
+        variants = self.variants(full_path, stat_result)
+        if variants:
+            headers["vary"] = "Accept-Encoding"
+
+        response = FileResponse(full_path, status_code=status_code, stat_result=stat_result,
+                                media_type=media_type, headers=headers)
+        response.chunk_size = CHUNK_SIZE
+
+        range_header = request_headers.get("range")
+        if range_header and status_code == 200 and not self.is_not_modified(response.headers, request_headers) \
+                and self._range_applies(request_headers, response.headers):
+            try:
+                byte_range = parse_range(range_header, stat_result.st_size)
+            except ValueError:
+                return Response(status_code=416, headers={"content-range": f"bytes */{stat_result.st_size}",
+                                                          "accept-ranges": "bytes"})
+            if byte_range is not None:
+                # Ranges are served from the identity file, never from a compressed variant
+                return RangeFileResponse(full_path, *byte_range, size=stat_result.st_size,
+                                         stat_result=stat_result, media_type=media_type, headers=headers)
+
+        encoding = negotiate(request_headers.get("accept-encoding", ""), tuple(variants)) if variants else None
+        if encoding is not None:
+            path, variant_stat = variants[encoding]
+            response = FileResponse(path, status_code=status_code, stat_result=variant_stat, media_type=media_type,
+                                    headers={**headers, "content-encoding": encoding})
+            response.chunk_size = CHUNK_SIZE
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    @staticmethod
+    def _range_applies(request_headers: Headers, response_headers) -> bool:
+        """If-Range: only send a slice of the version the client already has part of"""
+        if_range = request_headers.get("if-range")
+        if if_range is None:
+            return True
+        if if_range.startswith(('"', 'W/')):
+            return if_range == response_headers["etag"]
+        try:
+            return parsedate_to_datetime(if_range) >= parsedate_to_datetime(response_headers["last-modified"])
+        except (TypeError, ValueError):
+            return False
+
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+from bson import ObjectId
+
+# Backend modules are imported flat (e.g. `import server`), as uvicorn does from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# ============== SHARED FAKES ==============
+# Imported by the test modules: `from conftest import Clock, FakeCollection`
+
+class Clock:
+    """A clock tests move by hand"""
+
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def matches(document, query):
+    """The subset of Mongo query semantics the fakes need"""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(document, clause) for clause in condition):
+                return False
+            continue
+        value = document.get(key)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for op, operand in condition.items():
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$gt" and not value > operand:
+                return False
+            if op == "$gte" and not value >= operand:
+                return False
+            if op == "$lte" and not value <= operand:
+                return False
+            if op == "$exists" and (key in document) != operand:
+                return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents.sort(key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.documents = self.documents[:n]
+        return self
+
+    async def to_list(self, length):
+        return self.documents[:length]
+
+
+class FakeCollection:
+    """In-memory collection with the reads and batched writes the jobs use; records the size of every write"""
+
+    def __init__(self, documents=()):
+        self.documents = [{"_id": ObjectId(), **d} for d in documents]
+        self.writes = []
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.documents if matches(d, query))
+
+    async def estimated_document_count(self):
+        return len(self.documents)
+
+    def find(self, query, projection=None):
+        hidden = {"_id"} if projection and projection.get("_id") == 0 else set()
+        return FakeCursor([{k: v for k, v in d.items() if k not in hidden}
+                           for d in self.documents if matches(d, query)])
+
+    async def insert_many(self, documents, ordered=True):
+        self.documents.extend(documents)
+        self.writes.append(len(documents))
+
+    async def delete_many(self, query):
+        keep = [d for d in self.documents if not matches(d, query)]
+        deleted = len(self.documents) - len(keep)
+        self.documents = keep
+        self.writes.append(deleted)
+        await asyncio.sleep(0)
+        return SimpleNamespace(deleted_count=deleted)
+
+    async def update_many(self, query, change):
+        matched = [d for d in self.documents if matches(d, query)]
+        for d in matched:
+            d.update(change["$set"])
+        self.writes.append(len(matched))
+        await asyncio.sleep(0)
+        return SimpleNamespace(modified_count=len(matched))
+
+    async def bulk_write(self, requests, ordered=True):
+        by_id = {d["_id"]: d for d in self.documents}
+        for op in requests:
+            by_id[op._filter["_id"]].update(op._doc["$set"])
+        self.writes.append(len(requests))
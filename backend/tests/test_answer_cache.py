@@ -0,0 +1,52 @@
+"""
+Answer cache tests
+Question normalization, TTL expiry and LRU eviction.
+"""
+
+from answer_cache import AnswerCache, normalize_question
+
+
+class TestNormalization:
+    """Paraphrases share a key"""
+
+    def test_filler_case_and_plurals_ignored(self):
+        assert normalize_question("How do I get a refund?") == normalize_question("how can i get refunds")
+        assert normalize_question("Refund policy please") == normalize_question("what is the refund policy")
+        print("✓ Filler words, case, punctuation and plurals don't change the key")
+
+    def test_different_questions_differ(self):
+        assert normalize_question("cancel my order") != normalize_question("track my order")
+        print("✓ Distinct questions keep distinct keys")
+
+
+class TestAnswerCache:
+    """TTL and size bounds"""
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = AnswerCache(ttl=60, clock=lambda: now[0])
+        cache.put("How do refunds work?", "Within 48 hours")
+        assert cache.get("how do refunds work") == "Within 48 hours"
+        now[0] = 61
+        assert cache.get("how do refunds work") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        print("✓ Entries expire after the TTL")
+
+    def test_lru_eviction(self):
+        cache = AnswerCache(max_entries=2)
+        cache.put("refund", "a")
+        cache.put("delivery", "b")
+        cache.get("refund")
+        cache.put("payment", "c")
+        assert cache.get("delivery") is None
+        assert cache.get("refund") == "a"
+        print("✓ Least recently used entries are evicted first")
+
+    def test_metrics(self):
+        cache = AnswerCache()
+        cache.put("refund", "a")
+        cache.get("refund")
+        text = cache.render_prometheus()
+        assert "chat_answer_cache_entries 1" in text
+        assert "chat_answer_cache_hit_ratio 1.0000" in text
+        print("✓ Hit ratio and size are exported")
@@ -0,0 +1,63 @@
+"""
+Background task tests
+Graceful shutdown: drain waits for tracked tasks that finish in time and
+cancels the ones that don't.
+"""
+
+import asyncio
+
+import background
+from background import drain, pending, spawn
+
+
+class TestDrain:
+    """Draining tracked tasks on shutdown"""
+
+    def test_waits_for_tasks_that_finish(self):
+        finished = []
+
+        async def send_email(n):
+            await asyncio.sleep(0.05)
+            finished.append(n)
+
+        async def main():
+            for n in range(3):
+                spawn(send_email(n), name=f"email_{n}")
+            assert pending() == 3
+            return await drain(timeout=2)
+
+        assert asyncio.run(main()) == 0
+        assert sorted(finished) == [0, 1, 2]
+        assert pending() == 0
+        print("✓ Drain waits for background tasks that finish within the timeout")
+
+    def test_cancels_stragglers_after_timeout(self):
+        cancelled = []
+
+        async def quick():
+            await asyncio.sleep(0.01)
+
+        async def stuck():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def main():
+            spawn(quick(), name="quick")
+            spawn(stuck(), name="stuck")
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await drain(timeout=0.1)
+            return result, loop.time() - started
+
+        stragglers, seconds = asyncio.run(main())
+        assert stragglers == 1 and cancelled == [True]
+        assert seconds < 1
+        assert not background._tasks
+        print("✓ Drain cancels tasks still running at the timeout and reports how many")
+
+    def test_nothing_to_drain(self):
+        assert asyncio.run(drain(timeout=0)) == 0
+        print("✓ Drain with no background tasks returns at once")
@@ -0,0 +1,61 @@
+"""
+Synthetic data generator tests
+Same seed, same bytes regardless of worker count; hot events and power
+sellers dominate; orders, payouts and ratings reference what they should.
+"""
+
+import json
+from collections import Counter
+
+from bench.generate import Spec, encode, gen_tickets, generate, zipf_index
+
+SPEC = Spec(seed=7, events=500, tickets=25_000, buyers=3_000, sellers=100, alerts=2_000, sessions=10)
+
+
+class TestDeterminism:
+    """Output depends only on the spec"""
+
+    def test_digests_independent_of_workers(self, tmp_path):
+        serial = generate(SPEC, ("ndjson", str(tmp_path / "serial")), workers=1)
+        parallel = generate(SPEC, ("ndjson", str(tmp_path / "parallel")), workers=3)
+        other_seed = generate(Spec(**{**SPEC.__dict__, "seed": 8}), ("ndjson", str(tmp_path / "other")), workers=1)
+
+        assert serial == parallel
+        assert serial["tickets"]["documents"] == 25_000
+        assert serial["tickets"]["sha256"] != other_seed["tickets"]["sha256"]
+        print(f"✓ 1 and 3 workers produce identical digests over {sum(c['documents'] for c in serial.values())} docs")
+
+    def test_extended_json_dates(self):
+        line = json.loads(encode({"created_at": SPEC.start}))
+        assert line == {"created_at": {"$date": "2026-01-01T00:00:00.000Z"}}
+        print("✓ Dates are written as Extended JSON for mongoimport")
+
+
+class TestShape:
+    """Skew and referential consistency"""
+
+    def test_hot_events_and_power_sellers(self):
+        tickets = gen_tickets(SPEC, 0)["tickets"] + gen_tickets(SPEC, 1)["tickets"]
+        by_event = Counter(t["event_id"] for t in tickets).most_common()
+        by_seller = Counter(t["seller_id"] for t in tickets).most_common()
+        top_events = sum(n for _, n in by_event[:5]) / len(tickets)
+        top_sellers = sum(n for _, n in by_seller[:5]) / len(tickets)
+
+        assert top_events > 0.2
+        assert top_sellers > 0.4
+        assert all(0 <= zipf_index(u / 1000, 10, 1.0) < 10 for u in range(1000))
+        print(f"✓ Top 1% of events hold {top_events:.0%} of listings, top 5% of sellers {top_sellers:.0%}")
+
+    def test_sold_tickets_have_orders(self):
+        docs = gen_tickets(SPEC, 0)
+        sold = {t["ticket_id"]: t for t in docs["tickets"] if t["status"] == "sold"}
+        orders = {o["order_id"]: o for o in docs["orders"]}
+
+        assert set(o["ticket_id"] for o in orders.values()) == set(sold)
+        for order in orders.values():
+            ticket = sold[order["ticket_id"]]
+            assert (order["event_id"], order["seller_id"], order["ticket_price"]) == \
+                   (ticket["event_id"], ticket["seller_id"], ticket["price"])
+        assert all(orders[p["order_id"]]["status"] == "completed" for p in docs["seller_payouts"])
+        assert all(orders[r["order_id"]]["status"] == "completed" for r in docs["ratings"])
+        print(f"✓ {len(orders)} orders match their sold tickets; payouts and ratings only for completed orders")
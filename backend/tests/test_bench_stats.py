@@ -0,0 +1,49 @@
+"""
+Benchmark harness tests
+Percentiles and baseline comparison used to fail regressed runs.
+"""
+
+from bench.stats import percentile, Recorder, compare
+
+
+class TestPercentiles:
+    """Nearest-rank percentiles and per-route summaries"""
+
+    def test_percentile(self):
+        values = [i / 1000 for i in range(1, 101)]
+        assert percentile(values, 50) == 0.05
+        assert percentile(values, 95) == 0.095
+        assert percentile(values, 99) == 0.099
+        assert percentile([], 95) == 0.0
+        print("✓ Nearest-rank percentiles")
+
+    def test_summary_counts_server_errors_only(self):
+        recorder = Recorder()
+        for status in (200, 200, 404, 500, 0):
+            recorder.record("GET /api/events", status, 0.01)
+        route = recorder.summary(1.0)["routes"]["GET /api/events"]
+        assert route["requests"] == 5
+        assert route["errors"] == 2
+        print("✓ 5xx and connection failures count as errors")
+
+
+class TestCompare:
+    """Baseline comparison"""
+
+    def _run(self, p95, rps, errors=0):
+        return {"routes": {"GET /api/events": {"p95_ms": p95, "p99_ms": p95 * 2, "rps": rps, "errors": errors}}}
+
+    def test_within_tolerance(self):
+        assert compare(self._run(100, 500), self._run(115, 450)) == []
+        print("✓ Small drift passes")
+
+    def test_latency_and_throughput_regressions(self):
+        regressions = compare(self._run(100, 500), self._run(150, 300, errors=3))
+        assert any("p95_ms" in r for r in regressions)
+        assert any("rps" in r for r in regressions)
+        assert any("errors" in r for r in regressions)
+        print("✓ Latency, throughput and error regressions are reported")
+
+    def test_missing_route(self):
+        assert compare(self._run(100, 500), {"routes": {}}) == ["GET /api/events: missing from current run"]
+        print("✓ Routes missing from the current run are reported")
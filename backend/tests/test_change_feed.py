@@ -0,0 +1,230 @@
+"""
+Change feed tests
+Domain events from raw change documents, subscriber fan-out, resume token
+persistence, history-loss resync and the polling fallback, against fakes.
+With MONGO_TEST_URL pointing at a replica set, a real change stream is tailed:
+
+    MONGO_TEST_URL="mongodb://localhost:27017/?replicaSet=rs0" pytest tests/test_change_feed.py
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+from pymongo.errors import OperationFailure
+
+from change_feed import ChangeBus, ChangeFeed, DomainEvent, RESYNC_SECONDS, from_change
+
+
+def _change(coll, op, _id, token, **extra):
+    return {"_id": {"_data": token}, "operationType": op, "ns": {"db": "t", "coll": coll},
+            "documentKey": {"_id": _id}, **extra}
+
+
+class FakeStream:
+    def __init__(self, changes):
+        self.changes = list(changes)
+        self.resume_token = None
+        self.alive = True
+
+    async def try_next(self):
+        if not self.changes:
+            self.alive = False
+            return None
+        change = self.changes.pop(0)
+        if change is not None:
+            self.resume_token = change["_id"]
+        return change
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeState:
+    def __init__(self):
+        self.docs = {}
+        self.writes = 0
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["_id"]] = doc
+        self.writes += 1
+
+
+class FakeCollection:
+    def __init__(self):
+        self.ids = []
+
+    async def find_one(self, query, projection, sort):
+        return {"_id": max(self.ids)} if self.ids else None
+
+    async def estimated_document_count(self):
+        return len(self.ids)
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+class Recorder:
+    def __init__(self, bus, *entities):
+        self.events = []
+        bus.subscriber(*entities)(self.events.append)
+
+
+class TestDomainEvents:
+    """Raw change documents become typed events"""
+
+    def test_update_carries_keys_and_fields(self):
+        event = from_change(_change("tickets", "update", 7, "a",
+                                    fullDocument={"ticket_id": "t1", "event_id": "e1", "seller_id": "s1",
+                                                  "status": "sold", "price": 90},
+                                    updateDescription={"updatedFields": {"status": "sold"}}))
+        assert event == DomainEvent("ticket.update", "ticket", "update", 7,
+                                    {"ticket_id": "t1", "event_id": "e1", "seller_id": "s1", "status": "sold"},
+                                    ("status",))
+        assert from_change(_change("events", "delete", 3, "b")).keys == {}
+        assert from_change(_change("users", "insert", 1, "c")) is None
+        assert from_change(_change("events", "drop", 1, "d")) is None
+        print("✓ Updates carry key fields and changed field names; unwatched collections are ignored")
+
+    def test_bus_filters_and_isolates_subscribers(self):
+        bus = ChangeBus()
+        tickets = Recorder(bus, "ticket")
+        everything = Recorder(bus)
+        calls = []
+
+        @bus.subscriber("ticket")
+        async def broken(event):
+            calls.append(event.type)
+            raise RuntimeError("boom")
+
+        async def main():
+            await bus.publish(DomainEvent.resync("event"))
+            await bus.publish(DomainEvent("ticket.insert", "ticket", "insert", 1))
+
+        asyncio.run(main())
+        assert [e.type for e in tickets.events] == ["ticket.insert"]
+        assert [e.type for e in everything.events] == ["event.resync", "ticket.insert"]
+        assert calls == ["ticket.insert"]
+        print("✓ Subscribers get their entities only; a failing one doesn't block the rest")
+
+
+class TestStream:
+    """Resume tokens and history loss"""
+
+    def test_token_saved_and_reloaded(self):
+        bus = ChangeBus()
+        seen = Recorder(bus)
+        state = FakeState()
+        now = [0.0]
+        feed = ChangeFeed(FakeDatabase(), bus, mode="stream", state=state, clock=lambda: now[0])
+
+        async def main():
+            stream = FakeStream([_change("events", "insert", i, f"tok{i}", fullDocument={"event_id": f"e{i}"})
+                                 for i in range(5)])
+            original = stream.try_next
+
+            async def ticking():
+                now[0] += 0.4
+                return await original()
+
+            stream.try_next = ticking
+            await feed.consume(stream)
+            await feed.save_token()
+            restarted = ChangeFeed(FakeDatabase(), bus, mode="stream", state=state)
+            return await restarted.load_token()
+
+        token = asyncio.run(main())
+        assert [e.keys["event_id"] for e in seen.events] == ["e0", "e1", "e2", "e3", "e4"]
+        assert token == {"_data": "tok4"}
+        assert state.writes < 5
+        print(f"✓ 5 changes published, token saved {state.writes} time(s) and reloaded on restart")
+
+    def test_history_lost_resyncs_and_restarts(self):
+        bus = ChangeBus()
+        seen = Recorder(bus)
+        state = FakeState()
+        state.docs["default"] = {"_id": "default", "token": {"_data": "ancient"}}
+        calls = []
+
+        class Database(FakeDatabase):
+            def watch(self, pipeline, full_document, start_after):
+                calls.append(start_after)
+                if len(calls) == 1:
+                    raise OperationFailure("history lost", code=286)
+                if len(calls) == 2:
+                    return FakeStream([_change("orders", "insert", 1, "fresh", fullDocument={"order_id": "o1"})])
+                raise RuntimeError("stop")
+
+        feed = ChangeFeed(Database(), bus, mode="stream", state=state)
+        with pytest.raises(RuntimeError):
+            asyncio.run(feed._stream())
+
+        assert calls == [{"_data": "ancient"}, None, {"_data": "fresh"}]
+        assert [e.type for e in seen.events][:4] == ["event.resync", "ticket.resync", "order.resync", "payout.resync"]
+        assert seen.events[-1].type == "order.insert"
+        print("✓ A token older than the oplog triggers a full resync and a fresh stream")
+
+
+class TestPolling:
+    """Standalone fallback"""
+
+    def test_resync_on_signature_change_and_periodically(self):
+        bus = ChangeBus()
+        seen = Recorder(bus)
+        database = FakeDatabase()
+        now = [0.0]
+        feed = ChangeFeed(database, bus, mode="poll", state=FakeState(), clock=lambda: now[0])
+
+        async def main():
+            baseline = await feed.poll_once()
+            database["tickets"].ids.append(1)
+            changed = await feed.poll_once()
+            quiet = await feed.poll_once()
+            now[0] += RESYNC_SECONDS
+            periodic = await feed.poll_once()
+            return baseline, changed, quiet, periodic
+
+        assert asyncio.run(main()) == (0, 1, 0, 4)
+        assert seen.events[0] == DomainEvent.resync("ticket")
+        print("✓ Polling resyncs a collection when it moves and everything every RESYNC_SECONDS")
+
+
+@pytest.mark.skipif(not os.environ.get("MONGO_TEST_URL"), reason="MONGO_TEST_URL not set")
+class TestMongoChangeStream:
+    """A real change stream on a replica set"""
+
+    def test_outside_write_reaches_subscriber(self):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def main():
+            client = AsyncIOMotorClient(os.environ["MONGO_TEST_URL"])
+            database = client[f"feed_test_{uuid.uuid4().hex[:8]}"]
+            bus = ChangeBus()
+            received = asyncio.Queue()
+            bus.subscriber("ticket")(received.put_nowait)
+            feed = ChangeFeed(database, bus)
+            try:
+                if await feed.detect_mode() != "stream":
+                    pytest.skip("MONGO_TEST_URL is not a replica set")
+                feed.start()
+                await asyncio.sleep(1)
+                await database.tickets.insert_one({"ticket_id": "t1", "event_id": "e1", "status": "available"})
+                return await asyncio.wait_for(received.get(), 10)
+            finally:
+                await feed.stop()
+                await client.drop_database(database.name)
+                client.close()
+
+        event = asyncio.run(main())
+        assert (event.type, event.keys["event_id"]) == ("ticket.insert", "e1")
+        print("✓ An insert made outside the API arrives as ticket.insert")
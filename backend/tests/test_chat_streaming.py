@@ -0,0 +1,280 @@
+"""
+Streaming support chat tests
+100 chats run against a local fake LLM server while the catalogue
+(/api/events against an in-memory events and tickets collection) is polled
+on the same event loop: LLM round-trips must not stall catalogue requests,
+the semaphore must bound upstream concurrency and chat logs are batch-written.
+"""
+
+import asyncio
+import json
+import socket
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import httpx
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from answer_cache import AnswerCache
+from conftest import FakeCollection, FakeCursor
+from rate_limit import RuleTable
+
+CHUNKS = 10
+CHUNK_DELAY = 0.05  # 0.5s per completion
+IN_FLIGHT_CHATS = 100
+SLOT_LIMIT = 20
+
+
+class FakeLLM:
+    """OpenAI-compatible /v1/chat/completions that streams slowly"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.requests = 0
+
+    async def completions(self, request):
+        body = await request.json()
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+
+        def chunk(content):
+            return {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": 0, "model": "fake",
+                    "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}]}
+
+        if not body.get("stream"):
+            await asyncio.sleep(CHUNKS * CHUNK_DELAY)
+            self.active -= 1
+            return JSONResponse({
+                "id": "chatcmpl-fake", "object": "chat.completion", "created": 0, "model": "fake",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "word " * CHUNKS},
+                             "finish_reason": "stop"}],
+            })
+
+        async def stream():
+            try:
+                for _ in range(CHUNKS):
+                    await asyncio.sleep(CHUNK_DELAY)
+                    yield f"data: {json.dumps(chunk('word '))}\n\n"
+                yield "data: [DONE]\n\n"
+            finally:
+                self.active -= 1
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+@pytest.fixture
+def fake_llm():
+    llm = FakeLLM()
+    app = Starlette(routes=[Route("/v1/chat/completions", llm.completions, methods=["POST"])])
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    llm.base_url = f"http://127.0.0.1:{sock.getsockname()[1]}/v1"
+    yield llm
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+class FakeTickets(FakeCollection):
+    """Tickets with the one aggregation GET /api/events runs: count and lowest price per event"""
+
+    def aggregate(self, pipeline):
+        stats = {}
+        for ticket in self.find(pipeline[0]["$match"]).documents:
+            row = stats.setdefault(ticket["event_id"], {"_id": ticket["event_id"], "ticket_count": 0,
+                                                        "lowest_price": ticket["price"]})
+            row["ticket_count"] += 1
+            row["lowest_price"] = min(row["lowest_price"], ticket["price"])
+        return FakeCursor(list(stats.values()))
+
+
+def _catalogue():
+    """What GET /api/events reads: 100 upcoming events with 10 tickets each"""
+    start = datetime(2026, 6, 1, tzinfo=timezone.utc)
+    events = [{"event_id": f"evt_{i}", "title": f"Match {i}", "event_type": "match", "status": "upcoming",
+               "event_date": start + timedelta(days=i), "venue": "Wembley Stadium", "city": "London",
+               "country": "UK", "description": "Final " * 20, "featured": i % 10 == 0} for i in range(100)]
+    tickets = [{"ticket_id": f"t_{i}", "event_id": f"evt_{i % 100}", "status": "available", "price": 50 + i % 30}
+               for i in range(1000)]
+    return SimpleNamespace(events=FakeCollection(events), tickets=FakeTickets(tickets))
+
+
+@pytest.fixture
+def chat_app(fake_llm, monkeypatch):
+    from openai import AsyncOpenAI
+    import llm
+    import server
+    from routers import catalogue, chat
+
+    monkeypatch.setattr(llm, "_openai_client", AsyncOpenAI(base_url=fake_llm.base_url, api_key="test", max_retries=0))
+    monkeypatch.setattr(llm, "_slots", asyncio.Semaphore(SLOT_LIMIT))
+    monkeypatch.setattr(llm, "LLM_QUEUE_TIMEOUT", 30.0)
+    logs = FakeCollection()
+    monkeypatch.setattr(chat.chat_log_writer, "collection", logs)
+    monkeypatch.setattr(chat, "answer_cache", AnswerCache())
+
+    async def no_live_events(question):
+        return []
+    monkeypatch.setattr(chat, "retrieve_events", no_live_events)
+    read_db = _catalogue()
+    monkeypatch.setattr(catalogue, "reads", lambda read_class: read_db)
+    # 100 anonymous chats from one client would hit the support chat rate limit
+    if server.rate_limiter is not None:
+        monkeypatch.setattr(server.rate_limiter, "table", RuleTable([]))
+    return server.app, chat, logs
+
+
+def parse_sse(text: str) -> list:
+    return [json.loads(line[6:]) for line in text.splitlines() if line.startswith("data: ")]
+
+
+async def _catalogue_latencies(client, samples: int, pause: float = 0.02) -> list:
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        response = await client.get("/api/events")
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200 and len(response.json()) == 100
+        await asyncio.sleep(pause)
+    return latencies
+
+
+def _percentile(latencies: list, p: float) -> float:
+    return sorted(latencies)[min(int(len(latencies) * p), len(latencies) - 1)]
+
+
+class TestStreamingChat:
+    """Async LLM calls under load"""
+
+    def test_catalogue_latency_unaffected_by_chats_in_flight(self, chat_app, fake_llm):
+        app, chat, logs = chat_app
+
+        async def main():
+            await chat.chat_log_writer.start()
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=60) as client:
+                baseline = await _catalogue_latencies(client, 20)
+
+                async def one_chat(i):
+                    response = await client.post("/api/chat/support/stream",
+                                                 json={"message": f"where is my ticket {i}", "session_id": f"s{i}"})
+                    return parse_sse(response.text)
+
+                chats = [asyncio.create_task(one_chat(i)) for i in range(IN_FLIGHT_CHATS)]
+                await asyncio.sleep(0.1)
+                under_load = await _catalogue_latencies(client, 50)
+                results = await asyncio.gather(*chats)
+            await chat.chat_log_writer.stop()
+            return baseline, under_load, results
+
+        baseline, under_load, results = asyncio.run(main())
+
+        for events in results:
+            assert "".join(e.get("delta", "") for e in events) == "word " * CHUNKS
+            assert events[-1] == {"done": True}
+
+        p50, p99 = _percentile(under_load, 0.5), _percentile(under_load, 0.99)
+        # A blocking LLM call would stall catalogue requests for a whole completion (0.5s)
+        assert p50 < 0.1, f"/api/events p50 {p50 * 1000:.0f}ms with chats in flight"
+        assert p99 < 0.25, f"/api/events p99 {p99 * 1000:.0f}ms with chats in flight"
+        assert fake_llm.max_active <= SLOT_LIMIT
+        assert len(logs.documents) == IN_FLIGHT_CHATS
+        assert len(logs.writes) < IN_FLIGHT_CHATS / 10
+        print(f"✓ /api/events p50 {statistics.median(baseline) * 1000:.1f}ms / p99 "
+              f"{_percentile(baseline, 0.99) * 1000:.1f}ms idle, p50 {p50 * 1000:.1f}ms / p99 {p99 * 1000:.1f}ms "
+              f"with {IN_FLIGHT_CHATS} chats in flight; "
+              f"{fake_llm.max_active} concurrent upstream calls; {len(logs.writes)} log batch(es)")
+
+    def test_json_endpoint_still_answers(self, chat_app):
+        app, chat, logs = chat_app
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=30) as client:
+                response = await client.post("/api/chat/support", json={"message": "refund?", "session_id": "json"})
+            await chat.chat_log_writer.flush()
+            return response.json()
+
+        assert asyncio.run(main()) == {"response": "word " * CHUNKS}
+        assert logs.documents[-1]["session_id"] == "json"
+        print("✓ Non-streaming endpoint uses the same async client and log writer")
+
+    def test_busy_when_no_slot(self, chat_app, monkeypatch):
+        import llm
+        app, chat, logs = chat_app
+        monkeypatch.setattr(llm, "LLM_QUEUE_TIMEOUT", 0.05)
+
+        async def main():
+            slots = asyncio.Semaphore(0)
+            monkeypatch.setattr(llm, "_slots", slots)
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+                response = await client.post("/api/chat/support/stream", json={"message": "hi", "session_id": "busy"})
+            return parse_sse(response.text)
+
+        events = asyncio.run(main())
+        assert events == [{"error": chat.BUSY_MESSAGE}]
+        assert "busy" not in chat.chat_histories
+        print("✓ Saturated workers answer 'busy' instead of queueing indefinitely")
+
+    def test_only_answered_turns_join_history(self, chat_app, fake_llm, monkeypatch):
+        import llm
+        app, chat, logs = chat_app
+        monkeypatch.setattr(llm, "LLM_QUEUE_TIMEOUT", 0.05)
+        monkeypatch.setattr(chat, "chat_histories", {})
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=30) as client:
+                monkeypatch.setattr(llm, "_slots", asyncio.Semaphore(0))
+                busy = await client.post("/api/chat/support", json={"message": "where is my ticket", "session_id": "r"})
+                monkeypatch.setattr(llm, "_slots", asyncio.Semaphore(1))
+                retried = await client.post("/api/chat/support", json={"message": "where is my ticket", "session_id": "r"})
+            await chat.chat_log_writer.flush()
+            return busy.json(), retried.json()
+
+        busy, retried = asyncio.run(main())
+        assert busy == {"response": chat.BUSY_MESSAGE}
+        assert retried == {"response": "word " * CHUNKS}
+        assert chat.chat_histories["r"] == [
+            {"role": "user", "content": "where is my ticket"},
+            {"role": "assistant", "content": "word " * CHUNKS},
+        ]
+        assert [doc["session_id"] for doc in logs.documents] == ["r"]
+        print("✓ A turn the model didn't answer is left out of the history, so a retry isn't sent twice")
+
+
+class TestAnswerCaching:
+    """FAQ answers are reused across sessions"""
+
+    def test_repeated_faq_served_from_cache(self, chat_app, fake_llm):
+        app, chat, logs = chat_app
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://api", timeout=30) as client:
+                first = await client.post("/api/chat/support", json={"message": "How do I get a refund?", "session_id": "a"})
+                again = await client.post("/api/chat/support/stream", json={"message": "how can i get refunds", "session_id": "b"})
+                follow_up = await client.post("/api/chat/support", json={"message": "How do I get a refund?", "session_id": "a"})
+            await chat.chat_log_writer.flush()
+            return first.json(), parse_sse(again.text), follow_up.json()
+
+        first, again, follow_up = asyncio.run(main())
+        assert again[0]["delta"] == first["response"]
+        assert fake_llm.requests == 2  # the follow-up in session "a" has history, so it isn't cached
+        assert [doc["cached"] for doc in logs.documents] == [False, True, False]
+        assert chat.answer_cache.hit_rate == 0.5
+        print("✓ Second session's paraphrased FAQ is answered without an LLM call")
@@ -0,0 +1,233 @@
+"""
+Response compression tests
+Accept-Encoding negotiation, what is and isn't compressed, streaming bodies,
+the CPU budget, and static files: byte ranges for video, precompressed
+variants and the precompress script.
+"""
+
+import asyncio
+import gzip
+import os
+import zlib
+
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from bench.compression import measure
+from compression import CompressionBudget, CompressionMiddleware, negotiate
+from conftest import Clock
+from precompress import precompress
+from static_files import StaticAssets, parse_range
+
+BODY = b'{"tickets": [' + b", ".join(b'{"id": "tkt_%d", "price": 120}' % i for i in range(200)) + b"]}"
+
+
+def _app(body, content_type="application/json", status=200, chunks=None, headers=()):
+    async def app(scope, receive, send):
+        raw = [(b"content-type", content_type.encode()), *headers]
+        if chunks is None:
+            raw.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": raw})
+        if chunks is None:
+            await send({"type": "http.response.body", "body": body})
+            return
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+async def _call(app, accept="gzip, deflate, br", method="GET"):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": method, "path": "/", "headers": [(b"accept-encoding", accept.encode())]}
+    await app(scope, None, send)
+    headers = dict(sent[0]["headers"])
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return sent[0]["status"], headers, body, len(sent) - 1
+
+
+class TestNegotiation:
+    """Accept-Encoding parsing"""
+
+    def test_q_values(self):
+        assert negotiate("gzip, br", ("br", "gzip")) == "br"
+        assert negotiate("br;q=0, gzip", ("br", "gzip")) == "gzip"
+        assert negotiate("identity", ("br", "gzip")) is None
+        assert negotiate("*", ("gzip",)) == "gzip"
+        assert negotiate("*, gzip;q=0", ("gzip",)) is None
+        assert negotiate("gzip;q=bogus", ("gzip",)) is None
+        print("✓ Server preference among encodings with q > 0; q=0 and wildcards honoured")
+
+
+class TestMiddleware:
+    """What gets compressed"""
+
+    def test_gzip_round_trip(self):
+        app = CompressionMiddleware(_app(BODY, headers=[(b"etag", b'"abc"'), (b"vary", b"Cookie")]))
+        status, headers, body, _ = asyncio.run(_call(app, accept="gzip"))
+        assert status == 200
+        assert headers[b"content-encoding"] == b"gzip"
+        assert int(headers[b"content-length"]) == len(body) < len(BODY) / 3
+        assert gzip.decompress(body) == BODY
+        assert headers[b"etag"] == b'W/"abc"'
+        assert headers[b"vary"] == b"Cookie, Accept-Encoding"
+        print(f"✓ {len(BODY)} bytes of JSON -> {len(body)} gzipped, weak ETag, Vary extended")
+
+    def test_skipped_responses(self):
+        small = asyncio.run(_call(CompressionMiddleware(_app(b'{"ok": true}'))))
+        sse = asyncio.run(_call(CompressionMiddleware(_app(BODY, "text/event-stream"))))
+        video = asyncio.run(_call(CompressionMiddleware(_app(BODY, "video/mp4"))))
+        partial = asyncio.run(_call(CompressionMiddleware(_app(BODY, status=206))))
+        encoded = asyncio.run(_call(CompressionMiddleware(_app(BODY, headers=[(b"content-encoding", b"br")]))))
+        identity = asyncio.run(_call(CompressionMiddleware(_app(BODY)), accept="identity"))
+        head = asyncio.run(_call(CompressionMiddleware(_app(BODY)), method="HEAD"))
+        for _, headers, body, _ in (small, sse, video, partial, identity, head):
+            assert b"content-encoding" not in headers
+        assert encoded[1][b"content-encoding"] == b"br" and encoded[2] == BODY
+        assert small[1][b"vary"] == b"Accept-Encoding"
+        print("✓ Small bodies, SSE, video, 206s, encoded bodies, identity clients and HEAD pass through")
+
+    def test_streamed_body_flushed_per_chunk(self):
+        chunks = [BODY[:1500], BODY[1500:3000], BODY[3000:]]
+        app = CompressionMiddleware(_app(None, chunks=chunks))
+        sent = []
+
+        async def main():
+            async def send(message):
+                sent.append(message)
+            scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+            await app(scope, None, send)
+
+        asyncio.run(main())
+        assert dict(sent[0]["headers"])[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in dict(sent[0]["headers"])
+        decoder = zlib.decompressobj(31)
+        # Each chunk decodes as soon as it arrives: nothing is held back in the compressor
+        assert decoder.decompress(sent[1]["body"]) == chunks[0]
+        assert decoder.decompress(sent[2]["body"]) == chunks[1]
+        assert decoder.decompress(sent[3]["body"]) == chunks[2]
+        print("✓ Streamed responses are encoded chunk by chunk with a flush after each")
+
+    def test_cpu_budget(self):
+        clock = Clock()
+        budget = CompressionBudget(fraction=0.1, clock=clock)
+        app = CompressionMiddleware(_app(BODY), budget=budget)
+
+        async def main():
+            first = await _call(app)
+            budget.charge(0.2)
+            over = await _call(app)
+            clock.now += 1.0
+            later = await _call(app)
+            return first, over, later
+
+        first, over, later = asyncio.run(main())
+        assert b"content-encoding" in first[1]
+        assert b"content-encoding" not in over[1] and over[2] == BODY
+        assert b"content-encoding" in later[1]
+        print("✓ Over the per-second CPU budget responses go out uncompressed until the next second")
+
+
+class TestStaticAssets:
+    """Ranges and precompressed variants"""
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        (tmp_path / "promo.mp4").write_bytes(bytes(range(256)) * 40)
+        (tmp_path / "app.js").write_bytes(b"function f() { return 1; }\n" * 200)
+        app = Starlette()
+        app.mount("/static", StaticAssets(directory=tmp_path))
+        return TestClient(app), tmp_path
+
+    def test_parse_range(self):
+        assert parse_range("bytes=0-99", 1000) == (0, 99)
+        assert parse_range("bytes=900-", 1000) == (900, 999)
+        assert parse_range("bytes=-100", 1000) == (900, 999)
+        assert parse_range("bytes=0-5000", 1000) == (0, 999)
+        assert parse_range("bytes=0-1,5-9", 1000) is None
+        assert parse_range("items=0-1", 1000) is None
+        with pytest.raises(ValueError):
+            parse_range("bytes=1000-", 1000)
+        print("✓ Single byte ranges parse; multipart and other units get the whole file")
+
+    def test_video_ranges(self, client):
+        client, _ = client
+        full = client.get("/static/promo.mp4")
+        assert full.headers["accept-ranges"] == "bytes"
+        assert "max-age" in full.headers["cache-control"]
+        etag = full.headers["etag"]
+
+        part = client.get("/static/promo.mp4", headers={"Range": "bytes=256-511"})
+        assert part.status_code == 206
+        assert part.headers["content-range"] == "bytes 256-511/10240"
+        assert part.content == full.content[256:512]
+
+        unsatisfiable = client.get("/static/promo.mp4", headers={"Range": "bytes=20000-"})
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == "bytes */10240"
+
+        same = client.get("/static/promo.mp4", headers={"Range": "bytes=0-9", "If-Range": etag})
+        stale = client.get("/static/promo.mp4", headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+        assert same.status_code == 206 and len(same.content) == 10
+        assert stale.status_code == 200 and len(stale.content) == 10240
+
+        cached = client.get("/static/promo.mp4", headers={"If-None-Match": etag})
+        assert cached.status_code == 304
+        print("✓ Video: 206 slices, 416 past the end, If-Range falls back to the full file, 304 on ETag")
+
+    def test_precompressed_variant(self, client):
+        client, directory = client
+        totals = precompress(directory)
+        assert (directory / "app.js.gz").exists()
+        assert not (directory / "promo.mp4.gz").exists()
+        assert totals["written"] >= 1
+
+        response = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.content == (directory / "app.js").read_bytes()  # decoded by the client
+        plain = client.get("/static/app.js", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in plain.headers
+
+        # A source edited after precompressing is served as-is until the variant is rewritten
+        source = directory / "app.js"
+        os.utime(source, (source.stat().st_atime, source.stat().st_mtime + 10))
+        stale = client.get("/static/app.js", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in stale.headers
+        assert precompress(directory)["written"] >= 1
+        print("✓ .gz written for JS (not for video), served to gzip clients, ignored once stale")
+
+    def test_variants_changed_while_serving(self, client):
+        client, directory = client
+        accept = {"Accept-Encoding": "gzip"}
+        assert "content-encoding" not in client.get("/static/app.js", headers=accept).headers
+
+        precompress(directory)  # run against the live server
+        fresh = client.get("/static/app.js", headers=accept)
+        assert fresh.headers["content-encoding"] == "gzip"
+
+        variant = directory / "app.js.gz"
+        variant.write_bytes(gzip.compress((directory / "app.js").read_bytes(), compresslevel=1))
+        rewritten = client.get("/static/app.js", headers=accept)
+        assert rewritten.content == (directory / "app.js").read_bytes()
+        assert int(rewritten.headers["content-length"]) == variant.stat().st_size
+
+        variant.unlink()
+        gone = client.get("/static/app.js", headers=accept)
+        assert gone.status_code == 200 and "content-encoding" not in gone.headers
+        print("✓ Variants written, rewritten or deleted after start-up are picked up without a restart")
+
+
+class TestBenchmark:
+    """bench/compression.py"""
+
+    def test_event_page_shrinks(self):
+        rows = asyncio.run(measure(3))
+        sizes = {(route, encoding): size for route, encoding, size, _, _ in rows}
+        event = "GET /api/events/{id}"
+        assert sizes[(event, "identity")] / sizes[(event, "gzip")] > 5
+        print("✓ " + ", ".join(f"{r} {e} {s}B" for (r, e), s in sizes.items()))
@@ -0,0 +1,151 @@
+"""
+Event description tests
+Prompt fingerprints, template reuse and the batch description job, run
+against in-memory collections and a fake LLM.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from conftest import FakeCollection
+from descriptions import fingerprint, render
+from jobs import JobRunner, MemoryJobStore
+
+
+def _tours():
+    """15 tours x 3 dates, none described yet"""
+    return [
+        {"_id": i, "event_id": f"evt_{i}", "event_type": "concert", "artist": f"Artist {i // 3}",
+         "venue": "Wembley Stadium", "city": "London", "country": "UK",
+         "event_date": datetime(2026, 7, 1 + i % 3, tzinfo=timezone.utc), "description": None}
+        for i in range(45)
+    ]
+
+
+class FakeTemplates:
+    def __init__(self):
+        self.documents = {}
+
+    async def find_one(self, query, projection=None):
+        return self.documents.get(query["fingerprint"])
+
+    async def update_one(self, query, change, upsert=False):
+        self.documents[query["fingerprint"]] = dict(change["$set"])
+
+
+class FakeLLM:
+    """Writes a one-line template per artist; 'Artist 7' fails while fail is set"""
+
+    def __init__(self):
+        self.prompts = []
+        self.active = 0
+        self.max_active = 0
+        self.fail = True
+
+    async def chat_completion(self, model, messages, max_tokens):
+        prompt = messages[-1]["content"]
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.001)
+        self.active -= 1
+        artist = prompt.split("Artist: ")[1].split("\n")[0]
+        if self.fail and artist == "Artist 7":
+            raise RuntimeError("content filter")
+        self.prompts.append(prompt)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f"See {artist} live on {{date}}!"))],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=50)
+        )
+
+
+@pytest.fixture
+def description_job(monkeypatch):
+    import descriptions
+    from routers import seo
+
+    events = FakeCollection(_tours())
+    llm = FakeLLM()
+    runner = JobRunner(MemoryJobStore(), lease_seconds=30)
+    runner.handler("descriptions")(seo.generate_descriptions_job)
+    monkeypatch.setattr(seo, "db", SimpleNamespace(events=events))
+    monkeypatch.setattr(seo, "description_cache", descriptions.DescriptionCache(FakeTemplates()))
+    monkeypatch.setattr(descriptions, "chat_completion", llm.chat_completion)
+    monkeypatch.setattr(seo, "DESCRIPTION_JOB_RATE", 0)
+    monkeypatch.setattr(seo, "DESCRIPTION_JOB_BATCH", 10)
+    monkeypatch.setattr(seo, "DESCRIPTION_JOB_CONCURRENCY", 3)
+    return runner, events, llm
+
+
+async def _run_job(runner, params=None):
+    job = await runner.submit("descriptions", params)
+    while runner._tasks:
+        await asyncio.gather(*runner._tasks.values(), return_exceptions=True)
+    return await runner.get(job["job_id"])
+
+
+class TestFingerprint:
+    """Same inputs, same prompt fingerprint"""
+
+    def test_case_spacing_and_date_do_not_matter(self):
+        a = {"event_type": "match", "home_team": "Real Madrid", "away_team": "FC Barcelona",
+             "league": "La Liga", "venue": "Santiago Bernabéu", "city": "Madrid", "country": "Spain",
+             "event_date": datetime(2026, 3, 1)}
+        b = {**a, "home_team": "real  madrid ", "event_date": datetime(2026, 10, 25)}
+        assert fingerprint(a) == fingerprint(b)
+        assert fingerprint(a) != fingerprint({**a, "venue": "Camp Nou"})
+        assert fingerprint(a) != fingerprint({**a, "event_type": "concert", "artist": "Real Madrid"})
+        print("✓ Fingerprint ignores case, spacing and date; changes with venue or event type")
+
+    def test_render_fills_in_date(self):
+        event = {"event_date": datetime(2026, 6, 14, 20, 0, tzinfo=timezone.utc)}
+        assert render("Kick-off on {date}.", event) == "Kick-off on 14 June 2026."
+        print("✓ Shared templates get each event's own date")
+
+
+class TestDescriptionJob:
+    """Batch AI descriptions reuse templates and only regenerate changed events"""
+
+    def test_parallel_generation_with_bulk_writes(self, description_job):
+        runner, events, llm = description_job
+        job = asyncio.run(_run_job(runner))
+
+        assert job["status"] == "completed"
+        assert (job["total"], job["done"], job["failed"]) == (45, 42, 3)
+        assert [e["event_id"] for e in job["errors"]] == ["evt_21", "evt_22", "evt_23"]
+        assert len(events.writes) == 5
+        assert llm.max_active <= 3
+        print("✓ 45 events: at most 3 LLM calls at a time, one bulk write per batch of 10, failures recorded")
+
+    def test_one_llm_call_per_template(self, description_job):
+        runner, events, llm = description_job
+        job = asyncio.run(_run_job(runner))
+
+        assert len(llm.prompts) == 14  # 15 line-ups, one of them failing
+        assert (job["llm_calls"], job["cache_hits"]) == (14, 28)
+        assert (job["prompt_tokens"], job["completion_tokens"]) == (1400, 700)
+        assert events.documents[1]["description"] == "See Artist 0 live on 2 July 2026!"
+        assert events.documents[0]["description_fingerprint"] == events.documents[2]["description_fingerprint"]
+        print(f"✓ 42 descriptions from {len(llm.prompts)} LLM calls; dates rendered into shared templates")
+
+    def test_refresh_only_regenerates_changed_inputs(self, description_job):
+        runner, events, llm = description_job
+
+        async def main():
+            await _run_job(runner)
+            events.documents[0]["venue"] = "Tottenham Hotspur Stadium"
+            events.documents[5]["description"] = "Written by the seller"
+            del events.documents[5]["description_fingerprint"]
+            llm.fail = False
+            calls = len(llm.prompts)
+            job = await _run_job(runner, {"refresh": True})
+            return len(llm.prompts) - calls, job
+
+        new_calls, job = asyncio.run(main())
+        assert new_calls == 2  # Artist 0 at the new venue, and the Artist 7 retry
+        assert (job["total"], job["done"], job["skipped"]) == (44, 4, 40)
+        assert events.documents[0]["description_fingerprint"] != events.documents[1]["description_fingerprint"]
+        assert events.documents[5]["description"] == "Written by the seller"
+        print("✓ Refresh regenerates only events whose inputs changed; hand-written copy is kept")
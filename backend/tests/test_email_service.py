@@ -0,0 +1,31 @@
+"""
+Email template tests
+Event dates render the same whether stored as BSON datetimes or legacy ISO strings.
+"""
+
+from datetime import datetime, timezone
+
+from email_service import format_date, order_confirmation_email
+
+
+class TestFormatDate:
+    """Dates in order and seller emails"""
+
+    def test_datetimes_and_strings(self):
+        expected = "June 11, 2026 at 08:00 PM"
+        assert format_date(datetime(2026, 6, 11, 20, 0)) == expected
+        assert format_date(datetime(2026, 6, 11, 20, 0, tzinfo=timezone.utc)) == expected
+        assert format_date("2026-06-11T20:00:00Z") == expected
+        assert format_date("2026-06-11T20:00:00") == expected
+        assert format_date(datetime(2026, 6, 11, 20, 0), "de") == "11.06.2026 um 20:00 Uhr"
+        assert format_date("TBC") == "TBC"
+        assert format_date(None) == ""
+        print("✓ Naive and aware datetimes and ISO strings all format; other values pass through")
+
+    def test_order_confirmation_shows_formatted_date(self):
+        event = {"title": "Final", "event_date": datetime(2026, 7, 19, 19, 0), "venue": "MetLife", "city": "New York"}
+        order = {"order_id": "ord_1", "total_amount": 250.0, "quantity": 2}
+        email = order_confirmation_email(order, event, {"category": "Cat 1"})
+        assert "July 19, 2026 at 07:00 PM" in email["html"]
+        assert "datetime.datetime" not in email["html"]
+        print("✓ Order confirmation shows a readable date for a BSON event_date")
@@ -0,0 +1,226 @@
+"""
+Outbound HTTP tests
+Keep-alive pooling, per-host limits, timeouts and circuit breakers, run
+against a local mock server standing in for the auth provider / Resend.
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from http_clients import OutboundHTTP, Dependency, CircuitBreaker, CircuitOpen
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits += 1
+            server.connections.add(self.client_address)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(float(self.path.split("=")[1]))
+            status = 500 if self.path == "/fail" else 200
+            body = b'{"ok": true}'
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mock_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.hits = 0
+    server.active = 0
+    server.max_active = 0
+    server.connections = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_outbound(server, **overrides) -> OutboundHTTP:
+    settings = dict(timeout=5.0, connect_timeout=1.0, max_connections=10, max_keepalive=10,
+                    failure_threshold=3, reset_timeout=30.0)
+    settings.update(overrides)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return OutboundHTTP({"mock": Dependency(name="mock", base_url=base_url, **settings)})
+
+
+def run(outbound: OutboundHTTP, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await outbound.close()
+    return asyncio.run(main())
+
+
+class TestPooling:
+    """Connection reuse and per-host limits"""
+
+    def test_keep_alive_reuses_connection(self, mock_server):
+        outbound = make_outbound(mock_server)
+
+        async def calls():
+            for _ in range(20):
+                response = await outbound.request("mock", "GET", "/ok")
+                assert response.status_code == 200
+
+        run(outbound, calls())
+        assert mock_server.hits == 20
+        assert len(mock_server.connections) == 1
+        print("✓ 20 sequential calls share one keep-alive connection")
+
+    def test_per_host_connection_limit(self, mock_server):
+        outbound = make_outbound(mock_server, max_connections=2, max_keepalive=2)
+
+        async def calls():
+            await asyncio.gather(*(outbound.request("mock", "GET", "/slow?s=0.1") for _ in range(8)))
+
+        run(outbound, calls())
+        assert mock_server.hits == 8
+        assert mock_server.max_active <= 2
+        assert len(mock_server.connections) <= 2
+        print("✓ Concurrent calls are capped at max_connections per dependency")
+
+    def test_timeout(self, mock_server):
+        outbound = make_outbound(mock_server, timeout=0.2)
+        with pytest.raises(httpx.ReadTimeout):
+            run(outbound, outbound.request("mock", "GET", "/slow?s=1"))
+        assert outbound.breakers["mock"].failures == 1
+        print("✓ Read timeouts raise and count against the breaker")
+
+
+class TestCircuitBreaker:
+    """Fail fast once a dependency is down"""
+
+    def test_opens_after_threshold_and_sheds_calls(self, mock_server):
+        outbound = make_outbound(mock_server, failure_threshold=3)
+
+        async def calls():
+            for _ in range(3):
+                response = await outbound.request("mock", "GET", "/fail")
+                assert response.status_code == 500
+            with pytest.raises(CircuitOpen):
+                await outbound.request("mock", "GET", "/ok")
+
+        run(outbound, calls())
+        assert mock_server.hits == 3
+        assert outbound.breakers["mock"].state == CircuitBreaker.OPEN
+        text = outbound.render_prometheus()
+        assert 'outbound_requests_total{dependency="mock",outcome="5xx"} 3' in text
+        assert 'outbound_requests_total{dependency="mock",outcome="rejected"} 1' in text
+        assert 'outbound_circuit_state{dependency="mock"} 2' in text
+        print("✓ Breaker opens after 3 failures and rejects without calling the server")
+
+    def test_half_open_trial_closes_or_reopens(self):
+        now = [0.0]
+        breaker = CircuitBreaker("dep", failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        now[0] = 11
+        breaker.before_call()  # trial call allowed
+        with pytest.raises(CircuitOpen):
+            breaker.before_call()  # only one trial at a time
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+        now[0] = 22
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+        print("✓ Half-open lets one trial through; success closes, failure re-opens")
+
+    def test_guard_only_counts_dependency_failures(self, mock_server):
+        outbound = make_outbound(mock_server, failure_threshold=1)
+
+        async def calls():
+            with pytest.raises(ValueError):
+                async with outbound.guard("mock", failures=(ConnectionError,)):
+                    raise ValueError("card declined")
+            assert outbound.breakers["mock"].state == CircuitBreaker.CLOSED
+            with pytest.raises(ConnectionError):
+                async with outbound.guard("mock", failures=(ConnectionError,)):
+                    raise ConnectionError("reset by peer")
+            assert outbound.breakers["mock"].state == CircuitBreaker.OPEN
+
+        run(outbound, calls())
+        print("✓ Client errors don't trip the breaker; connection errors do")
+
+    def test_cancelled_trial_frees_the_slot(self, mock_server):
+        outbound = make_outbound(mock_server, failure_threshold=1, reset_timeout=10)
+        breaker = outbound.breakers["mock"]
+        now = [0.0]
+        breaker.clock = lambda: now[0]
+
+        async def stream():
+            async with outbound.guard("mock"):
+                yield "chunk"
+                yield "chunk"
+
+        async def calls():
+            breaker.record_failure()
+            now[0] = 11
+
+            # Half-open trial request cancelled mid-flight
+            task = asyncio.create_task(outbound.request("mock", "GET", "/slow?s=1"))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            assert not breaker.trial_in_flight
+
+            # Half-open trial inside an SSE generator closed by a client disconnect
+            chunks = stream()
+            await chunks.__anext__()
+            await chunks.aclose()
+            assert not breaker.trial_in_flight
+
+            response = await outbound.request("mock", "GET", "/ok")
+            assert response.status_code == 200
+
+        run(outbound, calls())
+        assert breaker.state == CircuitBreaker.CLOSED
+        print("✓ A cancelled or abandoned half-open trial doesn't leave the breaker stuck open")
+
+
+class TestApiIntegration:
+    """Open circuits surface as 503 with Retry-After"""
+
+    def test_auth_circuit_open_returns_503(self):
+        from fastapi.testclient import TestClient
+        import server
+        from http_clients import outbound
+
+        breaker = outbound.breakers["auth"]
+        breaker.opened_at = breaker.clock()
+        try:
+            response = TestClient(server.app).post("/api/auth/session", json={"session_id": "abc"})
+        finally:
+            breaker.record_success()
+        assert response.status_code == 503
+        assert int(response.headers["retry-after"]) >= 1
+        print("✓ Login fails fast with 503 while the auth provider's circuit is open")
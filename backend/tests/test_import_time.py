@@ -0,0 +1,79 @@
+"""
+Cold start tests
+Importing server must stay cheap: heavy SDKs load on first use and seed
+datasets live in seed_data/*.json instead of module-level literals.
+Override the budget with IMPORT_TIME_BUDGET_MS on slow CI machines.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', '800'))
+DEFERRED_MODULES = ("stripe", "openai", "qrcode", "PIL", "resend")
+
+
+def import_profile(module: str = "server") -> dict:
+    """Cumulative import time in microseconds per module, from -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            timings[name.strip()] = int(cumulative)
+    return timings
+
+
+@pytest.fixture(scope="module")
+def server_imports():
+    # Warm run so bytecode caches don't count against the budget
+    import_profile()
+    return import_profile()
+
+
+class TestColdStart:
+    """Import-time budget for the API module"""
+
+    def test_heavy_sdks_not_imported(self, server_imports):
+        loaded = [name for name in DEFERRED_MODULES if name in server_imports]
+        assert loaded == [], f"Imported at startup: {loaded}"
+        print("✓ stripe, openai, qrcode, PIL and resend load on first use")
+
+    def test_import_budget(self, server_imports):
+        elapsed_ms = server_imports["server"] / 1000
+        assert elapsed_ms <= IMPORT_TIME_BUDGET_MS, (
+            f"import server took {elapsed_ms:.0f}ms (budget {IMPORT_TIME_BUDGET_MS:.0f}ms)"
+        )
+        print(f"✓ import server: {elapsed_ms:.0f}ms")
+
+
+class TestSeedData:
+    """Seed datasets load from JSON"""
+
+    def test_datasets_load(self):
+        from routers.seeding import load_seed_data
+        for name in ("demo", "worldcup_2026", "champions_league", "euro_leagues", "vip_worldcup", "expanded"):
+            assert load_seed_data(name)
+        assert len(load_seed_data("worldcup_2026")["wc_matches"]) > 0
+        print("✓ All seed datasets parse")
+
+    def test_lazy_module_configures_once(self):
+        from lazy import LazyModule
+        calls = []
+        module = LazyModule("json", configure=calls.append)
+        assert calls == []
+        assert module.dumps({"a": 1}) == '{"a": 1}'
+        module.loads("{}")
+        assert len(calls) == 1
+        print("✓ LazyModule imports and configures on first access")
@@ -0,0 +1,236 @@
+"""
+Background job tests
+Runner, leases, checkpoints and resume against the in-memory job store.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from jobs import JobConflict, JobRunner, MemoryJobStore, RateLimiter, run_bounded
+
+ITEMS = 45
+BATCH = 10
+
+
+@pytest.fixture
+def counting_runner():
+    """A job that 'processes' ITEMS items in batches, checkpointing after each"""
+    runner = JobRunner(MemoryJobStore(), lease_seconds=30)
+    processed = []
+
+    @runner.handler("count")
+    async def count_job(job):
+        if job.total is None:
+            await job.progress(total=ITEMS)
+        while job.state.get("next", 0) < ITEMS:
+            start = job.state.get("next", 0)
+            batch = list(range(start, min(start + BATCH, ITEMS)))
+            await asyncio.sleep(0.005)
+            processed.extend(batch)
+            await job.progress(done=len(batch), state={"next": batch[-1] + 1}, counts={"batches": 1})
+
+    return runner, processed
+
+
+async def _finish(runner, job_id):
+    while runner._tasks:
+        await asyncio.gather(*runner._tasks.values(), return_exceptions=True)
+    return await runner.get(job_id)
+
+
+class TestJobRunner:
+    """Persisted progress, one active job per kind, resume after interruption"""
+
+    def test_job_runs_to_completion(self, counting_runner):
+        runner, processed = counting_runner
+
+        async def main():
+            job = await runner.submit("count", created_by="admin")
+            return await _finish(runner, job["job_id"])
+
+        job = asyncio.run(main())
+        assert job["status"] == "completed"
+        assert (job["total"], job["done"], job["batches"]) == (ITEMS, ITEMS, 5)
+        assert job["lease_until"] is None
+        print("✓ Job progress and extra counts are persisted per batch")
+
+    def test_second_submit_returns_running_job(self, counting_runner):
+        runner, processed = counting_runner
+
+        async def main():
+            first = await runner.submit("count")
+            second = await runner.submit("count")
+            await _finish(runner, first["job_id"])
+            return first, second
+
+        first, second = asyncio.run(main())
+        assert first["job_id"] == second["job_id"]
+        assert len(processed) == ITEMS
+        print("✓ Only one job of a kind runs at a time")
+
+    def test_submit_with_other_params_conflicts(self, counting_runner):
+        runner, processed = counting_runner
+
+        async def main():
+            first = await runner.submit("count", {"draw_id": "draw_a"})
+            again = await runner.submit("count", {"draw_id": "draw_a"})
+            with pytest.raises(JobConflict) as conflict:
+                await runner.submit("count", {"draw_id": "draw_b"})
+            await _finish(runner, first["job_id"])
+            after = await runner.submit("count", {"draw_id": "draw_b"})
+            await _finish(runner, after["job_id"])
+            return first, again, conflict.value, after
+
+        first, again, conflict, after = asyncio.run(main())
+        assert again["job_id"] == first["job_id"]
+        assert conflict.active["job_id"] == first["job_id"]
+        assert after["params"] == {"draw_id": "draw_b"} and after["job_id"] != first["job_id"]
+        print("✓ A different task of a running kind is refused, not silently mapped to the running job")
+
+    def test_concurrent_submits_start_one_job(self, counting_runner):
+        runner, processed = counting_runner
+
+        class RacyStore(MemoryJobStore):
+            async def find_active(self, kinds):
+                found = await super().find_active(kinds)
+                await asyncio.sleep(0)  # both submits check before either inserts
+                return found
+
+        runner.store = RacyStore()
+
+        async def main():
+            jobs = await asyncio.gather(*(runner.submit("count") for _ in range(5)))
+            await _finish(runner, jobs[0]["job_id"])
+            again = await runner.submit("count")
+            await _finish(runner, again["job_id"])
+            return jobs, again
+
+        jobs, again = asyncio.run(main())
+        assert len({j["job_id"] for j in jobs}) == 1
+        assert again["job_id"] != jobs[0]["job_id"]
+        assert len(runner.store.jobs) == 2
+        assert len(processed) == 2 * ITEMS
+        print("✓ Concurrent submits start one job; a new one can start once it finishes")
+
+    def test_interrupted_job_resumes_from_checkpoint(self, counting_runner):
+        runner, processed = counting_runner
+
+        async def main():
+            job = await runner.submit("count")
+            while len(processed) < 2 * BATCH:
+                await asyncio.sleep(0.001)
+            await runner.stop()
+            interrupted = await runner.get(job["job_id"])
+
+            # A fresh worker picks it up from the persisted checkpoint
+            successor = JobRunner(runner.store, lease_seconds=30)
+            successor.handlers = runner.handlers
+            assert await successor.resume() == 1
+            return interrupted, await _finish(successor, job["job_id"])
+
+        interrupted, finished = asyncio.run(main())
+        assert interrupted["status"] == "queued" and interrupted["lease_until"] is None
+        assert interrupted["state"]["next"] >= 2 * BATCH
+        assert finished["status"] == "completed" and finished["done"] == ITEMS
+        assert sorted(processed) == list(range(ITEMS))
+        print(f"✓ Interrupted after {interrupted['done']} item(s); resumed without redoing any")
+
+    def test_failed_job_records_error(self):
+        runner = JobRunner(MemoryJobStore())
+
+        @runner.handler("broken")
+        async def broken(job):
+            raise RuntimeError("boom")
+
+        async def main():
+            job = await runner.submit("broken")
+            return await _finish(runner, job["job_id"])
+
+        job = asyncio.run(main())
+        assert (job["status"], job["error"]) == ("failed", "boom")
+        print("✓ Handler exceptions mark the job failed")
+
+
+class TestRunnerPrimitives:
+    """Leases, bounded parallelism and rate limiting"""
+
+    def test_heartbeat_survives_failed_renewal(self, caplog):
+        store = MemoryJobStore()
+        runner = JobRunner(store, lease_seconds=0.03)
+        calls = []
+        update = store.update
+
+        async def flaky_update(job_id, fields, **kwargs):
+            calls.append(fields)
+            if len(calls) == 1:
+                raise ConnectionError("primary stepped down")
+            await update(job_id, fields, **kwargs)
+
+        store.update = flaky_update
+
+        async def main():
+            now = datetime.now(timezone.utc)
+            await store.insert({"job_id": "j1", "kind": "noop", "status": "running", "lease_until": now})
+            heartbeat = asyncio.create_task(runner._heartbeat("j1"))
+            await asyncio.sleep(0.1)
+            assert not heartbeat.done()
+            heartbeat.cancel()
+            return store.jobs["j1"]["lease_until"] > now
+
+        renewed = asyncio.run(main())
+        assert len(calls) >= 3 and renewed
+        assert "lease renewal failed" in caplog.text
+        print("✓ A failed lease renewal is logged and the heartbeat keeps renewing")
+
+    def test_live_lease_is_not_taken_over(self):
+        store = MemoryJobStore()
+        now = datetime.now(timezone.utc)
+
+        async def main():
+            await store.insert({"job_id": "j1", "kind": "noop", "status": "running", "owner": "other:1",
+                                "lease_until": now + timedelta(seconds=30), "created_at": now})
+            held = await store.claim("j1", "me:2", now, now + timedelta(seconds=30))
+            expired = await store.claim("j1", "me:2", now + timedelta(seconds=31), now + timedelta(seconds=61))
+            return held, expired
+
+        held, expired = asyncio.run(main())
+        assert held is None
+        assert expired["owner"] == "me:2"
+        print("✓ A job is only taken over once its worker stops renewing the lease")
+
+    def test_run_bounded_limits_concurrency(self):
+        active = {"now": 0, "max": 0}
+
+        async def work(item):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.001)
+            active["now"] -= 1
+            if item == 3:
+                raise ValueError("bad")
+            return item * 2
+
+        results = asyncio.run(run_bounded(list(range(10)), work, concurrency=4))
+        assert active["max"] == 4
+        assert isinstance(results[3], ValueError)
+        assert results[4] == 8
+        print("✓ run_bounded caps parallelism and returns per-item failures")
+
+    def test_rate_limiter_spaces_calls(self):
+        now = [100.0]
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(round(seconds, 3))
+
+        limiter = RateLimiter(4, clock=lambda: now[0], sleep=fake_sleep)
+
+        async def main():
+            for _ in range(5):
+                await limiter.wait()
+
+        asyncio.run(main())
+        assert sleeps == [0.25, 0.5, 0.75, 1.0]
+        print("✓ 4/s limiter spaces five immediate calls 250ms apart")
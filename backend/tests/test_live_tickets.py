@@ -0,0 +1,147 @@
+"""
+Live availability tests
+Deltas from ticket changes, one upstream read per change shared by all
+subscribers, resync of slow consumers, and 10k idle streams on one worker,
+against an in-memory tickets collection.
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from change_feed import DomainEvent
+from conftest import FakeCursor
+from live_tickets import LiveHub, RESYNC
+
+
+class FakeTickets:
+    def __init__(self, tickets):
+        self.documents = {i: {"_id": i, **t} for i, t in enumerate(tickets)}
+        self.reads = 0
+
+    def find(self, query, projection):
+        self.reads += 1
+        return FakeCursor([dict(d) for d in self.documents.values()
+                           if d["event_id"] == query["event_id"] and d["status"] == query["status"]])
+
+    async def find_one(self, query, projection):
+        self.reads += 1
+        document = self.documents.get(query["_id"])
+        return dict(document) if document else None
+
+
+def _catalogue():
+    tickets = [{"ticket_id": f"t{i}", "event_id": "e1", "category": "cat1" if i < 3 else "vip",
+                "section": "101", "price": 100.0 + i, "status": "available"} for i in range(5)]
+    return FakeTickets(tickets)
+
+
+def _change(tickets, _id, **fields):
+    tickets.documents[_id].update(fields)
+    doc = tickets.documents[_id]
+    return DomainEvent("ticket.update", "ticket", "update", _id,
+                       {"ticket_id": doc["ticket_id"], "event_id": doc["event_id"], "status": doc["status"]})
+
+
+async def _drain(hub):
+    while hub._pending:
+        await asyncio.gather(*list(hub._pending))
+
+
+def _kinds(subscriber):
+    kinds = []
+    while subscriber.items:
+        item = subscriber.items.pop(0)
+        kinds.append("resync" if item is RESYNC else item.split("\n", 1)[0].removeprefix("event: "))
+    return kinds
+
+
+class TestDeltas:
+    """Ticket changes become listed/price/sold/categories messages"""
+
+    def test_changes_fan_out_from_one_read(self):
+        tickets = _catalogue()
+        hub = LiveHub(SimpleDatabase(tickets))
+
+        async def main():
+            async with hub.subscribe("e1") as (channel, a), hub.subscribe("e1") as (_, b), \
+                    hub.subscribe("e1") as (_, c):
+                reads_after_load = tickets.reads
+                hub.on_change(_change(tickets, 0, price=80.0))   # new cat1 minimum
+                hub.on_change(_change(tickets, 1, status="sold"))
+                tickets.documents[9] = {"_id": 9, "ticket_id": "t9", "event_id": "e1", "category": "vip",
+                                        "section": "VIP", "price": 900.0, "status": "available"}
+                hub.on_change(DomainEvent("ticket.insert", "ticket", "insert", 9, {"event_id": "e1"}))
+                hub.on_change(_change(tickets, 2, event_id="e2"))  # unrelated event now
+                await _drain(hub)
+                return reads_after_load, tickets.reads, _kinds(a), _kinds(b), _kinds(c), channel.categories
+
+        loaded, reads, a, b, c, categories = asyncio.run(main())
+        assert loaded == 1
+        assert reads == 5
+        assert a == b == c == ["price", "categories", "sold", "categories", "listed", "categories",
+                               "removed", "categories"]
+        assert categories == {"cat1": {"count": 1, "lowest_price": 80.0}, "vip": {"count": 3, "lowest_price": 103.0}}
+        assert hub.channels == {}
+        print("✓ One snapshot load and one read per change, shared by 3 subscribers")
+
+    def test_slow_subscriber_resyncs(self):
+        tickets = _catalogue()
+        hub = LiveHub(SimpleDatabase(tickets), queue_size=4)
+
+        async def main():
+            async with hub.subscribe("e1") as (channel, slow), hub.subscribe("e1") as (_, fast):
+                seen = []
+                for price in range(10):
+                    hub.on_change(_change(tickets, 4, price=200.0 + price))
+                    await _drain(hub)
+                    seen += _kinds(fast)
+                return _kinds(slow), seen, channel.snapshot()
+
+        slow, fast, snapshot = asyncio.run(main())
+        assert slow == ["resync"]
+        assert fast.count("price") == 10
+        assert '"price": 209.0' in snapshot
+        print("✓ A stalled client's backlog is replaced by one resync; others get every delta")
+
+
+class SimpleDatabase:
+    def __init__(self, tickets):
+        self.tickets = tickets
+
+
+class TestScale:
+    """Idle subscribers are cheap"""
+
+    def test_ten_thousand_idle_streams(self):
+        tickets = _catalogue()
+        hub = LiveHub(SimpleDatabase(tickets), heartbeat=60, max_seconds=60)
+        clients = 10_000
+
+        async def client(received):
+            async for message in hub.stream("e1"):
+                received.append(message)
+                if "event: sold" in message:
+                    return
+
+        async def main():
+            received = [[] for _ in range(clients)]
+            tracemalloc.start()
+            tasks = [asyncio.create_task(client(r)) for r in received]
+            while hub.subscriber_count < clients:
+                await asyncio.sleep(0.01)
+            memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            started = time.perf_counter()
+            hub.on_change(_change(tickets, 3, status="sold"))
+            await asyncio.gather(*tasks)
+            return received, memory, time.perf_counter() - started
+
+        received, memory, delivery = asyncio.run(main())
+        assert all(len(r) == 3 and r[0].startswith("retry:") and "event: snapshot" in r[1] for r in received)
+        assert tickets.reads == 2
+        assert memory / clients < 4 * 1024
+        assert hub.channels == {}
+        print(f"✓ {clients} streams on one channel: {memory / clients / 1024:.1f} KiB each, "
+              f"2 upstream reads, sold delta delivered to all in {delivery * 1000:.0f} ms")
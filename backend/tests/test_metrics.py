@@ -0,0 +1,100 @@
+"""
+Request metrics tests
+DB command attribution, route histograms and the Prometheus exposition.
+"""
+
+import asyncio
+import contextvars
+from types import SimpleNamespace
+
+import pytest
+
+import metrics
+from metrics import RequestMetricsMiddleware, command_metrics, render_prometheus
+
+
+def _app_issuing_commands(count):
+    async def app(scope, receive, send):
+        scope["route"] = SimpleNamespace(path="/api/things/{thing_id}")
+        for _ in range(count):
+            # Motor runs PyMongo on an executor with a copy of the caller's context
+            event = SimpleNamespace(reply={"ok": 1}, duration_micros=2000)
+            await asyncio.get_running_loop().run_in_executor(
+                None, contextvars.copy_context().run, command_metrics.succeeded, event
+            )
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+    return RequestMetricsMiddleware(app)
+
+
+async def _get(app, path):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "method": "GET", "path": path, "headers": []}, receive, send)
+    return messages
+
+
+class TestRequestMetrics:
+    """Per-request DB attribution and per-route histograms"""
+
+    def test_commands_attributed_to_route_template(self):
+        asyncio.run(_get(_app_issuing_commands(3), "/api/things/42"))
+        series = metrics.request_db_commands._series[("GET", "/api/things/{thing_id}")]
+        assert series[-1] == 1  # one request observed
+        assert series[-2] == 3  # three commands
+        print("✓ DB commands are attributed to the route template, not the raw path")
+
+    def test_commands_outside_requests_ignored(self):
+        command_metrics.succeeded(SimpleNamespace(reply={"ok": 1}, duration_micros=1000))
+        assert metrics.current_request_stats() is None
+        print("✓ Commands outside a request are ignored")
+
+    def test_server_timing_header(self, monkeypatch):
+        monkeypatch.setattr(metrics, "SERVER_TIMING", True)
+        messages = asyncio.run(_get(_app_issuing_commands(2), "/api/things/1"))
+        headers = dict(messages[0]["headers"])
+        assert b"db;dur=" in headers[b"server-timing"]
+        assert b"2 cmds" in headers[b"server-timing"]
+        print("✓ Server-Timing header added in debug mode")
+
+    def test_prometheus_exposition(self):
+        asyncio.run(_get(_app_issuing_commands(1), "/api/things/7"))
+        text = render_prometheus({"pid": 1, "servers": {"db:27017": {"checked_out": 2, "open_connections": 4, "saturation": 0.02, "avg_wait_ms": 0.1}}})
+        assert '# TYPE http_request_duration_seconds histogram' in text
+        assert 'http_request_db_commands_bucket{method="GET",route="/api/things/{thing_id}",le="+Inf"}' in text
+        assert 'http_requests_total{method="GET",route="/api/things/{thing_id}",status="200"}' in text
+        assert 'mongo_pool_checked_out{server="db:27017",pid="1"} 2' in text
+        print("✓ Prometheus text exposition")
+
+
+class TestOpsEndpoints:
+    """/metrics and the pool and dependency health checks are for operators only"""
+
+    @pytest.mark.parametrize("path", ["/metrics", "/api/health/db-pool", "/api/health/dependencies"])
+    def test_token_or_admin_required(self, monkeypatch, path):
+        from fastapi import HTTPException
+        from fastapi.testclient import TestClient
+        import server
+
+        async def require_admin(request):
+            if request.headers.get("Authorization") != "Bearer admin_session":
+                raise HTTPException(status_code=401, detail="Not authenticated")
+
+        monkeypatch.setenv("METRICS_TOKEN", "scrape")
+        monkeypatch.setattr(server, "require_admin", require_admin)
+        client = TestClient(server.app)
+
+        assert client.get(path).status_code == 401
+        assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+        scraped = client.get(path, headers={"Authorization": "Bearer scrape"})
+        assert scraped.status_code == 200
+        assert client.get(path, headers={"Authorization": "Bearer admin_session"}).status_code == 200
+        monkeypatch.delenv("METRICS_TOKEN")
+        assert client.get(path).status_code == 401  # no token configured doesn't mean open
+        print(f"✓ {path} needs the metrics token or an admin session")
@@ -0,0 +1,151 @@
+"""
+On-demand profiling tests
+The sampling profiler against a busy thread, the flamegraph renderer, the
+X-Profile middleware and the admin profile endpoints (with the admin check
+stubbed, as require_admin needs a session store).
+"""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+import profiling
+import routers.admin as admin
+from profiling import ProfileRequestMiddleware, ProfilerBusy, SamplingProfiler, render_flamegraph
+
+
+def _spin(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fresh_profiles():
+    profiling._profiles.clear()
+    yield
+    profiling._profiles.clear()
+
+
+class TestSamplingProfiler:
+    """Sampling and rendering"""
+
+    def test_samples_busy_thread(self):
+        worker = threading.Thread(target=_spin, args=(0.3,))
+        worker.start()
+        profiler = SamplingProfiler(worker.ident, interval=0.002)
+        profiler.start()
+        with pytest.raises(ProfilerBusy):
+            SamplingProfiler(worker.ident).start()
+        time.sleep(0.2)
+        profiler.stop()
+        worker.join()
+
+        assert profiler.samples > 10
+        top_stack, count = profiler.collapsed().splitlines()[0].rsplit(" ", 1)
+        assert "_spin (test_profiling.py:" in top_stack and int(count) > 0
+        again = SamplingProfiler(threading.get_ident())
+        again.start()  # stop() released the one-profile-per-worker lock
+        again.stop()
+        print(f"✓ {profiler.samples} samples of a busy thread; one profile at a time per worker")
+
+    def test_flamegraph_svg(self):
+        svg = render_flamegraph(Counter({"main (a.py:1);handler (b.py:2)": 3, "main (a.py:1);<lambda> (c.py:3)": 1}),
+                                title="t & t")
+        assert svg.startswith("<svg") and svg.endswith("</svg>")
+        assert "handler (b.py:2) (3 samples, 75.0%)" in svg
+        assert "&lt;lambda&gt;" in svg and "t &amp; t" in svg
+        print("✓ Flamegraph SVG sizes frames by samples and escapes names")
+
+
+class TestProfileMiddleware:
+    """X-Profile on a single request"""
+
+    @staticmethod
+    async def _app(scope, receive, send):
+        _spin(0.05)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    def _call(self, headers, admin_user):
+        async def authorize(scope):
+            return admin_user
+
+        app = ProfileRequestMiddleware(self._app, authorize)
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        async def main():
+            await app({"type": "http", "method": "GET", "path": "/", "headers": headers}, None, send)
+
+        asyncio.run(main())
+        return dict(sent[0]["headers"])
+
+    def test_profiles_admin_requests_only(self):
+        plain = self._call([], admin_user=True)
+        refused = self._call([(b"x-profile", b"1")], admin_user=False)
+        profiled = self._call([(b"x-profile", b"1")], admin_user=True)
+
+        assert b"x-profile-id" not in plain and b"x-profile-id" not in refused
+        profile = profiling.get_profile(profiled[b"x-profile-id"].decode())
+        assert profile is not None and profile.samples > 0
+        assert [p["profile_id"] for p in profiling.list_profiles()] == [profiled[b"x-profile-id"].decode()]
+        print("✓ Only an admin's X-Profile request is profiled, and its id comes back in a header")
+
+
+class TestProfileEndpoints:
+    """/api/admin/profile and /api/admin/profiles"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        role = {"value": "admin"}
+
+        async def require_admin(request):
+            if role["value"] != "admin":
+                raise HTTPException(status_code=403, detail="Admin access required")
+            return SimpleNamespace(user_id="admin_1", role="admin")
+
+        monkeypatch.setattr(admin, "require_admin", require_admin)
+        app = FastAPI()
+        app.include_router(admin.router)
+        return TestClient(app), role
+
+    def test_worker_profile_formats(self, client):
+        client, _ = client
+        collapsed = client.post("/api/admin/profile", params={"seconds": 0.2})
+        svg = client.post("/api/admin/profile", params={"seconds": 0.2, "format": "svg"})
+        assert collapsed.status_code == 200 and collapsed.headers["content-type"].startswith("text/plain")
+        assert svg.headers["content-type"] == "image/svg+xml" and svg.text.startswith("<svg")
+        print("✓ Worker profiles come back as collapsed stacks or, with format=svg, a flamegraph")
+
+    def test_busy_and_request_profiles(self, client):
+        client, _ = client
+        busy = SamplingProfiler(threading.get_ident())
+        busy.start()
+        try:
+            conflict = client.post("/api/admin/profile", params={"seconds": 0.1})
+        finally:
+            busy.stop()
+        assert conflict.status_code == 409
+
+        profile_id = profiling.store_profile(busy)
+        listed = client.get("/api/admin/profiles").json()
+        assert listed["profiles"][0]["profile_id"] == profile_id
+        assert client.get(f"/api/admin/profiles/{profile_id}", params={"format": "svg"}).text.startswith("<svg")
+        assert client.get("/api/admin/profiles/missing").status_code == 404
+        print("✓ 409 while a profile runs; stored request profiles list and render; unknown ids 404")
+
+    def test_admin_only(self, client):
+        client, role = client
+        role["value"] = "buyer"
+        assert client.post("/api/admin/profile", params={"seconds": 0.1}).status_code == 403
+        assert client.get("/api/admin/profiles").status_code == 403
+        print("✓ Profile endpoints are admin only")
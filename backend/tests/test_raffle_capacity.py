@@ -0,0 +1,195 @@
+"""
+Raffle capacity tests
+A promo spike of concurrent checkouts against the in-memory raffle store:
+the capacity is never exceeded, abandoned checkouts give their slots back,
+and stats come from the counters. With MONGO_TEST_URL set, the same spike
+runs against the conditional $inc in MongoDB:
+
+    MONGO_TEST_URL="mongodb://localhost:27017" pytest tests/test_raffle_capacity.py
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from raffle_engine import MemoryRaffleStore, MongoRaffleStore, Raffle, RaffleEngine, SoldOut, shard_capacities
+
+CAPACITY = 500
+BUYERS = 2000
+
+
+def _user(i):
+    return SimpleNamespace(user_id=f"user_{i}", email=f"fan{i}@example.com", name=f"Fan {i}")
+
+
+class CapacityWatch:
+    """Wraps a store and checks the invariant after every counter change"""
+
+    def __init__(self, store, capacity):
+        self.store = store
+        self.capacity = capacity
+        self.peak = 0
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    async def _check(self):
+        counters = await self.store.counters_for("promo")
+        used = sum(c["used"] for c in counters)
+        self.peak = max(self.peak, used)
+        assert used <= self.capacity
+        for c in counters:
+            assert c["used"] == c["reserved"] + c["completed"]
+
+    async def reserve(self, counter_id, n):
+        ok = await self.store.reserve(counter_id, n)
+        await self._check()
+        return ok
+
+    async def adjust(self, counter_id, **change):
+        await self.store.adjust(counter_id, **change)
+        await self._check()
+
+
+async def _spike(engine, buyers=BUYERS, seed=7):
+    """Every buyer tries to check out; some abandon (expire), some pay"""
+    rng = random.Random(seed)
+    outcome = {"sold_out": 0, "paid": 0, "abandoned": 0}
+
+    async def buyer(i):
+        entries = rng.choice([1, 1, 1, 2, 3])
+        await asyncio.sleep(rng.random() / 100)
+        try:
+            entry = await engine.open_entry("promo", entries, _user(i), 100)
+        except SoldOut:
+            outcome["sold_out"] += 1
+            return
+        await asyncio.sleep(rng.random() / 100)  # Stripe session, then the customer decides
+        if rng.random() < 0.3:
+            await engine.expire(entry["entry_id"])
+            outcome["abandoned"] += 1
+        else:
+            await engine.complete(entry["entry_id"])
+            await engine.complete(entry["entry_id"])  # duplicate webhook
+            outcome["paid"] += 1
+
+    await asyncio.gather(*(buyer(i) for i in range(buyers)))
+    return outcome
+
+
+def _engine(store, shards=1):
+    return RaffleEngine(store, {"promo": Raffle("promo", CAPACITY, "2026-05-01")}, shards=shards)
+
+
+class TestCapacity:
+    """The cap holds under contention"""
+
+    @pytest.mark.parametrize("shards", [1, 8])
+    def test_spike_never_oversells(self, shards):
+        watch = CapacityWatch(MemoryRaffleStore(), CAPACITY)
+        engine = _engine(watch, shards)
+
+        outcome = asyncio.run(_spike(engine))
+        stats = asyncio.run(engine.stats("promo"))
+        completed = sum(e["entries"] for e in watch.store.entries.values() if e["status"] == "completed")
+
+        assert watch.peak <= CAPACITY
+        assert stats["total_entries"] == completed <= CAPACITY
+        assert stats["reserved_entries"] == 0
+        assert stats["entries_remaining"] == CAPACITY - completed
+        assert outcome["sold_out"] > 0
+        print(f"✓ {BUYERS} buyers, {shards} shard(s): {completed}/{CAPACITY} entries sold, peak {watch.peak} held, "
+              f"{outcome['abandoned']} abandoned, {outcome['sold_out']} turned away")
+
+    def test_sweeper_releases_expired_reservations(self):
+        store = MemoryRaffleStore()
+        engine = _engine(store)
+
+        async def main():
+            entry = await engine.open_entry("promo", 3, _user(1), 100)
+            before = await engine.stats("promo")
+            assert await engine.sweep(now=datetime.now(timezone.utc)) == 0
+            released = await engine.sweep(now=entry["expires_at"] + timedelta(seconds=1))
+            engine._stats.clear()
+            return before, released, await engine.stats("promo"), entry
+
+        before, released, after, entry = asyncio.run(main())
+        assert before["entries_remaining"] == CAPACITY - 3
+        assert released == 1
+        assert after["entries_remaining"] == CAPACITY
+        assert store.entries[entry["entry_id"]]["status"] == "expired"
+        print("✓ Reservations without a webhook are released after the session expires")
+
+    def test_late_payment_is_honoured(self):
+        store = MemoryRaffleStore()
+        engine = _engine(store)
+
+        async def main():
+            entry = await engine.open_entry("promo", 2, _user(1), 100)
+            await engine.expire(entry["entry_id"])
+            await engine.complete(entry["entry_id"])
+            engine._stats.clear()
+            return entry, await engine.stats("promo")
+
+        entry, stats = asyncio.run(main())
+        assert store.entries[entry["entry_id"]]["status"] == "completed"
+        assert stats["total_entries"] == 2
+        print("✓ A payment arriving after release still counts the entry")
+
+    def test_existing_completed_entries_carried_over(self):
+        store = MemoryRaffleStore()
+        for i in range(5):
+            store.entries[f"old{i}"] = {"entry_id": f"old{i}", "raffle_type": "promo", "entries": 1,
+                                        "status": "completed"}
+        engine = _engine(store, shards=4)
+        stats = asyncio.run(engine.stats("promo"))
+        assert (stats["total_entries"], stats["entries_remaining"]) == (5, CAPACITY - 5)
+        assert shard_capacities(10, 4) == [3, 3, 2, 2]
+        print("✓ Counters start from the entries sold before they existed")
+
+    def test_legacy_pending_entry_expires(self):
+        store = MemoryRaffleStore()
+        store.entries["old"] = {"entry_id": "old", "raffle_type": "promo", "entries": 2, "status": "pending"}
+        engine = _engine(store)
+
+        async def main():
+            await engine.setup()
+            expired = await engine.expire("old")
+            engine._stats.clear()
+            return expired, await engine.stats("promo")
+
+        expired, stats = asyncio.run(main())
+        assert expired and store.entries["old"]["status"] == "expired"
+        assert stats["entries_remaining"] == CAPACITY and stats["reserved_entries"] == 0
+        print("✓ A pending entry from before the counters expires without releasing slots it never held")
+
+
+@pytest.mark.skipif(not os.environ.get("MONGO_TEST_URL"), reason="MONGO_TEST_URL not set")
+class TestMongoCapacity:
+    """Conditional $inc in MongoDB under the same spike"""
+
+    def test_spike_never_oversells(self):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        async def main():
+            client = AsyncIOMotorClient(os.environ["MONGO_TEST_URL"], maxPoolSize=200)
+            database = client[f"raffle_test_{uuid.uuid4().hex[:8]}"]
+            try:
+                engine = _engine(MongoRaffleStore(database), shards=4)
+                await _spike(engine, buyers=1000)
+                counters = await database.raffle_counters.find({}).to_list(None)
+                completed = await database.raffle_entries.count_documents({"status": "completed"})
+                return counters, completed
+            finally:
+                await client.drop_database(database.name)
+                client.close()
+
+        counters, completed = asyncio.run(main())
+        assert sum(c["used"] for c in counters) <= CAPACITY
+        assert all(c["used"] == c["reserved"] + c["completed"] for c in counters)
+        print(f"✓ MongoDB counters held the cap: {sum(c['completed'] for c in counters)} entries in {completed} checkouts")
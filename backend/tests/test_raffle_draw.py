@@ -0,0 +1,97 @@
+"""
+Raffle draw tests
+The A-Res draw is pure, so these run without MongoDB: determinism,
+verification, weighting, one place per participant, checkpoint/resume and
+constant memory over a large stream.
+"""
+
+import tracemalloc
+
+from raffle_draw import Draw, commitment, new_seed, participant, verify
+
+
+def _entries(n, weight=lambda i: 1 + i % 3, users=None):
+    for i in range(n):
+        yield f"entry_{i:07d}", participant(f"user_{i % users if users else i}"), weight(i)
+
+
+class TestDeterminism:
+    """Same seed and entries, same published result"""
+
+    def test_verify_reproduces_draw(self):
+        seed = new_seed()
+        draw = Draw(seed, 3)
+        for row in _entries(1000):
+            draw.add(*row)
+
+        audit = verify("world_cup_2026", seed, 3, _entries(1000))
+        assert audit["winners"] == draw.winners()
+        assert audit["verification_hash"] == draw.verification_hash("world_cup_2026")
+        assert verify("world_cup_2026", new_seed(), 3, _entries(1000))["winners"] != draw.winners()
+        assert commitment(seed) != commitment(new_seed())
+        print("✓ Anyone with the seed and entry list reproduces winners and verification hash")
+
+    def test_tampered_entry_list_changes_digest(self):
+        seed = new_seed()
+        honest = verify("world_cup_2026", seed, 1, _entries(100))
+        heavier = verify("world_cup_2026", seed, 1, _entries(100, weight=lambda i: 50 if i == 7 else 1 + i % 3))
+        dropped = verify("world_cup_2026", seed, 1, (row for row in _entries(100) if row[0] != "entry_0000042"))
+        assert len({honest["entries_digest"], heavier["entries_digest"], dropped["entries_digest"]}) == 3
+        assert honest["verification_hash"] != heavier["verification_hash"]
+        print("✓ Reweighting or dropping a single entry changes the published digest")
+
+    def test_resume_from_checkpoint_matches_single_pass(self):
+        seed = new_seed()
+        rows = list(_entries(5000, users=800))
+        single = Draw(seed, 5)
+        for row in rows:
+            single.add(*row)
+
+        first = Draw(seed, 5)
+        for row in rows[:2345]:
+            first.add(*row)
+        resumed = Draw.from_state(seed, 5, first.to_state())
+        for row in rows[2345:]:
+            resumed.add(*row)
+
+        assert resumed.winners() == single.winners()
+        assert resumed.verification_hash("x") == single.verification_hash("x")
+        print("✓ A draw resumed from a checkpoint equals an uninterrupted one")
+
+
+class TestFairness:
+    """Selection probability follows entry weights"""
+
+    def test_weighted_selection(self):
+        rows = [("a", participant("alice"), 3), ("b", participant("bob"), 1)]
+        wins = sum(verify("r", f"seed-{i}", 1, rows)["winners"][0]["entry_id"] == "a" for i in range(4000))
+        assert 0.72 < wins / 4000 < 0.78
+        print(f"✓ 3:1 weights win {wins / 4000:.1%} of 4000 seeded draws (expected 75%)")
+
+    def test_split_entries_count_as_combined_weight(self):
+        # carol bought twice (1 + 1), dave once with 2 entries
+        rows = [("c1", participant("carol"), 1), ("c2", participant("carol"), 1), ("d", participant("dave"), 2)]
+        carol = 0
+        for i in range(4000):
+            result = verify("r", f"seed-{i}", 2, rows)["winners"]
+            assert len({w["participant"] for w in result}) == 2
+            carol += result[0]["entry_id"] in ("c1", "c2")
+        assert 0.47 < carol / 4000 < 0.53
+        print(f"✓ One place per participant; split purchases win {carol / 4000:.1%} (expected 50%)")
+
+
+class TestScale:
+    """O(places) memory over a long stream"""
+
+    def test_constant_memory(self):
+        seed = new_seed()
+        draw = Draw(seed, 10)
+        tracemalloc.start()
+        for row in _entries(100_000, users=75_000):
+            draw.add(*row)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert draw.count == 100_000
+        assert len(draw.winners()) == 10
+        assert peak < 256 * 1024
+        print(f"✓ 100k streamed entries, peak {peak / 1024:.0f} KiB of draw state")
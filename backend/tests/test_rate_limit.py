@@ -0,0 +1,190 @@
+"""
+Rate limiting tests
+Rule parsing and matching, token bucket refill, client keys, the 429
+response with Retry-After, and the middleware's overhead. With MONGO_TEST_URL
+set, the shared bucket is checked under concurrent takes from two workers:
+
+    MONGO_TEST_URL=mongodb://localhost:27017 pytest tests/test_rate_limit.py
+"""
+
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from bench.rate_limit import measure
+from conftest import Clock
+from rate_limit import (DEFAULT_RULES, MemoryBuckets, MongoBuckets, RateLimiter, RateLimitMiddleware, RuleTable,
+                        SessionUsers, client_ip, parse_rules)
+
+
+class FakeSessions:
+    def __init__(self, users):
+        self.users = users
+        self.reads = 0
+
+    async def find_one(self, query, projection):
+        self.reads += 1
+        user_id = self.users.get(query["session_token"])
+        return {"user_id": user_id} if user_id else None
+
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _scope(method, path, cookie=None, client="10.0.0.1", forwarded=None):
+    headers = []
+    if cookie:
+        headers.append((b"cookie", f"theme=dark; session_token={cookie}".encode()))
+    if forwarded:
+        headers.append((b"x-forwarded-for", forwarded.encode()))
+    return {"type": "http", "method": method, "path": path, "headers": headers, "client": (client, 1234)}
+
+
+async def _call(app, scope):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, None, send)
+    start = sent[0]
+    return start["status"], dict(start["headers"])
+
+
+class TestRules:
+    """Parsing and matching"""
+
+    def test_default_rules_match_expensive_routes(self):
+        table = RuleTable(parse_rules(DEFAULT_RULES))
+        assert table.match("POST", "/api/chat/support").key == "user"
+        assert table.match("POST", "/api/chat/support/stream").path == "/api/chat/support*"
+        assert table.match("POST", "/api/checkout/create").burst == 5
+        assert table.match("POST", "/api/events/evt_1/queue").path == "/api/events/{event_id}/queue"
+        assert table.match("POST", "/api/seed-expanded").key == "ip"
+        assert table.match("POST", "/api/add-worldcup-2026") is not None
+        assert table.match("GET", "/api/events/evt_1/queue") is None
+        assert table.match("POST", "/api/events/evt_1/queue/extra") is None
+        assert table.match("GET", "/api/events") is None
+        print("✓ Chat, auth, checkout, queue and seed routes are limited; reads are not")
+
+    def test_spec_parsing(self):
+        rule, = parse_rules("post /api/x 30/min burst=3 by=session")
+        assert (rule.method, rule.rate, rule.burst, rule.key) == ("POST", 0.5, 3, "session")
+        assert parse_rules("GET /a 10/s")[0].burst == 10
+        for bad in ("GET /a 10/fortnight", "GET /a 10/s by=email", "GET /a"):
+            with pytest.raises(ValueError):
+                parse_rules(bad)
+        print("✓ RATE_LIMITS specs parse, and typos fail at boot")
+
+
+class TestBuckets:
+    """Token bucket arithmetic"""
+
+    def test_burst_then_refill(self):
+        clock = Clock()
+        buckets = MemoryBuckets(clock=clock)
+        rule, = parse_rules("POST /x 6/min burst=3")
+
+        async def main():
+            burst = [await buckets.take("k", rule) for _ in range(4)]
+            clock.now += 5
+            early = await buckets.take("k", rule)
+            clock.now += 5
+            refilled = await buckets.take("k", rule)
+            clock.now += 3600
+            full = [await buckets.take("k", rule) for _ in range(4)]
+            return burst, early, refilled, full
+
+        burst, early, refilled, full = asyncio.run(main())
+        assert burst[:3] == [0, 0, 0] and burst[3] == pytest.approx(10)
+        assert early == pytest.approx(5)
+        assert refilled == 0
+        assert full[:3] == [0, 0, 0] and full[3] > 0
+        print("✓ 3 in a burst, then one every 10s; idle time refills up to the burst only")
+
+    def test_memory_buckets_bounded(self):
+        buckets = MemoryBuckets(size=100)
+        rule, = parse_rules("POST /x 1/s")
+
+        async def main():
+            for i in range(1000):
+                await buckets.take(f"k{i}", rule)
+
+        asyncio.run(main())
+        assert len(buckets._buckets) == 100
+        print("✓ Least recently used buckets are dropped beyond the size bound")
+
+
+class TestClientKeys:
+    """Buckets per user, session or IP"""
+
+    def test_forwarded_for_uses_proxy_entry(self):
+        headers = {b"x-forwarded-for": b"6.6.6.6, 203.0.113.9"}
+        assert client_ip({"client": ("10.0.0.1", 1)}, headers, hops=1) == "203.0.113.9"
+        assert client_ip({"client": ("10.0.0.1", 1)}, headers, hops=0) == "10.0.0.1"
+        assert client_ip({"client": ("10.0.0.1", 1)}, {}, hops=1) == "10.0.0.1"
+        print("✓ A client can't pick its own IP by prepending to X-Forwarded-For")
+
+    def test_users_limited_separately_with_429(self):
+        sessions = FakeSessions({"s1": "alice", "s2": "alice", "s3": "bob"})
+        limiter = RateLimiter(parse_rules("POST /api/checkout/create 1/min burst=2 by=user"),
+                              MemoryBuckets(), users=SessionUsers(sessions))
+        app = RateLimitMiddleware(_ok, limiter)
+
+        async def main():
+            alice = [await _call(app, _scope("POST", "/api/checkout/create", cookie=s)) for s in ("s1", "s2", "s1")]
+            bob = await _call(app, _scope("POST", "/api/checkout/create", cookie="s3"))
+            anonymous = [await _call(app, _scope("POST", "/api/checkout/create")) for _ in range(3)]
+            other_ip = await _call(app, _scope("POST", "/api/checkout/create", client="10.0.0.2"))
+            unlimited = await _call(app, _scope("GET", "/api/checkout/create"))
+            return alice, bob, anonymous, other_ip, unlimited
+
+        alice, bob, anonymous, other_ip, unlimited = asyncio.run(main())
+        assert [s for s, _ in alice] == [200, 200, 429]
+        assert alice[2][1][b"retry-after"] == b"60"
+        assert bob[0] == 200
+        assert [s for s, _ in anonymous] == [200, 200, 429]
+        assert other_ip[0] == 200 and unlimited[0] == 200
+        assert sessions.reads == 3
+        print("✓ Two sessions of one user share a bucket; other users and IPs don't; 429 carries Retry-After")
+
+
+class TestOverhead:
+    """The micro-benchmark in bench/rate_limit.py"""
+
+    def test_overhead_is_microseconds(self):
+        results = asyncio.run(measure(20_000))
+        overhead = {name: micros - results["no middleware"] for name, micros in results.items()}
+        assert overhead["unlimited route"] < 20
+        assert overhead["limited, by user"] < 50
+        print("✓ Overhead per request: " + ", ".join(f"{k} {v:.1f}us" for k, v in overhead.items() if v))
+
+
+@pytest.mark.skipif(not os.environ.get("MONGO_TEST_URL"), reason="MONGO_TEST_URL not set")
+class TestMongoBuckets:
+    """Shared buckets across workers"""
+
+    def test_concurrent_takes_never_exceed_burst(self):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        rule, = parse_rules("POST /x 1/hour burst=10")
+
+        async def main():
+            client = AsyncIOMotorClient(os.environ["MONGO_TEST_URL"])
+            collection = client[f"ratelimit_test_{uuid.uuid4().hex[:8]}"].rate_limits
+            workers = [MongoBuckets(collection), MongoBuckets(collection)]
+            try:
+                await workers[0].ensure_indexes()
+                waits = await asyncio.gather(*(workers[i % 2].take("k", rule) for i in range(50)))
+            finally:
+                await client.drop_database(collection.database.name)
+                client.close()
+            return waits
+
+        waits = asyncio.run(main())
+        assert waits.count(0) == 10
+        assert all(w > 0 for w in waits if w)
+        print("✓ 50 concurrent requests from two workers: exactly the burst of 10 let through")
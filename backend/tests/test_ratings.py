@@ -0,0 +1,148 @@
+"""
+Seller rating counter tests
+Counters against the in-memory rating store: every rating counted exactly
+once when a request dies between writes or races another, and counters
+seeded from the ratings that existed before them.
+"""
+
+import asyncio
+import uuid
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from ratings import MemoryRatingStore, SellerRatings
+
+
+def _rating(star, seller="seller_1", counted=None):
+    rating = {"rating_id": f"rating_{uuid.uuid4().hex[:12]}", "order_id": f"order_{uuid.uuid4().hex[:8]}",
+              "seller_id": seller, "buyer_id": "buyer_1", "rating": star}
+    if counted is not None:
+        rating["counted"] = counted
+    return rating
+
+
+@pytest.fixture
+def store():
+    store = MemoryRatingStore()
+    store.users["seller_1"] = {"user_id": "seller_1", "rating": 0, "rating_count": 0}
+    return store
+
+
+class Crash(Exception):
+    pass
+
+
+class TestSellerRatings:
+    """Counters stay equal to the ratings collection"""
+
+    def test_counts_and_average(self, store):
+        ratings = SellerRatings(store)
+
+        async def main():
+            for star in (5, 4, 4, 1):
+                await ratings.add(_rating(star))
+
+        asyncio.run(main())
+        stats = store.stats["seller_1"]
+        assert (stats["rating_sum"], stats["rating_count"]) == (14, 4)
+        assert stats["histogram"] == {"5": 1, "4": 2, "1": 1}
+        assert store.users["seller_1"]["rating"] == 3.5
+        assert all(r["counted"] for r in store.ratings.values())
+        print("✓ Counters, histogram and the seller's average follow each rating")
+
+    def test_duplicate_order_rejected(self, store):
+        ratings = SellerRatings(store)
+        first = _rating(5)
+
+        async def main():
+            await ratings.add(first)
+            with pytest.raises(DuplicateKeyError):
+                await ratings.add({**_rating(1), "order_id": first["order_id"]})
+
+        asyncio.run(main())
+        assert store.stats["seller_1"]["rating_count"] == 1
+        print("✓ A second rating for the same order is refused and not counted")
+
+    @pytest.mark.parametrize("crash_in", ["apply", "mark_counted"])
+    def test_request_dying_between_writes(self, store, crash_in):
+        """apply: dies before the $inc; mark_counted: dies after it"""
+        ratings = SellerRatings(store)
+        original = getattr(store, crash_in)
+
+        async def crash_once(*args):
+            setattr(store, crash_in, original)
+            raise Crash()
+
+        async def main():
+            await ratings.add(_rating(5))
+            setattr(store, crash_in, crash_once)
+            with pytest.raises(Crash):
+                await ratings.add(_rating(1))
+            await ratings.add(_rating(3))
+
+        asyncio.run(main())
+        stats = store.stats["seller_1"]
+        assert (stats["rating_sum"], stats["rating_count"]) == (9, 3)
+        assert store.users["seller_1"]["rating_count"] == 3
+        assert all(r["counted"] for r in store.ratings.values())
+        print(f"✓ A request dying at {crash_in} is repaired by the next rating, counted once")
+
+    def test_concurrent_ratings(self, store):
+        ratings = SellerRatings(store)
+        stars = [1 + i % 5 for i in range(200)]
+
+        async def main():
+            await asyncio.gather(*(ratings.add(_rating(star)) for star in stars))
+
+        asyncio.run(main())
+        stats = store.stats["seller_1"]
+        assert (stats["rating_sum"], stats["rating_count"]) == (sum(stars), len(stars))
+        assert store.users["seller_1"]["rating_count"] == len(stars)
+        print("✓ 200 concurrent ratings: counters and average match the ratings")
+
+    def test_seeded_from_existing_ratings(self, store):
+        for star in (5, 5, 2):
+            rating = _rating(star)
+            store.ratings[rating["rating_id"]] = rating  # before counters existed: no counted flag
+        ratings = SellerRatings(store)
+
+        async def main():
+            await ratings.add(_rating(4))
+
+        asyncio.run(main())
+        stats = store.stats["seller_1"]
+        assert (stats["rating_sum"], stats["rating_count"]) == (16, 4)
+        assert store.users["seller_1"]["rating"] == 4.0
+        print("✓ A seller's first rating after deploy starts from their existing ratings")
+
+    def test_seeded_on_first_read(self, store):
+        for star in (5, 4):
+            rating = _rating(star)
+            store.ratings[rating["rating_id"]] = rating  # before counters existed
+        ratings = SellerRatings(store)
+
+        async def main():
+            return await ratings.get("seller_1"), await ratings.get("seller_2")
+
+        stats, unrated = asyncio.run(main())
+        assert (stats["rating_sum"], stats["rating_count"]) == (9, 2)
+        assert stats["histogram"] == {"5": 1, "4": 1}
+        assert unrated is None and "seller_2" not in store.stats
+        print("✓ Reading a seller's summary seeds counters from their existing ratings")
+
+    def test_rebuild(self, store):
+        ratings = SellerRatings(store)
+
+        async def main():
+            for star in (5, 3):
+                await ratings.add(_rating(star))
+            store.stats["seller_1"]["rating_sum"] = 999  # drifted
+            store.ratings["left"] = _rating(1, counted=False)  # not yet counted: left to the next rating
+            return await ratings.rebuild()
+
+        updated = asyncio.run(main())
+        assert updated == 1
+        assert (store.stats["seller_1"]["rating_sum"], store.stats["seller_1"]["rating_count"]) == (8, 2)
+        assert store.users["seller_1"]["rating"] == 4.0
+        print("✓ Rebuild recomputes counters from counted ratings")
@@ -0,0 +1,151 @@
+"""
+Read routing tests
+Unit checks for read class routing and read-your-writes pinning. The replica
+set test runs against a local replica set when MONGO_REPLICA_SET_URL is set:
+
+    mongod --replSet rs0 --port 27017 --dbpath /tmp/rs0-0 &
+    mongod --replSet rs0 --port 27018 --dbpath /tmp/rs0-1 &
+    mongosh --eval 'rs.initiate({_id: "rs0", members: [{_id: 0, host: "localhost:27017"}, {_id: 1, host: "localhost:27018", priority: 0}]})'
+    MONGO_REPLICA_SET_URL="mongodb://localhost:27017,localhost:27018/?replicaSet=rs0" pytest tests/test_read_routing.py
+"""
+
+import asyncio
+import os
+import time
+import uuid
+
+import pytest
+from pymongo import monitoring
+from pymongo.read_preferences import ReadPreference
+
+import db_routing
+from db_routing import reads, is_pinned, ReadRoutingMiddleware, PIN_COOKIE
+
+
+async def _call(app, method, headers=()):
+    """Run one request through an ASGI app, returning the response start message"""
+    scope = {"type": "http", "method": method, "path": "/", "headers": list(headers)}
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]
+
+
+def _app_reporting_preference(seen):
+    async def app(scope, receive, send):
+        seen.append(reads("catalogue").read_preference.mode)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+    return ReadRoutingMiddleware(app)
+
+
+class TestReadClasses:
+    """Routing of read classes outside of any request"""
+
+    def test_routed_classes_use_secondary_preferred(self):
+        for read_class in db_routing.READ_CLASSES:
+            preference = reads(read_class).read_preference
+            assert preference.mode == ReadPreference.SECONDARY_PREFERRED.mode
+            assert preference.max_staleness == db_routing.MAX_STALENESS_SECONDS
+        print("✓ Catalogue, sitemap, ratings and analytics read from secondaries")
+
+    def test_unknown_class_rejected(self):
+        with pytest.raises(ValueError):
+            reads("checkout")
+        print("✓ Unknown read classes are rejected")
+
+    def test_max_staleness_floor(self):
+        assert db_routing.MAX_STALENESS_SECONDS >= 90
+        print("✓ maxStalenessSeconds respects the server minimum")
+
+
+class TestReadYourWrites:
+    """Cookie-based primary pinning after a user's write"""
+
+    def test_pin_window(self):
+        now = time.time()
+        assert is_pinned(str(now + 30), now)
+        assert not is_pinned(str(now - 1), now)
+        assert not is_pinned("garbage", now)
+        assert not is_pinned(None, now)
+        print("✓ Pin cookie honoured only inside its window")
+
+    def test_write_sets_pin_cookie(self):
+        seen = []
+        app = _app_reporting_preference(seen)
+        start = asyncio.run(_call(app, "POST", [(b"cookie", b"session_token=abc")]))
+        cookies = [v for k, v in start["headers"] if k == b"set-cookie"]
+        assert any(c.startswith(PIN_COOKIE.encode()) for c in cookies)
+        print("✓ Authenticated writes set the read-your-writes cookie")
+
+    def test_anonymous_write_not_pinned(self):
+        app = _app_reporting_preference([])
+        start = asyncio.run(_call(app, "POST"))
+        assert not [v for k, v in start["headers"] if k == b"set-cookie"]
+        print("✓ Anonymous writes don't pin")
+
+    def test_pinned_request_reads_primary(self):
+        seen = []
+        app = _app_reporting_preference(seen)
+        pinned = f"{PIN_COOKIE}={time.time() + 60:.0f}".encode()
+        asyncio.run(_call(app, "GET", [(b"cookie", pinned)]))
+        asyncio.run(_call(app, "GET"))
+        assert seen == [ReadPreference.PRIMARY.mode, ReadPreference.SECONDARY_PREFERRED.mode]
+        # The pin never leaks outside the request
+        assert reads("catalogue").read_preference.mode == ReadPreference.SECONDARY_PREFERRED.mode
+        print("✓ Pinned users read from the primary, everyone else from secondaries")
+
+
+class _ServedBy(monitoring.CommandListener):
+    def __init__(self):
+        self.finds = []
+
+    def started(self, event):
+        if event.command_name == "find":
+            self.finds.append(event.connection_id)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+@pytest.mark.skipif(not os.environ.get("MONGO_REPLICA_SET_URL"), reason="needs a local replica set")
+class TestAgainstReplicaSet:
+    """Routing against a real replica set"""
+
+    def test_routed_reads_hit_secondary_and_pinned_reads_hit_primary(self):
+        from motor.motor_asyncio import AsyncIOMotorClient
+        from pymongo.read_preferences import SecondaryPreferred
+
+        async def run():
+            listener = _ServedBy()
+            client = AsyncIOMotorClient(os.environ["MONGO_REPLICA_SET_URL"], event_listeners=[listener], tz_aware=True)
+            name = f"routing_test_{uuid.uuid4().hex[:8]}"
+            primary = client[name]
+            secondary = client.get_database(name, read_preference=SecondaryPreferred(max_staleness=db_routing.MAX_STALENESS_SECONDS))
+            try:
+                await primary.events.insert_one({"event_id": "e1"})
+                hello = await client.admin.command("hello")
+                primary_host = hello["primary"]
+
+                # Pinned read: primary sees the write immediately
+                assert await primary.events.find_one({"event_id": "e1"}) is not None
+
+                await secondary.events.find_one({"event_id": "e1"})
+                served = [f"{host}:{port}" for host, port in listener.finds]
+                assert served[0] == primary_host
+                assert served[-1] != primary_host
+            finally:
+                await client.drop_database(name)
+                client.close()
+
+        asyncio.run(run())
+        print("✓ Routed reads served by a secondary, pinned reads by the primary")
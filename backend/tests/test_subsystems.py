@@ -0,0 +1,74 @@
+"""
+API subsystem tests
+API_SUBSYSTEMS selects which routers a worker mounts; catalogue-only replicas
+must not import the other subsystems at all.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from routers import enabled_subsystems, SUBSYSTEMS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys
+import server
+print(json.dumps({
+    "paths": sorted({route.path for route in server.app.routes}),
+    "modules": sorted(name for name in sys.modules if name.startswith("routers.")),
+}))
+"""
+
+
+def probe(subsystems: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120,
+        env={**os.environ, "API_SUBSYSTEMS": subsystems},
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestSubsystemSelection:
+    """Parsing API_SUBSYSTEMS"""
+
+    def test_default_is_everything(self):
+        assert enabled_subsystems("all") == list(SUBSYSTEMS)
+        assert enabled_subsystems("") == list(SUBSYSTEMS)
+        print("✓ Empty or 'all' mounts every subsystem")
+
+    def test_list_keeps_canonical_order(self):
+        assert enabled_subsystems("seo, catalogue") == ["catalogue", "seo"]
+        print("✓ Subsystems mount in a fixed order")
+
+    def test_unknown_subsystem_rejected(self):
+        with pytest.raises(ValueError):
+            enabled_subsystems("catalogue,payments")
+        print("✓ Typos fail at boot instead of silently dropping routes")
+
+
+class TestCatalogueReplica:
+    """A catalogue-only worker"""
+
+    def test_only_catalogue_routes_mounted(self):
+        result = probe("catalogue")
+        assert result["modules"] == ["routers.catalogue"]
+        assert "/api/events" in result["paths"]
+        assert "/api/sellers/{seller_id}/ratings" in result["paths"]
+        assert "/api/checkout/create" not in result["paths"]
+        assert "/api/seed" not in result["paths"]
+        # Health and metrics are always served
+        assert {"/health", "/api/health", "/metrics"} <= set(result["paths"])
+        print("✓ Catalogue replica mounts catalogue routes plus health/metrics only")
+
+    def test_full_app_mounts_every_subsystem(self):
+        result = probe("all")
+        assert result["modules"] == sorted(f"routers.{name}" for name in SUBSYSTEMS)
+        assert "/api/checkout/create" in result["paths"]
+        print("✓ Default deployment mounts every subsystem")
@@ -0,0 +1,141 @@
+"""
+Video job runner tests
+A fake generator stands in for Sora: concurrency is bounded, failures are
+retried and resumed without redoing finished videos, and outputs are skipped
+only while their spec and bytes match what was recorded.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from types import ModuleType
+
+import pytest
+
+from video_jobs import VideoJobs, VideoSpec, sora_generator, write_atomic
+
+
+class FakeGenerator:
+    def __init__(self, delay=0.05, fail=()):
+        self.delay = delay
+        self.fail = dict.fromkeys(fail, 0)  # name -> failures left (0 = always)
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, spec):
+        with self._lock:
+            self.calls.append(spec.name)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if spec.name in self.fail:
+                raise RuntimeError("generation timed out")
+            return f"{spec.name}|{spec.prompt}|{spec.size}".encode()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _specs(n=6):
+    return [VideoSpec(name=f"ad_{i}.mp4", prompt=f"Stadium at night, take {i}") for i in range(n)]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return tmp_path / "static", tmp_path / "state.json"
+
+
+class TestVideoJobs:
+    """Bounded pool, resume and skip"""
+
+    def test_bounded_concurrency(self, paths):
+        out, state = paths
+        fake = FakeGenerator(delay=0.2)
+        started = time.monotonic()
+        summary = asyncio.run(VideoJobs(out, fake, concurrency=3, state_path=state).run(_specs(6)))
+        elapsed = time.monotonic() - started
+        assert len(summary["generated"]) == 6
+        assert fake.peak == 3
+        assert elapsed < 1.0  # two rounds of three (0.4s), not six in a row (1.2s)
+        assert (out / "ad_0.mp4").read_bytes().startswith(b"ad_0.mp4|")
+        assert not list(out.glob(".*.tmp"))
+        print(f"✓ 6 videos with 3 workers in {elapsed:.2f}s; at most 3 in flight")
+
+    def test_failure_resumes_only_what_is_left(self, paths):
+        out, state = paths
+        first = FakeGenerator(fail=["ad_2.mp4"])
+        summary = asyncio.run(VideoJobs(out, first, max_attempts=2, state_path=state).run(_specs(4)))
+        assert summary["failed"] == ["ad_2.mp4"]
+        assert first.calls.count("ad_2.mp4") == 2
+        assert not (out / "ad_2.mp4").exists()
+
+        second = FakeGenerator()
+        summary = asyncio.run(VideoJobs(out, second, state_path=state).run(_specs(4)))
+        assert second.calls == ["ad_2.mp4"]
+        assert sorted(summary["skipped"]) == ["ad_0.mp4", "ad_1.mp4", "ad_3.mp4"]
+        print("✓ A failed video is retried, and the rerun generates only that one")
+
+    def test_changed_prompt_or_damaged_file_regenerates(self, paths):
+        out, state = paths
+        specs = _specs(3)
+        asyncio.run(VideoJobs(out, FakeGenerator(), state_path=state).run(specs))
+
+        (out / "ad_1.mp4").write_bytes(b"truncated")
+        specs[2] = VideoSpec(name="ad_2.mp4", prompt="New prompt")
+        fake = FakeGenerator()
+        asyncio.run(VideoJobs(out, fake, state_path=state).run(specs, force=["ad_0.mp4"]))
+        assert sorted(fake.calls) == ["ad_0.mp4", "ad_1.mp4", "ad_2.mp4"]
+        assert b"New prompt" in (out / "ad_2.mp4").read_bytes()
+
+        again = FakeGenerator()
+        asyncio.run(VideoJobs(out, again, state_path=state).run(specs))
+        assert again.calls == []
+        print("✓ Skips go by spec hash and file sha256; forced, edited and damaged videos are redone")
+
+    def test_existing_files_adopted(self, paths):
+        out, state = paths
+        out.mkdir()
+        write_atomic(out / "ad_0.mp4", b"made before the runner")
+        fake = FakeGenerator()
+        summary = asyncio.run(VideoJobs(out, fake, state_path=state).run(_specs(2)))
+        assert fake.calls == ["ad_1.mp4"]
+        assert summary["skipped"] == ["ad_0.mp4"]
+        assert (out / "ad_0.mp4").read_bytes() == b"made before the runner"
+        print("✓ Videos generated before job state existed are kept, not paid for again")
+
+
+class TestSoraGenerator:
+    """sora_generator() on parallel worker threads"""
+
+    def test_client_per_generation(self, paths, monkeypatch):
+        clients = []
+
+        class OpenAIVideoGeneration:
+            def __init__(self, api_key):
+                self.api_key = api_key
+                self.busy = False
+                clients.append(self)
+
+            def text_to_video(self, prompt, model, size, duration, max_wait_time):
+                assert not self.busy, "client shared between threads"
+                self.busy = True
+                time.sleep(0.05)
+                self.busy = False
+                return f"{prompt}|{self.api_key}".encode()
+
+        module = ModuleType("emergentintegrations.llm.openai.video_generation")
+        module.OpenAIVideoGeneration = OpenAIVideoGeneration
+        monkeypatch.setitem(sys.modules, module.__name__, module)
+        monkeypatch.setenv("EMERGENT_LLM_KEY", "key_1")
+
+        out, state = paths
+        generate = sora_generator()
+        monkeypatch.delenv("EMERGENT_LLM_KEY")
+        summary = asyncio.run(VideoJobs(out, generate, concurrency=3, state_path=state).run(_specs(3)))
+        assert len(summary["generated"]) == 3
+        assert len(clients) == 3 and {c.api_key for c in clients} == {"key_1"}
+        print("✓ Each Sora generation gets its own client; the key is read once up front")
@@ -0,0 +1,289 @@
+"""
+Waiting room tests
+Signed tokens, the pre-sale lottery, rate-limited admission shared by several
+workers, the checkout gate, and 100k queued users with position streams,
+against the in-memory store.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+import waiting_room
+from conftest import Clock
+from waiting_room import MemoryQueueStore, QueueHub, QueueRequired, QueueUnavailable, WaitingRoom
+
+
+def _room(store=None, clock=None, secret=b"test-secret"):
+    return WaitingRoom(store or MemoryQueueStore(), secret=secret, clock=clock or Clock(), cache_seconds=0)
+
+
+class TestTokens:
+    """Queue tokens are bound to the account, event and place"""
+
+    def test_forged_and_borrowed_tokens_rejected(self):
+        clock = Clock()
+        rooms = _room(clock=clock)
+
+        async def main():
+            await rooms.configure("e1", rate_per_minute=60)
+            clock.now += 5
+            mine = await rooms.join("e1", "alice")
+            await rooms.join("e1", "bob")
+            clock.now += 5
+            forged = mine["token"][:-1] + ("1" if mine["token"][-1] == "0" else "0")
+            results = []
+            for user, token in [("alice", mine["token"]), ("bob", mine["token"]),
+                                ("alice", forged), ("alice", None)]:
+                try:
+                    await rooms.check_admission("e1", user, token)
+                    results.append("ok")
+                except QueueRequired:
+                    results.append("refused")
+            other = await _room(rooms.store, clock, secret=b"other").join("e1", "alice")
+            return results, rooms.verify(mine["token"]), other["token"] == mine["token"]
+
+        results, claims, same = asyncio.run(main())
+        assert results == ["ok", "refused", "refused", "refused"]
+        assert claims[:2] == ("e1", "alice")
+        assert not same
+        print("✓ Only the account's own, correctly signed token passes the gate")
+
+    def test_non_ascii_token_rejected(self):
+        rooms = _room()
+
+        async def main():
+            await rooms.configure("e1")
+            token = (await rooms.join("e1", "alice"))["token"]
+            payload, _, signature = token.partition(".")
+            for bad in (f"{payload}.{signature[:-1]}é", f"{payload}é.{signature}", "\xff\xfe.\xff"):
+                with pytest.raises(QueueRequired):
+                    await rooms.check_admission("e1", "alice", bad)
+            return rooms.verify(f"{payload}.{signature[:-1]}é")
+
+        assert asyncio.run(main()) is None
+        print("✓ A token with non-ASCII characters (e.g. a latin-1 header) is refused, not a 500")
+
+    def test_no_shared_secret_refuses_to_activate(self, monkeypatch):
+        monkeypatch.delenv("WAITING_ROOM_SECRET", raising=False)
+        rooms = WaitingRoom(MemoryQueueStore(), clock=Clock(), cache_seconds=0)
+
+        async def main():
+            with pytest.raises(QueueUnavailable):
+                await rooms.configure("e1")
+            await rooms.configure("e1", active=False)
+            return await rooms.room("e1")
+
+        room = asyncio.run(main())
+        assert not room["active"]
+        assert rooms.verify("ZTF8YWxpY2V8eA.0123") is None
+        print("✓ Without WAITING_ROOM_SECRET rooms can't be turned on (tokens wouldn't verify across workers)")
+
+
+class TestFairness:
+    """Pre-sale arrivals are shuffled, later ones are first come first served"""
+
+    def test_prequeue_lottery_then_fifo(self):
+        clock = Clock()
+        rooms = _room(clock=clock)
+
+        async def main():
+            await rooms.configure("e1", rate_per_minute=60, opens_at=clock.now + 600)
+            early = [await rooms.join("e1", f"early{i}") for i in range(1000)]
+            assert {s["state"] for s in early} == {"pending"}
+            clock.now += 600
+            late = [await rooms.join("e1", f"late{i}") for i in range(10)]
+            room = await rooms.room("e1")
+            early = [rooms.status(await rooms.store.get_entry("e1", f"early{i}"), room) for i in range(1000)]
+            return [s["position"] for s in early], [s["position"] for s in late]
+
+        early, late = asyncio.run(main())
+        assert sorted(early) == list(range(1, 1001))
+        assert early != sorted(early)
+        assert late == list(range(1001, 1011))
+        print("✓ 1000 pre-sale joiners placed in random order, later joiners queue behind them in order")
+
+    def test_interrupted_opening_resumes(self, monkeypatch):
+        monkeypatch.setattr(waiting_room, "QUEUE_OPEN_BATCH", 10)
+        clock = Clock()
+        store = MemoryQueueStore()
+        rooms, other_worker = _room(store, clock), _room(store, clock)
+        original = store.assign_seqs
+        calls = []
+
+        async def dies_on_third_batch(seqs):
+            calls.append(len(seqs))
+            if len(calls) == 3:
+                raise asyncio.CancelledError()  # worker killed mid-opening
+            await original(seqs)
+
+        async def main():
+            await rooms.configure("e1", rate_per_minute=60, opens_at=clock.now + 600)
+            for i in range(50):
+                await rooms.join("e1", f"early{i}")
+            clock.now += 600
+            store.assign_seqs = dies_on_third_batch
+            with pytest.raises(asyncio.CancelledError):
+                await rooms.room("e1")
+            store.assign_seqs = original
+            late = await other_worker.join("e1", "late")
+            stuck = await other_worker.room("e1")  # the lease is still held
+            clock.now += waiting_room.QUEUE_OPENING_LEASE_SECONDS
+            room = await other_worker.room("e1")
+            seqs = [(await store.get_entry("e1", f"early{i}"))["seq"] for i in range(50)]
+            return stuck["state"], room["state"], seqs, late
+
+        stuck, state, seqs, late = asyncio.run(main())
+        assert (stuck, state) == ("opening", "open")
+        assert sorted(seqs) == list(range(1, 51))
+        assert late["position"] == 51
+        print("✓ An opening interrupted part way is resumed by another worker once its lease lapses")
+
+    def test_rejoining_keeps_place(self):
+        clock = Clock()
+        rooms = _room(clock=clock)
+
+        async def main():
+            await rooms.configure("e1", rate_per_minute=60)
+            first = await rooms.join("e1", "alice")
+            await rooms.join("e1", "bob")
+            again = await rooms.join("e1", "alice")
+            return first, again
+
+        first, again = asyncio.run(main())
+        assert again["position"] == first["position"] == 1
+        assert again["token"] == first["token"]
+        print("✓ Refreshing or rejoining returns the same place and token")
+
+
+class TestAdmission:
+    """Places are admitted at the configured rate across workers"""
+
+    def test_rate_shared_by_workers(self):
+        clock = Clock()
+        store = MemoryQueueStore()
+        workers = [_room(store, clock) for _ in range(3)]
+
+        async def main():
+            await workers[0].configure("e1", rate_per_minute=120)
+            for i in range(100):
+                await workers[i % 3].join("e1", f"u{i}")
+            admitted = []
+            for _ in range(10):
+                clock.now += 1
+                rooms = await asyncio.gather(*(w.room("e1") for w in workers))
+                admitted.append(max(r["admitted_through"] for r in rooms))
+            return admitted
+
+        admitted = asyncio.run(main())
+        assert admitted == [2, 4, 6, 8, 10, 12, 14, 16, 18, 20]
+        print("✓ 120/min admits 2 a second no matter how many workers look at the room")
+
+    def test_idle_allowance_not_banked(self):
+        clock = Clock()
+        rooms = _room(clock=clock)
+
+        async def main():
+            await rooms.configure("e1", rate_per_minute=60)
+            await rooms.join("e1", "first")
+            clock.now += 3600
+            await rooms.room("e1")
+            for i in range(50):
+                await rooms.join("e1", f"u{i}")
+            clock.now += 5
+            return (await rooms.room("e1"))["admitted_through"]
+
+        assert asyncio.run(main()) == 6
+        print("✓ An hour with an empty queue doesn't turn into a burst of admissions")
+
+    def test_admission_window_expires(self):
+        clock = Clock()
+        rooms = _room(clock=clock)
+
+        async def main():
+            await rooms.configure("e1", rate_per_minute=60, admit_minutes=10)
+            alice = await rooms.join("e1", "alice")
+            for i in range(5):
+                await rooms.join("e1", f"u{i}")
+            outcomes = []
+            for step in (0, 1, 300, 301):
+                clock.now += step
+                try:
+                    await rooms.check_admission("e1", "alice", alice["token"])
+                    outcomes.append("ok")
+                except QueueRequired as e:
+                    outcomes.append(str(e).split(" ")[0])
+            rejoined = await rooms.join("e1", "alice")
+            return outcomes, rejoined
+
+        outcomes, rejoined = asyncio.run(main())
+        assert outcomes == ["It's", "ok", "ok", "Your"]
+        assert rejoined["state"] == "waiting" and rejoined["position"] == 1
+        print("✓ Checkout opens on admission, closes after admit_minutes; rejoining goes to the back")
+
+    def test_inactive_room_is_open_checkout(self):
+        rooms = _room()
+
+        async def main():
+            await rooms.check_admission("e1", "alice", None)
+            await rooms.configure("e1", active=False)
+            await rooms.check_admission("e1", "alice", None)
+            with pytest.raises(QueueRequired):
+                await rooms.join("e1", "alice")
+
+        asyncio.run(main())
+        print("✓ Events without an active queue check out as before")
+
+
+class TestLoad:
+    """100k queued users on one worker"""
+
+    def test_hundred_thousand_queued_users(self):
+        users = 100_000
+        clock = Clock()
+        rooms = _room(clock=clock)
+        rooms.cache_seconds = 3600  # streams read the room the ticker refreshed
+        hub = QueueHub(rooms, tick=3600, position_every=0, max_seconds=3600)
+
+        async def client(entry, received):
+            async for message in hub.stream("e1", entry):
+                received.append(message)
+
+        async def main():
+            await rooms.configure("e1", rate_per_minute=6000, opens_at=clock.now + 60)
+            started = time.perf_counter()
+            for i in range(users):
+                await rooms.join("e1", f"u{i}")
+            joined = time.perf_counter() - started
+
+            clock.now += 60
+            started = time.perf_counter()
+            await rooms.room("e1", max_age=0)
+            opened = time.perf_counter() - started
+
+            entries = [await rooms.store.get_entry("e1", f"u{i}") for i in range(users)]
+            received = [[] for _ in range(users)]
+            tasks = [asyncio.create_task(client(e, r)) for e, r in zip(entries, received)]
+            while hub.stream_count < users:
+                await asyncio.sleep(0.01)
+
+            clock.now += 10  # 1000 admitted
+            started = time.perf_counter()
+            await hub.advance(time.monotonic(), positions=True)
+            await asyncio.sleep(0)
+            while sum(len(r) for r in received) < users * 3:
+                await asyncio.sleep(0.01)
+            fanout = time.perf_counter() - started
+
+            hub.close()
+            await asyncio.gather(*tasks)
+            return received, joined, opened, fanout
+
+        received, joined, opened, fanout = asyncio.run(main())
+        kinds = [r[-1].split("\n", 1)[0].removeprefix("event: ") for r in received]
+        assert kinds.count("admitted") == 1000
+        assert kinds.count("waiting") == 99_000
+        assert hub.channels == {}
+        print(f"✓ {users} users: joined in {joined:.1f}s, lottery in {opened:.1f}s, "
+              f"1000 admissions + 99000 position updates pushed in {fanout:.2f}s")
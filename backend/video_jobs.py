@@ -0,0 +1,223 @@
+"""
+EuroMatchTickets Video Jobs
+Offline runner for generated ad videos. Every prompt is submitted at once to
+a bounded pool of VIDEO_CONCURRENCY workers (each generation blocks for
+minutes, so a batch takes as long as its slowest round, not the sum).
+
+Job state is kept in VIDEO_STATE_FILE (outside static/, which is served
+publicly), keyed by output path and rewritten atomically after every change,
+so an interrupted or partly failed batch resumes where it stopped:
+
+- A video is skipped when its output exists, its recorded spec hash (model,
+  prompt, size, duration) matches and the file's sha256 is the one written.
+  A changed prompt or a damaged file is generated again.
+- Outputs are written to a temporary file and renamed into place, so a
+  crash never leaves a truncated mp4 for the static route to serve.
+- Existing files with no record (videos generated before this runner) are
+  adopted as they are rather than paid for twice; use --force to redo them.
+
+The generator is any callable taking a VideoSpec and returning the video
+bytes (or None on failure); sora_generator() wraps the Sora 2 API.
+
+Usage (from backend/):
+    python generate_ads_videos.py [--out static] [--concurrency 3] [--force NAME ...]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VIDEO_CONCURRENCY = int(os.environ.get('VIDEO_CONCURRENCY', '3'))
+VIDEO_MAX_ATTEMPTS = int(os.environ.get('VIDEO_MAX_ATTEMPTS', '2'))
+VIDEO_OUTPUT_DIR = Path(os.environ.get('VIDEO_OUTPUT_DIR', Path(__file__).parent / "static"))
+VIDEO_STATE_FILE = Path(os.environ.get('VIDEO_STATE_FILE', Path(__file__).parent / ".video_jobs.json"))
+VIDEO_MODEL = "sora-2"
+
+
+@dataclass(frozen=True)
+class VideoSpec:
+    name: str        # output file name, e.g. "ad_video_square.mp4"
+    prompt: str
+    size: str = "1280x720"
+    duration: int = 8
+    model: str = VIDEO_MODEL
+
+    @property
+    def spec_hash(self) -> str:
+        return hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()
+
+
+Generator = Callable[[VideoSpec], Optional[bytes]]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write to a temporary file in the same directory, then rename over the target"""
+    temp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+def sora_generator(api_key: Optional[str] = None, max_wait_time: int = 900) -> Generator:
+    """Generator backed by the Sora 2 API (needs emergentintegrations and EMERGENT_LLM_KEY)"""
+    from emergentintegrations.llm.openai.video_generation import OpenAIVideoGeneration
+    api_key = api_key or os.environ['EMERGENT_LLM_KEY']
+
+    def generate(spec: VideoSpec) -> Optional[bytes]:
+        # One client per call: generations run on parallel worker threads, and the
+        # client isn't known to be safe to share between them
+        video_gen = OpenAIVideoGeneration(api_key=api_key)
+        return video_gen.text_to_video(prompt=spec.prompt, model=spec.model, size=spec.size,
+                                       duration=spec.duration, max_wait_time=max_wait_time)
+    return generate
+
+
+class VideoJobs:
+    """Runs VideoSpecs through a generator with bounded concurrency and resumable state"""
+
+    def __init__(self, output_dir: Path, generate: Generator, concurrency: int = VIDEO_CONCURRENCY,
+                 max_attempts: int = VIDEO_MAX_ATTEMPTS, state_path: Path = VIDEO_STATE_FILE):
+        self.output_dir = Path(output_dir)
+        self.generate = generate
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.state_path = Path(state_path)
+        self.state: Dict[str, dict] = {}  # output path -> job
+
+    def _key(self, spec: VideoSpec) -> str:
+        return str((self.output_dir / spec.name).resolve())
+
+    def load(self):
+        try:
+            self.state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            self.state = {}
+        except ValueError:
+            logger.warning(f"⚠️ Unreadable {self.state_path}; starting with no job state")
+            self.state = {}
+
+    def save(self):
+        write_atomic(self.state_path, json.dumps(self.state, indent=2, sort_keys=True).encode())
+
+    def _update(self, spec: VideoSpec, **fields):
+        job = self.state.setdefault(self._key(spec), {})
+        job.update(fields, spec_hash=spec.spec_hash, updated_at=_now())
+        self.save()
+
+    def is_done(self, spec: VideoSpec) -> bool:
+        """Output on disk matches both the spec and the bytes recorded when it was written"""
+        path = self.output_dir / spec.name
+        job = self.state.get(self._key(spec))
+        if not path.exists():
+            return False
+        if job is None:
+            # Generated before this runner kept state: adopt rather than pay for it again
+            self._update(spec, status="done", sha256=file_sha256(path), bytes=path.stat().st_size,
+                         attempts=0, error=None, adopted=True)
+            logger.info(f"📥 Adopted existing {spec.name}")
+            return True
+        return (job.get("status") == "done" and job.get("spec_hash") == spec.spec_hash
+                and job.get("sha256") == file_sha256(path))
+
+    async def _run_one(self, spec: VideoSpec, slots: asyncio.Semaphore) -> bool:
+        async with slots:
+            for attempt in range(1, self.max_attempts + 1):
+                self._update(spec, status="running", attempts=attempt, error=None)
+                logger.info(f"🎬 {spec.name} ({spec.size}, {spec.duration}s), attempt {attempt}")
+                started = time.monotonic()
+                try:
+                    data = await asyncio.to_thread(self.generate, spec)
+                    error = None if data else "generator returned no video"
+                except Exception as e:
+                    data, error = None, f"{type(e).__name__}: {e}"
+                if data:
+                    write_atomic(self.output_dir / spec.name, data)
+                    self._update(spec, status="done", sha256=hashlib.sha256(data).hexdigest(), bytes=len(data),
+                                 seconds=round(time.monotonic() - started, 1), adopted=False)
+                    logger.info(f"✅ {spec.name}: {len(data)} bytes in {time.monotonic() - started:.0f}s")
+                    return True
+                logger.warning(f"❌ {spec.name} attempt {attempt}: {error}")
+                self._update(spec, status="failed", error=error)
+            return False
+
+    async def run(self, specs: Iterable[VideoSpec], force: Iterable[str] = ()) -> dict:
+        """Generate every spec not already done; returns {"generated": [...], "skipped": [...], "failed": [...]}"""
+        specs = list(specs)
+        names = [s.name for s in specs]
+        if len(set(names)) != len(names):
+            raise ValueError("video names must be unique")
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.load()
+        force = set(force)
+        todo: List[VideoSpec] = []
+        skipped = []
+        for spec in specs:
+            if spec.name not in force and self.is_done(spec):
+                skipped.append(spec.name)
+            else:
+                todo.append(spec)
+        if skipped:
+            logger.info(f"⏭️ Up to date: {', '.join(skipped)}")
+
+        slots = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._run_one(spec, slots) for spec in todo))
+        return {
+            "generated": [s.name for s, ok in zip(todo, results) if ok],
+            "skipped": skipped,
+            "failed": [s.name for s, ok in zip(todo, results) if not ok],
+        }
+
+
+def main(specs: List[VideoSpec], description: str = "Generate ad videos"):
+    """CLI shared by the generate_*_videos.py scripts"""
+    from dotenv import load_dotenv
+    load_dotenv(Path(__file__).parent / ".env")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--out", type=Path, default=VIDEO_OUTPUT_DIR, help="Output directory")
+    parser.add_argument("--state", type=Path, default=VIDEO_STATE_FILE, help="Job state file")
+    parser.add_argument("--concurrency", type=int, default=VIDEO_CONCURRENCY)
+    parser.add_argument("--force", nargs="*", default=[], metavar="NAME", help="Regenerate these even if up to date")
+    parser.add_argument("--only", nargs="*", metavar="NAME", help="Run just these videos")
+    args = parser.parse_args()
+    if args.only:
+        specs = [s for s in specs if s.name in args.only]
+
+    jobs = VideoJobs(args.out, sora_generator(), concurrency=args.concurrency, state_path=args.state)
+    summary = asyncio.run(jobs.run(specs, force=args.force))
+    logger.info(f"🎬 {len(summary['generated'])} generated, {len(summary['skipped'])} up to date, "
+                f"{len(summary['failed'])} failed")
+    for name in summary["generated"] + summary["skipped"]:
+        logger.info(f"   📹 {args.out / name}")
+    if summary["failed"]:
+        logger.error(f"❌ Failed: {', '.join(summary['failed'])} (run again to retry just these)")
+        raise SystemExit(1)
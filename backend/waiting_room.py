@@ -0,0 +1,682 @@
+"""
+EuroMatchTickets Waiting Room
+Admission control for high-demand on-sales. An admin turns the queue on for
+an event; from then on checkout for that event needs an admission, handed out
+in queue order at the event's configured rate instead of letting every buyer
+hit checkout at once.
+
+Each room is one document in db.waiting_rooms holding two counters:
+
+    {_id: event_id, rate_per_minute, admit_minutes, opens_at, state,
+     next_seq, admitted_through, admit_clock, opening_seqs, opening_until}
+
+Joining takes the next sequence number ($inc next_seq), so a buyer's position
+is seq - admitted_through and needs no counting. Admission is lazy: whoever
+looks at the room first after time has passed advances admitted_through by
+rate x elapsed with one compare-and-set, so any number of workers can serve
+the queue without a coordinator.
+
+Fairness and bots: only signed-in accounts can join, once per event (joining
+again returns the same place, so refreshing gains nothing). Everyone who
+joins before the on-sale opens is placed in random order when it opens, so
+arriving a millisecond early is worth nothing. Queue tokens are HMAC-signed
+and bound to the account and event: forged or shared tokens are rejected
+before any database read, and an admission is only good for admit_minutes.
+
+Queued pages hold one Server-Sent Events stream for their position. Each
+worker re-reads a room once per tick for all its streams, sends admissions as
+they happen and position updates every QUEUE_POSITION_SECONDS.
+"""
+
+import asyncio
+import base64
+import hashlib
+import heapq
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from database import db
+from metrics import Counter, register_collector
+
+logger = logging.getLogger(__name__)
+
+QUEUE_RATE_PER_MINUTE = int(os.environ.get('QUEUE_RATE_PER_MINUTE', '300'))
+QUEUE_ADMIT_MINUTES = int(os.environ.get('QUEUE_ADMIT_MINUTES', '10'))
+QUEUE_ROOM_CACHE_SECONDS = float(os.environ.get('QUEUE_ROOM_CACHE_SECONDS', '2'))
+QUEUE_TICK_SECONDS = float(os.environ.get('QUEUE_TICK_SECONDS', '2'))
+QUEUE_POSITION_SECONDS = float(os.environ.get('QUEUE_POSITION_SECONDS', '10'))
+QUEUE_STREAM_MAX_SECONDS = float(os.environ.get('QUEUE_STREAM_MAX_SECONDS', '900'))
+QUEUE_OPEN_BATCH = 1000
+QUEUE_OPENING_LEASE_SECONDS = float(os.environ.get('QUEUE_OPENING_LEASE_SECONDS', '60'))
+RETRY_MS = 3000
+
+queue_joins = Counter("waiting_room_joins_total", "Waiting room joins by outcome")
+queue_admissions = Counter("waiting_room_admissions_total", "Admissions handed out by the waiting room")
+queue_rejections = Counter("waiting_room_checkout_rejections_total", "Checkouts refused by the waiting room by reason")
+
+
+class QueueRequired(Exception):
+    """Checkout for an event with an active queue without a valid admission"""
+
+
+class QueueUnavailable(Exception):
+    """Waiting rooms can't run without WAITING_ROOM_SECRET"""
+
+    def __init__(self):
+        super().__init__("Waiting rooms need WAITING_ROOM_SECRET set, the same on every worker")
+
+
+def _secret() -> Optional[bytes]:
+    # Tokens must verify on every worker and across restarts, so a per-process
+    # random secret would lock admitted buyers out of checkout
+    secret = os.environ.get('WAITING_ROOM_SECRET')
+    if secret:
+        return secret.encode()
+    logger.warning("WAITING_ROOM_SECRET not set; waiting rooms can't be activated")
+    return None
+
+
+def sse(kind: str, payload: dict) -> str:
+    return f"event: {kind}\ndata: {json.dumps(payload)}\n\n"
+
+
+# ============== STORES ==============
+
+class MongoQueueStore:
+    """Rooms in db.waiting_rooms, places in db.waiting_room_entries"""
+
+    def __init__(self, database):
+        self.rooms = database.waiting_rooms
+        self.entries = database.waiting_room_entries
+
+    async def ensure_indexes(self):
+        await self.entries.create_index([("event_id", 1), ("user_id", 1)], unique=True)
+        await self.entries.create_index("entry_id", unique=True)
+        await self.entries.create_index([("event_id", 1), ("seq", 1), ("lottery", 1)])
+
+    async def get_room(self, event_id: str) -> Optional[dict]:
+        return await self.rooms.find_one({"_id": event_id})
+
+    async def put_room(self, event_id: str, fields: dict) -> dict:
+        return await self.rooms.find_one_and_update(
+            {"_id": event_id},
+            {"$set": fields,
+             "$setOnInsert": {"state": "scheduled", "next_seq": 0, "admitted_through": 0, "admit_clock": 0.0}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+
+    async def open_room(self, event_id: str, first: int, reserved: int, now: float, until: float) -> bool:
+        result = await self.rooms.update_one(
+            {"_id": event_id, "state": "scheduled", "next_seq": first},
+            {"$set": {"state": "opening", "admit_clock": now, "opening_seqs": [first, first + reserved],
+                      "opening_until": until},
+             "$inc": {"next_seq": reserved}}
+        )
+        return result.modified_count == 1
+
+    async def claim_opening(self, event_id: str, until: float, new_until: float) -> bool:
+        result = await self.rooms.update_one(
+            {"_id": event_id, "state": "opening", "opening_until": until}, {"$set": {"opening_until": new_until}}
+        )
+        return result.modified_count == 1
+
+    async def set_state(self, event_id: str, state: str):
+        await self.rooms.update_one({"_id": event_id}, {"$set": {"state": state}})
+
+    async def take_seq(self, event_id: str) -> int:
+        room = await self.rooms.find_one_and_update(
+            {"_id": event_id}, {"$inc": {"next_seq": 1}},
+            projection={"next_seq": 1}, return_document=ReturnDocument.AFTER
+        )
+        return room["next_seq"]
+
+    async def advance(self, event_id: str, through: int, clock: float, new_through: int, new_clock: float) -> bool:
+        result = await self.rooms.update_one(
+            {"_id": event_id, "admitted_through": through, "admit_clock": clock},
+            {"$set": {"admitted_through": new_through, "admit_clock": new_clock}}
+        )
+        return result.modified_count == 1
+
+    async def add_entry(self, entry: dict) -> dict:
+        """Insert a place, or return the account's existing one"""
+        try:
+            await self.entries.insert_one(dict(entry))
+            return entry
+        except DuplicateKeyError:
+            return await self.get_entry(entry["event_id"], entry["user_id"])
+
+    async def get_entry(self, event_id: str, user_id: str) -> Optional[dict]:
+        return await self.entries.find_one({"event_id": event_id, "user_id": user_id}, {"_id": 0})
+
+    async def get_entry_by_id(self, entry_id: str) -> Optional[dict]:
+        return await self.entries.find_one({"entry_id": entry_id}, {"_id": 0})
+
+    async def reassign(self, entry_id: str, expected_seq: Optional[int], seq: int) -> bool:
+        """Give a place a new sequence number (and clear its admission) if it still has expected_seq"""
+        result = await self.entries.update_one(
+            {"entry_id": entry_id, "seq": expected_seq}, {"$set": {"seq": seq, "admitted_at": None}}
+        )
+        return result.modified_count == 1
+
+    async def assign_seqs(self, seqs: Dict[str, int]):
+        await self.entries.bulk_write(
+            [UpdateOne({"entry_id": e, "seq": None}, {"$set": {"seq": s}}) for e, s in seqs.items()],
+            ordered=False
+        )
+
+    async def mark_admitted(self, entry_id: str, now: float) -> Optional[float]:
+        """Record when an admission was first used; returns the recorded time"""
+        entry = await self.entries.find_one_and_update(
+            {"entry_id": entry_id, "admitted_at": None}, {"$set": {"admitted_at": now}},
+            projection={"admitted_at": 1}, return_document=ReturnDocument.AFTER
+        )
+        if entry is None:
+            entry = await self.entries.find_one({"entry_id": entry_id}, {"admitted_at": 1})
+        return entry["admitted_at"] if entry else None
+
+    async def count_prequeue(self, event_id: str) -> int:
+        return await self.entries.count_documents({"event_id": event_id, "seq": None})
+
+    async def taken_seqs(self, event_id: str, first: int, last: int) -> set:
+        """Sequence numbers in (first, last] that places already hold"""
+        cursor = self.entries.find({"event_id": event_id, "seq": {"$gt": first, "$lte": last}}, {"_id": 0, "seq": 1})
+        return {entry["seq"] async for entry in cursor}
+
+    async def prequeue(self, event_id: str, after: int, limit: int) -> List[dict]:
+        return await self.entries.find(
+            {"event_id": event_id, "seq": None, "lottery": {"$gt": after}}, {"_id": 0, "entry_id": 1, "lottery": 1}
+        ).sort("lottery", 1).to_list(limit)
+
+
+class MemoryQueueStore:
+    """In-process stand-in with the same atomicity as the Mongo store: every
+    conditional update happens without yielding to the event loop."""
+
+    def __init__(self):
+        self.rooms: Dict[str, dict] = {}
+        self.entries: Dict[str, dict] = {}
+        self.by_user: Dict[tuple, str] = {}
+        self.unsequenced: Dict[str, Dict[str, dict]] = {}
+
+    async def ensure_indexes(self):
+        pass
+
+    async def get_room(self, event_id: str) -> Optional[dict]:
+        room = self.rooms.get(event_id)
+        return dict(room) if room else None
+
+    async def put_room(self, event_id: str, fields: dict) -> dict:
+        room = self.rooms.setdefault(event_id, {"_id": event_id, "state": "scheduled", "next_seq": 0,
+                                                "admitted_through": 0, "admit_clock": 0.0})
+        room.update(fields)
+        return dict(room)
+
+    async def open_room(self, event_id: str, first: int, reserved: int, now: float, until: float) -> bool:
+        room = self.rooms[event_id]
+        if room["state"] != "scheduled" or room["next_seq"] != first:
+            return False
+        room.update(state="opening", admit_clock=now, next_seq=first + reserved,
+                    opening_seqs=[first, first + reserved], opening_until=until)
+        return True
+
+    async def claim_opening(self, event_id: str, until: float, new_until: float) -> bool:
+        room = self.rooms[event_id]
+        if room["state"] != "opening" or room.get("opening_until") != until:
+            return False
+        room["opening_until"] = new_until
+        return True
+
+    async def set_state(self, event_id: str, state: str):
+        self.rooms[event_id]["state"] = state
+
+    async def take_seq(self, event_id: str) -> int:
+        room = self.rooms[event_id]
+        room["next_seq"] += 1
+        return room["next_seq"]
+
+    async def advance(self, event_id: str, through: int, clock: float, new_through: int, new_clock: float) -> bool:
+        room = self.rooms[event_id]
+        if (room["admitted_through"], room["admit_clock"]) != (through, clock):
+            return False
+        room.update(admitted_through=new_through, admit_clock=new_clock)
+        return True
+
+    async def add_entry(self, entry: dict) -> dict:
+        key = (entry["event_id"], entry["user_id"])
+        if key in self.by_user:
+            return dict(self.entries[self.by_user[key]])
+        self.by_user[key] = entry["entry_id"]
+        self.entries[entry["entry_id"]] = dict(entry)
+        if entry["seq"] is None:
+            self.unsequenced.setdefault(entry["event_id"], {})[entry["entry_id"]] = self.entries[entry["entry_id"]]
+        return entry
+
+    async def get_entry(self, event_id: str, user_id: str) -> Optional[dict]:
+        entry_id = self.by_user.get((event_id, user_id))
+        return dict(self.entries[entry_id]) if entry_id else None
+
+    async def get_entry_by_id(self, entry_id: str) -> Optional[dict]:
+        entry = self.entries.get(entry_id)
+        return dict(entry) if entry else None
+
+    async def reassign(self, entry_id: str, expected_seq: Optional[int], seq: int) -> bool:
+        entry = self.entries[entry_id]
+        if entry["seq"] != expected_seq:
+            return False
+        entry.update(seq=seq, admitted_at=None)
+        self.unsequenced.get(entry["event_id"], {}).pop(entry_id, None)
+        return True
+
+    async def assign_seqs(self, seqs: Dict[str, int]):
+        for entry_id, seq in seqs.items():
+            entry = self.entries[entry_id]
+            if entry["seq"] is None:
+                entry["seq"] = seq
+                self.unsequenced.get(entry["event_id"], {}).pop(entry_id, None)
+
+    async def mark_admitted(self, entry_id: str, now: float) -> Optional[float]:
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return None
+        if entry["admitted_at"] is None:
+            entry["admitted_at"] = now
+        return entry["admitted_at"]
+
+    async def count_prequeue(self, event_id: str) -> int:
+        return len(self.unsequenced.get(event_id, {}))
+
+    async def taken_seqs(self, event_id: str, first: int, last: int) -> set:
+        return {e["seq"] for e in self.entries.values()
+                if e["event_id"] == event_id and e["seq"] is not None and first < e["seq"] <= last}
+
+    async def prequeue(self, event_id: str, after: int, limit: int) -> List[dict]:
+        pending = (e for e in self.unsequenced.get(event_id, {}).values() if e["lottery"] > after)
+        return [{"entry_id": e["entry_id"], "lottery": e["lottery"]}
+                for e in heapq.nsmallest(limit, pending, key=lambda e: e["lottery"])]
+
+
+# ============== ROOMS ==============
+
+class WaitingRoom:
+    """Queue places, admission and signed tokens for every event with a room"""
+
+    def __init__(self, store, secret: Optional[bytes] = None, clock=time.time,
+                 cache_seconds: float = QUEUE_ROOM_CACHE_SECONDS):
+        self.store = store
+        self.secret = secret if secret is not None else _secret()
+        self.clock = clock
+        self.cache_seconds = cache_seconds
+        self._rooms: Dict[str, tuple] = {}  # event_id -> (read at, room or None)
+
+    # ----- tokens -----
+
+    def token(self, entry: dict) -> str:
+        payload = base64.urlsafe_b64encode(
+            f"{entry['event_id']}|{entry['user_id']}|{entry['entry_id']}".encode()).decode().rstrip("=")
+        return f"{payload}.{self._sign(payload)}"
+
+    def _sign(self, payload: str) -> str:
+        if not self.secret:
+            raise QueueUnavailable()
+        return hmac.new(self.secret, payload.encode(), hashlib.sha256).hexdigest()[:32]
+
+    def verify(self, token: Optional[str]) -> Optional[tuple]:
+        """(event_id, user_id, entry_id) of a genuine token, else None"""
+        payload, _, signature = (token or "").partition(".")
+        # Tokens come from headers and bodies: compare bytes, as compare_digest refuses non-ASCII str
+        if (not payload or not self.secret
+                or not hmac.compare_digest(signature.encode(), self._sign(payload).encode())):
+            return None
+        try:
+            parts = base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)).decode().split("|")
+        except ValueError:
+            return None
+        return tuple(parts) if len(parts) == 3 else None
+
+    # ----- rooms -----
+
+    async def configure(self, event_id: str, active: bool = True, rate_per_minute: int = QUEUE_RATE_PER_MINUTE,
+                        admit_minutes: int = QUEUE_ADMIT_MINUTES, opens_at: Optional[float] = None) -> dict:
+        """Raises QueueUnavailable when activating a room without a shared token secret"""
+        if active and not self.secret:
+            raise QueueUnavailable()
+        room = await self.store.put_room(event_id, {
+            "active": active, "rate_per_minute": rate_per_minute, "admit_minutes": admit_minutes,
+            "opens_at": opens_at if opens_at is not None else self.clock(),
+        })
+        self._rooms.pop(event_id, None)
+        return room
+
+    async def room(self, event_id: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """The room, opened and advanced to now; cached for checkout's sake"""
+        max_age = self.cache_seconds if max_age is None else max_age
+        cached = self._rooms.get(event_id)
+        now = self.clock()
+        if cached and now - cached[0] < max_age:
+            return cached[1]
+        room = await self.store.get_room(event_id)
+        if room and room.get("active"):
+            room = await self._open(room, now)
+            room = await self._advance(room, now)
+        self._rooms[event_id] = (now, room)
+        return room
+
+    async def _open(self, room: dict, now: float) -> dict:
+        """Place everyone who joined before the on-sale in random order, once"""
+        event_id = room["_id"]
+        if room["state"] == "scheduled" and now >= room["opens_at"]:
+            first = room["next_seq"]
+            reserved = await self.store.count_prequeue(event_id)
+            until = now + QUEUE_OPENING_LEASE_SECONDS
+            if not await self.store.open_room(event_id, first, reserved, now, until):
+                return await self.store.get_room(event_id)
+            # Numbers first+1..first+reserved were taken in one go; stragglers get numbered after them by sequence()
+            await self._number_prequeue(event_id, first, first + reserved, until, taken=set())
+        elif room["state"] == "opening" and now >= room["opening_until"]:
+            # The worker opening the room died part way: take over and number whoever it didn't reach
+            until = now + QUEUE_OPENING_LEASE_SECONDS
+            if not await self.store.claim_opening(event_id, room["opening_until"], until):
+                return await self.store.get_room(event_id)
+            first, last = room["opening_seqs"]
+            logger.warning(f"🚪 Resuming the opening of the waiting room for {event_id}")
+            await self._number_prequeue(event_id, first, last, until,
+                                        taken=await self.store.taken_seqs(event_id, first, last))
+        else:
+            return room
+        return await self.store.get_room(event_id)
+
+    async def _number_prequeue(self, event_id: str, first: int, last: int, until: float, taken: set):
+        """Hand the reserved numbers not yet taken to pre-queued places in lottery order, then open"""
+        free = (seq for seq in range(first + 1, last + 1) if seq not in taken)
+        remaining = last - first - len(taken)
+        after = -1
+        while remaining > 0:
+            batch = await self.store.prequeue(event_id, after, min(QUEUE_OPEN_BATCH, remaining))
+            if not batch:
+                break
+            # Renew the lease per batch; if it lapsed and another worker took over, leave the rest to it
+            renewed = self.clock() + QUEUE_OPENING_LEASE_SECONDS
+            if not await self.store.claim_opening(event_id, until, renewed):
+                return
+            until = renewed
+            await self.store.assign_seqs({entry["entry_id"]: next(free) for entry in batch})
+            remaining -= len(batch)
+            after = batch[-1]["lottery"]
+        await self.store.set_state(event_id, "open")
+        logger.info(f"🚪 Waiting room for {event_id} opened with {last - first} pre-queued")
+
+    async def _advance(self, room: dict, now: float) -> dict:
+        """Admit rate x elapsed more places, bounded by how many have joined"""
+        if room["state"] == "scheduled":
+            return room
+        rate = room["rate_per_minute"] / 60.0
+        due = int((now - room["admit_clock"]) * rate)
+        if due <= 0 or rate <= 0:
+            return room
+        through = min(room["admitted_through"] + due, room["next_seq"])
+        # When nobody is left to admit the unused allowance lapses instead of banking a burst
+        clock = room["admit_clock"] + due / rate if through < room["next_seq"] else now
+        if await self.store.advance(room["_id"], room["admitted_through"], room["admit_clock"], through, clock):
+            queue_admissions.inc((), through - room["admitted_through"])
+            return {**room, "admitted_through": through, "admit_clock": clock}
+        return await self.store.get_room(room["_id"])  # another worker advanced it
+
+    # ----- places -----
+
+    async def join(self, event_id: str, user_id: str) -> dict:
+        """A place in the queue for an account; the same place when it joins again"""
+        room = await self.room(event_id, max_age=0)
+        if not room or not room.get("active"):
+            raise QueueRequired("This event has no waiting room")
+        entry = await self.store.get_entry(event_id, user_id)
+        if entry is None:
+            prequeue = room["state"] == "scheduled"
+            entry = await self.store.add_entry({
+                "entry_id": f"queue_{uuid.uuid4().hex[:16]}", "event_id": event_id, "user_id": user_id,
+                "seq": None if prequeue else await self.store.take_seq(event_id),
+                "lottery": secrets.randbits(62), "joined_at": self.clock(), "admitted_at": None,
+            })
+            queue_joins.inc(("prequeue" if prequeue else "queued",))
+        elif self._expired(entry, room):
+            # An admission that went unused: back of the queue
+            await self.store.reassign(entry["entry_id"], entry["seq"], await self.store.take_seq(event_id))
+            entry = await self.store.get_entry(event_id, user_id)
+            queue_joins.inc(("requeued",))
+        else:
+            queue_joins.inc(("existing",))
+        entry = await self.sequence(entry, room)
+        return {**self.status(entry, room), "token": self.token(entry)}
+
+    async def sequence(self, entry: dict, room: dict) -> dict:
+        """Number a pre-queued place that missed the opening shuffle (joined while it ran)"""
+        if entry["seq"] is None and room["state"] == "open":
+            # Losing the race means someone else numbered it; the spare number is just never admitted to anyone
+            await self.store.reassign(entry["entry_id"], None, await self.store.take_seq(entry["event_id"]))
+            return await self.store.get_entry_by_id(entry["entry_id"])
+        return entry
+
+    def _expired(self, entry: dict, room: dict) -> bool:
+        admitted_at = entry.get("admitted_at")
+        return admitted_at is not None and self.clock() > admitted_at + room["admit_minutes"] * 60
+
+    def status(self, entry: dict, room: dict) -> dict:
+        """What the queue page shows"""
+        opens_at = datetime.fromtimestamp(room["opens_at"], timezone.utc).isoformat()
+        status = {"event_id": room["_id"], "opens_at": opens_at}
+        if entry["seq"] is None:
+            return {**status, "state": "pending"}
+        if entry["seq"] > room["admitted_through"]:
+            ahead = entry["seq"] - room["admitted_through"] - 1
+            rate = room["rate_per_minute"] / 60.0
+            return {**status, "state": "waiting", "position": ahead + 1,
+                    "eta_seconds": int(ahead / rate) if rate > 0 else None}
+        if self._expired(entry, room):
+            return {**status, "state": "expired"}
+        return {**status, "state": "admitted", "admit_minutes": room["admit_minutes"]}
+
+    async def check_admission(self, event_id: str, user_id: str, token: Optional[str]):
+        """Raise QueueRequired unless checkout for this event is open to this account right now"""
+        room = await self.room(event_id)
+        if not room or not room.get("active"):
+            return
+        claims = self.verify(token)
+        if claims is None or claims[:2] != (event_id, user_id):
+            queue_rejections.inc(("token",))
+            raise QueueRequired("Join the queue for this event to buy tickets")
+        entry = await self.store.get_entry_by_id(claims[2])
+        if entry is None or entry["seq"] is None or entry["seq"] > room["admitted_through"]:
+            queue_rejections.inc(("waiting",))
+            raise QueueRequired("It's not your turn yet - please wait in the queue")
+        admitted_at = entry["admitted_at"] or await self.store.mark_admitted(entry["entry_id"], self.clock())
+        if self.clock() > admitted_at + room["admit_minutes"] * 60:
+            queue_rejections.inc(("expired",))
+            raise QueueRequired("Your checkout window has closed - please rejoin the queue")
+
+
+# ============== POSITION STREAMS ==============
+
+class Waiter:
+    """One queued page's stream: a single future, no timers"""
+
+    __slots__ = ("entry", "deadline", "closed", "in_heap", "_future")
+
+    def __init__(self, entry: dict, deadline: float):
+        self.entry = entry
+        self.deadline = deadline
+        self.closed = False
+        self.in_heap = False
+        self._future: Optional[asyncio.Future] = None
+
+    def __lt__(self, other):
+        return self.entry["seq"] < other.entry["seq"]
+
+    def wake(self, reason: str):
+        if self._future is not None and not self._future.done():
+            self._future.set_result(reason)
+
+    async def wait(self) -> str:
+        self._future = asyncio.get_running_loop().create_future()
+        try:
+            return await self._future
+        finally:
+            self._future = None
+
+
+class RoomChannel:
+    """This worker's streams for one room, ordered by place so admissions pop off the front"""
+
+    def __init__(self):
+        self.heap: List[Waiter] = []
+        self.pending: set = set()  # pre-queued, no place yet
+        self.count = 0
+        self.dead = 0  # closed waiters still in the heap
+
+    def push(self, waiter: Waiter):
+        self.pending.discard(waiter)
+        waiter.in_heap = True
+        heapq.heappush(self.heap, waiter)
+
+    def pop(self) -> Waiter:
+        waiter = heapq.heappop(self.heap)
+        waiter.in_heap = False
+        if waiter.closed:
+            self.dead -= 1
+        return waiter
+
+    def remove(self, waiter: Waiter):
+        waiter.closed = True
+        self.count -= 1
+        self.pending.discard(waiter)
+        if waiter.in_heap:
+            self.dead += 1
+            # Reconnecting pages leave closed waiters behind; rebuild before they outnumber the live ones
+            if self.dead * 2 > len(self.heap):
+                self.heap = [w for w in self.heap if not w.closed]
+                heapq.heapify(self.heap)
+                self.dead = 0
+
+
+class QueueHub:
+    """Position streams by event for this worker, all driven by one ticker"""
+
+    def __init__(self, rooms: WaitingRoom, tick: float = QUEUE_TICK_SECONDS,
+                 position_every: float = QUEUE_POSITION_SECONDS, max_seconds: float = QUEUE_STREAM_MAX_SECONDS):
+        self.rooms = rooms
+        self.tick = tick
+        self.position_every = position_every
+        self.max_seconds = max_seconds
+        self.channels: Dict[str, RoomChannel] = {}
+        self._ticker: Optional[asyncio.Task] = None
+        self._last_positions = 0.0
+
+    @property
+    def stream_count(self) -> int:
+        return sum(c.count for c in self.channels.values())
+
+    def _add(self, event_id: str, waiter: Waiter):
+        channel = self.channels.get(event_id)
+        if channel is None:
+            channel = self.channels[event_id] = RoomChannel()
+        channel.count += 1
+        if waiter.entry["seq"] is None:
+            channel.pending.add(waiter)
+        else:
+            channel.push(waiter)
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._tick(), name="waiting-room-ticker")
+
+    def _remove(self, event_id: str, waiter: Waiter):
+        channel = self.channels.get(event_id)
+        if channel is None:
+            return
+        channel.remove(waiter)
+        if channel.count == 0:
+            del self.channels[event_id]
+
+    async def advance(self, now: float, positions: bool):
+        """One room read per event: wake admitted streams, and every stream when positions are due"""
+        for event_id, channel in list(self.channels.items()):
+            room = await self.rooms.room(event_id, max_age=0)
+            if not room or not room.get("active"):
+                for waiter in list(channel.pending) + channel.heap:
+                    waiter.wake("closed")
+                continue
+            while channel.heap and (channel.heap[0].closed or channel.heap[0].entry["seq"] <= room["admitted_through"]):
+                channel.pop().wake("admitted")
+            if positions or room["state"] == "open" and channel.pending:
+                for waiter in list(channel.pending):
+                    waiter.wake("position")
+            if positions:
+                for waiter in channel.heap:
+                    waiter.wake("closed" if now >= waiter.deadline else "position")
+
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        while self.channels:
+            await asyncio.sleep(self.tick)
+            now = loop.time()
+            positions = now - self._last_positions >= self.position_every
+            if positions:
+                self._last_positions = now
+            try:
+                await self.advance(now, positions)
+            except Exception as e:
+                logger.warning(f"Waiting room tick failed: {e}")
+
+    async def stream(self, event_id: str, entry: dict) -> AsyncIterator[str]:
+        """SSE body for one queued page: its status now, then position updates until admitted"""
+        loop = asyncio.get_running_loop()
+        waiter = Waiter(entry, loop.time() + self.max_seconds)
+        room = await self.rooms.room(event_id)
+        yield f"retry: {RETRY_MS}\n\n"
+        if room is None or not room.get("active"):
+            yield sse("closed", {"event_id": event_id})
+            return
+        status = self.rooms.status(entry, room)
+        yield sse(status["state"], status)
+        if status["state"] in ("admitted", "expired"):
+            return
+        self._add(event_id, waiter)
+        try:
+            while True:
+                reason = await waiter.wait()
+                if reason == "closed":
+                    return
+                room = await self.rooms.room(event_id) or room  # just refreshed by the ticker
+                if waiter.entry["seq"] is None:
+                    # The opening shuffle may have placed it: one read, then it joins the ordered heap
+                    placed = await self.rooms.sequence(await self.rooms.store.get_entry_by_id(entry["entry_id"]), room)
+                    if placed["seq"] is None:
+                        continue
+                    waiter.entry = placed
+                    self.channels[event_id].push(waiter)
+                status = self.rooms.status(waiter.entry, room)
+                yield sse(status["state"], status)
+                if status["state"] != "waiting":
+                    return
+        finally:
+            self._remove(event_id, waiter)
+
+    def close(self):
+        """End every open stream; pages reconnect and keep their place"""
+        for channel in list(self.channels.values()):
+            for waiter in list(channel.pending) + channel.heap:
+                waiter.wake("closed")
+
+
+waiting_room = WaitingRoom(MongoQueueStore(db))
+queue_hub = QueueHub(waiting_room)
+register_collector(lambda: "\n".join(
+    queue_joins.render(("outcome",)) + queue_admissions.render(()) + queue_rejections.render(("reason",))
+    + ["# TYPE waiting_room_streams gauge", f"waiting_room_streams {queue_hub.stream_count}"]
+) + "\n")
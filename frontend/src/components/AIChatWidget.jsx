@@ -33,7 +33,7 @@ const AIChatWidget = () => {
     setLoading(true);
 
     try {
-      const response = await fetch(`${API}/chat/support`, {
+      const response = await fetch(`${API}/chat/support/stream`, {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
@@ -42,9 +42,32 @@ const AIChatWidget = () => {
         })
       });
 
-      if (response.ok) {
-        const data = await response.json();
-        setMessages(prev => [...prev, { role: "assistant", content: data.response }]);
+      if (response.ok && response.body) {
+        // Server-Sent Events: append tokens to the reply as they arrive
+        setMessages(prev => [...prev, { role: "assistant", content: "" }]);
+        const appendToReply = (text) => setMessages(prev => {
+          const updated = [...prev];
+          const last = updated[updated.length - 1];
+          updated[updated.length - 1] = { ...last, content: last.content + text };
+          return updated;
+        });
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = "";
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) break;
+          buffer += decoder.decode(value, { stream: true });
+          const events = buffer.split("\n\n");
+          buffer = events.pop();
+          for (const event of events) {
+            if (!event.startsWith("data: ")) continue;
+            const data = JSON.parse(event.slice(6));
+            if (data.delta) appendToReply(data.delta);
+            if (data.error) appendToReply(data.error);
+          }
+        }
       } else {
         setMessages(prev => [...prev, { 
           role: "assistant", 
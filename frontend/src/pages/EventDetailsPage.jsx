@@ -95,6 +95,7 @@ const EventDetailsPage = () => {
   const [selectedCategory, setSelectedCategory] = useState(null);
   const [selectedTicket, setSelectedTicket] = useState(null);
   const [purchasing, setPurchasing] = useState(false);
+  const [queue, setQueue] = useState(null);
 
   useEffect(() => {
     const fetchEvent = async () => {
@@ -113,6 +114,85 @@ const EventDetailsPage = () => {
     fetchEvent();
   }, [eventId, navigate]);
 
+  // Live availability: a snapshot, then listed/price/reserved/sold deltas pushed by the server
+  useEffect(() => {
+    if (typeof EventSource === "undefined") return;
+    const source = new EventSource(`${API}/events/${eventId}/live`);
+    const update = (fn) => (message) => {
+      const data = JSON.parse(message.data);
+      setEvent((prev) => (prev ? { ...prev, ...fn(prev, data) } : prev));
+    };
+    const without = (tickets, ticketId) => tickets.filter((t) => t.ticket_id !== ticketId);
+
+    source.addEventListener("snapshot", update((prev, data) => ({
+      tickets: data.tickets, categories: data.categories, ticket_count: data.ticket_count
+    })));
+    source.addEventListener("listed", update((prev, data) => ({
+      tickets: [...without(prev.tickets || [], data.ticket.ticket_id), data.ticket]
+    })));
+    source.addEventListener("updated", update((prev, data) => ({
+      tickets: (prev.tickets || []).map((t) => (t.ticket_id === data.ticket.ticket_id ? data.ticket : t))
+    })));
+    source.addEventListener("price", update((prev, data) => ({
+      tickets: (prev.tickets || []).map((t) => (t.ticket_id === data.ticket_id ? { ...t, price: data.price } : t))
+    })));
+    ["reserved", "sold", "removed"].forEach((kind) => {
+      source.addEventListener(kind, update((prev, data) => ({ tickets: without(prev.tickets || [], data.ticket_id) })));
+    });
+    source.addEventListener("categories", update((prev, data) => ({
+      categories: data.categories, ticket_count: data.ticket_count
+    })));
+
+    return () => source.close();
+  }, [eventId]);
+
+  // Waiting room: high-demand on-sales admit buyers to checkout in queue order
+  useEffect(() => {
+    axios.get(`${API}/events/${eventId}/queue`, { withCredentials: true })
+      .then((response) => setQueue(response.data))
+      .catch(() => setQueue(null));
+  }, [eventId, user]);
+
+  // Position updates are pushed over one stream until the buyer is admitted
+  const queueToken = queue?.token;
+  const queueWaiting = queue?.state === "waiting" || queue?.state === "pending";
+  useEffect(() => {
+    if (!queueToken || !queueWaiting || typeof EventSource === "undefined") return;
+    const source = new EventSource(`${API}/events/${eventId}/queue/stream?token=${encodeURIComponent(queueToken)}`);
+    const update = (message) => setQueue((prev) => ({ ...prev, ...JSON.parse(message.data) }));
+    ["pending", "waiting", "admitted", "expired"].forEach((kind) => source.addEventListener(kind, update));
+    source.addEventListener("admitted", () => {
+      source.close();
+      toast.success("It's your turn - you can buy tickets now");
+    });
+    source.addEventListener("closed", () => source.close());
+    return () => source.close();
+  }, [eventId, queueToken, queueWaiting]);
+
+  const joinQueue = async () => {
+    if (!user) {
+      toast.error("Please sign in to join the queue");
+      login();
+      return;
+    }
+    try {
+      const response = await axios.post(`${API}/events/${eventId}/queue`, {}, { withCredentials: true });
+      setQueue(response.data);
+    } catch (error) {
+      toast.error(error.response?.data?.detail || "Could not join the queue");
+    }
+  };
+
+  const queueBlocksCheckout = queue?.active && queue.state !== "admitted";
+
+  // Drop the selection if the selected ticket was just reserved or sold
+  useEffect(() => {
+    if (selectedTicket && event?.tickets && !event.tickets.some((t) => t.ticket_id === selectedTicket.ticket_id)) {
+      setSelectedTicket(null);
+      toast.info("That ticket was just taken - please pick another one");
+    }
+  }, [event, selectedTicket]);
+
   // SEO - removed document.title in favor of SEOHead component
 
   const handleCategorySelect = (category) => {
@@ -131,6 +211,11 @@ const EventDetailsPage = () => {
       return;
     }
 
+    if (queueBlocksCheckout) {
+      toast.info("Tickets for this event are sold through a queue - please join it first");
+      return;
+    }
+
     setPurchasing(true);
     try {
       const ticketTotal = ticket.price * 1.1; // 10% commission
@@ -162,7 +247,8 @@ const EventDetailsPage = () => {
 
       const response = await axios.post(`${API}/checkout/create`, {
         ticket_id: ticket.ticket_id,
-        origin_url: window.location.origin
+        origin_url: window.location.origin,
+        queue_token: queue?.token
       }, { withCredentials: true });
 
       window.location.href = response.data.url;
@@ -185,6 +271,11 @@ const EventDetailsPage = () => {
       return;
     }
 
+    if (queueBlocksCheckout) {
+      toast.info("Tickets for this event are sold through a queue - please join it first");
+      return;
+    }
+
     setPurchasing(true);
     try {
       // Track Facebook Pixel - InitiateCheckout
@@ -214,7 +305,8 @@ const EventDetailsPage = () => {
 
       const response = await axios.post(`${API}/checkout/create`, {
         ticket_id: selectedTicket.ticket_id,
-        origin_url: window.location.origin
+        origin_url: window.location.origin,
+        queue_token: queue?.token
       }, { withCredentials: true });
 
       window.location.href = response.data.url;
@@ -474,6 +566,29 @@ const EventDetailsPage = () => {
               </div>
             </div>
 
+            {/* Waiting room */}
+            {queue?.active && (
+              <div className="bg-zinc-900/50 border border-cyan-500/30 rounded-2xl p-6" data-testid="waiting-room">
+                <div className="flex items-center justify-between gap-4">
+                  <div>
+                    <h2 className="text-xl font-bold mb-1">High demand - you're in a queue</h2>
+                    <p className="text-sm text-zinc-400">
+                      {queue.state === "not_joined" && "Join the queue to get your turn to buy. Your place is kept if you reload."}
+                      {queue.state === "pending" && `The sale opens ${new Date(queue.opens_at).toLocaleString()}. Everyone who joined before then gets a random place.`}
+                      {queue.state === "waiting" && `Position ${queue.position.toLocaleString()}${queue.eta_seconds != null ? ` - about ${Math.max(1, Math.round(queue.eta_seconds / 60))} min` : ""}`}
+                      {queue.state === "admitted" && `It's your turn: you have ${queue.admit_minutes} minutes to check out.`}
+                      {queue.state === "expired" && "Your checkout window has closed."}
+                    </p>
+                  </div>
+                  {(queue.state === "not_joined" || queue.state === "expired") && (
+                    <Button onClick={joinQueue} className="btn-crystal px-4 py-2 text-sm font-semibold" data-testid="join-queue">
+                      {queue.state === "expired" ? "Rejoin queue" : "Join queue"}
+                    </Button>
+                  )}
+                </div>
+              </div>
+            )}
+
             {/* Tickets */}
             <div className="bg-zinc-900/50 border border-white/5 rounded-2xl p-6">
               <div className="flex items-center justify-between mb-6">
@@ -48,6 +48,8 @@ const WorldCupRafflePage = () => {
         if (data.checkout_url) {
           window.location.href = data.checkout_url;
         }
+      } else if (response.status === 409) {
+        alert('Sorry, all raffle entries have been taken.');
       } else {
         alert('Please sign in to enter the raffle');
         navigate('/events');